@@ -0,0 +1,90 @@
+"""
+Bar Schedule Export
+Bar bending schedules of uploaded project member lists. The list is read CHUNK_ROWS rows at a time
+(see trend_chunks) and each chunk is scheduled in one array pass: the summary keeps running totals
+and the aggregated cut pieces for the stock optimization, the CSV export streams every scheduled
+chunk straight back, and the XLSX export zips the same chunks into the workbook as they are
+scheduled (see stream_workbook), so memory stays bounded whatever the project size.
+"""
+
+import io
+import itertools
+from typing import Dict, Any, Iterator, Optional, Sequence
+
+import pandas as pd
+
+from analytics.psychrometrics import trend_chunks
+from analytics.xlsx_stream import stream_workbook
+from calculators.services.bar_schedule import LAP, ROUNDING, SCHEDULE_COLUMNS, STOCK_LENGTHS, ScheduleSummary, schedule_chunks
+
+CHUNK_ROWS = 50_000
+SUMMARY_COLUMNS = ["diameter", "bars", "total_length", "weight", "stock_length", "stock_bars", "stock_weight", "offcut", "waste_percent"]
+CUTTING_COLUMNS = ["diameter", "stock_length", "repeats", "pieces", "offcut"]
+
+
+def _stream(fileobj, filename: str, stock_lengths: Optional[Sequence[float]], lap: float, rounding: float):
+    summary = ScheduleSummary(stock_lengths or STOCK_LENGTHS, lap)
+    chunks = schedule_chunks(trend_chunks(fileobj, filename, CHUNK_ROWS), summary.stock_lengths, lap, rounding, summary)
+    # Evaluate the first chunk eagerly so missing columns or bad rows raise before streaming starts
+    first = next(chunks, None)
+    return summary, itertools.chain([first] if first is not None else [], chunks)
+
+
+class BarScheduleService:
+    @staticmethod
+    def analyze_file(fileobj, filename: str, stock_lengths: Optional[Sequence[float]] = None, lap: float = LAP, rounding: float = ROUNDING,
+                     optimize: bool = True):
+        """Totals and stock cutting plan of an uploaded member list without keeping its rows"""
+        try:
+            summary, chunks = _stream(fileobj, filename, stock_lengths, lap, rounding)
+            for _ in chunks:
+                pass
+            results = summary.result(optimize)
+            return {"results": results, "compliance": "IS 2502:1963", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    @staticmethod
+    def export_csv(fileobj, filename: str, stock_lengths: Optional[Sequence[float]] = None, lap: float = LAP,
+                   rounding: float = ROUNDING) -> Iterator[str]:
+        """The schedule as CSV text, one chunk at a time"""
+        _, chunks = _stream(fileobj, filename, stock_lengths, lap, rounding)
+
+        def lines():
+            for i, chunk in enumerate(chunks):
+                buffer = io.StringIO()
+                chunk.to_csv(buffer, index=False, header=i == 0, float_format='%.6g')
+                yield buffer.getvalue()
+
+        return lines()
+
+    @staticmethod
+    def export_xlsx(fileobj, filename: str, stock_lengths: Optional[Sequence[float]] = None, lap: float = LAP,
+                    rounding: float = ROUNDING) -> Iterator[bytes]:
+        """The schedule as an XLSX workbook (Schedule, Summary and Cutting sheets), one zipped chunk of rows at a time"""
+        summary, chunks = _stream(fileobj, filename, stock_lengths, lap, rounding)
+        totals = []
+
+        def summary_rows():
+            totals.append(summary.result())
+            yield _summary_frame(totals[0])
+
+        def cutting_rows():
+            yield _cutting_frame(totals[0])
+
+        return stream_workbook([("Schedule", SCHEDULE_COLUMNS, chunks), ("Summary", SUMMARY_COLUMNS, summary_rows()),
+                                ("Cutting", CUTTING_COLUMNS, cutting_rows())])
+
+
+def _summary_frame(results: Dict[str, Any]) -> pd.DataFrame:
+    rows = [[f'{row["diameter"]:g}', row["bars"], row["total_length"], row["weight"]] + [row["cutting"][key] for key in SUMMARY_COLUMNS[4:]]
+            for row in results["diameters"]]
+    rows.append(["total", results["total_bars"], None, results["total_weight"]] + [None] * (len(SUMMARY_COLUMNS) - 4))
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def _cutting_frame(results: Dict[str, Any]) -> pd.DataFrame:
+    rows = [[row["diameter"], row["cutting"]["stock_length"], pattern["repeats"],
+             " + ".join(f"{count} x {length:g}" for length, count in pattern["pieces"].items()), pattern["offcut"]]
+            for row in results["diameters"] for pattern in row["cutting"]["top_patterns"]]
+    return pd.DataFrame(rows, columns=CUTTING_COLUMNS)
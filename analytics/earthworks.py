@@ -0,0 +1,69 @@
+"""
+Earthworks Survey Analysis
+Cut and fill of uploaded survey point files. Points are read CHUNK_ROWS rows at a time (see
+trend_chunks; header-less .xyz/.pts files are read the same way) and binned straight into a
+SurveyGrid, so a file of millions of points only ever holds one chunk and the grid in memory. The
+per-cell export streams the cell table back one block of grid rows at a time.
+"""
+
+import io
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics.psychrometrics import trend_chunks
+from calculators.services.earthworks import BULKING, CELL_SIZE, SHRINKAGE, SurveyGrid, earthwork_volumes, survey_cells
+
+CHUNK_ROWS = 500_000
+CELL_COLUMNS = ["x", "y", "existing", "design", "depth", "cut", "fill"]
+
+
+def survey_chunks(fileobj, filename: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Point frames from a survey file: CSV, Excel or JSON with x/y/z headings, or whitespace-separated x y z rows (.xyz, .pts)"""
+    if filename.lower().endswith(('.xyz', '.pts')):
+        return pd.read_csv(fileobj, sep=r'\s+', header=None, usecols=[0, 1, 2], names=['x', 'y', 'z'], comment='#', chunksize=chunk_rows)
+    return trend_chunks(fileobj, filename, chunk_rows)
+
+
+def read_survey(fileobj, filename: str, cell_size: float = CELL_SIZE) -> SurveyGrid:
+    """A survey file binned to a grid of cell_size, one chunk at a time"""
+    survey = SurveyGrid(cell_size)
+    for chunk in survey_chunks(fileobj, filename):
+        survey.feed(chunk)
+    return survey
+
+
+class EarthworksService:
+    @staticmethod
+    def analyze_file(fileobj, filename: str, design: Any, cell_size: float = CELL_SIZE, method: str = 'grid', bulking: float = BULKING,
+                     shrinkage: float = SHRINKAGE, include_heatmap: bool = True, design_file=None, design_filename: Optional[str] = None):
+        """Cut/fill volumes and heatmap of a survey file against a design level, plane, point list or design survey file"""
+        try:
+            survey = read_survey(fileobj, filename, cell_size)
+            if design_file is not None:
+                design = read_survey(design_file, design_filename or "", cell_size)
+            if design is None:
+                raise ValueError("A design level, plane, point list or design file is required")
+            results = earthwork_volumes(survey, design, method, bulking, shrinkage, include_heatmap)
+            return {"results": results, "compliance": "IS 1200 (Part 1)", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    @staticmethod
+    def export_csv(fileobj, filename: str, design: Any, cell_size: float = CELL_SIZE, method: str = 'grid', design_file=None,
+                   design_filename: Optional[str] = None, block_rows: int = 100) -> Iterator[str]:
+        """Per-cell centre, levels, depth, cut and fill as CSV text, block_rows grid rows at a time"""
+        survey = read_survey(fileobj, filename, cell_size)
+        if design_file is not None:
+            design = read_survey(design_file, design_filename or "", cell_size)
+        cells = survey_cells(survey, design, method)
+
+        def lines():
+            for start in range(0, cells["depth"].shape[0], block_rows):
+                block = pd.DataFrame({name: np.ravel(cells[name][start:start + block_rows]) for name in CELL_COLUMNS})
+                buffer = io.StringIO()
+                block.to_csv(buffer, index=False, header=start == 0, float_format='%.4f')
+                yield buffer.getvalue()
+
+        return lines()
@@ -0,0 +1,371 @@
+"""
+Harmonic Analysis
+FFT harmonic analysis of multi-channel waveform recordings: per-harmonic magnitudes,
+THD/TDD and IEEE 519-2014 compliance. Recordings are read and transformed in
+IEC 61000-4-7 windows (10 cycles at 50 Hz, 12 at 60 Hz) a block at a time, so memory
+stays bounded however long the recording is; window results are aggregated into an
+RMS spectrum, peak values and percentile distortion per channel.
+"""
+
+import math
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAX_HARMONIC = 50
+BLOCK_SAMPLES = 1 << 20  # samples per channel read from an upload at a time
+BINARY_EXTENSIONS = ('.bin', '.raw', '.dat')
+
+# IEEE 519-2014 Table 1: (bus voltage up to kV, individual harmonic %, THD %)
+VOLTAGE_LIMITS = ((1.0, 5.0, 8.0), (69.0, 3.0, 5.0), (161.0, 1.5, 2.5), (math.inf, 1.0, 1.5))
+
+# IEEE 519-2014 Table 2 (120 V - 69 kV): (Isc/IL up to, odd-harmonic limits per band, TDD %)
+CURRENT_BANDS = (3, 11, 17, 23, 35, MAX_HARMONIC + 1)
+CURRENT_LIMITS = (
+    (20, (4.0, 2.0, 1.5, 0.6, 0.3), 5.0),
+    (50, (7.0, 3.5, 2.5, 1.0, 0.5), 8.0),
+    (100, (10.0, 4.5, 4.0, 1.5, 0.7), 12.0),
+    (1000, (12.0, 5.5, 5.0, 2.0, 1.0), 15.0),
+    (math.inf, (15.0, 7.0, 6.0, 2.5, 1.4), 20.0),
+)
+
+# Typical current spectra of nonlinear loads: {harmonic order: % of the load's fundamental current}
+LOAD_SPECTRA = {
+    "six_pulse": {5: 30.0, 7: 12.0, 11: 8.0, 13: 6.0, 17: 4.0, 19: 3.0},  # drive or rectifier with DC choke
+    "twelve_pulse": {11: 9.0, 13: 6.0, 23: 2.0, 25: 2.0},
+    "ups": {5: 25.0, 7: 10.0, 11: 6.0, 13: 4.0},
+    "smps": {3: 80.0, 5: 60.0, 7: 35.0, 9: 20.0, 11: 10.0},  # single-phase electronic loads
+    "led": {3: 50.0, 5: 30.0, 7: 20.0, 9: 10.0},
+}
+LOAD_ALIASES = {"vfd": "six_pulse", "drive": "six_pulse", "rectifier": "six_pulse", "computer": "smps", "it": "smps", "lighting": "led"}
+POWER_FACTOR = 0.9  # displacement power factor of the estimated loads
+SYSTEM_IMPEDANCE = 5.0  # source impedance (% on the load kVA base) when none is given
+
+
+def _kilowatts(value) -> float:
+    if isinstance(value, (list, tuple)):
+        return max((_kilowatts(item) for item in value), default=0.0)
+    if isinstance(value, dict):
+        return float(value.get("kw", 0))
+    return float(value)
+
+
+def estimated_waveforms(load_profile, nonlinear_loads, system_impedance: Optional[float] = None, frequency: float = 50,
+                        nominal_voltage: float = 0.4) -> Dict[str, Any]:
+    """
+    One IEC window of phase voltage and current for a load estimated from typical spectra (LOAD_SPECTRA).
+    load_profile is the total demand in kW (or a demand series, whose peak is used); nonlinear_loads is kW of
+    six-pulse drives, {type: kW}, or a list of {"type", "kw"}. Harmonic currents of the loads add in phase,
+    and each drives a voltage of I_h x h x Z across the source impedance (%, on the load kVA base).
+    """
+    if isinstance(nonlinear_loads, dict):
+        loads = list(nonlinear_loads.items())
+    elif isinstance(nonlinear_loads, (list, tuple)):
+        loads = [(load.get("type", "six_pulse"), load.get("kw", 0)) for load in nonlinear_loads]
+    else:
+        loads = [("six_pulse", nonlinear_loads)]
+    loads = [(LOAD_ALIASES.get(str(kind).lower(), str(kind).lower()), float(kw)) for kind, kw in loads]
+    unknown = sorted({kind for kind, _ in loads if kind not in LOAD_SPECTRA})
+    if unknown:
+        raise ValueError(f"Unknown nonlinear load type: {', '.join(unknown)} (expected {', '.join(LOAD_SPECTRA)})")
+    impedance = float(system_impedance) if system_impedance else SYSTEM_IMPEDANCE
+    total = max(_kilowatts(load_profile) if load_profile is not None else 0.0, sum(kw for _, kw in loads))
+    if total <= 0 or impedance <= 0:
+        raise ValueError("The load profile, nonlinear loads and system impedance must be positive")
+
+    def amps(kw):
+        return kw / (math.sqrt(3) * nominal_voltage * POWER_FACTOR)
+
+    load_current = amps(total)
+    harmonics: Dict[int, float] = {}
+    for kind, kw in loads:
+        for order, percent in LOAD_SPECTRA[kind].items():
+            harmonics[order] = harmonics.get(order, 0.0) + amps(kw) * percent / 100
+
+    sample_rate = 128 * frequency
+    cycles = 12 if abs(frequency - 60) < 5 else 10
+    phase = 2 * np.pi * frequency * np.arange(int(cycles * 128)) / sample_rate
+    phase_voltage = nominal_voltage * 1000 / math.sqrt(3)
+    current = load_current * np.sin(phase)
+    voltage = np.sin(phase)
+    for order, amplitude in harmonics.items():
+        current += amplitude * np.sin(order * phase)
+        voltage += amplitude / load_current * order * impedance / 100 * np.sin(order * phase)
+    return {
+        "samples": {"Va": math.sqrt(2) * phase_voltage * voltage, "Ia": math.sqrt(2) * current},
+        "sample_rate": sample_rate,
+        "load_current": load_current,
+        "short_circuit_current": load_current * 100 / impedance,
+    }
+
+
+def _channel_type(name: str) -> str:
+    return "current" if name.strip().lower().startswith("i") else "voltage"
+
+
+class HarmonicAnalyzer:
+    """
+    Streaming FFT analysis: feed (samples, channels) blocks in order, then call result()
+    """
+
+    def __init__(self, sample_rate: float, frequency: float = 50, channels: Optional[List[str]] = None,
+                 channel_types: Optional[Dict[str, str]] = None, max_harmonic: int = MAX_HARMONIC):
+        if sample_rate <= 0 or frequency <= 0:
+            raise ValueError("sample_rate and frequency must be positive")
+        self.sample_rate = float(sample_rate)
+        self.frequency = float(frequency)
+        self.cycles = 12 if abs(frequency - 60) < 5 else 10
+        self.window = int(round(self.cycles * sample_rate / frequency))
+        self.max_harmonic = min(max_harmonic, (self.window // 2) // self.cycles)
+        if self.max_harmonic < 2:
+            raise ValueError(f"Sample rate {sample_rate} Hz is too low to resolve harmonics of {frequency} Hz")
+        self.bins = np.arange(1, self.max_harmonic + 1) * self.cycles
+        self.channels = channels
+        self.channel_types = channel_types or {}
+        self.samples = 0
+        self.windows = 0
+        self._carry: Optional[np.ndarray] = None
+
+    def _start(self, width: int):
+        if self.channels is None:
+            self.channels = [f"ch{i + 1}" for i in range(width)]
+        if len(self.channels) != width:
+            raise ValueError(f"Expected {len(self.channels)} channels, got {width}")
+        shape = (self.max_harmonic, width)
+        self._power = np.zeros(shape)  # sum over windows of squared RMS magnitudes, harmonic 1..H
+        self._peak = np.zeros(shape)  # max over windows of each harmonic as % of the window fundamental
+        self._fundamental_max = np.zeros(width)
+        self._distortion: List[np.ndarray] = []  # per-window harmonic RMS (h >= 2) and fundamental
+        self._carry = np.empty((0, width))
+
+    def feed(self, block: np.ndarray):
+        """
+        Add the next (samples, channels) block; partial windows carry over to the next call
+        """
+        block = np.asarray(block, dtype=float)
+        if block.ndim == 1:
+            block = block[:, None]
+        if self._carry is None:
+            self._start(block.shape[1])
+        if block.shape[1] != self._carry.shape[1]:
+            raise ValueError(f"Block has {block.shape[1]} channels, expected {self._carry.shape[1]}")
+
+        data = np.concatenate([self._carry, block]) if len(self._carry) else block
+        count = len(data) // self.window
+        if count:
+            self._transform(data[:count * self.window].reshape(count, self.window, -1))
+        self._carry = data[count * self.window:].copy()
+        self.samples += len(block)
+
+    def _transform(self, frames: np.ndarray):
+        """
+        FFT of whole windows at once: (windows, window, channels)
+        """
+        spectrum = np.fft.rfft(frames, axis=1)[:, self.bins, :]
+        rms = np.abs(spectrum) * (math.sqrt(2) / self.window)
+        fundamental = rms[:, 0, :]
+        self._power += np.sum(rms ** 2, axis=0)
+        relative = rms / np.maximum(fundamental[:, None, :], 1e-12) * 100
+        np.maximum(self._peak, relative.max(axis=0), out=self._peak)
+        np.maximum(self._fundamental_max, fundamental.max(axis=0), out=self._fundamental_max)
+        harmonic_rms = np.sqrt(np.sum(rms[:, 1:, :] ** 2, axis=1))
+        self._distortion.append(np.stack([harmonic_rms, fundamental], axis=1).astype(np.float32))
+        self.windows += len(frames)
+
+    def result(self, nominal_voltage: float = 0.4, load_current: Optional[float] = None,
+               short_circuit_current: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Aggregated spectrum, THD/TDD statistics and IEEE 519 checks per channel.
+        nominal_voltage in kV; load_current (maximum demand IL) and short_circuit_current in A.
+        """
+        if not self.windows:
+            raise ValueError(f"Recording is shorter than one {self.cycles}-cycle window ({self.window} samples)")
+
+        spectrum = np.sqrt(self._power / self.windows)  # RMS aggregation over windows
+        windows = np.concatenate(self._distortion)
+        harmonic_rms, fundamental = windows[:, 0, :].astype(float), windows[:, 1, :].astype(float)
+        voltage_row = next(row for row in VOLTAGE_LIMITS if nominal_voltage <= row[0])
+
+        channels = {}
+        for c, name in enumerate(self.channels):
+            kind = self.channel_types.get(name, _channel_type(name))
+            if kind == "current":
+                reference = float(load_current) if load_current else float(self._fundamental_max[c])
+                channels[name] = self._current_channel(c, spectrum[:, c], harmonic_rms[:, c], reference, short_circuit_current)
+            else:
+                series = harmonic_rms[:, c] / np.maximum(fundamental[:, c], 1e-12) * 100
+                channels[name] = self._voltage_channel(c, spectrum[:, c], series, voltage_row)
+
+        return {
+            "channels": channels,
+            "sample_rate": self.sample_rate,
+            "frequency": self.frequency,
+            "samples": self.samples,
+            "duration_s": round(self.samples / self.sample_rate, 3),
+            "windows": self.windows,
+            "window_cycles": self.cycles,
+            "compliant": all(channel["compliant"] for channel in channels.values()),
+        }
+
+    def _harmonics(self, c: int, spectrum: np.ndarray, reference: float) -> List[Dict[str, Any]]:
+        return [
+            {
+                "order": h,
+                "frequency": round(h * self.frequency, 2),
+                "magnitude": round(float(spectrum[h - 1]), 4),
+                "percent": round(float(spectrum[h - 1] / reference * 100), 3) if reference else None,
+                "peak_percent": round(float(self._peak[h - 1, c]), 3),
+            }
+            for h in range(1, self.max_harmonic + 1)
+        ]
+
+    def _voltage_channel(self, c: int, spectrum: np.ndarray, thd: np.ndarray, limits) -> Dict[str, Any]:
+        _, individual_limit, thd_limit = limits
+        fundamental = float(spectrum[0])
+        harmonics = self._harmonics(c, spectrum, fundamental)
+        p95, p99 = np.percentile(thd, [95, 99])
+        worst = max(harmonics[1:], key=lambda h: h["percent"] or 0)
+        return {
+            "type": "voltage",
+            "fundamental_rms": round(fundamental, 4),
+            "thd": round(float(np.sqrt(np.sum(spectrum[1:] ** 2)) / fundamental * 100) if fundamental else 0.0, 3),
+            "thd_p95": round(float(p95), 3),
+            "thd_p99": round(float(p99), 3),
+            "thd_max": round(float(thd.max()), 3),
+            "limits": {"individual": individual_limit, "thd": thd_limit},
+            "worst_harmonic": worst["order"],
+            # IEEE 519: weekly 95th percentile within limits, daily 99th within 1.5x
+            "compliant": bool(p95 <= thd_limit and p99 <= 1.5 * thd_limit and (worst["percent"] or 0) <= individual_limit),
+            "harmonics": harmonics,
+        }
+
+    def _current_channel(self, c: int, spectrum: np.ndarray, harmonic_rms: np.ndarray, load_current: float,
+                         short_circuit_current: Optional[float]) -> Dict[str, Any]:
+        ratio = short_circuit_current / load_current if short_circuit_current and load_current else None
+        _, odd_limits, tdd_limit = next(row for row in CURRENT_LIMITS if (ratio or 0) < row[0])
+        orders = np.arange(1, self.max_harmonic + 1)
+        band = np.searchsorted(CURRENT_BANDS, orders, side="right") - 1
+        limits = np.where(band >= 0, np.array(odd_limits + (odd_limits[-1],))[np.clip(band, 0, 4)], odd_limits[0])
+        limits = np.where(orders % 2 == 0, 0.25 * limits, limits)  # even harmonics: 25 % of the odd limits
+
+        harmonics = self._harmonics(c, spectrum, load_current)
+        for entry, limit in zip(harmonics, limits.tolist()):
+            entry["limit"] = None if entry["order"] == 1 else limit
+        tdd = harmonic_rms / load_current * 100 if load_current else np.zeros_like(harmonic_rms)
+        p95, p99 = np.percentile(tdd, [95, 99])
+        aggregate_tdd = float(np.sqrt(np.sum(spectrum[1:] ** 2)) / load_current * 100) if load_current else 0.0
+        violations = [h["order"] for h in harmonics[1:] if h["percent"] is not None and h["percent"] > h["limit"]]
+        # Active filter current that brings the aggregate TDD down to the limit
+        excess = load_current * math.sqrt(max(aggregate_tdd ** 2 - tdd_limit ** 2, 0)) / 100
+        return {
+            "type": "current",
+            "fundamental_rms": round(float(spectrum[0]), 4),
+            "load_current": round(load_current, 4),
+            "isc_il_ratio": round(ratio, 1) if ratio else None,
+            "thd": round(float(np.sqrt(np.sum(spectrum[1:] ** 2)) / spectrum[0] * 100) if spectrum[0] else 0.0, 3),
+            "tdd": round(aggregate_tdd, 3),
+            "tdd_p95": round(float(p95), 3),
+            "tdd_p99": round(float(p99), 3),
+            "tdd_max": round(float(tdd.max()), 3),
+            "limits": {"tdd": tdd_limit, "individual_odd": list(odd_limits)},
+            "violations": violations,
+            "filter_current": round(excess, 2),
+            # IEEE 519: weekly 95th percentile within limits, daily 99th within 2x
+            "compliant": bool(p95 <= tdd_limit and p99 <= 2 * tdd_limit and not violations),
+            "harmonics": harmonics,
+        }
+
+
+def _csv_blocks(fileobj, channels: Optional[List[str]], block_samples: int) -> Tuple[List[str], Iterator[np.ndarray]]:
+    reader = pd.read_csv(fileobj, chunksize=block_samples)
+    first = next(reader)
+    first.columns = [str(col).strip() for col in first.columns]
+    names = channels or [col for col in first.select_dtypes(include="number").columns
+                         if col.lower() not in ("t", "time", "timestamp", "seconds", "sample")]
+    missing = [name for name in names if name not in first.columns]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(missing)}")
+
+    def blocks():
+        yield first[names].to_numpy(dtype=float)
+        for chunk in reader:
+            chunk.columns = [str(col).strip() for col in chunk.columns]
+            yield chunk[names].to_numpy(dtype=float)
+
+    return names, blocks()
+
+
+def _npy_blocks(fileobj, channels: Optional[List[str]], block_samples: int) -> Tuple[List[str], Iterator[np.ndarray]]:
+    version = np.lib.format.read_magic(fileobj)
+    read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+    shape, fortran_order, dtype = read_header(fileobj)
+    if fortran_order or len(shape) > 2:
+        raise ValueError("Expected a C-ordered (samples,) or (samples, channels) array")
+    width = shape[1] if len(shape) == 2 else 1
+    names = channels or [f"ch{i + 1}" for i in range(width)]
+    return names, _raw_blocks(fileobj, dtype, width, block_samples)
+
+
+def _raw_blocks(fileobj, dtype: np.dtype, width: int, block_samples: int) -> Iterator[np.ndarray]:
+    frame = dtype.itemsize * width
+    while True:
+        data = fileobj.read(frame * block_samples)
+        if not data:
+            return
+        usable = len(data) - len(data) % frame
+        yield np.frombuffer(data[:usable], dtype=dtype).reshape(-1, width)
+
+
+def waveform_blocks(fileobj, filename: str, channels: Optional[List[str]] = None, dtype: str = "float32",
+                    channel_count: Optional[int] = None, block_samples: int = BLOCK_SAMPLES) -> Tuple[List[str], Iterator[np.ndarray]]:
+    """
+    Channel names and an iterator of (samples, channels) blocks from a CSV, .npy or interleaved
+    raw binary recording, read incrementally from a file object
+    """
+    name = filename.lower()
+    if name.endswith(('.csv', '.txt')):
+        return _csv_blocks(fileobj, channels, block_samples)
+    if name.endswith('.npy'):
+        return _npy_blocks(fileobj, channels, block_samples)
+    if name.endswith(BINARY_EXTENSIONS):
+        width = channel_count or (len(channels) if channels else 1)
+        names = channels or [f"ch{i + 1}" for i in range(width)]
+        return names, _raw_blocks(fileobj, np.dtype(dtype), width, block_samples)
+    raise ValueError("Unsupported waveform format. Upload CSV, .npy or raw binary (.bin/.raw/.dat) recordings.")
+
+
+class HarmonicAnalysisService:
+    @staticmethod
+    def analyze_stream(blocks: Iterable[np.ndarray], channels: List[str], sample_rate: float, frequency: float = 50,
+                       nominal_voltage: float = 0.4, load_current: Optional[float] = None,
+                       short_circuit_current: Optional[float] = None, channel_types: Optional[Dict[str, str]] = None,
+                       scale: float = 1.0):
+        """Run the streaming analyzer over waveform blocks"""
+        try:
+            analyzer = HarmonicAnalyzer(sample_rate, frequency, channels, channel_types)
+            for block in blocks:
+                analyzer.feed(block * scale if scale != 1.0 else block)
+            return {"results": analyzer.result(nominal_voltage, load_current, short_circuit_current), "compliance": "IEEE 519-2014", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    @staticmethod
+    def analyze_file(fileobj, filename: str, sample_rate: float, channels: Optional[List[str]] = None, dtype: str = "float32",
+                     channel_count: Optional[int] = None, **options):
+        """Analyze an uploaded recording without loading it into memory"""
+        try:
+            names, blocks = waveform_blocks(fileobj, filename, channels, dtype, channel_count)
+        except Exception as e:
+            return {"error": str(e), "success": False}
+        return HarmonicAnalysisService.analyze_stream(blocks, names, sample_rate, **options)
+
+    @staticmethod
+    def analyze_samples(samples: Dict[str, List[float]], sample_rate: float, **options):
+        """Analyze in-memory channels, e.g. {"Va": [...], "Ia": [...]}"""
+        names = list(samples)
+        lengths = {len(values) for values in samples.values()}
+        if len(lengths) != 1:
+            return {"error": "All channels must have the same number of samples", "success": False}
+        data = np.column_stack([np.asarray(samples[name], dtype=float) for name in names])
+        return HarmonicAnalysisService.analyze_stream([data], names, sample_rate, **options)
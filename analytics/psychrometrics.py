@@ -0,0 +1,126 @@
+"""
+Psychrometric Analysis
+Moist-air properties for uploaded BMS trend logs. CSV logs are read CHUNK_ROWS rows at a
+time and every chunk is evaluated in one array pass, so memory stays bounded however many
+samples the log holds: the summary keeps running counts, sums and extremes, and the CSV
+export streams each augmented chunk straight back to the client.
+"""
+
+import io
+import itertools
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from calculators.services.psychrometrics import CHUNK_ROWS, STATE_PROPERTIES, psychrometric_chunks
+
+
+def trend_chunks(fileobj, filename: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Data frames of at most chunk_rows rows from a CSV, Excel or JSON trend log. CSV is read
+    incrementally; Excel and JSON have no streaming reader and are loaded whole, then sliced.
+    """
+    name = filename.lower()
+    if name.endswith(('.csv', '.txt')):
+        frames = pd.read_csv(fileobj, chunksize=chunk_rows)
+    elif name.endswith(('.xlsx', '.xls')):
+        frames = [pd.read_excel(fileobj)]
+    elif name.endswith('.json'):
+        frames = [pd.read_json(fileobj)]
+    else:
+        raise ValueError("Unsupported file format. Please upload CSV, Excel, or JSON files.")
+    for frame in frames:
+        frame.columns = [str(col).strip() for col in frame.columns]
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+
+
+class PsychrometricSummary:
+    """
+    Running statistics of psychrometric columns: feed chunks in any order, then call result()
+    """
+
+    def __init__(self, properties: List[str], prefix: str = ''):
+        self.properties = properties
+        self.prefix = prefix
+        self.rows = 0
+        self.invalid = 0
+        self.count = np.zeros(len(properties), dtype=np.int64)
+        self.total = np.zeros(len(properties))
+        self.low = np.full(len(properties), np.inf)
+        self.high = np.full(len(properties), -np.inf)
+
+    def feed(self, chunk: pd.DataFrame):
+        values = chunk[[self.prefix + name for name in self.properties]].to_numpy(dtype=float)
+        finite = np.isfinite(values)
+        self.rows += len(values)
+        self.invalid += int((~finite.all(axis=1)).sum())
+        self.count += finite.sum(axis=0)
+        self.total += np.where(finite, values, 0).sum(axis=0)
+        self.low = np.minimum(self.low, np.where(finite, values, np.inf).min(axis=0, initial=np.inf))
+        self.high = np.maximum(self.high, np.where(finite, values, -np.inf).max(axis=0, initial=-np.inf))
+
+    def result(self) -> Dict[str, Any]:
+        statistics = {}
+        for i, name in enumerate(self.properties):
+            count = int(self.count[i])
+            statistics[name] = {
+                "count": count,
+                "min": round(float(self.low[i]), 4) if count else None,
+                "mean": round(float(self.total[i] / count), 4) if count else None,
+                "max": round(float(self.high[i]), 4) if count else None,
+            }
+        return {"rows": self.rows, "invalid_rows": self.invalid, "statistics": statistics}
+
+
+def _properties(properties: Optional[Iterable[str]]) -> List[str]:
+    wanted = list(STATE_PROPERTIES if properties is None else properties)
+    unknown = [name for name in wanted if name not in STATE_PROPERTIES]
+    if unknown:
+        raise ValueError(f"Unknown psychrometric properties: {', '.join(unknown)} (expected {', '.join(STATE_PROPERTIES)})")
+    return wanted
+
+
+class PsychrometricAnalysisService:
+    @staticmethod
+    def analyze_stream(frames: Iterable[pd.DataFrame], dry_bulb: str, humidity: str, basis: str = 'relative_humidity',
+                       altitude: float = 0, properties: Optional[Iterable[str]] = None):
+        """Summarize the psychrometric state over a stream of data frames"""
+        try:
+            wanted = _properties(properties)
+            summary = PsychrometricSummary(wanted)
+            for chunk in psychrometric_chunks(frames, dry_bulb, humidity, basis, altitude, wanted):
+                summary.feed(chunk)
+            results = summary.result()
+            results.update({"dry_bulb_column": dry_bulb, "humidity_column": humidity, "basis": basis,
+                            "altitude": altitude})
+            return {"results": results, "compliance": "ASHRAE Fundamentals", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    @staticmethod
+    def analyze_file(fileobj, filename: str, dry_bulb: str, humidity: str, **options):
+        """Summarize an uploaded trend log without loading it into memory"""
+        return PsychrometricAnalysisService.analyze_stream(trend_chunks(fileobj, filename), dry_bulb, humidity, **options)
+
+    @staticmethod
+    def export_csv(fileobj, filename: str, dry_bulb: str, humidity: str, basis: str = 'relative_humidity', altitude: float = 0,
+                   properties: Optional[Iterable[str]] = None, prefix: str = '') -> Iterator[str]:
+        """
+        The trend log as CSV text with psychrometric columns appended, one chunk at a time.
+        The first chunk is evaluated eagerly so bad column names or options raise before streaming starts.
+        """
+        chunks = psychrometric_chunks(trend_chunks(fileobj, filename), dry_bulb, humidity, basis, altitude,
+                                      _properties(properties), prefix)
+        first = next(chunks, None)
+
+        def lines():
+            if first is None:
+                return
+            for i, chunk in enumerate(itertools.chain([first], chunks)):
+                buffer = io.StringIO()
+                chunk.to_csv(buffer, index=False, header=i == 0, float_format='%.6g')
+                yield buffer.getvalue()
+
+        return lines()
@@ -2,6 +2,8 @@ import pandas as pd
 import json
 import numpy as np
 
+from calculators.services.psychrometrics import add_psychrometrics
+
 class QueryBuilder:
     @staticmethod
     def execute_query(data: str, query: dict):
@@ -13,6 +15,20 @@ class QueryBuilder:
             # Process query with advanced functionality
             result = df.copy()
             
+            # Psychrometric columns, derived first so they can be filtered, grouped and sorted
+            if query.get('psychrometrics'):
+                operations = query['psychrometrics']
+                if isinstance(operations, dict):
+                    operations = [operations]
+                for operation in operations:
+                    add_psychrometrics(
+                        result, operation['dry_bulb'], operation['humidity'],
+                        basis=operation.get('basis', 'relative_humidity'),
+                        altitude=float(operation.get('altitude', 0)),
+                        properties=operation.get('properties'),
+                        prefix=operation.get('prefix', '')
+                    )
+            
             # Filter operations
             if query.get('filters'):
                 for filter in query['filters']:
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from database import get_db
 from auth.router import get_current_user
@@ -7,6 +7,11 @@ from auth.models import User
 from analytics.upload import FileUploadService
 from analytics.query_builder import QueryBuilder
 from analytics.report_generator import ReportGenerator
+from analytics.harmonics import HarmonicAnalysisService
+from analytics.psychrometrics import PsychrometricAnalysisService
+from analytics.bar_schedule import BarScheduleService
+from analytics.earthworks import EarthworksService
+from calculators.services.electrical import ElectricalCalculators
 import json
 from datetime import datetime
 
@@ -47,6 +52,188 @@ async def get_excel_sheets(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/harmonics")
+def analyze_harmonics(
+    file: UploadFile = File(...),
+    sample_rate: float = Form(...),
+    frequency: float = Form(50),
+    channels: str = Form(None),
+    channel_types: str = Form(None),
+    dtype: str = Form("float32"),
+    channel_count: int = Form(None),
+    scale: float = Form(1.0),
+    nominal_voltage: float = Form(0.4),
+    load_current: float = Form(None),
+    short_circuit_current: float = Form(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Harmonic spectrum, THD/TDD and IEEE 519 compliance of a waveform recording (CSV, .npy or raw binary)."""
+    try:
+        # Read from the spooled upload in blocks rather than loading the whole recording
+        result = HarmonicAnalysisService.analyze_file(
+            file.file, file.filename,
+            sample_rate=sample_rate,
+            channels=[name.strip() for name in channels.split(",")] if channels else None,
+            dtype=dtype,
+            channel_count=channel_count,
+            frequency=frequency,
+            nominal_voltage=nominal_voltage,
+            load_current=load_current,
+            short_circuit_current=short_circuit_current,
+            channel_types=json.loads(channel_types) if channel_types else None,
+            scale=scale,
+        )
+
+        if result["success"]:
+            return result
+        else:
+            raise HTTPException(status_code=400, detail=result["error"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/psychrometrics")
+def analyze_psychrometrics(
+    file: UploadFile = File(...),
+    dry_bulb: str = Form(...),
+    humidity: str = Form(...),
+    basis: str = Form("relative_humidity"),
+    altitude: float = Form(0),
+    properties: str = Form(None),
+    output: str = Form("summary"),
+    prefix: str = Form(""),
+    current_user: User = Depends(get_current_user)
+):
+    """Psychrometric state of every sample in a trend log: a running summary, or the log streamed back as CSV with the properties appended."""
+    try:
+        options = dict(
+            basis=basis,
+            altitude=altitude,
+            properties=[name.strip() for name in properties.split(",")] if properties else None,
+        )
+        # Read from the spooled upload a chunk at a time rather than loading the whole log
+        if output == "csv":
+            content = PsychrometricAnalysisService.export_csv(file.file, file.filename, dry_bulb, humidity, prefix=prefix, **options)
+            return StreamingResponse(content, media_type="text/csv",
+                                     headers={"Content-Disposition": "attachment; filename=psychrometrics.csv"})
+        if output != "summary":
+            raise HTTPException(status_code=400, detail="output must be 'summary' or 'csv'")
+
+        result = PsychrometricAnalysisService.analyze_file(file.file, file.filename, dry_bulb, humidity, **options)
+        if result["success"]:
+            return result
+        else:
+            raise HTTPException(status_code=400, detail=result["error"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bar-schedule")
+def bar_bending_schedule(
+    file: UploadFile = File(...),
+    stock_lengths: str = Form(None),
+    lap: float = Form(50),
+    rounding: float = Form(10),
+    output: str = Form("summary"),
+    current_user: User = Depends(get_current_user)
+):
+    """Bar bending schedule of a project member list: totals with the stock cutting plan, or the full schedule streamed as CSV or XLSX."""
+    try:
+        options = dict(
+            stock_lengths=[float(length) for length in stock_lengths.split(",")] if stock_lengths else None,
+            lap=lap,
+            rounding=rounding,
+        )
+        # Schedule the spooled upload a chunk at a time rather than loading the whole member list
+        if output == "csv":
+            content = BarScheduleService.export_csv(file.file, file.filename, **options)
+            return StreamingResponse(content, media_type="text/csv",
+                                     headers={"Content-Disposition": "attachment; filename=bar_schedule.csv"})
+        if output == "xlsx":
+            content = BarScheduleService.export_xlsx(file.file, file.filename, **options)
+            return StreamingResponse(content, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                     headers={"Content-Disposition": "attachment; filename=bar_schedule.xlsx"})
+        if output != "summary":
+            raise HTTPException(status_code=400, detail="output must be 'summary', 'csv' or 'xlsx'")
+
+        result = BarScheduleService.analyze_file(file.file, file.filename, **options)
+        if result["success"]:
+            return result
+        else:
+            raise HTTPException(status_code=400, detail=result["error"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/earthworks")
+def analyze_earthworks(
+    file: UploadFile = File(...),
+    design: str = Form(None),
+    design_file: UploadFile = File(None),
+    cell_size: float = Form(1.0),
+    method: str = Form("grid"),
+    bulking_factor: float = Form(1.25),
+    shrink_factor: float = Form(0.9),
+    output: str = Form("summary"),
+    current_user: User = Depends(get_current_user)
+):
+    """Cut/fill of a survey point file against a design level, plane (JSON), point list (JSON) or design survey file: volumes with a per-cell heatmap, or the cell table streamed as CSV."""
+    try:
+        options = dict(
+            design=json.loads(design) if design else None,
+            cell_size=cell_size,
+            method=method,
+            design_file=design_file.file if design_file else None,
+            design_filename=design_file.filename if design_file else None,
+        )
+        # Bin the spooled upload a chunk at a time rather than loading the whole point cloud
+        if output == "csv":
+            content = EarthworksService.export_csv(file.file, file.filename, **options)
+            return StreamingResponse(content, media_type="text/csv",
+                                     headers={"Content-Disposition": "attachment; filename=earthworks.csv"})
+        if output != "summary":
+            raise HTTPException(status_code=400, detail="output must be 'summary' or 'csv'")
+
+        result = EarthworksService.analyze_file(file.file, file.filename, bulking=bulking_factor, shrinkage=shrink_factor, **options)
+        if result["success"]:
+            return result
+        else:
+            raise HTTPException(status_code=400, detail=result["error"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/pv-yield")
+async def analyze_pv_yield(
+    file: UploadFile = File(...),
+    parameters: str = Form("{}"),
+    sheet_name: str = Form(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Hourly PV yield from an uploaded weather year; parameters is a JSON object of pv_yield arguments."""
+    try:
+        content = await file.read()
+        upload = FileUploadService.process_file(content, file.filename, sheet_name)
+        if not upload["success"]:
+            raise HTTPException(status_code=400, detail=upload["error"])
+
+        rows = json.loads(upload["data"])
+        weather = {column: [row[column] for row in rows] for column in upload["summary"]["numeric_columns"]}
+        result = ElectricalCalculators.pv_yield(weather=weather, **json.loads(parameters))
+
+        if result["success"]:
+            return result
+        else:
+            raise HTTPException(status_code=400, detail=result["error"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/database-connect")
 async def connect_to_database(
     connection_params: dict,
@@ -0,0 +1,105 @@
+"""
+Streaming XLSX Writer
+Minimal SpreadsheetML workbooks written as they are produced. Each sheet is a zip entry whose rows
+are XML-encoded a whole data frame at a time, and the zip goes to an unseekable sink (sizes follow
+each entry in data descriptors), so the bytes can be sent while later rows are still being
+computed and nothing larger than one chunk is held in memory.
+"""
+
+import zipfile
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                 '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                 '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                 '<Default Extension="xml" ContentType="application/xml"/>'
+                 '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                 '{sheets}</Types>')
+SHEET_TYPE = '<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+ROOT_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+             '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+             '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+             '</Relationships>')
+WORKBOOK = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>{sheets}</sheets></workbook>')
+WORKBOOK_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{sheets}</Relationships>')
+SHEET_RELATION = ('<Relationship Id="rId{index}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                  'Target="worksheets/sheet{index}.xml"/>')
+SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+              '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+SHEET_TAIL = '</sheetData></worksheet>'
+
+
+class _Sink:
+    """Unseekable file object collecting the zip bytes until they are drained"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def _cells(values: pd.Series) -> np.ndarray:
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.astype(float)
+        text = ('<c><v>' + numbers.map(repr) + '</v></c>').where(np.isfinite(numbers), '<c/>')
+    else:
+        text = '<c t="inlineStr"><is><t>' + values.fillna('').astype(str).map(escape) + '</t></is></c>'
+    return text.to_numpy(dtype=object)
+
+
+def rows_xml(frame: pd.DataFrame) -> str:
+    """SpreadsheetML rows of a data frame, one column at a time"""
+    if frame.empty:
+        return ''
+    columns = [_cells(frame[column]) for column in frame.columns]
+    return ''.join('<row>' + ''.join(cells) + '</row>' for cells in zip(*columns))
+
+
+def header_xml(names: Sequence[str]) -> str:
+    return '<row>' + ''.join(f'<c t="inlineStr"><is><t>{escape(str(name))}</t></is></c>' for name in names) + '</row>'
+
+
+def stream_workbook(sheets: Iterable[Tuple[str, Sequence[str], Iterable[pd.DataFrame]]]) -> Iterator[bytes]:
+    """
+    XLSX bytes of sheets given as (name, column headings, data frame chunks), yielded as each chunk is written.
+    Sheets are consumed in order, so a later sheet may summarize what earlier chunks produced.
+    """
+    sink = _Sink()
+    names = []
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, headings, chunks in sheets:
+            names.append(name)
+            with archive.open(f"xl/worksheets/sheet{len(names)}.xml", 'w', force_zip64=True) as sheet:
+                sheet.write((SHEET_HEAD + header_xml(headings)).encode('utf-8'))
+                for chunk in chunks:
+                    sheet.write(rows_xml(chunk).encode('utf-8'))
+                    yield sink.drain()
+                sheet.write(SHEET_TAIL.encode('utf-8'))
+        indices = range(1, len(names) + 1)
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES.format(sheets=''.join(SHEET_TYPE.format(index=i) for i in indices)))
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("xl/workbook.xml", WORKBOOK.format(sheets=''.join(
+            f'<sheet name="{escape(name[:31])}" sheetId="{i}" r:id="rId{i}"/>' for i, name in zip(indices, names))))
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS.format(sheets=''.join(SHEET_RELATION.format(index=i) for i in indices)))
+    yield sink.drain()
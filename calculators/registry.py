@@ -0,0 +1,284 @@
+"""
+Calculator Registry
+Maps calculator IDs (e.g. "electrical_cable_sizing") to their callables at import time,
+with pydantic input models generated from the method signatures and EquationInput metadata.
+"""
+
+import inspect
+import sys
+import time
+from typing import Dict, Any, Callable, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, Field, AliasChoices, ValidationError, create_model
+
+from calculators.services.electrical import ElectricalCalculators
+from calculators.services.mechanical import MechanicalCalculators
+from calculators.services.civil import CivilCalculators
+from calculators.services.batch import VECTORIZED_CALCULATORS, broadcast_inputs, run_rows
+from calculators.services import equipment_data
+from calculators.services.equation_engine import EquationEngine
+from calculators.services.result_cache import ResultCache, source_version
+from config import settings
+from units.converter import normalize_inputs
+
+CALCULATOR_CLASSES = {
+    "electrical": ElectricalCalculators,
+    "mechanical": MechanicalCalculators,
+    "civil": CivilCalculators,
+}
+
+_DATA_TYPES = {"float": float, "int": int, "string": str, "boolean": bool}
+
+# Units the built-in calculators expect; inputs given as {"value": ..., "unit": ...} are converted to these
+INPUT_UNITS: Dict[str, Dict[str, str]] = {
+    "electrical_load_calculation": {"connected_load": "kW", "voltage": "V"},
+    "electrical_cable_sizing": {"design_current": "A", "length": "m", "voltage_system": "V", "ambient_temp": "degC"},
+    "electrical_breaker_selection": {"design_current": "A", "fault_current": "kA"},
+    "electrical_transformer_sizing": {"total_load": "kVA"},
+    "electrical_power_factor_correction": {"active_power": "kW", "voltage": "V"},
+    "electrical_generator_sizing": {"running_load": "kVA", "starting_load": "kVA", "altitude": "m", "temperature": "degC"},
+    "electrical_short_circuit": {"voltage": "V", "transformer_kva": "kVA", "impedance": "%"},
+    "electrical_voltage_drop": {"current": "A", "length": "m", "cross_section": "mm^2", "voltage": "V"},
+    "electrical_earthing_conductor": {"fault_current": "A", "fault_time": "s"},
+    "electrical_earthing_grid": {"length": "m", "width": "m", "fault_current": "A", "soil_resistivity": "ohm*m", "depth": "m",
+                                 "conductor_diameter": "m", "rod_length": "m", "rod_diameter": "m", "fault_time": "s",
+                                 "surface_resistivity": "ohm*m", "surface_thickness": "m", "ambient_temp": "degC",
+                                 "segment_length": "m", "map_spacing": "m"},
+    "electrical_busbar_sizing": {"current": "A"},
+    "electrical_network_analysis": {"base_kv": "kV", "max_voltage_drop": "%"},
+    "electrical_arc_flash_study": {"bolted_fault_ka": "kA", "clearing_time": "s", "voltage_kv": "kV", "gap_mm": "mm",
+                                   "working_distance_mm": "mm", "clearing_time_reduced": "s", "max_clearing_time": "s"},
+    "electrical_pv_yield": {"dc_capacity": "kW", "tilt": "deg", "azimuth": "deg", "system_losses": "%", "energy_demand": "kWh"},
+    "electrical_lighting_layout": {"length": "m", "width": "m", "target_lux": "lx", "mounting_height": "m", "work_plane_height": "m",
+                                   "grid_spacing": "m", "border": "m"},
+    "mechanical_hvac_load": {"area": "m^2", "height": "m"},
+    "mechanical_hvac_simulation": {"altitude": "m", "cooling_design_temp": "degC", "heating_design_temp": "degC",
+                                   "relative_humidity": "%", "supply_temp": "degC", "return_temp": "degC"},
+    "mechanical_pump_sizing": {"flow_rate": "m^3/h", "head": "m"},
+    "mechanical_pump_selection": {"flow_rate": "m^3/h", "head": "m", "static_head": "m", "fluid_density": "kg/m^3"},
+    "mechanical_pipe_sizing": {"flow_rate": "m^3/h", "velocity": "m/s"},
+    "mechanical_pipe_friction": {"flow_rate": "m^3/h", "pipe_size": "mm", "pipe_length": "m", "temperature": "degC"},
+    "mechanical_pipe_network": {"temperature": "degC"},
+    "mechanical_duct_sizing": {"airflow": "m^3/h", "velocity": "m/s"},
+    "mechanical_duct_network": {"friction_rate": "Pa/m", "max_velocity": "m/s", "min_velocity": "m/s", "terminal_pressure": "Pa",
+                                "air_temperature": "degC", "altitude": "m"},
+    "mechanical_heat_transfer": {"area": "m^2"},
+    "mechanical_chiller_selection": {"inlet_temp": "degC", "outlet_temp": "degC"},
+    "mechanical_fan_selection": {"airflow": "m^3/h", "pressure": "Pa"},
+    "mechanical_compressor_sizing": {"system_pressure": "Pa", "altitude": "m"},
+    "mechanical_psychrometrics": {"dry_bulb_temp": "degC", "altitude": "m"},
+    "mechanical_stress_strain_analysis": {"force": "N", "area": "mm^2"},
+    "civil_concrete_volume": {"length": "m", "width": "m", "depth": "m"},
+    "civil_steel_weight": {"diameter": "mm", "length": "m"},
+    "civil_beam_load": {"length": "m", "beam_depth": "mm", "beam_width": "mm"},
+    "civil_column_design": {"unsupported_length": "mm"},
+    "civil_earthwork_volume": {"length": "m", "width": "m", "depth1": "m", "depth2": "m"},
+    "civil_retaining_wall_pressure": {"height": "m"},
+    "civil_wind_load": {"building_height": "m", "building_width": "m", "wind_speed": "m/s"},
+    "civil_pile_foundation": {"pile_diameter": "m", "pile_length": "m"},
+}
+
+
+def _model_from_signature(calculator_id: str, func: Callable) -> Type[BaseModel]:
+    """
+    Build a pydantic model whose fields mirror the calculator's parameters
+    """
+    fields = {}
+    for name, param in inspect.signature(func).parameters.items():
+        annotation = param.annotation if param.annotation is not inspect.Parameter.empty else Any
+        default = param.default if param.default is not inspect.Parameter.empty else ...
+        fields[name] = (annotation, default)
+
+    return create_model(f"{calculator_id}_inputs", __config__=ConfigDict(extra="forbid"), **fields)
+
+
+def _code_version(func: Callable) -> str:
+    """
+    Hash of the calculator's module, the shared equipment catalogs and any other
+    calculators.services module it calls into (e.g. the network analysis engine)
+    """
+    module = inspect.getmodule(func)
+    names = {module.__name__, equipment_data.__name__}
+    for value in vars(module).values():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+        if isinstance(name, str) and name.startswith("calculators.services."):
+            names.add(name)
+    return source_version(*(inspect.getsource(sys.modules[name]) for name in sorted(names)))
+
+
+class CalculatorSpec:
+    """
+    A registered calculator: callable, generated input model and call metrics
+    """
+
+    def __init__(self, calculator_id: str, domain: str, func: Callable, batch: Optional[Callable] = None):
+        self.id = calculator_id
+        self.domain = domain
+        self.func = func
+        self.batch = batch
+        self.description = inspect.getdoc(func)
+        self.input_model = _model_from_signature(calculator_id, func)
+        self.units = INPUT_UNITS.get(calculator_id, {})
+        # Any edit to the calculator's code or the shared equipment catalogs invalidates cached results
+        self.version = _code_version(func)
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+
+    def validate(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert unit-tagged inputs, then validate and coerce; raises pydantic.ValidationError
+        """
+        return self.input_model.model_validate(normalize_inputs(inputs, self.units)).model_dump()
+
+    def __call__(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return self.run(self.validate(inputs))
+
+    def run(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call the calculator with already validated inputs, recording metrics
+        """
+        start = time.perf_counter()
+        try:
+            result = self.func(**values)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.calls += 1
+            self.total_time += time.perf_counter() - start
+
+        if not result.get("success", True):
+            self.errors += 1
+        return result
+
+    def describe(self) -> Dict[str, Any]:
+        schema = self.input_model.model_json_schema()
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "version": self.version,
+            "description": self.description,
+            "inputs": schema.get("properties", {}),
+            "required": schema.get("required", []),
+            "units": self.units,
+            "vectorized": self.batch is not None,
+            "metrics": {
+                "calls": self.calls,
+                "errors": self.errors,
+                "avg_time_ms": round(self.total_time / self.calls * 1000, 4) if self.calls else None
+            }
+        }
+
+
+def _build_registry() -> Dict[str, CalculatorSpec]:
+    registry = {}
+    for domain, calculators in CALCULATOR_CLASSES.items():
+        for name, func in inspect.getmembers(calculators, predicate=inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            calculator_id = f"{domain}_{name}"
+            registry[calculator_id] = CalculatorSpec(calculator_id, domain, func, VECTORIZED_CALCULATORS.get(calculator_id))
+    return registry
+
+
+CALCULATOR_REGISTRY: Dict[str, CalculatorSpec] = _build_registry()
+
+RESULT_CACHE = ResultCache(
+    max_entries=settings.RESULT_CACHE_SIZE,
+    ttl=settings.RESULT_CACHE_TTL,
+    sqlite_path=settings.RESULT_CACHE_DB
+)
+RESULT_CACHE.purge_stale({spec.id: spec.version for spec in CALCULATOR_REGISTRY.values()})
+
+
+def run_calculator(calculator_id: str, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Validate inputs and run a registered calculator through the result cache;
+    returns None if the ID is unknown
+    """
+    spec = CALCULATOR_REGISTRY.get(calculator_id)
+    if spec is None:
+        return None
+    values = spec.validate(inputs)
+    return RESULT_CACHE.get_or_compute(spec.id, spec.version, values, lambda: spec.run(values))
+
+
+def run_batch(calculator_id: str, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run a registered calculator over columnar inputs; returns None if the ID is unknown.
+    Calculators without a vectorized implementation fall back to a per-row loop.
+    """
+    spec = CALCULATOR_REGISTRY.get(calculator_id)
+    if spec is None:
+        return None
+
+    try:
+        unknown = set(inputs) - set(spec.input_model.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown inputs for {calculator_id}: {', '.join(sorted(unknown))}")
+
+        columns, n = broadcast_inputs(normalize_inputs(inputs, spec.units))
+        if spec.batch is not None:
+            return spec.batch(**columns, n=n)
+
+        def call_row(**row):
+            try:
+                return spec(row)
+            except ValidationError as e:
+                return {"error": str(e), "success": False}
+
+        return run_rows(call_row, columns, n)
+    except Exception as e:
+        return {"error": str(e), "success": False}
+
+
+_EQUATION_MODELS: Dict[Any, Type[BaseModel]] = {}
+
+
+def equation_input_model(equation) -> Type[BaseModel]:
+    """
+    Input model for a catalog Equation, generated once per equation revision.
+    Fields are keyed by symbol, also accept the input name, and are optional so
+    callers can solve for any variable; the engine reports what is missing.
+    """
+    key = (equation.equation_id, equation.updated_at)
+    model = _EQUATION_MODELS.get(key)
+    if model is None:
+        fields = {}
+        for inp in equation.inputs:
+            annotation = _DATA_TYPES.get(getattr(inp, "data_type", None) or "float", float)
+            fields[inp.symbol] = (Optional[annotation], Field(
+                inp.default_value,
+                ge=inp.min_value,
+                le=inp.max_value,
+                validation_alias=AliasChoices(inp.symbol, inp.name),
+                description=inp.description
+            ))
+        model = create_model(f"{equation.equation_id}_inputs", __config__=ConfigDict(extra="allow"), **fields)
+        _EQUATION_MODELS[key] = model
+    return model
+
+
+def validate_equation_inputs(equation, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert unit-tagged inputs to the catalog units, then validate and coerce; raises pydantic.ValidationError
+    """
+    units = {}
+    for inp in equation.inputs:
+        unit = getattr(inp, "unit", None)
+        if unit:
+            units[inp.symbol] = units[inp.name] = unit
+    return equation_input_model(equation).model_validate(normalize_inputs(inputs, units)).model_dump(exclude_none=True)
+
+
+def calculate_equation(equation, inputs: Dict[str, Any], target: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Evaluate a catalog Equation through the result cache; edits to the row change its version
+    """
+    values = validate_equation_inputs(equation, inputs)
+    version = source_version(equation.equation, equation.updated_at)
+    return RESULT_CACHE.get_or_compute(
+        equation.equation_id, version, {"inputs": values, "target": target},
+        lambda: EquationEngine.calculate(equation, values, target)
+    )
@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from database import get_db
 from workflow_database import get_workflow_db
 from auth.router import get_current_user
 from auth.models import User
-from calculators.services.electrical import ElectricalCalculators
-from calculators.services.mechanical import MechanicalCalculators
-from calculators.services.civil import CivilCalculators
+from calculators.services.equation_planner import get_planner
+from calculators.registry import CALCULATOR_REGISTRY, RESULT_CACHE, run_calculator, calculate_equation, run_batch
+import workflow_search
 from workflow_models import Equation, EquationCategory, EquationInput, EquationOutput
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import Dict, Any, List, Optional
 
 router = APIRouter(prefix="/calculators", tags=["calculators"])
 
 class CalculationRequest(BaseModel):
     inputs: Dict[str, Any]
+    target: Optional[str] = None
+
+class BatchCalculationRequest(BaseModel):
+    inputs: Dict[str, Any]  # column name -> list of values (scalars apply to every row)
+
+class SolveRequest(BaseModel):
+    known: Dict[str, Any]  # variable name (e.g. "voltage") -> value
+    target: str
 
 @router.get("/")
 async def get_all_calculations(db: Session = Depends(get_workflow_db)):
@@ -39,6 +47,26 @@ async def get_all_calculations(db: Session = Depends(get_workflow_db)):
     
     return result
 
+@router.get("/registry")
+async def get_calculator_registry(db: Session = Depends(get_workflow_db)):
+    """List built-in calculators with their input schemas and call metrics"""
+    return {
+        "calculators": [spec.describe() for spec in CALCULATOR_REGISTRY.values()],
+        "count": len(CALCULATOR_REGISTRY),
+        "catalog_equations": db.query(Equation).count(),
+        "cache": RESULT_CACHE.stats()
+    }
+
+@router.get("/search")
+async def search_calculators(
+    q: str,
+    domain: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_workflow_db)
+):
+    """Ranked full-text search over catalog equations (prefix and typo tolerant)"""
+    return workflow_search.search(db, "equations", q, domain, limit)
+
 @router.get("/{domain}")
 async def get_calculators_by_domain(domain: str, db: Session = Depends(get_workflow_db)):
     """Get equations for a specific domain with category hierarchy"""
@@ -170,33 +198,54 @@ async def get_equation_details(equation_id: str, db: Session = Depends(get_workf
     }
 
 
+@router.post("/solve")
+def solve_chain(
+    request: SolveRequest,
+    workflow_db: Session = Depends(get_workflow_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Chain catalog equations to derive a target variable from known variables"""
+    result = get_planner(workflow_db).solve(request.known, request.target)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
 @router.post("/{type}/calculate")
 async def calculate(
     type: str,
     request: CalculationRequest,
     db: Session = Depends(get_db),
+    workflow_db: Session = Depends(get_workflow_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        if type.startswith("electrical_"):
-            method_name = type.replace("electrical_", "")
-            if hasattr(ElectricalCalculators, method_name):
-                method = getattr(ElectricalCalculators, method_name)
-                result = method(**request.inputs)
-                return result
-        elif type.startswith("mechanical_"):
-            method_name = type.replace("mechanical_", "")
-            if hasattr(MechanicalCalculators, method_name):
-                method = getattr(MechanicalCalculators, method_name)
-                result = method(**request.inputs)
-                return result
-        elif type.startswith("civil_"):
-            method_name = type.replace("civil_", "")
-            if hasattr(CivilCalculators, method_name):
-                method = getattr(CivilCalculators, method_name)
-                result = method(**request.inputs)
-                return result
+        result = run_calculator(type, request.inputs)
+        if result is not None:
+            return result
+        
+        # Fall back to the generic engine for catalog equations (e.g. "civil_bending_stress_1")
+        equation = workflow_db.query(Equation).filter_by(equation_id=type).first()
+        if equation:
+            return calculate_equation(equation, request.inputs, request.target)
         
         raise HTTPException(status_code=404, detail="Calculator type not found")
+    except HTTPException:
+        raise
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{type}/calculate-batch")
+async def calculate_batch(
+    type: str,
+    request: BatchCalculationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Run a built-in calculator over columnar inputs in a single request"""
+    result = run_batch(type, request.inputs)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Calculator type not found")
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
\ No newline at end of file
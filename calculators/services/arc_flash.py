@@ -0,0 +1,182 @@
+"""
+Arc Flash
+IEEE 1584 arc-flash study evaluated for every bus and operating scenario in one
+NumPy pass: arcing current, incident energy at the working distance and the
+arc-flash boundary, reduced to a label-ready table (worst scenario per bus).
+Uses the IEEE 1584-2002 empirical model for 0.208-15 kV and the Lee method above.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+from calculators.services.equipment_data import ARC_FLASH_EQUIPMENT
+
+ArrayLike = Union[float, Sequence[float], Sequence[Sequence[float]]]
+
+# NFPA 70E arc ratings (cal/cm²) for PPE categories 1-4
+PPE_CATEGORIES = (1.2, 4.0, 8.0, 25.0, 40.0)
+
+# NFPA 70E Table 130.4(D)(a) approach boundaries (mm) to fixed circuit parts: (max kV, limited, restricted)
+SHOCK_BOUNDARIES = ((0.75, 1067, 305), (15.0, 1524, 660), (36.0, 1829, 787))
+
+ONSET_ENERGY = 5.0  # J/cm², 1.2 cal/cm² second-degree burn threshold
+J_PER_CAL = 4.184
+
+_CLASSES = list(ARC_FLASH_EQUIPMENT)
+_TABLE = {field: np.array([ARC_FLASH_EQUIPMENT[c][field] for c in _CLASSES], dtype=float) for field in ("gap", "x", "distance")}
+_ENCLOSED = np.array([ARC_FLASH_EQUIPMENT[c]['enclosed'] for c in _CLASSES])
+
+
+def _equipment_index(equipment) -> np.ndarray:
+    equipment = np.asarray(equipment)
+    uniq, inverse = np.unique(equipment, return_inverse=True)
+    unknown = [name for name in uniq.tolist() if name not in ARC_FLASH_EQUIPMENT]
+    if unknown:
+        raise ValueError(f"Unknown equipment class: {', '.join(unknown)} (expected {', '.join(_CLASSES)})")
+    return np.array([_CLASSES.index(name) for name in uniq.tolist()])[inverse].reshape(equipment.shape)
+
+
+def arcing_current(voltage_kv: np.ndarray, bolted_ka: np.ndarray, gap_mm: np.ndarray, enclosed: np.ndarray) -> np.ndarray:
+    """
+    IEEE 1584-2002 eq. 1 (below 1 kV) and eq. 2 (1-15 kV); above 15 kV the arc draws the bolted current
+    """
+    lg_ibf = np.log10(bolted_ka)
+    k = np.where(enclosed, -0.097, -0.153)
+    lv = k + 0.662 * lg_ibf + 0.0966 * voltage_kv + 0.000526 * gap_mm + 0.5588 * voltage_kv * lg_ibf - 0.00304 * gap_mm * lg_ibf
+    mv = 0.00402 + 0.983 * lg_ibf
+    return np.where(voltage_kv > 15, bolted_ka, 10 ** np.where(voltage_kv < 1, lv, mv))
+
+
+def incident_energy(voltage_kv: np.ndarray, bolted_ka: np.ndarray, arcing_ka: np.ndarray, time_s: np.ndarray, gap_mm: np.ndarray,
+                    distance_mm: np.ndarray, x: np.ndarray, enclosed: np.ndarray, grounded: np.ndarray) -> np.ndarray:
+    """
+    Incident energy (J/cm²) at the working distance, IEEE 1584-2002 eq. 4-6, Lee method above 15 kV
+    """
+    lg_en = np.where(enclosed, -0.555, -0.792) + np.where(grounded, -0.113, 0.0) + 1.081 * np.log10(arcing_ka) + 0.0011 * gap_mm
+    cf = np.where(voltage_kv <= 1, 1.5, 1.0)
+    empirical = J_PER_CAL * cf * 10 ** lg_en * (time_s / 0.2) * (610 ** x / distance_mm ** x)
+    lee = 2.142e6 * voltage_kv * bolted_ka * time_s / distance_mm ** 2
+    return np.where(voltage_kv > 15, lee, empirical)
+
+
+def flash_boundary(energy: np.ndarray, distance_mm: np.ndarray, x: np.ndarray, voltage_kv: np.ndarray) -> np.ndarray:
+    """
+    Distance (mm) at which incident energy falls to the 5 J/cm² onset, from the energy at the working distance
+    """
+    exponent = np.where(voltage_kv > 15, 2.0, x)
+    return distance_mm * (energy / ONSET_ENERGY) ** (1 / exponent)
+
+
+def ppe_category(energy_cal: np.ndarray) -> np.ndarray:
+    """
+    0 below 1.2 cal/cm², 1-4 per NFPA 70E, 5 where no PPE category applies (> 40 cal/cm²)
+    """
+    return np.searchsorted(np.array(PPE_CATEGORIES), energy_cal, side="left")
+
+
+def arc_flash_study(bolted_fault_ka: ArrayLike, clearing_time: ArrayLike, voltage_kv: ArrayLike,
+                    equipment: Union[str, Sequence[str]] = 'switchgear', bus_ids: Optional[List[str]] = None,
+                    gap_mm: Optional[ArrayLike] = None, working_distance_mm: Optional[ArrayLike] = None,
+                    clearing_time_reduced: Optional[ArrayLike] = None, grounded: Union[bool, Sequence[bool]] = True,
+                    scenarios: Optional[List[str]] = None, max_clearing_time: Optional[float] = 2.0) -> Dict[str, Any]:
+    """
+    Arc-flash study over buses (last axis) and operating scenarios (first axis, optional).
+    Fault currents and clearing times may be (buses,) or (scenarios, buses); bus properties broadcast.
+    Below 1 kV the energy is also evaluated at 85 % arcing current with clearing_time_reduced
+    (the protective device time at that current) and the higher result is kept.
+    """
+    bolted = np.atleast_2d(np.asarray(bolted_fault_ka, dtype=float))
+    time_s = np.atleast_2d(np.asarray(clearing_time, dtype=float))
+    per_bus = [v for v in (voltage_kv, equipment, gap_mm, working_distance_mm, grounded) if v is not None]
+    shape = np.broadcast_shapes(bolted.shape, time_s.shape, *(np.shape(v) for v in per_bus))
+    n_scenarios, n_buses = shape
+    if np.any(bolted <= 0) or np.any(time_s <= 0):
+        raise ValueError("Bolted fault currents and clearing times must be positive")
+    if max_clearing_time:
+        time_s = np.minimum(time_s, max_clearing_time)
+
+    voltage = np.broadcast_to(np.asarray(voltage_kv, dtype=float), (n_buses,))
+    band = np.digitize(voltage, [1.0, 5.0], right=True)
+    kind = np.broadcast_to(_equipment_index(equipment), (n_buses,))
+    enclosed = _ENCLOSED[kind]
+    x = _TABLE["x"][kind, band]
+    gap = _TABLE["gap"][kind, band] if gap_mm is None else np.broadcast_to(np.asarray(gap_mm, dtype=float), (n_buses,))
+    distance = (_TABLE["distance"][kind, band] if working_distance_mm is None
+                else np.broadcast_to(np.asarray(working_distance_mm, dtype=float), (n_buses,)))
+    grounded = np.broadcast_to(np.asarray(grounded, dtype=bool), (n_buses,))
+
+    bolted = np.broadcast_to(bolted, shape)
+    time_s = np.broadcast_to(time_s, shape)
+    arcing = arcing_current(voltage, bolted, gap, enclosed)
+    energy = incident_energy(voltage, bolted, arcing, time_s, gap, distance, x, enclosed, grounded)
+
+    if clearing_time_reduced is not None:
+        reduced_time = np.broadcast_to(np.atleast_2d(np.asarray(clearing_time_reduced, dtype=float)), shape)
+        if max_clearing_time:
+            reduced_time = np.minimum(reduced_time, max_clearing_time)
+        reduced = incident_energy(voltage, bolted, 0.85 * arcing, reduced_time, gap, distance, x, enclosed, grounded)
+        use_reduced = (voltage < 1) & (reduced > energy)
+        energy = np.where(use_reduced, reduced, energy)
+        arcing = np.where(use_reduced, 0.85 * arcing, arcing)
+        time_s = np.where(use_reduced, reduced_time, time_s)
+
+    boundary = flash_boundary(energy, distance, x, voltage)
+    energy_cal = energy / J_PER_CAL
+
+    # Label table: the worst scenario at each bus
+    worst = np.argmax(energy, axis=0)
+    columns = np.arange(n_buses)
+    worst_cal = energy_cal[worst, columns]
+    category = ppe_category(worst_cal)
+    limits = np.array([b[0] for b in SHOCK_BOUNDARIES])
+    shock = np.minimum(np.searchsorted(limits, voltage, side="left"), len(SHOCK_BOUNDARIES) - 1)
+    bus_ids = bus_ids or [f"Bus {i + 1}" for i in range(n_buses)]
+    if len(bus_ids) != n_buses:
+        raise ValueError(f"Expected {n_buses} bus ids, got {len(bus_ids)}")
+    scenarios = scenarios or [f"Scenario {i + 1}" for i in range(n_scenarios)]
+    if len(scenarios) != n_scenarios:
+        raise ValueError(f"Expected {n_scenarios} scenario names, got {len(scenarios)}")
+
+    labels = [
+        {
+            "bus": bus_ids[i],
+            "nominal_voltage_kv": float(voltage[i]),
+            "equipment": _CLASSES[kind[i]],
+            "worst_scenario": scenarios[worst[i]],
+            "bolted_fault_ka": round(float(bolted[worst[i], i]), 2),
+            "arcing_current_ka": round(float(arcing[worst[i], i]), 2),
+            "clearing_time": round(float(time_s[worst[i], i]), 3),
+            "working_distance_mm": round(float(distance[i])),
+            "incident_energy_cal_cm2": round(float(worst_cal[i]), 2),
+            "arc_flash_boundary_mm": round(float(boundary[worst[i], i])),
+            "ppe_category": int(category[i]) if category[i] <= 4 else None,
+            "limited_approach_mm": SHOCK_BOUNDARIES[shock[i]][1],
+            "restricted_approach_mm": SHOCK_BOUNDARIES[shock[i]][2],
+            "method": "Lee" if voltage[i] > 15 else "IEEE 1584-2002",
+            "danger": bool(category[i] > 4),
+        }
+        for i in range(n_buses)
+    ]
+
+    return {
+        "labels": labels,
+        "scenarios": {
+            name: {
+                "incident_energy_cal_cm2": np.round(energy_cal[s], 3).tolist(),
+                "arc_flash_boundary_mm": np.round(boundary[s]).tolist(),
+                "arcing_current_ka": np.round(arcing[s], 3).tolist(),
+            }
+            for s, name in enumerate(scenarios)
+        },
+        "summary": {
+            "buses": n_buses,
+            "scenarios": n_scenarios,
+            "max_incident_energy_cal_cm2": round(float(worst_cal.max()), 2),
+            "max_energy_bus": bus_ids[int(np.argmax(worst_cal))],
+            "buses_by_ppe_category": {str(c): int(np.sum(category == c)) for c in range(5)},
+            "buses_above_40_cal": int(np.sum(category > 4)),
+            "outside_model_range": [bus_ids[i] for i in np.flatnonzero(
+                (voltage < 0.208) | ((voltage <= 15) & ((bolted.max(axis=0) > 106) | (bolted.min(axis=0) < 0.7))))],
+        },
+    }
@@ -0,0 +1,239 @@
+"""
+Bar Schedule
+Bar bending schedules for whole projects. Cutting lengths are the shape's dimensions plus hook
+allowances less bend deductions, evaluated for a member list (or one chunk of it) as array
+expressions; bars longer than the stock are lapped. Cut pieces are aggregated by diameter and
+length, so stock-length optimization only sees the distinct lengths: a sequential pattern
+heuristic fills a stock bar with the longest pieces that fit, repeats that pattern as often as the
+remaining demand allows, and the stock length with the least offcut is kept for each diameter.
+"""
+
+from collections import Counter
+from typing import Dict, Any, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+HOOK = 10  # hook allowance (x d)
+BEND_DEDUCTION = {45: 1, 90: 2, 135: 3}  # x d
+STEEL_WEIGHT = 0.00617  # kg/m per mm² of d²
+STOCK_LENGTHS = (12000,)  # mm
+LAP = 50  # lap length (x d)
+ROUNDING = 10  # cutting lengths rounded up to (mm)
+DIMENSIONS = ('A', 'B', 'C', 'D')
+SCHEDULE_COLUMNS = ['member', 'member_type', 'bar_mark', 'shape', 'diameter', 'A', 'B', 'C', 'D', 'bars', 'members', 'quantity',
+                    'cut_length', 'laps', 'total_length', 'unit_weight', 'weight']
+# Alternative headings accepted in member lists
+ALIASES = {'dia': 'diameter', 'bar_diameter': 'diameter', 'shape_code': 'shape', 'mark': 'bar_mark', 'type': 'member_type',
+           'length': 'A', 'no_of_bars': 'bars', 'bars_per_member': 'bars', 'no_of_members': 'members', 'count': 'quantity'}
+
+# Bar shapes for bending schedules: cutting length = coefficients . (A, B, C, D) + hooks x hook allowance
+# - bend deductions, with the IS 2502 allowances (hook 10d; 45°, 90°, 135° bends deduct 1d, 2d, 3d)
+BAR_SHAPES = {
+    'straight': {'dimensions': (1, 0, 0, 0), 'bends': {}, 'hooks': 0},
+    'hooked': {'dimensions': (1, 0, 0, 0), 'bends': {}, 'hooks': 2},  # A between hook ends
+    'L': {'dimensions': (1, 1, 0, 0), 'bends': {90: 1}, 'hooks': 0},
+    'U': {'dimensions': (1, 1, 1, 0), 'bends': {90: 2}, 'hooks': 0},
+    'crank': {'dimensions': (1, 0.42, 0, 0), 'bends': {45: 4}, 'hooks': 0},  # A overall length, B crank height
+    'link': {'dimensions': (2, 2, 0, 0), 'bends': {90: 3, 135: 2}, 'hooks': 2},  # closed A x B stirrup
+}
+
+_SHAPE_NAMES = list(BAR_SHAPES)
+_COEFFICIENTS = np.array([BAR_SHAPES[name]['dimensions'] for name in _SHAPE_NAMES], dtype=float)
+_ALLOWANCE = np.array([HOOK * BAR_SHAPES[name]['hooks'] - sum(count * BEND_DEDUCTION[angle] for angle, count in BAR_SHAPES[name]['bends'].items())
+                       for name in _SHAPE_NAMES], dtype=float)
+
+
+def _columns(frame: pd.DataFrame) -> pd.DataFrame:
+    renamed = {}
+    for column in frame.columns:
+        key = str(column).strip()
+        key = key.upper() if key.upper() in DIMENSIONS else key.lower().replace(' ', '_')
+        renamed[column] = ALIASES.get(key, key)
+    return frame.rename(columns=renamed)
+
+
+def schedule_frame(frame: pd.DataFrame, stock_length: float = max(STOCK_LENGTHS), lap: float = LAP, rounding: float = ROUNDING) -> pd.DataFrame:
+    """
+    Schedule rows for a member list: "diameter" (mm), "shape" (default straight) with dimensions "A" to "D" (mm),
+    "bars" per member and "members" (or a total "quantity"), plus optional "member", "member_type" and "bar_mark".
+    Cut lengths in mm, total length in m, weights in kg
+    """
+    frame = _columns(frame)
+    if 'diameter' not in frame or 'A' not in frame:
+        raise ValueError("The member list needs 'diameter' and 'A' (or 'length') columns")
+    count = len(frame)
+    text = {name: frame[name].fillna('').astype(str).to_numpy() if name in frame else np.full(count, '') for name in ('member', 'member_type', 'bar_mark')}
+    shape = frame['shape'].fillna('straight').astype(str).str.strip().to_numpy() if 'shape' in frame else np.full(count, 'straight')
+    index = pd.Index(_SHAPE_NAMES).get_indexer(shape)
+    if np.any(index < 0):
+        unknown = sorted(set(shape[index < 0]))
+        raise ValueError(f"Unknown bar shapes: {', '.join(unknown)} (expected {', '.join(_SHAPE_NAMES)})")
+    diameter = pd.to_numeric(frame['diameter'], errors='coerce').to_numpy(dtype=float)
+    dims = np.column_stack([pd.to_numeric(frame[name], errors='coerce').fillna(0).to_numpy(dtype=float) if name in frame else np.zeros(count)
+                            for name in DIMENSIONS])
+    if 'quantity' in frame:
+        bars, members = pd.to_numeric(frame['quantity'], errors='coerce').to_numpy(dtype=float), np.ones(count)
+    else:
+        bars = pd.to_numeric(frame['bars'], errors='coerce').fillna(1).to_numpy(dtype=float) if 'bars' in frame else np.ones(count)
+        members = pd.to_numeric(frame['members'], errors='coerce').fillna(1).to_numpy(dtype=float) if 'members' in frame else np.ones(count)
+    quantity = bars * members
+    invalid = ~(np.isfinite(diameter) & (diameter > 0) & np.isfinite(quantity) & (quantity >= 0))
+    if np.any(invalid):
+        raise ValueError(f"Rows need a positive diameter and quantity (first bad row: {int(np.argmax(invalid))})")
+
+    cut = np.ceil(((dims * _COEFFICIENTS[index]).sum(axis=1) + _ALLOWANCE[index] * diameter) / rounding) * rounding
+    if np.any(cut <= 0):
+        raise ValueError(f"Bar dimensions give no cutting length (first bad row: {int(np.argmax(cut <= 0))})")
+    laps = np.where(cut > stock_length, np.ceil((cut - stock_length) / (stock_length - lap * diameter)), 0)
+    total = quantity * (cut + laps * lap * diameter) / 1000
+    unit_weight = STEEL_WEIGHT * diameter ** 2
+    return pd.DataFrame({
+        'member': text['member'], 'member_type': text['member_type'], 'bar_mark': text['bar_mark'], 'shape': shape, 'diameter': diameter,
+        **{name: dims[:, k] for k, name in enumerate(DIMENSIONS)}, 'bars': bars, 'members': members, 'quantity': quantity,
+        'cut_length': cut, 'laps': laps, 'total_length': np.round(total, 3), 'unit_weight': np.round(unit_weight, 4),
+        'weight': np.round(total * unit_weight, 3),
+    }, columns=SCHEDULE_COLUMNS)
+
+
+def cutting_plan(pieces: Dict[float, int], stock_length: float, max_patterns: int = 20) -> Dict[str, Any]:
+    """
+    Stock bars for {piece length: count} of one diameter by sequential pattern repetition. Pieces must fit the stock
+    """
+    lengths = np.array(sorted(pieces, reverse=True), dtype=float)
+    counts = np.array([pieces[length] for length in lengths], dtype=np.int64)
+    if len(lengths) and lengths[0] > stock_length:
+        raise ValueError(f"Piece of {lengths[0]:g} mm is longer than the {stock_length:g} mm stock")
+    patterns, bars, offcut = [], 0, 0.0
+    while counts.sum():
+        active = np.flatnonzero(counts)
+        use = np.zeros(len(lengths), dtype=np.int64)
+        remaining = stock_length
+        start = 0
+        while start < len(active):
+            # Longest active piece that still fits (lengths are sorted longest first)
+            start += int(np.searchsorted(-lengths[active[start:]], -remaining, side='left'))
+            if start >= len(active):
+                break
+            i = active[start]
+            take = int(min(counts[i], remaining // lengths[i]))
+            use[i] = take
+            remaining -= take * lengths[i]
+            start += 1
+        used = np.flatnonzero(use)
+        repeats = int((counts[used] // use[used]).min())
+        counts -= repeats * use
+        bars += repeats
+        offcut += repeats * remaining
+        patterns.append((repeats, float(remaining), {float(lengths[i]): int(use[i]) for i in used}))
+    patterns.sort(key=lambda pattern: -pattern[0])
+    return {
+        "stock_length": stock_length, "stock_bars": bars,
+        "offcut": round(float(offcut) / 1000, 3),
+        "waste_percent": round(float(offcut) / (bars * stock_length) * 100, 3) if bars else 0.0,
+        "patterns": len(patterns),
+        "top_patterns": [{"repeats": repeats, "pieces": cuts, "offcut": round(remaining, 1)} for repeats, remaining, cuts in patterns[:max_patterns]],
+    }
+
+
+class ScheduleSummary:
+    """
+    Running totals of schedule chunks (by diameter and member type) and the aggregated cut pieces per diameter,
+    so the stock optimization at the end works on distinct lengths only
+    """
+
+    def __init__(self, stock_lengths: Sequence[float] = STOCK_LENGTHS, lap: float = LAP):
+        self.stock_lengths = sorted(float(length) for length in stock_lengths)
+        if not self.stock_lengths or self.stock_lengths[0] <= 0:
+            raise ValueError("Stock lengths must be positive")
+        self.lap = lap
+        self.rows = 0
+        self.by_diameter: Dict[float, np.ndarray] = {}
+        self.by_type: Counter = Counter()
+        # Lapping depends on the stock length, so pieces and whole lapped bars are kept for every candidate
+        self.pieces: Dict[float, Dict[float, Counter]] = {stock: {} for stock in self.stock_lengths}
+        self.full_bars: Dict[float, Counter] = {stock: Counter() for stock in self.stock_lengths}
+        self.unusable: Dict[float, set] = {stock: set() for stock in self.stock_lengths}
+
+    def feed(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        totals = chunk.groupby('diameter')[['quantity', 'total_length', 'weight']].sum()
+        for diameter, values in zip(totals.index, totals.to_numpy()):
+            self.by_diameter[diameter] = self.by_diameter.get(diameter, np.zeros(3)) + values
+        self.by_type.update(chunk.groupby('member_type')['weight'].sum().to_dict())
+
+        # Lapped bars: whole stock bars plus a last piece carrying the laps
+        diameter, cut, quantity = (chunk[name].to_numpy() for name in ('diameter', 'cut_length', 'quantity'))
+        for stock in self.stock_lengths:
+            advance = stock - self.lap * diameter
+            long = cut > stock
+            # Stock no longer than a lap cannot be lapped
+            self.unusable[stock].update(np.unique(diameter[long & (advance <= 0)]).tolist())
+            laps = np.where(long, np.ceil((cut - stock) / np.where(advance > 0, advance, np.inf)), 0)
+            last = cut + laps * self.lap * diameter - laps * stock
+            pieces = pd.DataFrame({'diameter': diameter, 'length': last, 'quantity': quantity})
+            for (bar, length), count in pieces.groupby(['diameter', 'length'])['quantity'].sum().items():
+                self.pieces[stock].setdefault(bar, Counter())[length] += int(count)
+            whole = pd.Series(laps * quantity).groupby(diameter).sum()
+            self.full_bars[stock].update({bar: int(count) for bar, count in whole.items() if count})
+
+    def result(self, optimize: bool = True) -> Dict[str, Any]:
+        diameters = []
+        for diameter in sorted(self.by_diameter):
+            quantity, length, weight = self.by_diameter[diameter]
+            row = {"diameter": diameter, "bars": int(quantity), "total_length": round(float(length), 2), "weight": round(float(weight), 2)}
+            if optimize:
+                plans = []
+                for stock in self.stock_lengths:
+                    if diameter in self.unusable[stock]:
+                        continue
+                    plan = cutting_plan({length: count for length, count in self.pieces[stock].get(diameter, {}).items() if count}, stock)
+                    # Whole bars of lapped runs are used uncut: they add to the stock but not to the offcut
+                    plan["lapped_bars"] = self.full_bars[stock].get(diameter, 0)
+                    plan["stock_bars"] += plan["lapped_bars"]
+                    plan["waste_percent"] = round(plan["offcut"] * 1000 / (plan["stock_bars"] * stock) * 100, 3) if plan["stock_bars"] else 0.0
+                    plans.append(plan)
+                if not plans:
+                    raise ValueError(f"No stock length is longer than the lap of {diameter:g} mm bars")
+                # Least stock bought: offcut plus the lap material that shorter stock adds
+                best = min(plans, key=lambda plan: (plan["stock_bars"] * plan["stock_length"], -plan["stock_length"]))
+                best["stock_weight"] = round(best["stock_bars"] * best["stock_length"] / 1000 * STEEL_WEIGHT * diameter ** 2, 2)
+                row["cutting"] = best
+            diameters.append(row)
+        return {
+            "rows": self.rows,
+            "total_bars": sum(row["bars"] for row in diameters),
+            "total_weight": round(sum(row["weight"] for row in diameters), 2),
+            "total_weight_ton": round(sum(row["weight"] for row in diameters) / 1000, 3),
+            "diameters": diameters,
+            "by_member_type": {name or "unspecified": round(float(weight), 2) for name, weight in sorted(self.by_type.items())},
+        }
+
+
+def bar_schedule(bars: Iterable[Dict[str, Any]], stock_lengths: Sequence[float] = STOCK_LENGTHS, lap: float = LAP, rounding: float = ROUNDING,
+                 include_rows: bool = True, optimize: bool = True) -> Dict[str, Any]:
+    """
+    Bar bending schedule and stock cutting plan of a list of bar rows (see schedule_frame for the columns)
+    """
+    rows = list(bars)
+    if not rows:
+        raise ValueError("At least one bar row is required")
+    summary = ScheduleSummary(stock_lengths, lap)
+    schedule = schedule_frame(pd.DataFrame(rows), max(summary.stock_lengths), lap, rounding)
+    summary.feed(schedule)
+    results = summary.result(optimize)
+    if include_rows:
+        results["schedule"] = schedule.to_dict(orient='records')
+    return results
+
+
+def schedule_chunks(frames: Iterable[pd.DataFrame], stock_lengths: Sequence[float] = STOCK_LENGTHS, lap: float = LAP,
+                    rounding: float = ROUNDING, summary: Optional[ScheduleSummary] = None) -> Iterable[pd.DataFrame]:
+    """Schedule each member-list chunk in turn, feeding the optional summary as it goes"""
+    stock = max(stock_lengths)
+    for frame in frames:
+        chunk = schedule_frame(frame, stock, lap, rounding)
+        if summary is not None:
+            summary.feed(chunk)
+        yield chunk
+
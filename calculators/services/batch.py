@@ -0,0 +1,491 @@
+"""
+Batch Calculators
+NumPy-vectorized versions of the hot calculators, evaluated over columnar inputs.
+Each method mirrors its scalar counterpart in the domain services row for row.
+"""
+
+import math
+from typing import Dict, Any, Callable, Optional
+
+import numpy as np
+
+from calculators.services.psychrometrics import atmospheric_pressure, psychrometric_state
+from calculators.services.equipment_data import CABLE_STANDARDS, INSTALL_DERATING, CABLE_TABLE, VOLTAGE_DROP_SIZES as _VOLTAGE_DROP_SIZES
+
+SQRT3 = 3 ** 0.5
+
+CABLE_SIZES = list(CABLE_TABLE.column('mm2'))
+CABLE_AMPACITY_XLPE = np.array(CABLE_TABLE.keys)
+VOLTAGE_DROP_SIZES = np.array(_VOLTAGE_DROP_SIZES.keys)
+
+
+def _lookup(keys, table: Dict[Any, Any], default):
+    """
+    Map a column of keys through a dict, resolving each distinct key once
+    """
+    keys = np.asarray(keys)
+    if keys.ndim == 0:
+        return np.asarray(table.get(keys.item(), default))
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return np.array([table.get(key, default) for key in uniq.tolist()])[inverse]
+
+
+def _fmt(value):
+    """
+    Format a number the way the scalar calculators print their integer inputs
+    """
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _to_columns(results: Dict[str, Any], n: int) -> Dict[str, Any]:
+    """
+    Broadcast result arrays to n rows and convert them to JSON-safe lists
+    """
+    columns = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            columns[key] = _to_columns(value, n)
+            continue
+
+        array = np.broadcast_to(np.asarray(value), (n,))
+        if array.dtype.kind == "f":
+            columns[key] = [None if math.isnan(v) else v for v in array.tolist()]
+        else:
+            columns[key] = array.tolist()
+    return columns
+
+
+def _finish(results: Dict[str, Any], compliance, n: int, failed=None, error: Optional[str] = None):
+    """
+    Assemble the columnar response, blanking rows that failed
+    """
+    columns = _to_columns(results, n)
+    failed = np.broadcast_to(np.asarray(failed if failed is not None else False), (n,))
+
+    if failed.any():
+        rows = np.flatnonzero(failed).tolist()
+        for column in _iter_columns(columns):
+            for row in rows:
+                column[row] = None
+
+    return {
+        "results": columns,
+        "compliance": compliance if isinstance(compliance, str) else np.broadcast_to(compliance, (n,)).tolist(),
+        "row_success": (~failed).tolist(),
+        "errors": [error if f else None for f in failed.tolist()],
+        "count": n,
+        "success": True
+    }
+
+
+def _iter_columns(columns: Dict[str, Any]):
+    for value in columns.values():
+        if isinstance(value, dict):
+            yield from _iter_columns(value)
+        else:
+            yield value
+
+
+class BatchCalculators:
+    @staticmethod
+    def load_calculation(connected_load, demand_factor=0.8, diversity_factor=0.85, system_type='3phase', voltage=400, power_factor=0.85, n: int = 1):
+        """Vectorized load_calculation"""
+        connected_load = np.asarray(connected_load, dtype=float)
+        demand_factor = np.asarray(demand_factor, dtype=float)
+        diversity_factor = np.asarray(diversity_factor, dtype=float)
+        voltage = np.asarray(voltage, dtype=float)
+        pf = np.asarray(power_factor, dtype=float)
+
+        diversified_load = connected_load * demand_factor * diversity_factor
+        phase_factor = np.where(np.asarray(system_type) == '3phase', SQRT3, 1.0)
+        design_current = (diversified_load * 1000) / (phase_factor * voltage * pf)
+        apparent_power = diversified_load / pf
+
+        results = {
+            "connected_load": np.round(connected_load, 2),
+            "demand_factor": np.round(demand_factor, 2),
+            "diversity_factor": np.round(diversity_factor, 2),
+            "system_type": np.asarray(system_type),
+            "voltage": np.round(voltage, 0),
+            "power_factor": np.round(pf, 2),
+            "diversified_load": np.round(diversified_load, 2),
+            "apparent_power": np.round(apparent_power, 2),
+            "design_current": np.round(design_current, 2)
+        }
+        return _finish(results, "IEC 60364/NEC 220", n)
+
+    @staticmethod
+    def cable_sizing(design_current, length, voltage_system=400, standard='IEC', circuit_type='power', install_method='conduit', material='copper', ambient_temp=40, grouping_factor=1.0, n: int = 1):
+        """Vectorized cable_sizing using a sorted ampacity search instead of a linear scan"""
+        design_current = np.asarray(design_current, dtype=float)
+        length = np.asarray(length, dtype=float)
+        voltage_system = np.asarray(voltage_system, dtype=float)
+        ambient_temp = np.asarray(ambient_temp, dtype=float)
+        grouping_factor = np.asarray(grouping_factor, dtype=float)
+        copper = np.asarray(material) == 'copper'
+
+        code_names = {k: v['name'] + '-' + v['ref'] for k, v in CABLE_STANDARDS.items()}
+        compliance = _lookup(standard, code_names, code_names['IEC'])
+        max_vdrop = np.where(np.asarray(circuit_type) == 'lighting', 3, 5)
+
+        install_factor = _lookup(install_method, INSTALL_DERATING, 0.8)
+        temp_derating = np.where(ambient_temp > 40, 0.91, 1.0)
+        combined_derating = install_factor * temp_derating * grouping_factor
+        required_ampacity = design_current / combined_derating
+
+        index = np.searchsorted(CABLE_AMPACITY_XLPE, required_ampacity, side='left')
+        failed = index >= len(CABLE_SIZES)
+        index = np.minimum(index, len(CABLE_SIZES) - 1)
+        cable_size = np.asarray(CABLE_SIZES, dtype=float)[index]
+        ampacity = CABLE_AMPACITY_XLPE[index]
+
+        resistivity = np.where(copper, 0.0172, 0.0282)
+        resistance = (resistivity * length) / cable_size
+        reactance = 0.08 * length / 1000
+        impedance = np.hypot(resistance, reactance)
+        voltage_drop = SQRT3 * design_current * impedance
+        voltage_drop_percent = (voltage_drop / voltage_system) * 100
+        power_loss = 3 * design_current ** 2 * resistance
+
+        index, copper, cores = np.broadcast_arrays(index, copper, voltage_system > 100)
+        cable_config = [
+            f"{'4C' if c else '3C'}× {CABLE_SIZES[i]}mm² {'Cu' if cu else 'Al'}XLPE"
+            for i, cu, c in zip(index.tolist(), copper.tolist(), cores.tolist())
+        ]
+
+        results = {
+            "cable_size": np.array([_fmt(s) for s in np.broadcast_to(cable_size, (n,))], dtype=object),
+            "cable_config": np.array(cable_config, dtype=object),
+            "ampacity": ampacity,
+            "required_ampacity": np.round(required_ampacity, 2),
+            "design_current": np.round(design_current, 2),
+            "voltage_drop": np.round(voltage_drop, 2),
+            "voltage_drop_percent": np.round(voltage_drop_percent, 2),
+            "max_allowed_drop": max_vdrop,
+            "compliance": voltage_drop_percent <= max_vdrop,
+            "power_loss": np.round(power_loss, 2),
+            "derating_factors": {
+                "installation": np.round(install_factor * 100, 0),
+                "temperature": np.round(temp_derating * 100, 0),
+                "grouping": np.round(grouping_factor * 100, 0),
+                "combined": np.round(combined_derating * 100, 0)
+            }
+        }
+        return _finish(results, compliance, n, failed, "Current too high. Consider parallel cables or larger system.")
+
+    @staticmethod
+    def voltage_drop(current, length, cross_section, voltage=400, material='copper', standard='IEC', circuit_type='power', system_type='3phase', n: int = 1):
+        """Vectorized voltage_drop"""
+        current = np.asarray(current, dtype=float)
+        length = np.asarray(length, dtype=float)
+        cross_section = np.asarray(cross_section, dtype=float)
+        voltage = np.asarray(voltage, dtype=float)
+        system_type = np.asarray(system_type)
+
+        code_names = {'IEC': 'IEC 60364-5-52', 'NEC': 'NEC 210.19(A)', 'BS7671': 'BS 7671', 'AS3000': 'AS/NZS 3000'}
+        compliance = _lookup(standard, code_names, code_names['IEC'])
+        max_vdrop_percent = np.where(np.asarray(circuit_type) == 'lighting', 3, 5)
+
+        resistivity = np.where(np.asarray(material) == 'copper', 0.0172, 0.0282)
+        resistance = (resistivity * length) / cross_section
+        reactance = 0.08 * (length / 1000)
+        impedance = np.hypot(resistance, reactance)
+
+        v_drop = np.where(system_type == '1phase', 2.0, SQRT3) * current * impedance
+        v_drop_percent = (v_drop / voltage) * 100
+        compliant = v_drop_percent <= max_vdrop_percent
+        power_loss = np.where(system_type == '3phase', 3, 2) * current ** 2 * resistance
+
+        next_index = np.searchsorted(VOLTAGE_DROP_SIZES, cross_section, side='right')
+        margin = max_vdrop_percent - v_drop_percent
+
+        next_index, compliant_rows, margin = np.broadcast_arrays(next_index, compliant, margin)
+        recommendation = []
+        for i, ok, m in zip(next_index.tolist(), compliant_rows.tolist(), margin.tolist()):
+            if ok:
+                recommendation.append("Voltage drop acceptable but close to limit" if m <= 1 else "Voltage drop acceptable with good safety margin")
+            elif i < len(VOLTAGE_DROP_SIZES):
+                recommendation.append(f"Increase cable size to {_fmt(VOLTAGE_DROP_SIZES[i])} mm² or reduce run length")
+            else:
+                recommendation.append("Use larger cable or reduce length")
+
+        results = {
+            "voltage_drop": np.round(v_drop, 2),
+            "voltage_drop_percent": np.round(v_drop_percent, 2),
+            "max_allowed_percent": max_vdrop_percent,
+            "resistance": np.round(resistance, 4),
+            "impedance": np.round(impedance, 4),
+            "reactance": np.round(reactance, 4),
+            "power_loss": np.round(power_loss, 2),
+            "compliant": compliant,
+            "recommendation": np.array(recommendation, dtype=object)
+        }
+        return _finish(results, compliance, n)
+
+    @staticmethod
+    def pipe_friction(flow_rate, pipe_size, pipe_length, temperature=20, roughness='steel_new', schedule='schedule40', n: int = 1):
+        """Vectorized pipe_friction (Darcy-Weisbach with Colebrook-White iterated over all rows)"""
+        flow_rate = np.asarray(flow_rate, dtype=float)
+        pipe_size = np.asarray(pipe_size, dtype=float)
+        pipe_length = np.asarray(pipe_length, dtype=float)
+        temperature = np.asarray(temperature, dtype=float)
+        g = 9.81
+        rho = 1000
+
+        diameter = pipe_size / 1000
+        velocity = (flow_rate / 3600) / (np.pi * diameter ** 2 / 4)
+        nu = np.where(temperature == 40, 0.653e-6, 1.004e-6)
+        Re = (velocity * diameter) / nu
+
+        epsilon = _lookup(roughness, {'steel_new': 0.045, 'steel_old': 0.2, 'copper': 0.0015, 'pvc': 0.0015, 'cast_iron': 0.26}, 0.045)
+        relative_roughness = epsilon / pipe_size
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = (-1.8 * np.log10((relative_roughness / 3.7) ** 1.1 + 6.9 / Re)) ** -2
+            for _ in range(3):
+                f = (-2 * np.log10(relative_roughness / 3.7 + 2.51 / (Re * np.sqrt(f)))) ** -2
+            f = np.where(Re < 2300, 64 / Re, f)
+
+        head_loss = f * (pipe_length / diameter) * (velocity ** 2 / (2 * g))
+        pressure_drop = rho * g * head_loss / 1000
+
+        results = {
+            "flow_rate": np.round(flow_rate, 2),
+            "calculated_diameter": np.array([_fmt(s) for s in np.broadcast_to(pipe_size, (n,))], dtype=object),
+            "fluid_velocity": np.round(velocity, 3),
+            "reynolds_number": np.round(Re, 0),
+            "flow_regime": np.select([Re < 2300, Re < 4000], ["Laminar", "Transitional"], "Turbulent"),
+            "friction_factor": np.round(f, 4),
+            "head_loss": np.round(head_loss, 3),
+            "pressure_drop": np.round(pressure_drop, 2),
+            "roughness_value": epsilon
+        }
+        return _finish(results, "Darcy-Weisbach & Colebrook-White", n)
+
+    @staticmethod
+    def psychrometrics(dry_bulb_temp, relative_humidity, altitude=0, n: int = 1):
+        """Vectorized psychrometrics (wet bulb bisection and dew point Newton steps over all rows at once)"""
+        dry_bulb_temp = np.asarray(dry_bulb_temp, dtype=float)
+        relative_humidity = np.asarray(relative_humidity, dtype=float)
+        altitude = np.asarray(altitude, dtype=float)
+
+        state = psychrometric_state(dry_bulb_temp, relative_humidity, altitude=altitude)
+        failed = np.isnan(state["humidity_ratio"])
+
+        results = {
+            "dry_bulb_temp": np.round(dry_bulb_temp, 1),
+            "relative_humidity": np.round(relative_humidity, 1),
+            "altitude": np.round(altitude, 0),
+            "atmospheric_pressure": np.round(atmospheric_pressure(altitude), 2),
+            "wet_bulb_temp": np.round(state["wet_bulb"], 1),
+            "dew_point_temp": np.round(state["dew_point"], 1),
+            "humidity_ratio": np.round(state["humidity_ratio"] * 1000, 2),
+            "specific_enthalpy": np.round(state["enthalpy"], 2),
+            "specific_volume": np.round(state["specific_volume"], 3),
+            "air_density": np.round(state["density"], 3),
+            "degree_of_saturation": np.round(state["degree_of_saturation"], 1),
+            "vapor_pressure": np.round(state["vapour_pressure"], 2)
+        }
+        return _finish(results, "ASHRAE Fundamentals", n, failed, "Relative humidity must be between 0 and 100 %")
+
+    @staticmethod
+    def beam_load(uniform_load, length, beam_depth=600, beam_width=300, concrete_grade=25, steel_grade=415, standard='IS456', n: int = 1):
+        """Vectorized beam_load"""
+        w = np.asarray(uniform_load, dtype=float)
+        length = np.asarray(length, dtype=float)
+        beam_depth = np.asarray(beam_depth, dtype=float)
+        beam_width = np.asarray(beam_width, dtype=float)
+        fck = np.asarray(concrete_grade, dtype=float)
+        fy = np.asarray(steel_grade, dtype=float)
+        standard = np.asarray(standard)
+
+        codes = {
+            'IS456': ('IS 456:2000', 'Indian Standard for RCC', 25, 0.85, 4.0),
+            'ACI318': ('ACI 318-19', 'American Concrete Institute', 40, 0.60, 4.0),
+            'EC2': ('Eurocode 2', 'EN 1992-1-1:2004', 30, 0.26, 4.0),
+            'BS8110': ('BS 8110-1:1997', 'British Standard for Structural Concrete', 25, 0.13, 4.0)
+        }
+        name = _lookup(standard, {k: v[0] for k, v in codes.items()}, codes['IS456'][0])
+        reference = _lookup(standard, {k: v[1] for k, v in codes.items()}, codes['IS456'][1])
+        cover = _lookup(standard, {k: v[2] for k, v in codes.items()}, codes['IS456'][2])
+        min_steel_pct = _lookup(standard, {k: v[3] for k, v in codes.items()}, codes['IS456'][3])
+        max_steel_pct = _lookup(standard, {k: v[4] for k, v in codes.items()}, codes['IS456'][4])
+
+        reaction = (w * length) / 2
+        max_moment = (w * length ** 2) / 8
+        max_shear = (w * length) / 2
+
+        effective_depth = beam_depth - (cover + 10)
+        section = beam_width * effective_depth
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            Mu = max_moment * 1.5 * 1e6
+            Ru = Mu / (beam_width * effective_depth ** 2)
+            percent_steel = (50 * fck / fy) * (1 - np.sqrt(1 - (4.6 * Ru / fck)))
+            failed = np.isnan(percent_steel)
+            Ast = (percent_steel * section) / 100
+
+            min_steel = (min_steel_pct / 100) * section
+            max_steel = (max_steel_pct / 100) * section
+            required_steel = np.maximum(Ast, min_steel)
+
+            bar_dia = 20
+            bar_area = math.pi * (bar_dia / 2) ** 2
+            num_bars = np.ceil(required_steel / bar_area)
+            provided_steel = num_bars * bar_area
+            actual_percent = (provided_steel / section) * 100
+
+            Vu = max_shear * 1.5
+            tauV = (Vu * 1000) / section
+
+            beta = 0.8 * fck / (6.89 * actual_percent)
+            tauC = np.select(
+                [standard == 'IS456', standard == 'ACI318'],
+                [0.85 * np.sqrt(0.8 * fck) * (np.sqrt(1 + 5 * beta) - 1) / 6, 0.17 * np.sqrt(fck)],
+                0.12 * np.sqrt(fck)
+            )
+            spacing_calc = np.floor((0.87 * fy * (2 * math.pi * (8 / 2) ** 2) * effective_depth) / ((tauV - tauC) * beam_width))
+
+        rows = np.broadcast_arrays(tauV > tauC, spacing_calc, effective_depth, num_bars, beam_width, beam_depth, fck, fy, failed)
+        stirrups, num_bars_list, beam_size, grades = [], [], [], []
+        for needs, spacing, d, bars, b, h, c, s, bad in zip(*(r.tolist() for r in rows)):
+            if needs and not bad and math.isfinite(spacing):
+                stirrup_spacing = min(int(spacing), min(0.75 * _fmt(d), 300))
+                stirrups.append(f'2-legged 8mm ø @ {stirrup_spacing} mm c/c')
+            else:
+                stirrups.append('None - concrete shear capacity sufficient')
+            num_bars_list.append(f"{0 if bad else int(bars)} bars of {bar_dia}mm ø")
+            beam_size.append(f"{_fmt(b)} × {_fmt(h)} mm")
+            grades.append((f"M{_fmt(c)}", f"Fe {_fmt(s)}"))
+
+        results = {
+            "design_code": np.char.add(np.char.add(name.astype(str), '-'), reference.astype(str)),
+            "reactions": np.round(reaction, 2),
+            "max_moment": np.round(max_moment, 2),
+            "max_shear": np.round(max_shear, 2),
+            "effective_depth": effective_depth,
+            "cover_provided": cover,
+            "concrete_grade": np.array([g[0] for g in grades], dtype=object),
+            "steel_grade": np.array([g[1] for g in grades], dtype=object),
+            "required_steel": np.round(required_steel, 0),
+            "min_steel_required": np.round(min_steel, 0),
+            "max_steel_allowed": np.round(max_steel, 0),
+            "reinforcement": np.array(num_bars_list, dtype=object),
+            "actual_steel_provided": np.round(provided_steel, 0),
+            "steel_percentage": np.round(actual_percent, 2),
+            "steel_compliance": required_steel <= max_steel,
+            "shear_stress": np.round(tauV, 3),
+            "concrete_shear_capacity": np.round(tauC, 3),
+            "stirrups": np.array(stirrups, dtype=object),
+            "beam_size": np.array(beam_size, dtype=object)
+        }
+        return _finish(results, name, n, failed, "math domain error")
+
+    @staticmethod
+    def column_design(axial_load, unsupported_length=3000, concrete_grade=25, steel_grade=415, end_condition='bothFixed', design_code='IS456', n: int = 1):
+        """Vectorized column_design"""
+        axial_load = np.asarray(axial_load, dtype=float)
+        unsupported_length = np.asarray(unsupported_length, dtype=float)
+        fck = np.asarray(concrete_grade, dtype=float)
+        fy = np.asarray(steel_grade, dtype=float)
+
+        codes = {
+            'IS456': (0.4, 0.67, 0.008, 0.04, 12),
+            'ACI318': (0.55, 0.52, 0.01, 0.08, 22),
+            'Eurocode': (0.35, 0.8, 0.002, 0.04, 15)
+        }
+        alpha = _lookup(design_code, {k: v[0] for k, v in codes.items()}, codes['IS456'][0])
+        gamma = _lookup(design_code, {k: v[1] for k, v in codes.items()}, codes['IS456'][1])
+        min_steel = _lookup(design_code, {k: v[2] for k, v in codes.items()}, codes['IS456'][2])
+        slenderness_limit = _lookup(design_code, {k: v[4] for k, v in codes.items()}, codes['IS456'][4])
+
+        Pu = axial_load * 1.5
+        k = _lookup(end_condition, {'bothFixed': 0.65, 'oneFixed': 0.80, 'bothPinned': 1.0, 'cantilever': 2.0}, 1.0)
+        effective_length = unsupported_length * k
+
+        steel_ratio = 0.015
+        required_area = (Pu * 1000) / (alpha * fck + gamma * fy * steel_ratio)
+        column_size = np.ceil(np.sqrt(required_area) / 50) * 50
+
+        slenderness_ratio = effective_length / column_size
+        actual_area = column_size * column_size
+        steel_area = np.maximum(min_steel * actual_area, steel_ratio * actual_area)
+
+        bar_dia = np.where(column_size <= 300, 16, 20)
+        bar_area = np.pi * (bar_dia / 2) ** 2
+        num_bars = np.maximum(4, np.ceil(steel_area / bar_area))
+        tie_spacing = np.minimum(np.minimum(column_size, 16 * bar_dia), 300)
+        tie_dia = np.maximum(6, bar_dia / 4)
+
+        provided_capacity = alpha * fck * (actual_area - steel_area) + gamma * fy * steel_area
+
+        rows = np.broadcast_arrays(column_size, num_bars, bar_dia, tie_dia, tie_spacing)
+        sizes, reinforcement, ties = [], [], []
+        for size, bars, dia, tdia, spacing in zip(*(r.tolist() for r in rows)):
+            sizes.append(f"{int(size)} × {int(size)} mm")
+            reinforcement.append(f"{int(bars)} bars of {int(dia)}mm ø")
+            ties.append(f"{_fmt(tdia)}mm ø @ {_fmt(spacing)}mm c/c")
+
+        results = {
+            "design_standard": np.asarray(design_code),
+            "column_size": np.array(sizes, dtype=object),
+            "effective_length": effective_length,
+            "slenderness_ratio": np.round(slenderness_ratio, 2),
+            "column_type": np.where(slenderness_ratio <= slenderness_limit, "Short Column", "Slender Column"),
+            "reinforcement": np.array(reinforcement, dtype=object),
+            "steel_provided": np.round(num_bars * bar_area, 0),
+            "steel_percentage": np.round((steel_area / actual_area) * 100, 2),
+            "ties": np.array(ties, dtype=object),
+            "design_capacity": np.round(provided_capacity / 1000, 2)
+        }
+        return _finish(results, np.asarray(design_code), n)
+
+
+VECTORIZED_CALCULATORS: Dict[str, Callable] = {
+    "electrical_load_calculation": BatchCalculators.load_calculation,
+    "electrical_cable_sizing": BatchCalculators.cable_sizing,
+    "electrical_voltage_drop": BatchCalculators.voltage_drop,
+    "mechanical_pipe_friction": BatchCalculators.pipe_friction,
+    "mechanical_psychrometrics": BatchCalculators.psychrometrics,
+    "civil_beam_load": BatchCalculators.beam_load,
+    "civil_column_design": BatchCalculators.column_design,
+}
+
+
+def broadcast_inputs(inputs: Dict[str, Any]):
+    """
+    Turn columnar inputs into equal-length arrays; scalars broadcast to every row
+    """
+    lengths = {len(v) for v in inputs.values() if isinstance(v, (list, tuple))}
+    if len(lengths) > 1:
+        raise ValueError(f"Input columns have different lengths: {sorted(lengths)}")
+    n = lengths.pop() if lengths else 1
+
+    columns = {}
+    for key, value in inputs.items():
+        if isinstance(value, (list, tuple)):
+            columns[key] = np.asarray(value)
+        else:
+            columns[key] = np.full(n, value)
+    return columns, n
+
+
+def run_rows(method: Callable, columns: Dict[str, np.ndarray], n: int) -> Dict[str, Any]:
+    """
+    Fallback for calculators without a vectorized implementation: call the scalar method per row
+    """
+    rows = [method(**{k: v[i].item() for k, v in columns.items()}) for i in range(n)]
+    results = {}
+    for i, row in enumerate(rows):
+        for key, value in row.get("results", {}).items():
+            results.setdefault(key, [None] * n)[i] = value
+
+    return {
+        "results": results,
+        "compliance": [row.get("compliance") for row in rows],
+        "row_success": [row["success"] for row in rows],
+        "errors": [row.get("error") for row in rows],
+        "count": n,
+        "success": True
+    }
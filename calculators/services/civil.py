@@ -1,3 +1,12 @@
+from typing import Dict, Any, List, Optional, Union
+
+from calculators.services.bar_schedule import bar_schedule
+from calculators.services.column_interaction import column_interaction
+from calculators.services.earthworks import earthworks
+from calculators.services.frame_analysis import continuous_beam, frame_analysis
+from calculators.services.load_combinations import load_combinations
+
+
 class CivilCalculators:
     @staticmethod
     def concrete_volume(length: float, width: float, depth: float):
@@ -254,6 +263,16 @@ class CivilCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def column_interaction(columns: List[Dict[str, Any]], sections: Dict[str, Dict[str, Any]], concrete_grade: float = 25, steel_grade: float = 415, design_code: str = 'IS456', combination_names: Optional[List[str]] = None, include_diagrams: bool = False):
+        """Check columns against the biaxial P-M interaction surfaces of their section types for every load combination"""
+        try:
+            results = column_interaction(columns, sections, concrete_grade, steel_grade, design_code, combination_names, include_diagrams=include_diagrams)
+            compliance = {'IS456': "IS 456:2000 cl. 39.6", 'ACI318': "ACI 318-19 §22.4", 'Eurocode': "EN 1992-1-1 §6.1"}[design_code]
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def earthwork_volume(length: float, width: float, depth1: float, depth2: float):
         """Calculate earthwork volume with swelling factor"""
@@ -273,6 +292,16 @@ class CivilCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def earthwork_grid(survey_points: List[List[float]], design_levels: Union[float, Dict[str, Any], List[List[float]]], cell_size: float = 1.0, method: str = 'grid', bulking_factor: float = 1.25, shrink_factor: float = 0.9, include_heatmap: bool = False):
+        """Calculate cut/fill volumes of survey points against a design level, plane or surface by triangular prisms"""
+        try:
+            results = earthworks(survey_points, design_levels, cell_size, method, bulking_factor, shrink_factor, include_heatmap)
+            compliance = "IS 1200 (Part 1)"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def retaining_wall_pressure(height: float, soil_density: float = 18, friction_angle: float = 30):
         """Calculate retaining wall earth pressure"""
@@ -345,6 +374,16 @@ class CivilCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def load_combinations(load_cases: Dict[str, List[Any]], code: str = 'ASCE7', combinations: Optional[Dict[str, Dict[str, float]]] = None, case_types: Optional[Dict[str, str]] = None, member_ids: Optional[List[Any]] = None, outputs: Optional[List[str]] = None, capacities: Optional[Union[float, List[Any]]] = None, include_members: bool = True):
+        """Combine basic load case effects with code factors and report envelopes and governing combinations"""
+        try:
+            results = load_combinations(load_cases, code, combinations, case_types, member_ids, outputs, capacities, include_members)
+            compliance = {'ASCE7': "ASCE 7-16 §2.3.1", 'EN1990': "EN 1990:2002 eq. 6.10", 'IS875': "IS 875 (Part 5):1987"}.get(results["code"], "User-defined combinations")
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def pile_foundation(load: float, soil_capacity: float, pile_diameter: float = 0.5, pile_length: float = 10):
         """Calculate pile foundation requirements"""
@@ -407,6 +446,37 @@ class CivilCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def frame_analysis(nodes: List[Dict[str, Any]], members: List[Dict[str, Any]], load_cases: Dict[str, List[Dict[str, Any]]], combinations: Union[None, str, Dict[str, Dict[str, float]]] = None, material: str = 'steel', stations: int = 21, include_details: bool = True, include_diagrams: bool = False):
+        """Analyze a 2D frame by the direct stiffness method for every load case and combination"""
+        try:
+            results = frame_analysis(nodes, members, load_cases, combinations, material, stations, include_details, include_diagrams)
+            compliance = "Linear elastic first-order analysis"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
+    @staticmethod
+    def continuous_beam(spans: List[float], section: Dict[str, Any], dead_load: Union[float, List[float]] = 0, live_load: Union[float, List[float]] = 0, point_loads: Optional[List[Dict[str, Any]]] = None, supports: Optional[List[Any]] = None, material: str = 'steel', dead_factor: float = 1.0, live_factor: float = 1.0, pattern: bool = True, include_diagrams: bool = False):
+        """Analyze a multi-span beam with pattern live loading and report span and support envelopes"""
+        try:
+            results = continuous_beam(spans, dead_load, live_load, point_loads, supports, section, material, dead_factor, live_factor, pattern,
+                                      include_diagrams=include_diagrams)
+            compliance = "Linear elastic analysis with pattern loading (EN 1992-1-1 5.1.3)"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
+    @staticmethod
+    def bar_schedule(bars: List[Dict[str, Any]], stock_lengths: Optional[List[float]] = None, lap: float = 50, rounding: float = 10, include_rows: bool = True):
+        """Bar bending schedule of a project's bar list with stock-length cutting optimization"""
+        try:
+            results = bar_schedule(bars, stock_lengths or (12000,), lap, rounding, include_rows)
+            compliance = "IS 2502:1963"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def cantilever_beam(point_load: float, load_distance: float):
         """Calculate cantilever beam parameters"""
@@ -0,0 +1,333 @@
+"""
+Column Interaction
+P-M and biaxial P-Mx-My capacity surfaces of reinforced concrete columns. The section is cut into
+concrete fibres and bars, and the neutral axis is swept over an array of angles and depths at once
+with the code's rectangular stress block, so a whole surface is a handful of array reductions. The
+surface is resampled as moment capacity over an axial load x moment direction grid, every load
+combination of every column is checked along its ray from the origin in one vectorized bisection,
+and surfaces are cached by section signature so columns sharing a section type share the work.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+ES = 200000.0  # steel modulus (MPa)
+FIBRES = 40  # concrete fibres across each side of the section
+DEFAULT_ANGLES = 36  # neutral axis directions, a multiple of 4 so both principal axes are swept
+DEPTHS = 64  # neutral axis depths per direction
+LEVELS = 48  # axial load levels of the resampled surface
+DIRECTIONS = 72  # moment directions of the resampled surface
+BISECTIONS = 40
+SURFACE_CACHE_SIZE = 256
+SHAPES = ('rectangular', 'circular')
+TENSION_STRAIN_RANGE = 0.003  # ACI 318 transition from compression- to tension-controlled
+BAR_DIAMETERS = (12, 16, 20, 25, 32)  # mm
+
+# Rectangular stress block and strength factors for RC sections: block stress (x fck) over block depth (x neutral axis
+# depth, None for the ACI 318 beta1 rule), ultimate concrete strain, design steel stress (x fy), strain limit in pure
+# compression (None: steel yields), axial cap (x P0), strength reduction factors compression/tension-controlled,
+# and the longitudinal steel ratio limits
+COLUMN_DESIGN_CODES = {
+    'IS456': {'block_stress': 0.36 / 0.84, 'block_depth': 0.84, 'eps_cu': 0.0035, 'steel_factor': 0.87, 'eps_c0': 0.002,
+              'axial_cap': 0.9, 'phi_compression': 1.0, 'phi_tension': 1.0, 'min_steel': 0.008, 'max_steel': 0.04},
+    'ACI318': {'block_stress': 0.85, 'block_depth': None, 'eps_cu': 0.003, 'steel_factor': 1.0, 'eps_c0': None,
+               'axial_cap': 0.80, 'phi_compression': 0.65, 'phi_tension': 0.90, 'min_steel': 0.01, 'max_steel': 0.08},
+    'Eurocode': {'block_stress': 0.85 / 1.5, 'block_depth': 0.8, 'eps_cu': 0.0035, 'steel_factor': 1 / 1.15, 'eps_c0': 0.002,
+                 'axial_cap': 1.0, 'phi_compression': 1.0, 'phi_tension': 1.0, 'min_steel': 0.002, 'max_steel': 0.04},
+}
+
+
+def _bar_area(diameter: float) -> float:
+    return np.pi * diameter ** 2 / 4
+
+
+def _bars(section: Mapping[str, Any]) -> tuple:
+    """Bar (x, y, area) tuples in mm from the section centroid"""
+    bars = section.get('bars')
+    if not bars:
+        raise ValueError("The section needs reinforcement bars")
+    if isinstance(bars, (list, tuple)):
+        return tuple((float(bar['x']), float(bar['y']), _bar_area(float(bar['diameter']))) for bar in bars)
+    area = _bar_area(float(bars['diameter']))
+    cover = float(section.get('cover', 50))
+    if section['shape'] == 'circular':
+        count = int(bars.get('count', 6))
+        if count < 4:
+            raise ValueError("A circular column needs at least 4 bars")
+        radius = float(section['diameter']) / 2 - cover
+        angles = 2 * np.pi * np.arange(count) / count
+        return tuple((round(radius * np.cos(a), 3), round(radius * np.sin(a), 3), area) for a in angles)
+    along_b, along_h = int(bars.get('count_x', 2)), int(bars.get('count_y', 2))
+    if along_b < 2 or along_h < 2:
+        raise ValueError("A rectangular column needs at least 2 bars along each face (count_x, count_y)")
+    half_x, half_y = float(section['b']) / 2 - cover, float(section['h']) / 2 - cover
+    points = {(round(x, 3), round(y, 3)) for x in np.linspace(-half_x, half_x, along_b) for y in (-half_y, half_y)}
+    points |= {(round(x, 3), round(y, 3)) for y in np.linspace(-half_y, half_y, along_h) for x in (-half_x, half_x)}
+    return tuple((x, y, area) for x, y in sorted(points))
+
+
+def section_signature(section: Mapping[str, Any], fck: float, fy: float, code: str, angles: int = DEFAULT_ANGLES) -> tuple:
+    """
+    Hashable description of everything the capacity surface depends on.
+    section: {"shape": 'rectangular', "b", "h" (mm)} or {"shape": 'circular', "diameter" (mm)}, "cover" (edge to bar
+    centre, mm) and "bars": {"count_x", "count_y", "diameter"} (bars along the b and h faces, corners included),
+    {"count", "diameter"} for circular sections, or a list of {"x", "y", "diameter"} from the centroid
+    """
+    shape = section.get('shape', 'circular' if 'diameter' in section else 'rectangular')
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown section shape: {shape} (expected {', '.join(SHAPES)})")
+    if code not in COLUMN_DESIGN_CODES:
+        raise ValueError(f"Unknown design code: {code} (expected {', '.join(COLUMN_DESIGN_CODES)})")
+    if angles % 4 or angles < 4:
+        raise ValueError("The number of neutral axis angles must be a positive multiple of 4")
+    section = dict(section, shape=shape)
+    dims = (float(section['diameter']),) if shape == 'circular' else (float(section['b']), float(section['h']))
+    if min(dims) <= 0 or fck <= 0 or fy <= 0:
+        raise ValueError("Section dimensions and material strengths must be positive")
+    return (shape, dims, _bars(section), float(fck), float(fy), code, int(angles))
+
+
+class InteractionSurface:
+    """
+    Capacity surface of one section (kN, kN·m; compression positive, Mx with compression on the +y face, My on +x):
+    raw points P, Mx, My over (angles, depths), and the moment capacity grid over (LEVELS axial loads, DIRECTIONS)
+    """
+
+    def __init__(self, signature: tuple):
+        shape, dims, bars, fck, fy, code, angles = signature
+        factors = COLUMN_DESIGN_CODES[code]
+        self.signature = signature
+        self.code = code
+
+        # Concrete fibres and bars
+        if shape == 'circular':
+            radius = dims[0] / 2
+            grid = (np.arange(FIBRES) + 0.5) / FIBRES * 2 * radius - radius
+            x, y = (values.ravel() for values in np.meshgrid(grid, grid))
+            inside = np.hypot(x, y) <= radius
+            fibre_x, fibre_y = x[inside], y[inside]
+            fibre_area = np.full(len(fibre_x), np.pi * radius ** 2 / inside.sum())
+            self.gross_area = np.pi * radius ** 2
+        else:
+            b, h = dims
+            gx, gy = ((np.arange(FIBRES) + 0.5) / FIBRES - 0.5) * b, ((np.arange(FIBRES) + 0.5) / FIBRES - 0.5) * h
+            fibre_x, fibre_y = (values.ravel() for values in np.meshgrid(gx, gy))
+            fibre_area = np.full(len(fibre_x), b * h / FIBRES ** 2)
+            self.gross_area = b * h
+        bar_x, bar_y, bar_area = (np.array(values) for values in zip(*bars))
+        self.steel_area = float(bar_area.sum())
+        if self.steel_area >= self.gross_area:
+            raise ValueError("The reinforcement area exceeds the section area")
+
+        # Design stresses
+        concrete = factors['block_stress'] * fck
+        beta = factors['block_depth'] if factors['block_depth'] is not None else float(np.clip(0.85 - 0.05 * (fck - 28) / 7, 0.65, 0.85))
+        steel = factors['steel_factor'] * fy
+        eps_cu, phi_c, phi_t = factors['eps_cu'], factors['phi_compression'], factors['phi_tension']
+
+        # Neutral axis sweep: compression towards direction theta, depth c from the extreme compression fibre
+        theta = 2 * np.pi * np.arange(angles) / angles
+        u = np.stack([np.cos(theta), np.sin(theta)])
+        extent = np.full(angles, dims[0] / 2) if shape == 'circular' else (np.abs(u[0]) * dims[0] + np.abs(u[1]) * dims[1]) / 2
+        ratios = np.concatenate([np.geomspace(0.01, 0.2, DEPTHS // 4, endpoint=False), np.linspace(0.2, 1.25, DEPTHS // 2, endpoint=False),
+                                 np.geomspace(1.25, 20, DEPTHS - DEPTHS // 4 - DEPTHS // 2)])
+        c = 2 * extent[:, None] * ratios[None, :]  # (angles, depths)
+
+        fibre_depth = extent[None, :] - np.column_stack([fibre_x, fibre_y]) @ u  # (fibres, angles)
+        block = (fibre_depth[:, :, None] <= beta * c[None]).astype(float)
+        concrete_force = concrete * np.einsum('f,fkj->kj', fibre_area, block)
+        concrete_mx = concrete * np.einsum('f,fkj->kj', fibre_area * fibre_y, block)
+        concrete_my = concrete * np.einsum('f,fkj->kj', fibre_area * fibre_x, block)
+
+        bar_depth = extent[None, :] - np.column_stack([bar_x, bar_y]) @ u  # (bars, angles)
+        strain = eps_cu * (c[None] - bar_depth[:, :, None]) / c[None]
+        stress = np.clip(ES * strain, -steel, steel) - concrete * (bar_depth[:, :, None] <= beta * c[None])
+        force = stress * bar_area[:, None, None]
+        axial = concrete_force + force.sum(axis=0)
+        mx = concrete_mx + np.einsum('b,bkj->kj', bar_y, force)
+        my = concrete_my + np.einsum('b,bkj->kj', bar_x, force)
+
+        # Strength reduction from the strain in the extreme tension bar
+        tension = eps_cu * (bar_depth.max(axis=0)[:, None] - c) / c
+        phi = np.clip(phi_c + (phi_t - phi_c) * (tension - steel / ES) / TENSION_STRAIN_RANGE, phi_c, phi_t)
+
+        squash = concrete * (self.gross_area - self.steel_area) + min(steel, ES * (factors['eps_c0'] or np.inf)) * self.steel_area
+        self.P0 = squash / 1e3
+        self.Pmax = factors['axial_cap'] * phi_c * self.P0
+        self.Pt = -phi_t * steel * self.steel_area / 1e3
+        self.P = np.minimum(phi * axial / 1e3, self.Pmax)
+        self.Mx, self.My = phi * mx / 1e6, phi * my / 1e6
+        self._resample()
+
+    def _resample(self):
+        """Moment capacity over a regular (axial load, moment direction) grid"""
+        self.levels = np.linspace(self.Pt, self.Pmax, LEVELS)
+        self.directions = np.linspace(-np.pi, np.pi, DIRECTIONS, endpoint=False)
+        capacity = np.zeros((LEVELS, DIRECTIONS))
+        contour_x, contour_y = np.empty((len(self.P), LEVELS)), np.empty((len(self.P), LEVELS))
+        for k in range(len(self.P)):
+            # Axial load rises with the neutral axis depth; past the axial cap only the first capped point bounds the surface
+            keep = np.arange(len(self.P[k])) <= np.argmax(self.P[k] >= self.Pmax) if np.any(self.P[k] >= self.Pmax) else slice(None)
+            axial = np.maximum.accumulate(np.concatenate([[self.Pt], self.P[k][keep]]))
+            contour_x[k] = np.interp(self.levels, axial, np.concatenate([[0.0], self.Mx[k][keep]]))
+            contour_y[k] = np.interp(self.levels, axial, np.concatenate([[0.0], self.My[k][keep]]))
+        for level in range(1, LEVELS):
+            direction = np.arctan2(contour_y[:, level], contour_x[:, level])
+            radius = np.hypot(contour_x[:, level], contour_y[:, level])
+            order = np.argsort(direction)
+            capacity[level] = np.interp(self.directions, direction[order], radius[order], period=2 * np.pi)
+        self.capacity = capacity
+        self.max_moment = float(capacity.max())
+
+    def moment_capacity(self, axial: np.ndarray, direction: np.ndarray) -> np.ndarray:
+        """Moment capacity (kN·m) at axial loads and moment directions (rad), -1 outside the axial range"""
+        position = (axial - self.Pt) / (self.Pmax - self.Pt) * (LEVELS - 1)
+        inside = (position >= 0) & (position <= LEVELS - 1)
+        row = np.clip(np.floor(position).astype(int), 0, LEVELS - 2)
+        t = np.clip(position - row, 0, 1)
+        column = (direction + np.pi) / (2 * np.pi) * DIRECTIONS
+        left = np.floor(column).astype(int) % DIRECTIONS
+        right, s = (left + 1) % DIRECTIONS, column - np.floor(column)
+        grid = self.capacity
+        value = ((1 - t) * ((1 - s) * grid[row, left] + s * grid[row, right])
+                 + t * ((1 - s) * grid[row + 1, left] + s * grid[row + 1, right]))
+        return np.where(inside, value, -1.0)
+
+    def utilization(self, axial, mx, my) -> np.ndarray:
+        """Demand over capacity along the ray from the origin through each (P, Mx, My) demand"""
+        axial, mx, my = np.broadcast_arrays(*(np.asarray(values, dtype=float) for values in (axial, mx, my)))
+        moment, direction = np.hypot(mx, my), np.arctan2(my, mx)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = np.stack([np.where(axial > 0, self.Pmax / axial, np.inf), np.where(axial < 0, self.Pt / axial, np.inf),
+                               np.where(moment > 0, self.max_moment / moment, np.inf)])
+        low, high = np.zeros(axial.shape), bounds.min(axis=0) * 1.001
+        if not np.all(np.isfinite(high[(moment > 0) | (axial != 0)])):
+            raise ValueError("Demands must be finite")
+        high = np.where(np.isfinite(high), high, 1.0)
+        for _ in range(BISECTIONS):
+            scale = (low + high) / 2
+            inside = scale * moment <= self.moment_capacity(scale * axial, direction)
+            low, high = np.where(inside, scale, low), np.where(inside, high, scale)
+        with np.errstate(divide='ignore'):
+            return np.where((moment > 0) | (axial != 0), 1 / low, 0.0)
+
+    def diagram(self, axis: str = 'x') -> Dict[str, List[float]]:
+        """Uniaxial P-M curve about the x or y axis, both bending senses, for plotting"""
+        angles = len(self.P)
+        rows = (angles // 4, 3 * angles // 4) if axis == 'x' else (0, angles // 2)
+        moment = self.Mx if axis == 'x' else self.My
+        first, second = rows
+        axial = np.concatenate([[self.Pt], self.P[first], self.P[second][::-1], [self.Pt]])
+        moments = np.concatenate([[0.0], moment[first], moment[second][::-1], [0.0]])
+        return {"P": np.round(axial, 2).tolist(), "M": np.round(moments, 2).tolist()}
+
+
+@lru_cache(maxsize=SURFACE_CACHE_SIZE)
+def _surface(signature: tuple) -> InteractionSurface:
+    return InteractionSurface(signature)
+
+
+def interaction_surface(section: Mapping[str, Any], fck: float = 25, fy: float = 415, code: str = 'IS456',
+                        angles: int = DEFAULT_ANGLES) -> InteractionSurface:
+    """
+    Capacity surface of a section, built once per section signature and then served from the cache
+    """
+    return _surface(section_signature(section, fck, fy, code, angles))
+
+
+def column_interaction(columns: Sequence[Dict[str, Any]], sections: Mapping[str, Mapping[str, Any]], fck: float = 25, fy: float = 415,
+                       code: str = 'IS456', combination_names: Optional[Sequence[str]] = None, angles: int = DEFAULT_ANGLES,
+                       include_diagrams: bool = False) -> Dict[str, Any]:
+    """
+    Check columns {"id", "section" (a key of sections), "P" (kN, compression positive), "Mx", "My" (kN·m), each a value or
+    one value per load combination} against the capacity surfaces of their section types. Sections may override fck
+    and fy. Every demand of every column sharing a section is checked in one vectorized pass.
+    """
+    if not columns:
+        raise ValueError("At least one column is required")
+    before = _surface.cache_info()
+    groups: Dict[str, List[int]] = {}
+    demands = []
+    for i, column in enumerate(columns):
+        if column.get('section') not in sections:
+            raise ValueError(f"Column {column.get('id', i)}: unknown section type {column.get('section')}")
+        axial, mx, my = np.broadcast_arrays(*(np.atleast_1d(np.asarray(column.get(key, 0), dtype=float)) for key in ('P', 'Mx', 'My')))
+        if combination_names is not None and len(axial) != len(combination_names):
+            raise ValueError(f"Column {column.get('id', i)} needs one demand per combination ({len(combination_names)})")
+        demands.append((axial, mx, my))
+        groups.setdefault(column['section'], []).append(i)
+
+    utilization: List[np.ndarray] = [np.empty(0)] * len(columns)
+    section_results = {}
+    for name, members in groups.items():
+        section = sections[name]
+        surface = interaction_surface(section, section.get('fck', fck), section.get('fy', fy), section.get('code', code), angles)
+        counts = [len(demands[i][0]) for i in members]
+        ratios = surface.utilization(*(np.concatenate([demands[i][k] for i in members]) for k in range(3)))
+        for i, part in zip(members, np.split(ratios, np.cumsum(counts)[:-1])):
+            utilization[i] = part
+        section_results[name] = {
+            "columns": len(members), "code": surface.code,
+            "steel_ratio": round(surface.steel_area / surface.gross_area * 100, 3),
+            "P0": round(surface.P0, 2), "Pmax": round(surface.Pmax, 2), "Pt": round(surface.Pt, 2),
+            "max_moment": round(surface.max_moment, 2),
+        }
+        if include_diagrams:
+            section_results[name]["diagram_x"] = surface.diagram('x')
+            section_results[name]["diagram_y"] = surface.diagram('y')
+
+    column_results = []
+    for i, column in enumerate(columns):
+        ratios, (axial, mx, my) = utilization[i], demands[i]
+        worst = int(np.argmax(ratios))
+        column_results.append({
+            "id": column.get('id', i), "section": column['section'],
+            "utilization": round(float(ratios[worst]), 4),
+            "governing_combination": combination_names[worst] if combination_names is not None else worst,
+            "P": round(float(axial[worst]), 2), "Mx": round(float(mx[worst]), 2), "My": round(float(my[worst]), 2),
+            "status": "PASS" if ratios[worst] <= 1 else "FAIL",
+        })
+    after = _surface.cache_info()
+    return {
+        "columns": column_results,
+        "sections": section_results,
+        "max_utilization": max(result["utilization"] for result in column_results),
+        "failing_columns": [result["id"] for result in column_results if result["status"] == "FAIL"],
+        "surfaces_built": after.misses - before.misses,
+        "surfaces_cached": after.currsize,
+    }
+
+
+def select_reinforcement(section: Mapping[str, Any], axial, mx=0.0, my=0.0, fck: float = 25, fy: float = 415, code: str = 'IS456',
+                         diameters: Sequence[float] = BAR_DIAMETERS, max_per_face: int = 6) -> Dict[str, Any]:
+    """
+    Lightest perimeter bar layout of a section (b, h or diameter, cover) that carries every (P, Mx, My) demand and
+    meets the code's steel ratio limits; candidate surfaces are cached like any other section
+    """
+    limits = COLUMN_DESIGN_CODES.get(code)
+    if limits is None:
+        raise ValueError(f"Unknown design code: {code} (expected {', '.join(COLUMN_DESIGN_CODES)})")
+    circular = section.get('shape', 'circular' if 'diameter' in section else 'rectangular') == 'circular'
+    gross = np.pi * float(section['diameter']) ** 2 / 4 if circular else float(section['b']) * float(section['h'])
+    candidates = []
+    for diameter in diameters:
+        for count in range(2, max_per_face + 1):
+            if circular:
+                bars = {"count": 2 * count + 2, "diameter": diameter}
+                total = 2 * count + 2
+            else:
+                along_h = max(2, int(round(count * float(section['h']) / float(section['b']))))
+                bars = {"count_x": count, "count_y": along_h, "diameter": diameter}
+                total = 2 * count + 2 * along_h - 4
+            area = total * _bar_area(diameter)
+            if limits['min_steel'] * gross <= area <= limits['max_steel'] * gross:
+                candidates.append((area, total, bars))
+    for area, total, bars in sorted(candidates, key=lambda candidate: candidate[0]):
+        surface = interaction_surface(dict(section, bars=bars), fck, fy, code)
+        ratio = float(surface.utilization(axial, mx, my).max())
+        if ratio <= 1:
+            return {"bars": bars, "bar_count": total, "bar_diameter": bars['diameter'], "steel_area": round(area, 1),
+                    "steel_ratio": round(area / gross, 5), "utilization": round(ratio, 4)}
+    raise ValueError("No bar layout within the code's steel limits carries the demands: enlarge the section")
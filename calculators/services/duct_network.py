@@ -0,0 +1,217 @@
+"""
+Duct Network
+Supply duct trees sized and analysed as flat arrays. Segments are ordered into levels by a
+breadth-first (topological) sweep from the fan; airflows accumulate level by level from the
+terminals; every segment is sized by equal friction in one vectorized pass, or by static
+regain level by level (each level depends only on its parents). Cumulative losses down the
+levels give the index (critical) path that sets the fan pressure.
+"""
+
+import math
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from calculators.services.equipment_data import DUCT_FITTINGS, DUCT_MATERIALS, DUCT_ROUND_SIZES
+from calculators.services.pipe_network import fittings_k, friction_factor
+
+AIR_GAS_CONSTANT = 287.05  # J/(kg·K)
+RECTANGULAR_STEP = 50  # mm, rectangular sides are rounded up to this module
+SIZING_ITERATIONS = 6  # friction-factor updates of the equal-friction diameter
+REGAIN_BISECTIONS = 30
+
+
+def air_properties(temperature: float = 20, altitude: float = 0) -> Dict[str, float]:
+    """
+    Density (kg/m³) and kinematic viscosity (m²/s) of dry air at temperature (°C) and altitude (m)
+    """
+    kelvin = temperature + 273.15
+    pressure = 101325 * (1 - 2.25577e-5 * altitude) ** 5.25588
+    density = pressure / (AIR_GAS_CONSTANT * kelvin)
+    dynamic = 1.458e-6 * kelvin ** 1.5 / (kelvin + 110.4)  # Sutherland
+    return {"density": density, "viscosity": dynamic / density}
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, stop) for every pair"""
+    lengths = stops - starts
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+
+def tree_levels(parent: np.ndarray) -> List[np.ndarray]:
+    """
+    Breadth-first levels of a forest given parent indices (-1 at roots): level k holds the segments k steps from the fan
+    """
+    count = len(parent)
+    order = np.argsort(parent, kind="stable")
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(parent + 1, minlength=count + 1))])
+    levels, frontier, visited = [], order[indptr[0]:indptr[1]], 0
+    while len(frontier):
+        levels.append(frontier)
+        visited += len(frontier)
+        frontier = order[_ranges(indptr[frontier + 1], indptr[frontier + 2])]
+    if visited != count:
+        raise ValueError("Duct segments form a loop; a supply network must be a tree")
+    return levels
+
+
+def equal_friction_diameter(flow: np.ndarray, friction_rate: float, density: float, viscosity: float, roughness: float) -> np.ndarray:
+    """
+    Round duct diameters (m) whose friction loss is friction_rate (Pa/m) at flow (m³/s): R = f ρ 8Q² / (π² D⁵)
+    """
+    f = np.full(len(flow), 0.02)
+    for _ in range(SIZING_ITERATIONS):
+        diameter = (8 * f * density * flow ** 2 / (math.pi ** 2 * friction_rate)) ** 0.2
+        reynolds = 4 * flow / (math.pi * diameter * viscosity)
+        f = friction_factor(reynolds, roughness / diameter)
+    return diameter
+
+
+def standard_size(diameter: np.ndarray, shape: str, aspect_ratio: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Round up to the EN 1506 diameters or to rectangular sides in RECTANGULAR_STEP. Returns the
+    friction-equivalent diameter (m), the flow area (m²), and width and height (mm; equal to the diameter for round ducts).
+    """
+    mm = diameter * 1000
+    if shape == 'round':
+        sizes = np.asarray(DUCT_ROUND_SIZES.keys, dtype=float)
+        index = np.searchsorted(sizes, mm - 1e-9)
+        size = np.where(index < len(sizes), sizes[np.minimum(index, len(sizes) - 1)], np.ceil(mm / 100) * 100)
+        return size / 1000, math.pi * (size / 1000) ** 2 / 4, size, size
+    # Huebscher De = 1.30 (ab)^0.625 / (a + b)^0.25 with a = r b, solved for the short side b
+    height = np.ceil(mm * (aspect_ratio + 1) ** 0.25 / (1.30 * aspect_ratio ** 0.625) / RECTANGULAR_STEP) * RECTANGULAR_STEP
+    width = np.ceil(aspect_ratio * height / RECTANGULAR_STEP) * RECTANGULAR_STEP
+    equivalent = 1.30 * (width * height) ** 0.625 / (width + height) ** 0.25
+    return equivalent / 1000, width * height / 1e6, width, height
+
+
+class DuctTree:
+    """Supply duct tree as flat arrays: parent index, level order, segment data and accumulated airflow"""
+
+    def __init__(self, segments: List[Dict[str, Any]], terminal_pressure: float = 0.0):
+        if not segments:
+            raise ValueError("The duct network needs at least one segment")
+        self.ids = [segment["id"] for segment in segments]
+        index = {segment_id: i for i, segment_id in enumerate(self.ids)}
+        if len(index) != len(segments):
+            raise ValueError("Segment ids must be unique")
+        try:
+            self.parent = np.array([-1 if segment.get("parent") is None else index[segment["parent"]] for segment in segments])
+        except KeyError as e:
+            raise ValueError(f"Segment parent {e.args[0]} does not exist")
+        self.levels = tree_levels(self.parent)
+
+        self.length = np.array([float(segment.get("length", 0)) for segment in segments])
+        own = np.array([float(segment.get("airflow", 0)) for segment in segments]) / 3600
+        self.coefficient = np.array([fittings_k(segment.get("fittings"), DUCT_FITTINGS) for segment in segments])
+        if np.any(self.length < 0) or np.any(own < 0):
+            raise ValueError("Segment lengths and airflows cannot be negative")
+        self.terminal = np.bincount(self.parent[self.parent >= 0], minlength=len(segments)) == 0
+        if np.any(own[self.terminal] <= 0):
+            missing = [self.ids[i] for i in np.flatnonzero(self.terminal & (own <= 0))[:5]]
+            raise ValueError(f"Terminal segments need a positive airflow: {', '.join(map(str, missing))}")
+        self.terminal_pressure = np.where(
+            self.terminal, [float(segment.get("terminal_pressure", terminal_pressure)) for segment in segments], 0.0)
+
+        # Airflow of every segment: its own outlet plus everything downstream, deepest level first
+        self.flow = own.copy()
+        for level in reversed(self.levels[1:]):
+            np.add.at(self.flow, self.parent[level], self.flow[level])
+
+    def path(self, segment: int) -> List[Any]:
+        """Segment ids from the fan down to segment"""
+        chain = []
+        while segment >= 0:
+            chain.append(self.ids[segment])
+            segment = self.parent[segment]
+        return chain[::-1]
+
+
+def duct_network(segments: List[Dict[str, Any]], method: str = 'equal_friction', friction_rate: float = 1.0,
+                 max_velocity: float = 10.0, min_velocity: float = 2.0, shape: str = 'round', aspect_ratio: float = 2.0, material: str = 'galvanized',
+                 regain_coefficient: float = 0.75, terminal_pressure: float = 25.0, air_temperature: float = 20,
+                 altitude: float = 0, include_details: bool = True) -> Dict[str, Any]:
+    """
+    Size a supply duct tree and find its index path.
+    segments: {"id", "parent" (upstream segment id, None at the fan), "length" (m), "airflow" (m³/h supplied at
+               the segment's end, required on terminals), "fittings" (C, fitting names or {fitting: count}),
+               optional "terminal_pressure" (Pa, diffuser or terminal unit loss)}
+    Equal friction sizes for friction_rate (Pa/m) within max_velocity (m/s). Static regain sizes the
+    first segments the same way, then each branch so the regained velocity pressure offsets its loss, never
+    slower than min_velocity (m/s) so long trunks do not grow without bound.
+    """
+    if method not in ('equal_friction', 'static_regain'):
+        raise ValueError("Method must be 'equal_friction' or 'static_regain'")
+    if shape not in ('round', 'rectangular'):
+        raise ValueError("Shape must be 'round' or 'rectangular'")
+    if material not in DUCT_MATERIALS:
+        raise ValueError(f"Unknown duct material: {material} (expected {', '.join(DUCT_MATERIALS)})")
+    if friction_rate <= 0 or not 0 < min_velocity < max_velocity or aspect_ratio < 1:
+        raise ValueError("Friction rate must be positive, 0 < min_velocity < max_velocity and the aspect ratio at least 1")
+    tree = DuctTree(segments, terminal_pressure)
+    air = air_properties(air_temperature, altitude)
+    rho, nu, roughness = air["density"], air["viscosity"], DUCT_MATERIALS[material] / 1000
+    flow = tree.flow
+
+    velocity_diameter = np.sqrt(4 * flow / (math.pi * max_velocity))
+    required = np.maximum(equal_friction_diameter(flow, friction_rate, rho, nu, roughness), velocity_diameter)
+    equivalent, area, width, height = standard_size(required, shape, aspect_ratio)
+
+    if method == 'static_regain':
+        for level in tree.levels[1:]:
+            q, length, coefficient = flow[level], tree.length[level], tree.coefficient[level]
+            upstream = flow[tree.parent[level]] / area[tree.parent[level]]
+            # Bisection in log D between V = V_upstream (all loss, no regain) and V = min_velocity
+            high = np.log(np.sqrt(4 * q / (math.pi * min_velocity)))
+            low = np.minimum(np.log(np.sqrt(4 * q / (math.pi * upstream))), high)
+            for _ in range(REGAIN_BISECTIONS):
+                diameter = np.exp(0.5 * (low + high))
+                velocity = 4 * q / (math.pi * diameter ** 2)
+                f = friction_factor(velocity * diameter / nu, roughness / diameter, iterations=2)
+                surplus = regain_coefficient * (upstream ** 2 - velocity ** 2) - (f * length / diameter + coefficient) * velocity ** 2
+                low, high = np.where(surplus < 0, 0.5 * (low + high), low), np.where(surplus < 0, high, 0.5 * (low + high))
+            sized = standard_size(np.exp(high), shape, aspect_ratio)
+            for target, values in zip((equivalent, area, width, height), sized):
+                target[level] = values
+
+    # Friction on the friction-equivalent round duct, fitting losses on the actual velocity pressure
+    round_velocity = 4 * flow / (math.pi * equivalent ** 2)
+    f = friction_factor(round_velocity * equivalent / nu, roughness / equivalent)
+    friction = f / equivalent * rho * round_velocity ** 2 / 2
+    velocity = flow / area
+    loss = friction * tree.length + tree.coefficient * rho * velocity ** 2 / 2 + tree.terminal_pressure
+
+    cumulative = loss.copy()
+    for level in tree.levels[1:]:
+        cumulative[level] += cumulative[tree.parent[level]]
+    terminals = np.flatnonzero(tree.terminal)
+    critical = int(terminals[np.argmax(cumulative[terminals])])
+    fan_pressure = float(cumulative[critical])
+    excess = fan_pressure - cumulative[terminals]
+    perimeter = np.pi * width / 1000 if shape == 'round' else 2 * (width + height) / 1000
+
+    results = {
+        "method": method,
+        "segments": len(segments),
+        "terminals": len(terminals),
+        "levels": len(tree.levels),
+        "total_airflow": round(float(flow[tree.levels[0]].sum() * 3600), 1),
+        "fan_pressure": round(fan_pressure, 1),
+        "critical_terminal": tree.ids[critical],
+        "critical_path": tree.path(critical),
+        "max_velocity": round(float(velocity.max()), 2),
+        "max_friction_rate": round(float(friction.max()), 3),
+        "max_excess_pressure": round(float(excess.max()), 1),
+        "duct_surface_area": round(float((perimeter * tree.length).sum()), 1),
+        "air_density": round(rho, 4),
+    }
+    if include_details:
+        sizes = [f"Ø{w:.0f}" for w in width] if shape == 'round' else [f"{w:.0f}x{h:.0f}" for w, h in zip(width, height)]
+        results["segment_results"] = [
+            {"id": segment_id, "airflow": round(float(q * 3600), 1), "size": size, "velocity": round(float(v), 2),
+             "friction_rate": round(float(r), 3), "loss": round(float(dp), 2), "cumulative": round(float(total), 2)}
+            for segment_id, q, size, v, r, dp, total in zip(tree.ids, flow, sizes, velocity, friction, loss, cumulative)
+        ]
+        results["terminal_excess"] = {tree.ids[i]: round(float(e), 1) for i, e in zip(terminals, excess)}
+    return results
@@ -0,0 +1,274 @@
+"""
+Earthing Grid
+IEEE 80 substation earthing grid analysis in uniform soil. Grid conductors and rods are
+split into segments carrying uniform leakage current; the mutual-resistance matrix
+(line-source potentials plus images in the soil surface) is solved for an equipotential
+grid, giving the grid resistance and GPR. Surface potentials over a mesh then give touch
+and step voltages, checked against the IEEE 80 tolerable limits.
+"""
+
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from scipy.linalg import solve
+
+from calculators.services.equipment_data import EARTHING_MATERIALS
+
+ROW_BLOCK = 512  # matrix rows / surface points broadcast against all segments at once
+MAP_POINTS = 10000  # surface mesh size when no map spacing is given (spacing never below 1 m)
+STEP_CANDIDATES = 16  # steepest mesh points re-sampled on a 0.25 m patch for the step voltage
+EARTHING_SIZES = (16, 25, 35, 50, 70, 95, 120, 150, 185, 240, 300, 400, 500)  # mm²
+BODY_CONSTANTS = {50: 0.116, 70: 0.157}  # IEEE 80 eq. 29/30 body-current constants
+IMAGE = np.array([1.0, 1.0, -1.0])  # reflection in the soil surface (z = depth, positive down)
+
+
+def grid_conductors(length: float, width: float, along_length: int, along_width: int, depth: float = 0.5,
+                    rod_count: int = 0, rod_length: float = 3.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rectangular grid: along_length conductors parallel to x, along_width parallel to y, and rods spread
+    evenly over the perimeter nodes. Returns start and end points (x, y, depth) and a rod mask.
+    """
+    if along_length < 2 or along_width < 2:
+        raise ValueError("A grid needs at least two conductors in each direction")
+    xs, ys = np.linspace(0, length, along_width), np.linspace(0, width, along_length)
+    starts = [(0.0, y, depth) for y in ys] + [(x, 0.0, depth) for x in xs]
+    ends = [(length, y, depth) for y in ys] + [(x, width, depth) for x in xs]
+
+    # Perimeter nodes in order around the grid
+    perimeter = ([(x, 0.0) for x in xs[:-1]] + [(length, y) for y in ys[:-1]]
+                 + [(x, width) for x in xs[:0:-1]] + [(0.0, y) for y in ys[:0:-1]])
+    rods = min(rod_count, len(perimeter))
+    for index in np.linspace(0, len(perimeter), rods, endpoint=False).astype(int):
+        x, y = perimeter[index]
+        starts.append((x, y, depth))
+        ends.append((x, y, depth + rod_length))
+    is_rod = np.arange(len(starts)) >= along_length + along_width
+    return np.array(starts, dtype=float), np.array(ends, dtype=float), is_rod
+
+
+def split_at_crossings(starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, tolerance: float = 1e-6):
+    """
+    Split conductors where another conductor crosses or joins them, so junctions fall on segment ends
+    and no collocation point lies on another conductor
+    """
+    direction = ends - starts
+    offset = starts[:, None, :] - starts[None, :, :]
+    a = (direction ** 2).sum(axis=1)
+    b = direction @ direction.T
+    d = np.einsum("ik,ijk->ij", direction, offset)
+    e = np.einsum("jk,ijk->ij", direction, offset)
+    denominator = a[:, None] * a[None, :] - b ** 2
+    parallel = denominator <= 1e-12 * a[:, None] * a[None, :]
+    denominator = np.where(parallel, 1.0, denominator)
+    s = (b * e - a[None, :] * d) / denominator  # closest point on conductor i
+    t = (a[:, None] * e - b * d) / denominator  # closest point on conductor j
+    gap = np.linalg.norm(offset + s[..., None] * direction[:, None, :] - t[..., None] * direction[None, :, :], axis=2)
+    crossing = ~parallel & (gap < tolerance) & (s > 1e-9) & (s < 1 - 1e-9) & (t > -1e-9) & (t < 1 + 1e-9)
+    if not crossing.any():
+        return starts, ends, radii
+
+    pieces_start, pieces_end, pieces_radius = [], [], []
+    for i in range(len(starts)):
+        cuts = np.unique(np.concatenate([[0.0], s[i, crossing[i]], [1.0]]))
+        pieces_start.append(starts[i] + cuts[:-1, None] * direction[i])
+        pieces_end.append(starts[i] + cuts[1:, None] * direction[i])
+        pieces_radius.append(np.full(len(cuts) - 1, radii[i]))
+    return np.concatenate(pieces_start), np.concatenate(pieces_end), np.concatenate(pieces_radius)
+
+
+class Segments:
+    """
+    Conductors split into equal segments and stored as one chain of nodes: consecutive nodes of a
+    conductor bound its segments, and the zero-length links between conductors carry no current.
+    Point-to-segment kernels then need only point-to-node distances and contiguous slices.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, segment_length: float):
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        if np.any(lengths <= 0):
+            raise ValueError("Conductors must have a positive length")
+        pieces = np.maximum(np.ceil(lengths / segment_length - 1e-9).astype(int), 1)
+        node_owner = np.repeat(np.arange(len(starts)), pieces + 1)
+        fraction = np.concatenate([np.linspace(0, 1, n + 1) for n in pieces])
+        self.nodes = starts[node_owner] + fraction[:, None] * (ends - starts)[node_owner]
+
+        self.valid = np.ones(len(self.nodes) - 1, dtype=bool)
+        self.valid[np.cumsum(pieces + 1)[:-1] - 1] = False
+        self.links = np.zeros(len(self.valid))
+        self.links[self.valid] = np.repeat(lengths / pieces, pieces)
+        index = np.flatnonzero(self.valid)
+        self.a, self.b = self.nodes[index], self.nodes[index + 1]
+        self.length = self.links[self.valid]
+        self.owner = np.repeat(np.arange(len(starts)), pieces)
+        self.radius = radii[self.owner]
+
+    def __len__(self):
+        return len(self.a)
+
+    def kernel(self, points: np.ndarray, image: bool = False, offset: Optional[np.ndarray] = None, dtype=np.float64) -> np.ndarray:
+        """
+        artanh(L / (r1 + r2)) from (n, 3) points to every chain link (or its image), shape (n, links).
+        Unit current spread over a segment gives a potential of ρ/(4π) x 2 artanh(L / (r1 + r2)) / L.
+        offset (n,) moves each point radially off the conductor axis (thin-wire approximation).
+        """
+        nodes = self.nodes * IMAGE if image else self.nodes
+        squared = (points ** 2).sum(axis=1)[:, None] + (nodes ** 2).sum(axis=1)[None, :] - 2 * points @ nodes.T
+        if offset is not None:
+            squared += offset[:, None] ** 2
+        distance = np.sqrt(np.maximum(squared, 0)).astype(dtype, copy=False)
+        total = distance[:, :-1] + distance[:, 1:]
+        np.divide(self.links.astype(dtype), total, out=total)
+        np.minimum(total, 1 - np.finfo(dtype).eps, out=total)
+        return np.arctanh(total, out=total)
+
+
+def resistance_matrix(segments: Segments, resistivity: float) -> np.ndarray:
+    """
+    Mutual resistances (Ω) between segments by collocation at segment midpoints on the conductor surface,
+    including images in the soil surface
+    """
+    n = len(segments)
+    mid = (segments.a + segments.b) / 2
+    scale = resistivity / (4 * math.pi) * 2 / segments.length
+    matrix = np.empty((n, n))
+    for start in range(0, n, ROW_BLOCK):
+        block, radius = mid[start:start + ROW_BLOCK], segments.radius[start:start + ROW_BLOCK]
+        kernel = segments.kernel(block, offset=radius) + segments.kernel(block, image=True, offset=radius)
+        matrix[start:start + ROW_BLOCK] = kernel[:, segments.valid] * scale
+    return (matrix + matrix.T) / 2
+
+
+def surface_potential(points: np.ndarray, segments: Segments, currents: np.ndarray, resistivity: float) -> np.ndarray:
+    """
+    Potential (V) at (n, 2) surface points; a segment and its image are equidistant from the surface.
+    Kernels are evaluated in single precision once the distances are known.
+    """
+    weights = np.zeros(len(segments.links), dtype=np.float32)
+    weights[segments.valid] = 2 * 2 * resistivity / (4 * math.pi) * currents / segments.length
+    surface = np.column_stack([points, np.zeros(len(points))])
+    potential = np.empty(len(points))
+    for start in range(0, len(points), ROW_BLOCK):
+        potential[start:start + ROW_BLOCK] = segments.kernel(surface[start:start + ROW_BLOCK], dtype=np.float32) @ weights
+    return potential
+
+
+def tolerable_voltages(resistivity: float, fault_time: float, surface_resistivity: Optional[float] = None,
+                       surface_thickness: float = 0.1, body_weight: int = 70) -> Dict[str, float]:
+    """
+    IEEE 80 eq. 27 and 32-35: tolerable touch and step voltages with an optional high-resistivity surface layer
+    """
+    if body_weight not in BODY_CONSTANTS:
+        raise ValueError("Body weight must be 50 or 70 kg")
+    if surface_resistivity:
+        cs = 1 - 0.09 * (1 - resistivity / surface_resistivity) / (2 * surface_thickness + 0.09)
+        rho_s = surface_resistivity
+    else:
+        cs, rho_s = 1.0, resistivity
+    k = BODY_CONSTANTS[body_weight] / math.sqrt(fault_time)
+    return {"touch": (1000 + 1.5 * cs * rho_s) * k, "step": (1000 + 6 * cs * rho_s) * k, "cs": cs}
+
+
+def conductor_area(fault_current: float, fault_time: float, material: str = 'copper_annealed', ambient_temp: float = 40) -> float:
+    """
+    IEEE 80 eq. 37 minimum conductor cross-section (mm²) for fault_current (A) over fault_time (s)
+    """
+    if material not in EARTHING_MATERIALS:
+        raise ValueError(f"Unknown conductor material: {material} (expected {', '.join(EARTHING_MATERIALS)})")
+    m = EARTHING_MATERIALS[material]
+    capacity = m['tcap'] * 1e-4 / (fault_time * m['alpha_r'] * m['rho_r']) * math.log((m['k0'] + m['tm']) / (m['k0'] + ambient_temp))
+    return fault_current / 1000 / math.sqrt(capacity)
+
+
+def earthing_grid(length: float, width: float, fault_current: float, soil_resistivity: float, along_length: int = 5,
+                  along_width: int = 5, depth: float = 0.5, conductor_diameter: float = 0.01, rod_count: int = 0,
+                  rod_length: float = 3.0, rod_diameter: float = 0.016, fault_time: float = 0.5, split_factor: float = 1.0,
+                  decrement_factor: float = 1.0, surface_resistivity: Optional[float] = None, surface_thickness: float = 0.1,
+                  body_weight: int = 70, material: str = 'copper_annealed', ambient_temp: float = 40,
+                  conductors: Optional[List[Dict[str, Any]]] = None, segment_length: Optional[float] = None,
+                  max_segments: int = 2500, map_spacing: Optional[float] = None, map_margin: float = 3.0,
+                  include_map: bool = False) -> Dict[str, Any]:
+    """
+    Grid resistance, GPR and surface touch/step voltages. fault_current is the symmetrical earth fault current (A);
+    the grid current is fault_current x split_factor x decrement_factor. conductors optionally replaces the
+    rectangular grid with explicit {"start": [x, y, depth], "end": [...], "diameter": m} entries.
+    """
+    if soil_resistivity <= 0 or fault_current <= 0 or fault_time <= 0:
+        raise ValueError("Soil resistivity, fault current and fault time must be positive")
+    if conductors:
+        starts = np.array([c["start"] for c in conductors], dtype=float)
+        ends = np.array([c["end"] for c in conductors], dtype=float)
+        radii = np.array([c.get("diameter", conductor_diameter) / 2 for c in conductors])
+        is_rod = np.abs(starts[:, 2] - ends[:, 2]) > 0.5 * np.linalg.norm(ends - starts, axis=1)
+    else:
+        starts, ends, is_rod = grid_conductors(length, width, along_length, along_width, depth, rod_count, rod_length)
+        radii = np.where(is_rod, rod_diameter / 2, conductor_diameter / 2)
+    if np.any(np.minimum(starts[:, 2], ends[:, 2]) <= 0):
+        raise ValueError("Conductors must be buried below the surface (depth > 0)")
+
+    total_length = float(np.linalg.norm(ends - starts, axis=1).sum())
+    segment_length = segment_length or max(total_length / max_segments, 1.0)
+    segments = Segments(*split_at_crossings(starts, ends, radii), segment_length)
+    if len(segments) > 2 * max_segments:
+        raise ValueError(f"Grid discretizes into {len(segments)} segments; increase segment_length")
+
+    # Equipotential grid at 1 V: R i = 1, grid resistance = 1 / total leakage current
+    matrix = resistance_matrix(segments, soil_resistivity)
+    unit_currents = solve(matrix, np.ones(len(segments)), assume_a="pos")
+    resistance = 1 / unit_currents.sum()
+    grid_current = fault_current * split_factor * decrement_factor
+    gpr = grid_current * resistance
+    currents = unit_currents * gpr
+
+    # Surface potential mesh over the grid plus a margin for step voltages outside the perimeter
+    lo, hi = np.minimum(starts, ends).min(axis=0), np.maximum(starts, ends).max(axis=0)
+    map_spacing = map_spacing or max(math.sqrt((hi[0] - lo[0] + 2 * map_margin) * (hi[1] - lo[1] + 2 * map_margin) / MAP_POINTS), 1.0)
+    xs = np.arange(lo[0] - map_margin, hi[0] + map_margin + 1e-9, map_spacing)
+    ys = np.arange(lo[1] - map_margin, hi[1] + map_margin + 1e-9, map_spacing)
+    gx, gy = np.meshgrid(xs, ys, indexing="ij")
+    potential = surface_potential(np.column_stack([gx.ravel(), gy.ravel()]), segments, currents, soil_resistivity).reshape(gx.shape)
+    touch = gpr - potential
+    inside = (gx >= lo[0]) & (gx <= hi[0]) & (gy >= lo[1]) & (gy <= hi[1])
+    # Step voltage: potential difference over 1 m on 0.25 m patches around the steepest mesh points
+    gradient = np.hypot(*np.gradient(potential, map_spacing, map_spacing))
+    centres = np.column_stack([gx.ravel(), gy.ravel()])[np.argsort(gradient.ravel())[-STEP_CANDIDATES:]]
+    offsets = np.arange(-math.ceil(map_spacing / 2 + 1) * 4, math.ceil(map_spacing / 2 + 1) * 4 + 1) * 0.25
+    ox, oy = np.meshgrid(offsets, offsets, indexing="ij")
+    patch = (centres[:, None, :] + np.column_stack([ox.ravel(), oy.ravel()])[None, :, :]).reshape(-1, 2)
+    fine = surface_potential(patch, segments, currents, soil_resistivity).reshape(len(centres), len(offsets), len(offsets))
+    max_step = float(max(np.abs(fine[:, 4:, :] - fine[:, :-4, :]).max(), np.abs(fine[:, :, 4:] - fine[:, :, :-4]).max(),
+                         np.abs(fine[:, 3:, 3:] - fine[:, :-3, :-3]).max() / math.hypot(0.75, 0.75),
+                         np.abs(fine[:, 3:, :-3] - fine[:, :-3, 3:]).max() / math.hypot(0.75, 0.75)))
+
+    limits = tolerable_voltages(soil_resistivity, fault_time, surface_resistivity, surface_thickness, body_weight)
+    worst = np.unravel_index(np.argmax(np.where(inside, touch, -np.inf)), touch.shape)
+    area = (hi[0] - lo[0]) * (hi[1] - lo[1])
+    min_area = conductor_area(fault_current * decrement_factor, fault_time, material, ambient_temp)
+    results = {
+        "segments": len(segments),
+        "total_conductor_length": round(total_length, 1),
+        "rods": int(is_rod.sum()),
+        "grid_resistance": round(float(resistance), 4),
+        "grid_current": round(grid_current, 1),
+        "gpr": round(float(gpr), 1),
+        "max_touch_voltage": round(float(touch[worst]), 1),
+        "max_touch_location": [round(float(gx[worst]), 2), round(float(gy[worst]), 2)],
+        "max_step_voltage": round(max_step, 1),
+        "tolerable_touch_voltage": round(limits["touch"], 1),
+        "tolerable_step_voltage": round(limits["step"], 1),
+        "surface_derating_cs": round(limits["cs"], 3),
+        "touch_ok": bool(touch[worst] <= limits["touch"]),
+        "step_ok": bool(max_step <= limits["step"]),
+        "leakage_current_density": {"max": round(float((currents / segments.length).max()), 2),
+                                    "min": round(float((currents / segments.length).min()), 2)},
+        "min_conductor_area": round(min_area, 2),
+        "recommended_conductor": next((size for size in EARTHING_SIZES if size >= min_area), None),
+    }
+    if area > 0:
+        # IEEE 80 eq. 52 (Sverak) as a cross-check on the numerical resistance
+        results["grid_resistance_ieee80"] = round(soil_resistivity * (1 / total_length + 1 / math.sqrt(20 * area)
+                                                  * (1 + 1 / (1 + depth * math.sqrt(20 / area)))), 4)
+    if include_map:
+        results["map"] = {"x": np.round(xs, 3).tolist(), "y": np.round(ys, 3).tolist(),
+                          "potential": np.round(potential, 1).tolist(), "touch": np.round(touch, 1).tolist()}
+    return results
@@ -0,0 +1,284 @@
+"""
+Earthworks
+Cut and fill volumes of survey point clouds against a design surface. Points are binned to the
+nodes of a square grid as they arrive (running sums per occupied node, so memory follows the grid,
+not the number of points), and the node elevations form a DEM: node means with the gaps filled
+from a Delaunay triangulation of the surrounding nodes, or a TIN of all node centroids. Every grid
+cell is split into two triangular prisms whose cut and fill parts are evaluated for all cells at
+once, which also gives the per-cell heatmaps.
+"""
+
+import warnings
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import LinearNDInterpolator
+from scipy.ndimage import binary_dilation
+from scipy.spatial import Delaunay
+
+CELL_SIZE = 1.0  # m
+BULKING = 1.25  # loose / bank volume
+SHRINKAGE = 0.90  # compacted / bank volume
+MAX_NODES = 4_000_000  # largest dense grid
+HEATMAP_CELLS = 10_000  # heatmaps larger than this are summed over blocks of cells
+METHODS = ('grid', 'tin')
+# Alternative headings accepted in survey files
+ALIASES = {'easting': 'x', 'e': 'x', 'east': 'x', 'northing': 'y', 'n': 'y', 'north': 'y',
+           'elevation': 'z', 'level': 'z', 'rl': 'z', 'height': 'z', 'h': 'z'}
+
+_OFFSET = 1 << 31  # node rows are stored as unsigned in the low 32 bits of a node key
+_LOW = (1 << 32) - 1
+
+
+def survey_points(data: Any) -> np.ndarray:
+    """Points (n, 3) from an array or a list of [x, y, z] rows, or a frame/list of records with x, y and z (or easting, northing, level)"""
+    if isinstance(data, pd.DataFrame) or (isinstance(data, (list, tuple)) and data and isinstance(data[0], dict)):
+        frame = pd.DataFrame(data)
+        frame.columns = [ALIASES.get(str(column).strip().lower(), str(column).strip().lower()) for column in frame.columns]
+        if not {'x', 'y', 'z'} <= set(frame.columns):
+            raise ValueError("Survey points need 'x', 'y' and 'z' (or easting, northing and level) columns")
+        return frame[['x', 'y', 'z']].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    points = np.asarray(data, dtype=float)
+    if points.ndim != 2 or points.shape[1] < 3:
+        raise ValueError("Survey points must be [x, y, z] rows")
+    return points[:, :3]
+
+
+class SurveyGrid:
+    """
+    Running point count, mean position and mean elevation of survey points at the nodes of a grid of cell_size
+    aligned to the coordinate origin. Feed chunks in any order, then build the DEM with surface()
+    """
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        if not cell_size > 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = float(cell_size)
+        self.points = 0
+        self.rejected = 0
+        self.keys = np.empty(0, dtype=np.int64)
+        self.sums = np.empty((0, 4))  # count, x, y, z per node
+
+    def feed(self, data: Any):
+        points = survey_points(data)
+        valid = np.isfinite(points).all(axis=1)
+        self.points += int(valid.sum())
+        self.rejected += int((~valid).sum())
+        points = points[valid]
+        column, row = (np.rint(points[:, k] / self.cell_size).astype(np.int64) for k in (0, 1))
+        keys = (column << 32) + (row + _OFFSET)
+        values = np.column_stack([np.ones(len(points)), points])
+        self.keys, self.sums = _accumulate(np.concatenate([self.keys, keys]), np.vstack([self.sums, values]))
+
+    def nodes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Column and row indices of the occupied nodes with their mean (x, y, z)"""
+        return self.keys >> 32, (self.keys & _LOW) - _OFFSET, self.sums[:, 1:] / self.sums[:, :1]
+
+    def surface(self, method: str = 'grid', bounds: Optional[Tuple[int, int, int, int]] = None) -> Dict[str, Any]:
+        """
+        DEM of node elevations (rows, columns) over the occupied extent or bounds (first column, first row, columns, rows).
+        'grid' takes the node means and fills empty nodes by linear interpolation over a triangulation of the
+        nodes around them; 'tin' interpolates every node from a triangulation of all node centroids. Nodes outside
+        the triangulation stay NaN.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown surface method: {method} (expected {', '.join(METHODS)})")
+        if not len(self.keys):
+            raise ValueError("No survey points with finite coordinates")
+        columns, rows, centroids = self.nodes()
+        if bounds is None:
+            bounds = (int(columns.min()), int(rows.min()), int(columns.max() - columns.min()) + 1, int(rows.max() - rows.min()) + 1)
+        first_column, first_row, width, height = bounds
+        if width * height > MAX_NODES:
+            raise ValueError(f"A {width} x {height} grid exceeds {MAX_NODES} nodes; use a larger cell size")
+        inside = (columns >= first_column) & (columns < first_column + width) & (rows >= first_row) & (rows < first_row + height)
+        occupied = np.zeros((height, width), dtype=bool)
+        occupied[rows[inside] - first_row, columns[inside] - first_column] = True
+        elevation = np.full((height, width), np.nan)
+
+        if method == 'grid':
+            elevation[rows[inside] - first_row, columns[inside] - first_column] = centroids[inside, 2]
+            # Only the nodes bordering a gap take part in its interpolation
+            sources = occupied & binary_dilation(~occupied, structure=np.ones((3, 3), dtype=bool))
+            targets = ~occupied
+            known = np.zeros(len(columns), dtype=bool)
+            known[np.flatnonzero(inside)] = sources[rows[inside] - first_row, columns[inside] - first_column]
+        else:
+            targets = np.ones((height, width), dtype=bool)
+            known = np.ones(len(columns), dtype=bool)
+        if targets.any() and known.sum() >= 3:
+            target_rows, target_columns = np.nonzero(targets)
+            elevation[target_rows, target_columns] = _interpolate(centroids[known], (target_columns + first_column) * self.cell_size,
+                                                                  (target_rows + first_row) * self.cell_size)
+        return {
+            "origin": (first_column * self.cell_size, first_row * self.cell_size),
+            "bounds": (first_column, first_row, width, height),
+            "cell_size": self.cell_size,
+            "elevation": elevation,
+            "surveyed_nodes": int(occupied.sum()),
+            "interpolated_nodes": int((np.isfinite(elevation) & ~occupied).sum()),
+        }
+
+
+def _accumulate(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = np.column_stack([np.bincount(inverse, weights=values[:, k], minlength=len(unique)) for k in range(values.shape[1])])
+    return unique, sums
+
+
+def _interpolate(points: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Linear interpolation of (x, y, z) points over their Delaunay triangulation, NaN outside it"""
+    try:
+        triangulation = Delaunay(points[:, :2])
+    except Exception:
+        raise ValueError("Survey points are collinear or too few to triangulate")
+    return LinearNDInterpolator(triangulation, points[:, 2])(x, y)
+
+
+def design_levels(design: Union[float, Dict[str, Any], Iterable, SurveyGrid], surface: Dict[str, Any], method: str = 'tin') -> np.ndarray:
+    """
+    Design elevations at the nodes of a surveyed surface. The design is a level (flat pad), a plane
+    {"level", "slope_x", "slope_y" (%), "origin": [x, y] (default the lower-left node)}, design points [x, y, z]
+    triangulated into a TIN, or another SurveyGrid of the same cell size
+    """
+    first_column, first_row, width, height = surface["bounds"]
+    cell = surface["cell_size"]
+    x = (first_column + np.arange(width)) * cell
+    y = (first_row + np.arange(height)) * cell
+    if isinstance(design, SurveyGrid):
+        if design.cell_size != cell:
+            raise ValueError("The design grid needs the same cell size as the survey")
+        return design.surface(method, surface["bounds"])["elevation"]
+    if isinstance(design, (int, float)):
+        return np.full((height, width), float(design))
+    if isinstance(design, dict):
+        if 'level' not in design:
+            raise ValueError("A design plane needs a 'level' (with optional 'slope_x', 'slope_y' in % and 'origin')")
+        origin_x, origin_y = design.get('origin') or surface["origin"]
+        return (float(design['level']) + float(design.get('slope_x', 0)) / 100 * (x[None, :] - origin_x)
+                + float(design.get('slope_y', 0)) / 100 * (y[:, None] - origin_y))
+    points = survey_points(list(design))
+    if len(points) < 3:
+        raise ValueError("A design surface needs at least three [x, y, z] points")
+    grid_x, grid_y = np.meshgrid(x, y)
+    return _interpolate(points[np.isfinite(points).all(axis=1)], grid_x, grid_y)
+
+
+def prism_volumes(depth: np.ndarray, cell_size: float) -> Dict[str, np.ndarray]:
+    """
+    Cut and fill volume and covered area of every cell of a node grid of depths (existing - design, positive in cut).
+    Each cell is split into two triangular prisms; where the depth changes sign within a triangle the cut and fill
+    parts are the volumes on either side of the zero line. Triangles with an unknown corner are left out.
+    """
+    a, b, c, d = depth[:-1, :-1], depth[:-1, 1:], depth[1:, 1:], depth[1:, :-1]
+    corners = np.stack([np.stack([a, b, c], axis=-1), np.stack([a, c, d], axis=-1)])
+    covered = np.isfinite(corners).all(axis=-1)
+    low, middle, high = np.moveaxis(np.sort(np.where(covered[..., None], corners, 0), axis=-1), -1, 0)
+    area = cell_size ** 2 / 2
+    total = area * (low + middle + high) / 3
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # One corner in cut: a tetrahedron over it; one corner in fill: the whole prism plus the fill tetrahedron under it
+        apex = area / 3 * high ** 3 / ((high - low) * (high - middle))
+        base = total + area / 3 * (-low) ** 3 / ((middle - low) * (high - low))
+    cut = np.select([low >= 0, high <= 0, middle <= 0], [total, 0, apex], base)
+    fill = cut - total
+    return {"cut": cut.sum(axis=0), "fill": fill.sum(axis=0), "area": covered.sum(axis=0) * area}
+
+
+def _blocks(values: np.ndarray, size: int, reduce) -> np.ndarray:
+    rows, columns = -(-values.shape[0] // size), -(-values.shape[1] // size)
+    padded = np.full((rows * size, columns * size), np.nan)
+    padded[:values.shape[0], :values.shape[1]] = values
+    with np.errstate(invalid='ignore'):
+        return reduce(padded.reshape(rows, size, columns, size).swapaxes(1, 2).reshape(rows, columns, -1), axis=-1)
+
+
+def heatmap(cells: Dict[str, np.ndarray], surface: Dict[str, Any], max_cells: int = HEATMAP_CELLS) -> Dict[str, Any]:
+    """Per-cell cut, fill (m³) and mean depth (m) as nested lists (rows from the south), summed over square blocks beyond max_cells"""
+    size = max(1, int(np.ceil(np.sqrt(cells["cut"].size / max_cells))))
+    unknown = cells["area"] == 0
+    layers = {"cut": np.where(unknown, np.nan, cells["cut"]), "fill": np.where(unknown, np.nan, cells["fill"]), "depth": cells["depth"]}
+    if size > 1:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            layers = {"cut": _blocks(layers["cut"], size, np.nansum), "fill": _blocks(layers["fill"], size, np.nansum),
+                      "depth": _blocks(layers["depth"], size, np.nanmean)}
+            empty = _blocks(cells["area"], size, np.nansum) == 0
+        layers["cut"][empty] = layers["fill"][empty] = np.nan
+    cell = surface["cell_size"]
+    rows = {name: np.where(np.isnan(values), None, np.round(values, 3)).tolist() for name, values in layers.items()}
+    return {"origin": list(surface["origin"]), "cell_size": cell * size, "shape": list(layers["cut"].shape), **rows}
+
+
+def survey_cells(survey: SurveyGrid, design: Union[float, Dict[str, Any], Iterable, SurveyGrid], method: str = 'grid') -> Dict[str, Any]:
+    """Per-cell arrays (rows, columns) of cell-centre x, y, mean existing and design level, mean depth, cut, fill and covered area"""
+    surface = survey.surface(method)
+    existing = surface["elevation"]
+    if min(existing.shape) < 2:
+        raise ValueError("The survey covers less than one grid cell; use a smaller cell size")
+    depth = existing - design_levels(design, surface)
+    cells = prism_volumes(depth, survey.cell_size)
+
+    def centres(values):
+        return (values[:-1, :-1] + values[:-1, 1:] + values[1:, 1:] + values[1:, :-1]) / 4
+
+    height, width = existing.shape
+    cell = survey.cell_size
+    cells.update({
+        "x": np.broadcast_to(surface["origin"][0] + (np.arange(width - 1) + 0.5) * cell, (height - 1, width - 1)),
+        "y": np.broadcast_to(surface["origin"][1] + (np.arange(height - 1)[:, None] + 0.5) * cell, (height - 1, width - 1)),
+        "existing": centres(existing),
+        "design": centres(existing - depth),
+        "depth": centres(depth),
+        "surface": surface,
+    })
+    return cells
+
+
+def earthwork_volumes(survey: SurveyGrid, design: Union[float, Dict[str, Any], Iterable, SurveyGrid], method: str = 'grid',
+                      bulking: float = BULKING, shrinkage: float = SHRINKAGE, include_heatmap: bool = False,
+                      heatmap_cells: int = HEATMAP_CELLS) -> Dict[str, Any]:
+    """
+    Bank cut and fill volumes of a gridded survey against a design surface (see design_levels), with the earthwork balance:
+    cut compacts to cut x shrinkage, surplus bank volume is hauled away at bulking x bank volume, a deficit is borrowed
+    """
+    if bulking < 1 or not 0 < shrinkage <= 1:
+        raise ValueError("Bulking factor must be at least 1 and shrink factor between 0 and 1")
+    cells = survey_cells(survey, design, method)
+    surface = cells.pop("surface")
+    cut, fill = float(cells["cut"].sum()), float(cells["fill"].sum())
+    depth = cells["depth"]
+    surplus = cut - fill / shrinkage
+    results = {
+        "points": survey.points,
+        "rejected_points": survey.rejected,
+        "method": method,
+        "cell_size": survey.cell_size,
+        "grid": {"columns": int(depth.shape[1]), "rows": int(depth.shape[0]), "surveyed_nodes": surface["surveyed_nodes"],
+                 "interpolated_nodes": surface["interpolated_nodes"]},
+        "area": round(float(cells["area"].sum()), 2),
+        "cut_area": round(float(cells["area"][depth > 0].sum()), 2),
+        "fill_area": round(float(cells["area"][depth < 0].sum()), 2),
+        "cut_volume": round(cut, 2),
+        "fill_volume": round(fill, 2),
+        "net_volume": round(cut - fill, 2),
+        "max_cut": round(float(np.nanmax(depth, initial=0)), 3),
+        "max_fill": round(float(-np.nanmin(depth, initial=0)), 3),
+        "loose_cut_volume": round(cut * bulking, 2),
+        "compacted_cut_volume": round(cut * shrinkage, 2),
+        "net_balance": round(cut * shrinkage - fill, 2),
+        "export_volume": round(max(surplus, 0) * bulking, 2),
+        "import_volume": round(max(-surplus, 0), 2),
+    }
+    if include_heatmap:
+        results["heatmap"] = heatmap(cells, surface, heatmap_cells)
+    return results
+
+
+def earthworks(points: Any, design: Union[float, Dict[str, Any], Iterable], cell_size: float = CELL_SIZE, method: str = 'grid',
+               bulking: float = BULKING, shrinkage: float = SHRINKAGE, include_heatmap: bool = False) -> Dict[str, Any]:
+    """Cut/fill volumes of survey points [x, y, z] (or records with x, y, z) against a design surface"""
+    survey = SurveyGrid(cell_size)
+    survey.feed(points)
+    return earthwork_volumes(survey, design, method, bulking, shrinkage, include_heatmap)
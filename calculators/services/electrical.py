@@ -1,3 +1,15 @@
+from typing import Dict, Any, List, Optional, Union
+
+from calculators.services.equipment_data import (
+    CABLE_STANDARDS, INSTALL_DERATING, CABLE_TABLE, VOLTAGE_DROP_SIZES,
+    BREAKER_STANDARDS, BREAKER_RATINGS, BREAKER_ICU, TRIP_CURVES, BREAKER_TYPES
+)
+from calculators.services.network_analysis import analyze_network
+from calculators.services.arc_flash import arc_flash_study
+from calculators.services.solar_pv import pv_yield
+from calculators.services.lighting import DEFAULT_REFLECTANCES, lighting_calculation, optimize_layout
+from calculators.services.earthing_grid import earthing_grid
+
 class ElectricalCalculators:
     @staticmethod
     def load_calculation(connected_load: float, demand_factor: float = 0.8, diversity_factor: float = 0.85, system_type: str = '3phase', voltage: float = 400, power_factor: float = 0.85):
@@ -36,44 +48,16 @@ class ElectricalCalculators:
     def cable_sizing(design_current: float, length: float, voltage_system: float = 400, standard: str = 'IEC', circuit_type: str = 'power', install_method: str = 'conduit', material: str = 'copper', ambient_temp: float = 40, grouping_factor: float = 1.0):
         """Calculate cable sizing with derating factors"""
         try:
-            code_data = {
-                'IEC': {'name': 'IEC 60364-5-52', 'ref': 'Current-carrying capacities'},
-                'NEC': {'name': 'NEC 310', 'ref': 'Conductors for General Wiring'},
-                'BS7671': {'name': 'BS 7671', 'ref': 'Wiring Regulations'},
-                'AS3000': {'name': 'AS/NZS 3000', 'ref': 'Wiring Rules'}
-            }
-            
-            code = code_data.get(standard, code_data['IEC'])
+            code = CABLE_STANDARDS.get(standard, CABLE_STANDARDS['IEC'])
             max_vdrop = 3 if circuit_type == 'lighting' else 5
             
-            install_derating = {'conduit': 0.8, 'cableTray': 0.85, 'directBuried': 0.9, 'openAir': 1.0, 'trunking': 0.75}
-            install_factor = install_derating.get(install_method, 0.8)
+            install_factor = INSTALL_DERATING.get(install_method, 0.8)
             
             temp_derating = 0.91 if ambient_temp > 40 else 0.82 if ambient_temp > 50 else 1.0
             combined_derating = install_factor * temp_derating * grouping_factor
             required_ampacity = design_current / combined_derating
             
-            cable_table = [
-                {'mm2': 1.5, 'xlpe': 15, 'pvc': 13},
-                {'mm2': 2.5, 'xlpe': 20, 'pvc': 17},
-                {'mm2': 4, 'xlpe': 27, 'pvc': 23},
-                {'mm2': 6, 'xlpe': 35, 'pvc': 30},
-                {'mm2': 10, 'xlpe': 48, 'pvc': 40},
-                {'mm2': 16, 'xlpe': 64, 'pvc': 53},
-                {'mm2': 25, 'xlpe': 85, 'pvc': 70},
-                {'mm2': 35, 'xlpe': 105, 'pvc': 88},
-                {'mm2': 50, 'xlpe': 130, 'pvc': 110},
-                {'mm2': 70, 'xlpe': 165, 'pvc': 140},
-                {'mm2': 95, 'xlpe': 200, 'pvc': 170},
-                {'mm2': 120, 'xlpe': 230, 'pvc': 195},
-                {'mm2': 150, 'xlpe': 260, 'pvc': 220},
-                {'mm2': 185, 'xlpe': 300, 'pvc': 250},
-                {'mm2': 240, 'xlpe': 350, 'pvc': 300},
-                {'mm2': 300, 'xlpe': 400, 'pvc': 340},
-                {'mm2': 400, 'xlpe': 470, 'pvc': 400}
-            ]
-            
-            suitable_cable = next((cable for cable in cable_table if cable['xlpe'] >= required_ampacity), None)
+            suitable_cable = CABLE_TABLE.ceiling(required_ampacity)
             if not suitable_cable:
                 return {"error": "Current too high. Consider parallel cables or larger system.", "success": False}
             
@@ -115,47 +99,24 @@ class ElectricalCalculators:
     def breaker_selection(design_current: float, fault_current: float, breaker_type: str = 'MCB', curve_type: str = 'C', standard: str = 'IEC'):
         """Select circuit breaker based on load and fault current"""
         try:
-            code_data = {
-                'IEC': {'name': 'IEC 60947-2', 'ref': 'Circuit-breakers'},
-                'NEMA': {'name': 'NEMA AB1', 'ref': 'Molded Case Circuit Breakers'}
-            }
-            
-            code = code_data.get(standard, code_data['IEC'])
-            standard_ratings = [6, 10, 16, 20, 25, 32, 40, 50, 63, 80, 100, 125, 160, 200, 250, 320, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3200, 4000, 5000, 6300]
+            code = BREAKER_STANDARDS.get(standard, BREAKER_STANDARDS['IEC'])
             
             continuous_load = design_current * 1.25
-            selected_in = next((rating for rating in standard_ratings if rating >= continuous_load), standard_ratings[-1])
+            selected_in = BREAKER_RATINGS.ceiling(continuous_load, BREAKER_RATINGS.last)
             in_check = selected_in >= design_current
             
             required_icu = fault_current * 1.2
-            standard_icu = [3, 6, 10, 15, 25, 35, 50, 65, 80, 100, 150]
-            selected_icu = next((icu for icu in standard_icu if icu >= required_icu), standard_icu[-1])
+            selected_icu = BREAKER_ICU.ceiling(required_icu, BREAKER_ICU.last)
             icu_check = selected_icu >= fault_current
             
-            curve_data = {
-                'B': {'name': 'Curve B', 'trip_point': '3-5x In', 'application': 'Residential, lighting'},
-                'C': {'name': 'Curve C', 'trip_point': '5-10x In', 'application': 'General purpose, commercial'},
-                'D': {'name': 'Curve D', 'trip_point': '10-20x In', 'application': 'Motor, inductive loads'},
-                'K': {'name': 'Curve K', 'trip_point': '10-14x In', 'application': 'Motor protection'},
-                'Z': {'name': 'Curve Z', 'trip_point': '2-3x In', 'application': 'Electronic equipment'}
-            }
-            
-            curve = curve_data.get(curve_type, curve_data['C'])
+            curve = TRIP_CURVES.get(curve_type, TRIP_CURVES['C'])
             
-            breaker_types = {
-                'MCB': {'name': 'MCB (Miniature Circuit Breaker)', 'max_in': 125, 'max_icu': 25, 'poles': '1P/2P/3P/4P'},
-                'MCCB': {'name': 'MCCB (Molded Case Circuit Breaker)', 'max_in': 1600, 'max_icu': 100, 'poles': '3P/4P'},
-                'ACB': {'name': 'ACB (Air Circuit Breaker)', 'max_in': 6300, 'max_icu': 150, 'poles': '3P/4P'},
-                'VCB': {'name': 'VCB (Vacuum Circuit Breaker)', 'max_in': 4000, 'max_icu': 63, 'poles': '3P'}
-            }
-            
-            breaker_spec = breaker_types.get(breaker_type, breaker_types['MCB'])
+            breaker_spec = BREAKER_TYPES.get(breaker_type, BREAKER_TYPES['MCB'])
             type_appropriate = selected_in <= breaker_spec['max_in']
             utilization = (design_current / selected_in) * 100
             
-            trip_range = curve['trip_point'].split('-')
-            instant_trip_min = selected_in * float(trip_range[0])
-            instant_trip_max = selected_in * float(trip_range[1])
+            instant_trip_min = selected_in * curve['trip_min']
+            instant_trip_max = selected_in * curve['trip_max']
             
             results = {
                 "breaker_type": breaker_spec['name'],
@@ -451,12 +412,7 @@ class ElectricalCalculators:
             
             power_loss = 3 * current ** 2 * resistance if system_type == '3phase' else 2 * current ** 2 * resistance
             
-            cable_table = [1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240]
-            next_size = None
-            for i in range(len(cable_table)):
-                if cable_table[i] > cross_section:
-                    next_size = cable_table[i]
-                    break
+            next_size = VOLTAGE_DROP_SIZES.above(cross_section)
             
             recommendation = "Voltage drop acceptable with good safety margin"
             if not compliant:
@@ -505,6 +461,19 @@ class ElectricalCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def earthing_grid(length: float, width: float, fault_current: float, soil_resistivity: float, along_length: int = 5, along_width: int = 5, depth: float = 0.5, conductor_diameter: float = 0.01, rod_count: int = 0, rod_length: float = 3.0, rod_diameter: float = 0.016, fault_time: float = 0.5, split_factor: float = 1.0, decrement_factor: float = 1.0, surface_resistivity: Optional[float] = None, surface_thickness: float = 0.1, body_weight: int = 70, material: str = 'copper_annealed', ambient_temp: float = 40, conductors: Optional[List[Dict[str, Any]]] = None, segment_length: Optional[float] = None, map_spacing: Optional[float] = None, include_map: bool = False):
+        """Earthing grid resistance, GPR and touch/step voltages by segment mutual-resistance analysis"""
+        try:
+            results = earthing_grid(length, width, fault_current, soil_resistivity, along_length, along_width, depth, conductor_diameter,
+                                    rod_count, rod_length, rod_diameter, fault_time, split_factor, decrement_factor, surface_resistivity,
+                                    surface_thickness, body_weight, material, ambient_temp, conductors, segment_length,
+                                    map_spacing=map_spacing, include_map=include_map)
+            safe = results["touch_ok"] and results["step_ok"]
+            return {"results": results, "compliance": "IEEE 80 touch and step voltages within limits" if safe else "IEEE 80 touch or step voltage exceeds limits", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def busbar_sizing(current: float, busbars_per_phase: int = 1, material: str = 'copper'):
         """Calculate busbar sizing"""
@@ -551,3 +520,48 @@ class ElectricalCalculators:
             return {"results": results, "compliance": mat_data['standard'], "success": True}
         except Exception as e:
             return {"error": str(e), "success": False}
+    
+    @staticmethod
+    def network_analysis(buses: List[Dict[str, Any]], branches: List[Dict[str, Any]], source: Dict[str, Any], base_kv: float = 0.4, max_voltage_drop: float = 5):
+        """Load flow and short circuit at every bus of a radial or meshed network"""
+        try:
+            results = analyze_network(buses, branches, source, base_kv, max_voltage_drop)
+            return {"results": results, "compliance": "IEC 60909-0:2016/IEC 60364-5-52", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
+    @staticmethod
+    def arc_flash_study(bolted_fault_ka: Union[List[float], List[List[float]]], clearing_time: Union[float, List[float], List[List[float]]], voltage_kv: Union[float, List[float]], equipment: Union[str, List[str]] = 'switchgear', bus_ids: Optional[List[str]] = None, gap_mm: Optional[Union[float, List[float]]] = None, working_distance_mm: Optional[Union[float, List[float]]] = None, clearing_time_reduced: Optional[Union[float, List[float], List[List[float]]]] = None, grounded: Union[bool, List[bool]] = True, scenarios: Optional[List[str]] = None, max_clearing_time: float = 2.0):
+        """Incident energy and arc flash boundary labels for every bus and scenario"""
+        try:
+            results = arc_flash_study(bolted_fault_ka, clearing_time, voltage_kv, equipment, bus_ids, gap_mm, working_distance_mm,
+                                      clearing_time_reduced, grounded, scenarios, max_clearing_time)
+            return {"results": results, "compliance": "IEEE 1584-2002/NFPA 70E", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    @staticmethod
+    def pv_yield(latitude: float, weather: Optional[Dict[str, List[float]]] = None, daily_irradiance: Optional[float] = None, longitude: Optional[float] = None, timezone: Optional[float] = None, dc_capacity: float = 1.0, tilt: Union[float, List[float]] = 20.0, azimuth: Union[float, List[float]] = 180.0, dc_ac_ratio: Union[float, List[float]] = 1.2, system_losses: float = 14, inverter_efficiency: float = 0.96, module_type: str = 'standard', mounting: str = 'open_rack', albedo: float = 0.2, energy_demand: Optional[float] = None, include_hourly: bool = False):
+        """Hourly PV yield over a weather year with tilt, azimuth and DC/AC ratio sweeps"""
+        try:
+            results = pv_yield(weather, latitude, longitude, timezone, dc_capacity, tilt, azimuth, dc_ac_ratio, system_losses,
+                               inverter_efficiency, module_type, mounting, albedo, daily_irradiance, energy_demand, include_hourly)
+            return {"results": results, "compliance": "PVWatts v5 yield model", "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+    @staticmethod
+    def lighting_layout(length: float, width: float, fixture_lumens: float, target_lux: Optional[float] = None, task: Optional[str] = None, target_uniformity: Optional[float] = None, mounting_height: float = 3.0, work_plane_height: float = 0.8, distribution: Union[str, Dict[str, List[float]]] = 'wide', maintenance_factor: float = 0.8, reflectances: Optional[List[float]] = None, luminaires: Optional[List[Dict[str, float]]] = None, grid_spacing: Optional[float] = None, border: float = 0.5):
+        """Point-by-point work-plane illuminance; searches a regular layout when no luminaires are given"""
+        try:
+            options = dict(work_plane_height=work_plane_height, distribution=distribution, maintenance_factor=maintenance_factor,
+                           reflectances=reflectances or DEFAULT_REFLECTANCES, task=task, target_lux=target_lux, target_uniformity=target_uniformity,
+                           grid_spacing_m=grid_spacing, border=border)
+            if luminaires:
+                results = lighting_calculation(length, width, luminaires, mounting_height, fixture_lumens, **options)
+            else:
+                results = optimize_layout(length, width, fixture_lumens, mounting_height, **options)
+            compliance = "Lighting levels meet EN 12464-1" if results["compliant"] else "Lighting levels below EN 12464-1 requirements"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
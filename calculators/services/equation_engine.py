@@ -0,0 +1,262 @@
+"""
+Equation Engine
+Compiles catalog equations (e.g. "sigma = M * c / I") into fast callables
+that can solve for any of their variables.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Optional, Callable, Tuple
+
+import sympy
+from scipy.special import lambertw
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
+
+_FUNCTIONS = {
+    "sqrt": sympy.sqrt,
+    "ln": sympy.log,
+    "log": sympy.log,
+    "log10": lambda x: sympy.log(x, 10),
+    "exp": sympy.exp,
+    "sin": sympy.sin,
+    "cos": sympy.cos,
+    "tan": sympy.tan,
+    "asin": sympy.asin,
+    "acos": sympy.acos,
+    "atan": sympy.atan,
+    "abs": sympy.Abs,
+    "pi": sympy.pi,
+}
+
+# Catalog equations write trigonometric terms as plain variables ("cos_phi"),
+# while their outputs ask for the angle ("phi"); expand them so it is solvable
+_TRIG_ALIAS = re.compile(r"\b(sin|cos|tan)_([A-Za-z]\w*)\b")
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+_TRANSFORMATIONS = standard_transformations + (convert_xor,)
+
+# Functions sympy may introduce while rearranging that the math module lacks
+_LAMBDIFY_MODULES = [{"LambertW": lambda x, k=0: lambertw(x, k).real}, "math"]
+
+
+def _with_branches(solutions: List[sympy.Expr]) -> List[sympy.Expr]:
+    """
+    Add the lower real branch of any Lambert W solution ahead of the principal one;
+    for the logarithmic catalog equations (rod lengths etc.) it is the physical root
+    """
+    expanded = []
+    for solution in solutions:
+        if solution.has(sympy.LambertW):
+            expanded.append(solution.replace(sympy.LambertW, lambda arg: sympy.LambertW(arg, -1)))
+        expanded.append(solution)
+    return expanded
+
+
+class SolvedForm:
+    """
+    An equation rearranged for one target variable and compiled to a scalar callable
+    """
+
+    __slots__ = ("target", "args", "candidates")
+
+    def __init__(self, target: str, args: Tuple[str, ...], candidates: List[Callable]):
+        self.target = target
+        self.args = args
+        self.candidates = candidates
+
+    def __call__(self, values: Dict[str, float]) -> float:
+        """
+        Evaluate the form, returning the first real root (non-negative roots preferred)
+        """
+        params = [values[name] for name in self.args]
+        fallback = None
+
+        for func in self.candidates:
+            try:
+                value = complex(func(*params))
+            except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+                continue
+
+            if abs(value.imag) > 1e-9 * max(1.0, abs(value.real)) or not math.isfinite(value.real):
+                continue
+            if value.real >= 0:
+                return value.real
+            if fallback is None:
+                fallback = value.real
+
+        if fallback is None:
+            raise ValueError(f"No real solution for '{self.target}' with the given inputs")
+        return fallback
+
+
+class CompiledEquation:
+    """
+    A parsed equation whose rearranged forms are derived and compiled the first time each target is asked for
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        normalized, lhs, rhs = self._parse(text)
+        self.symbols = sorted((str(s) for s in (lhs - rhs).free_symbols), key=lambda n: re.search(rf"\b{n}\b", normalized).start())
+        self.relation = sympy.Eq(lhs, rhs)
+        # target -> compiled form, or None once the target is known to be unsolvable
+        self.forms: Dict[str, Optional[SolvedForm]] = {}
+
+    def form(self, target: str) -> Optional[SolvedForm]:
+        """
+        The form rearranged for target, or None if sympy cannot isolate it
+        """
+        if target not in self.forms:
+            self.forms[target] = self._derive(target) if target in self.symbols else None
+        return self.forms[target]
+
+    def _derive(self, name: str) -> Optional[SolvedForm]:
+        # simplify/check only tidy the roots; SolvedForm already rejects non-real ones at call time
+        try:
+            solutions = sympy.solve(self.relation, sympy.Symbol(name), simplify=False, check=False)
+        except (NotImplementedError, ValueError):
+            return None
+
+        args = tuple(n for n in self.symbols if n != name)
+        arg_symbols = [sympy.Symbol(n) for n in args]
+        candidates = []
+        for solution in _with_branches(solutions):
+            try:
+                candidates.append(sympy.lambdify(arg_symbols, solution, modules=_LAMBDIFY_MODULES))
+            except Exception:
+                continue
+
+        return SolvedForm(name, args, candidates) if candidates else None
+
+    @staticmethod
+    def _parse(text: str):
+        """
+        Parse "lhs = rhs" into the normalized text and a pair of sympy expressions
+        """
+        if text.count("=") != 1:
+            raise ValueError(f"Equation '{text}' must contain exactly one '='")
+
+        normalized = _TRIG_ALIAS.sub(r"\1(\2)", text)
+        local_dict = {}
+        for name in _IDENTIFIER.findall(normalized):
+            local_dict[name] = _FUNCTIONS.get(name, sympy.Symbol(name))
+
+        lhs_text, rhs_text = normalized.split("=")
+        lhs = parse_expr(lhs_text, local_dict=local_dict, transformations=_TRANSFORMATIONS)
+        rhs = parse_expr(rhs_text, local_dict=local_dict, transformations=_TRANSFORMATIONS)
+        return normalized, lhs, rhs
+
+    @property
+    def solvable_for(self) -> List[str]:
+        return [name for name in self.symbols if self.form(name) is not None]
+
+    def solve(self, target: str, values: Dict[str, float]) -> float:
+        """
+        Solve for target given values for every other variable
+        """
+        form = self.form(target)
+        if form is None:
+            raise ValueError(f"Equation '{self.text}' cannot be solved for '{target}'")
+
+        missing = [name for name in form.args if name not in values]
+        if missing:
+            raise ValueError(f"Missing inputs for '{target}': {', '.join(missing)}")
+
+        return form(values)
+
+
+@lru_cache(maxsize=None)
+def compile_equation(text: str) -> CompiledEquation:
+    """
+    Parse an equation once; catalog rows sharing the same text share the result and its forms
+    """
+    return CompiledEquation(text.strip())
+
+
+@lru_cache(maxsize=None)
+def equation_symbols(text: str) -> FrozenSet[str]:
+    """
+    Variables of an equation, parsed without deriving its rearranged forms
+    """
+    _, lhs, rhs = CompiledEquation._parse(text.strip())
+    return frozenset(str(s) for s in (lhs - rhs).free_symbols)
+
+
+class EquationEngine:
+    """
+    Evaluates catalog equations against their EquationInput/EquationOutput metadata
+    """
+
+    @staticmethod
+    def warm(db) -> int:
+        """
+        Derive every form of every active catalog equation up front, returning the number of forms
+        """
+        from workflow_models import Equation
+
+        texts = {row[0] for row in db.query(Equation.equation).filter(Equation.is_active == True).all()}
+        forms = 0
+        for text in texts:
+            try:
+                forms += len(compile_equation(text).solvable_for)
+            except Exception:
+                continue  # unparseable rows are reported when they are calculated
+        return forms
+
+    @staticmethod
+    def _coerce_inputs(inputs_meta, inputs: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Map request inputs (by symbol or name) onto equation symbols, applying defaults and limits
+        """
+        values = {}
+        for key, value in inputs.items():
+            if value is None or value == "":
+                continue
+            values[key] = float(value)
+
+        for meta in inputs_meta:
+            if meta.symbol not in values and meta.name in values:
+                values[meta.symbol] = values[meta.name]
+            if meta.symbol not in values and meta.default_value is not None:
+                values[meta.symbol] = float(meta.default_value)
+
+            if meta.symbol in values:
+                value = values[meta.symbol]
+                if meta.min_value is not None and value < meta.min_value:
+                    raise ValueError(f"'{meta.name}' ({value}) is less than minimum {meta.min_value}")
+                if meta.max_value is not None and value > meta.max_value:
+                    raise ValueError(f"'{meta.name}' ({value}) exceeds maximum {meta.max_value}")
+
+        return values
+
+    @staticmethod
+    def calculate(equation, inputs: Dict[str, Any], target: Optional[str] = None):
+        """
+        Evaluate a catalog Equation, solving for its outputs or an explicit target variable
+        """
+        try:
+            compiled = compile_equation(equation.equation)
+            values = EquationEngine._coerce_inputs(equation.inputs, inputs)
+
+            if target:
+                output = next((o for o in equation.outputs if target in (o.symbol, o.name)), None)
+                targets = [(output.symbol, output.name, output.precision) if output else (target, target, None)]
+            else:
+                targets = [(o.symbol, o.name, o.precision) for o in sorted(equation.outputs, key=lambda o: o.output_order or 0)]
+                if not targets:
+                    lhs = compiled.symbols[0]
+                    targets = [(lhs, lhs, None)]
+
+            results = {}
+            for symbol, name, precision in targets:
+                value = compiled.solve(symbol, values)
+                results[name] = round(value, precision) if precision is not None else value
+
+            return {
+                "results": results,
+                "equation": compiled.text,
+                "solved_for": [symbol for symbol, _, _ in targets],
+                "success": True
+            }
+        except Exception as e:
+            return {"error": str(e), "success": False}
@@ -0,0 +1,226 @@
+"""
+Equation Planner
+Chains catalog equations to reach a target variable from a set of known ones.
+Equations and variables (EquationInput/EquationOutput names) form a bipartite
+graph; a plan is the cheapest set of equation applications that derives the
+target, found with a Dijkstra-style search over the hypergraph, cached by
+(known variables, target) and executed with the compiled equation forms.
+"""
+
+import heapq
+import threading
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+from calculators.services.equation_engine import compile_equation
+
+
+class EquationNode:
+    """
+    One distinct catalog equation: its text and the variable name behind each symbol
+    """
+
+    __slots__ = ("equation_id", "text", "symbols", "names")
+
+    def __init__(self, equation_id: str, text: str, symbols: Dict[str, str]):
+        self.equation_id = equation_id
+        self.text = text
+        self.symbols = symbols
+        compiled = compile_equation(text)
+        # variable name -> symbol it appears as in the equation
+        self.names = {name: symbol for symbol, name in symbols.items() if symbol in compiled.symbols}
+
+    def solvable_for(self, variable: str) -> Optional[str]:
+        """
+        Symbol to rearrange for to derive variable, or None; only that one form is derived, on first use
+        """
+        symbol = self.names.get(variable)
+        if symbol is None or compile_equation(self.text).form(symbol) is None:
+            return None
+        return symbol
+
+    @property
+    def variables(self) -> List[str]:
+        return list(self.symbols.values())
+
+
+class PlanStep:
+    """
+    Apply one equation to derive one variable
+    """
+
+    __slots__ = ("node", "target")
+
+    def __init__(self, node: EquationNode, target: str):
+        self.node = node
+        self.target = target
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "equation_id": self.node.equation_id,
+            "equation": self.node.text,
+            "solved_for": self.target,
+            "requires": [v for v in self.node.variables if v != self.target]
+        }
+
+
+class EquationPlanner:
+    """
+    Bipartite variable-equation graph with cached shortest derivation plans
+    """
+
+    def __init__(self, nodes: List[EquationNode], version: Any = None):
+        self.nodes = nodes
+        self.version = version
+        self.by_variable: Dict[str, List[int]] = {}
+        for index, node in enumerate(nodes):
+            for variable in set(node.variables):
+                self.by_variable.setdefault(variable, []).append(index)
+        self.plan = lru_cache(maxsize=4096)(self._plan)
+
+    @classmethod
+    def from_db(cls, db: Session, version: Any = None) -> "EquationPlanner":
+        """
+        Build the graph from active catalog equations, one node per distinct (text, variables) pair
+        """
+        from workflow_models import Equation
+
+        equations = (
+            db.query(Equation)
+            .filter(Equation.is_active == True)
+            .options(selectinload(Equation.inputs), selectinload(Equation.outputs))
+            .order_by(Equation.id)
+            .all()
+        )
+
+        nodes, seen = [], set()
+        for equation in equations:
+            symbols = {v.symbol: v.name for v in list(equation.inputs) + list(equation.outputs) if v.symbol and v.name}
+            signature = (equation.equation, tuple(sorted(symbols.items())))
+            if signature in seen:
+                continue
+            seen.add(signature)
+            try:
+                nodes.append(EquationNode(equation.equation_id, equation.equation, symbols))
+            except Exception:
+                continue  # unparseable catalog rows cannot take part in chains
+        return cls(nodes, version)
+
+    @property
+    def variables(self) -> List[str]:
+        return sorted(self.by_variable)
+
+    def _plan(self, known: FrozenSet[str], target: str) -> Optional[Tuple[PlanStep, ...]]:
+        """
+        Cheapest plan (fewest equation applications, counting shared prerequisites once per use)
+        to derive target from known, or None if it is unreachable
+        """
+        if target in known:
+            return ()
+
+        cost: Dict[str, float] = {v: 0.0 for v in known}
+        via: Dict[str, Tuple[int, str]] = {}
+        done = set()
+        # unresolved variable count per equation; an equation fires when one remains
+        pending = [len(set(node.variables) - known) for node in self.nodes]
+        queue = [(0.0, v) for v in known]
+        heapq.heapify(queue)
+
+        for index, node in enumerate(self.nodes):
+            if pending[index] == 1:
+                self._relax(index, known, cost, via, queue)
+
+        while queue:
+            current, variable = heapq.heappop(queue)
+            if variable in done or current > cost.get(variable, float("inf")):
+                continue
+            done.add(variable)
+            if variable == target:
+                break
+            if variable in known:
+                continue
+            for index in self.by_variable.get(variable, []):
+                pending[index] -= 1
+                if pending[index] == 1:
+                    self._relax(index, done | known, cost, via, queue)
+
+        if target not in done:
+            return None
+
+        steps: List[PlanStep] = []
+        emitted = set(known)
+
+        def emit(variable: str):
+            if variable in emitted:
+                return
+            index, _ = via[variable]
+            node = self.nodes[index]
+            for prerequisite in node.variables:
+                if prerequisite != variable:
+                    emit(prerequisite)
+            steps.append(PlanStep(node, variable))
+            emitted.add(variable)
+
+        emit(target)
+        return tuple(steps)
+
+    def _relax(self, index: int, resolved, cost, via, queue):
+        node = self.nodes[index]
+        missing = [v for v in set(node.variables) if v not in resolved]
+        if len(missing) != 1 or node.solvable_for(missing[0]) is None:
+            return
+        variable = missing[0]
+        candidate = 1.0 + sum(cost[v] for v in set(node.variables) if v != variable)
+        if candidate < cost.get(variable, float("inf")):
+            cost[variable] = candidate
+            via[variable] = (index, variable)
+            heapq.heappush(queue, (candidate, variable))
+
+    def solve(self, known: Dict[str, Any], target: str) -> Dict[str, Any]:
+        """
+        Plan and execute a chain from known variable values to the target
+        """
+        try:
+            values = {name: float(value) for name, value in known.items() if value is not None and value != ""}
+            if target not in self.by_variable and target not in values:
+                raise ValueError(f"Unknown variable '{target}'")
+
+            plan = self.plan(frozenset(values), target)
+            if plan is None:
+                raise ValueError(f"'{target}' cannot be derived from: {', '.join(sorted(values)) or 'no inputs'}")
+
+            steps = []
+            for step in plan:
+                node = step.node
+                compiled = compile_equation(node.text)
+                args = {symbol: values[name] for symbol, name in node.symbols.items() if name in values}
+                values[step.target] = compiled.solve(node.solvable_for(step.target), args)
+                steps.append({**step.describe(), "value": values[step.target]})
+
+            return {"target": target, "value": values[target], "steps": steps, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+
+
+_planner: Optional[EquationPlanner] = None
+_lock = threading.Lock()
+
+
+def get_planner(db: Session) -> EquationPlanner:
+    """
+    Shared planner, rebuilt when the catalog changes (row count or latest updated_at).
+    Building only parses the equations; rearranged forms are derived as plans need them.
+    """
+    global _planner
+    from workflow_models import Equation
+
+    version = db.query(func.count(Equation.id), func.max(Equation.updated_at)).one()
+    version = tuple(version)
+    if _planner is None or _planner.version != version:
+        with _lock:
+            if _planner is None or _planner.version != version:
+                _planner = EquationPlanner.from_db(db, version)
+    return _planner
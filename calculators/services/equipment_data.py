@@ -0,0 +1,268 @@
+"""
+Equipment Data
+Immutable equipment catalogs shared by the calculators: standard ratings held as
+sorted arrays with bisect lookup, and read-only code/derating tables. Larger
+manufacturer catalogs (e.g. rows loaded from the workflow DB) can be registered
+as additional RatingTables and searched the same way.
+"""
+
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+
+def _freeze(table: Dict[str, Any]) -> MappingProxyType:
+    """
+    Read-only view of a (possibly nested) dict
+    """
+    return MappingProxyType({k: _freeze(v) if isinstance(v, dict) else v for k, v in table.items()})
+
+
+class RatingTable:
+    """
+    Catalog rows sorted by a numeric key, searched in O(log n).
+    Rows are plain numbers (key=None) or mappings such as {'mm2': 2.5, 'xlpe': 20}.
+    """
+
+    __slots__ = ("key", "keys", "rows")
+
+    def __init__(self, rows: Iterable[Union[float, Dict[str, Any]]], key: Optional[str] = None):
+        pairs = sorted(((row if key is None else row[key], row) for row in rows), key=lambda pair: pair[0])
+        self.key = key
+        self.keys: Tuple[float, ...] = tuple(k for k, _ in pairs)
+        self.rows: Tuple[Any, ...] = tuple(_freeze(row) if isinstance(row, dict) else row for _, row in pairs)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def column(self, name: str) -> Tuple[Any, ...]:
+        return tuple(row[name] for row in self.rows)
+
+    def ceiling(self, value: float, default: Any = None) -> Any:
+        """
+        First row whose key is >= value, or default when value exceeds the catalog
+        """
+        index = bisect_left(self.keys, value)
+        return self.rows[index] if index < len(self.rows) else default
+
+    def above(self, value: float, default: Any = None) -> Any:
+        """
+        First row whose key is strictly greater than value
+        """
+        index = bisect_right(self.keys, value)
+        return self.rows[index] if index < len(self.rows) else default
+
+    @property
+    def last(self) -> Any:
+        return self.rows[-1]
+
+
+# Cable sizing (IEC 60364-5-52 style ampacities, mm² / A)
+CABLE_STANDARDS = _freeze({
+    'IEC': {'name': 'IEC 60364-5-52', 'ref': 'Current-carrying capacities'},
+    'NEC': {'name': 'NEC 310', 'ref': 'Conductors for General Wiring'},
+    'BS7671': {'name': 'BS 7671', 'ref': 'Wiring Regulations'},
+    'AS3000': {'name': 'AS/NZS 3000', 'ref': 'Wiring Rules'}
+})
+
+INSTALL_DERATING = _freeze({'conduit': 0.8, 'cableTray': 0.85, 'directBuried': 0.9, 'openAir': 1.0, 'trunking': 0.75})
+
+CABLE_TABLE = RatingTable([
+    {'mm2': 1.5, 'xlpe': 15, 'pvc': 13},
+    {'mm2': 2.5, 'xlpe': 20, 'pvc': 17},
+    {'mm2': 4, 'xlpe': 27, 'pvc': 23},
+    {'mm2': 6, 'xlpe': 35, 'pvc': 30},
+    {'mm2': 10, 'xlpe': 48, 'pvc': 40},
+    {'mm2': 16, 'xlpe': 64, 'pvc': 53},
+    {'mm2': 25, 'xlpe': 85, 'pvc': 70},
+    {'mm2': 35, 'xlpe': 105, 'pvc': 88},
+    {'mm2': 50, 'xlpe': 130, 'pvc': 110},
+    {'mm2': 70, 'xlpe': 165, 'pvc': 140},
+    {'mm2': 95, 'xlpe': 200, 'pvc': 170},
+    {'mm2': 120, 'xlpe': 230, 'pvc': 195},
+    {'mm2': 150, 'xlpe': 260, 'pvc': 220},
+    {'mm2': 185, 'xlpe': 300, 'pvc': 250},
+    {'mm2': 240, 'xlpe': 350, 'pvc': 300},
+    {'mm2': 300, 'xlpe': 400, 'pvc': 340},
+    {'mm2': 400, 'xlpe': 470, 'pvc': 400}
+], key='xlpe')
+
+# Same rows keyed by conductor area, for looking up the rating of a given cable
+CABLE_AREAS = RatingTable(CABLE_TABLE, key='mm2')
+
+# Conductor resistivity at 20°C (Ω·mm²/m) and typical LV cable reactance (Ω/km)
+CONDUCTOR_RESISTIVITY = _freeze({'copper': 0.0172, 'aluminium': 0.0282})
+CABLE_REACTANCE = 0.08
+
+# Next-size recommendations in voltage_drop stop at 240 mm²
+VOLTAGE_DROP_SIZES = RatingTable([1.5, 2.5, 4, 6, 10, 16, 25, 35, 50, 70, 95, 120, 150, 185, 240])
+
+# Circuit breakers (IEC 60947-2)
+BREAKER_STANDARDS = _freeze({
+    'IEC': {'name': 'IEC 60947-2', 'ref': 'Circuit-breakers'},
+    'NEMA': {'name': 'NEMA AB1', 'ref': 'Molded Case Circuit Breakers'}
+})
+
+BREAKER_RATINGS = RatingTable([6, 10, 16, 20, 25, 32, 40, 50, 63, 80, 100, 125, 160, 200, 250, 320, 400, 500, 630, 800, 1000, 1250, 1600, 2000, 2500, 3200, 4000, 5000, 6300])
+
+BREAKER_ICU = RatingTable([3, 6, 10, 15, 25, 35, 50, 65, 80, 100, 150])
+
+TRIP_CURVES = _freeze({
+    'B': {'name': 'Curve B', 'trip_point': '3-5x In', 'trip_min': 3.0, 'trip_max': 5.0, 'application': 'Residential, lighting'},
+    'C': {'name': 'Curve C', 'trip_point': '5-10x In', 'trip_min': 5.0, 'trip_max': 10.0, 'application': 'General purpose, commercial'},
+    'D': {'name': 'Curve D', 'trip_point': '10-20x In', 'trip_min': 10.0, 'trip_max': 20.0, 'application': 'Motor, inductive loads'},
+    'K': {'name': 'Curve K', 'trip_point': '10-14x In', 'trip_min': 10.0, 'trip_max': 14.0, 'application': 'Motor protection'},
+    'Z': {'name': 'Curve Z', 'trip_point': '2-3x In', 'trip_min': 2.0, 'trip_max': 3.0, 'application': 'Electronic equipment'}
+})
+
+BREAKER_TYPES = _freeze({
+    'MCB': {'name': 'MCB (Miniature Circuit Breaker)', 'max_in': 125, 'max_icu': 25, 'poles': '1P/2P/3P/4P'},
+    'MCCB': {'name': 'MCCB (Molded Case Circuit Breaker)', 'max_in': 1600, 'max_icu': 100, 'poles': '3P/4P'},
+    'ACB': {'name': 'ACB (Air Circuit Breaker)', 'max_in': 6300, 'max_icu': 150, 'poles': '3P/4P'},
+    'VCB': {'name': 'VCB (Vacuum Circuit Breaker)', 'max_in': 4000, 'max_icu': 63, 'poles': '3P'}
+})
+
+# Arc flash equipment classes: enclosed (box) configuration, then per voltage band (<=1 kV, 1-5 kV, 5-15 kV)
+# the typical gap (mm), distance exponent x (IEEE 1584-2002 Table 4) and working distance (mm, Table 3)
+ARC_FLASH_EQUIPMENT = _freeze({
+    'open_air': {'enclosed': False, 'gap': (32, 102, 153), 'x': (2.0, 2.0, 2.0), 'distance': (455, 455, 455)},
+    'switchgear': {'enclosed': True, 'gap': (32, 102, 153), 'x': (1.473, 0.973, 0.973), 'distance': (610, 910, 910)},
+    'mcc': {'enclosed': True, 'gap': (25, 102, 153), 'x': (1.641, 0.973, 0.973), 'distance': (455, 910, 910)},
+    'panelboard': {'enclosed': True, 'gap': (25, 102, 153), 'x': (1.641, 0.973, 0.973), 'distance': (455, 910, 910)},
+    'cable': {'enclosed': False, 'gap': (13, 13, 13), 'x': (2.0, 2.0, 2.0), 'distance': (455, 455, 455)}
+})
+
+# PV module types (PVWatts v5): power temperature coefficient (1/°C) and STC efficiency
+PV_MODULE_TYPES = _freeze({
+    'standard': {'gamma': -0.0037, 'efficiency': 0.15},
+    'premium': {'gamma': -0.0035, 'efficiency': 0.19},
+    'thin_film': {'gamma': -0.0020, 'efficiency': 0.10}
+})
+
+# PV mounting heat loss factors (PVsyst model): constant U_c (W/m²K) and wind U_v (W/m²K per m/s)
+PV_MOUNTING = _freeze({
+    'open_rack': {'u_c': 29.0, 'u_v': 0.0},
+    'roof_mount': {'u_c': 20.0, 'u_v': 0.0},
+    'insulated': {'u_c': 15.0, 'u_v': 0.0}
+})
+
+# EN 12464-1 task requirements: maintained illuminance Em (lx) and uniformity U0 = Emin/Eavg
+EN12464_TASKS = _freeze({
+    'corridor': {'lux': 100, 'uniformity': 0.4},
+    'storage': {'lux': 100, 'uniformity': 0.4},
+    'warehouse': {'lux': 200, 'uniformity': 0.4},
+    'loading_bay': {'lux': 150, 'uniformity': 0.4},
+    'retail': {'lux': 300, 'uniformity': 0.4},
+    'classroom': {'lux': 300, 'uniformity': 0.6},
+    'office': {'lux': 500, 'uniformity': 0.6},
+    'conference': {'lux': 500, 'uniformity': 0.6},
+    'technical_drawing': {'lux': 750, 'uniformity': 0.7},
+    'assembly_rough': {'lux': 200, 'uniformity': 0.6},
+    'assembly_medium': {'lux': 300, 'uniformity': 0.6},
+    'assembly_fine': {'lux': 500, 'uniformity': 0.7},
+    'assembly_precision': {'lux': 750, 'uniformity': 0.7}
+})
+
+# Rotationally symmetric luminaire distributions I(gamma) = I0 cos^n(gamma), downward hemisphere only
+LUMINAIRE_DISTRIBUTIONS = _freeze({'wide': 1, 'medium': 2, 'narrow': 5, 'very_narrow': 10})
+
+# IEEE 80 Table 1 earthing conductor constants: alpha_r (1/°C at 20 °C), K0 (°C), fusing temperature Tm (°C),
+# resistivity rho_r (µΩ·cm at 20 °C) and thermal capacity TCAP (J/(cm³·°C))
+EARTHING_MATERIALS = _freeze({
+    'copper_annealed': {'alpha_r': 0.00393, 'k0': 234, 'tm': 1083, 'rho_r': 1.72, 'tcap': 3.42},
+    'copper_hard_drawn': {'alpha_r': 0.00381, 'k0': 242, 'tm': 1084, 'rho_r': 1.78, 'tcap': 3.42},
+    'copper_clad_steel': {'alpha_r': 0.00378, 'k0': 245, 'tm': 1084, 'rho_r': 4.40, 'tcap': 3.85},
+    'aluminium': {'alpha_r': 0.00403, 'k0': 228, 'tm': 657, 'rho_r': 2.86, 'tcap': 2.56},
+    'galvanized_steel': {'alpha_r': 0.00320, 'k0': 293, 'tm': 419, 'rho_r': 20.1, 'tcap': 3.93},
+    'stainless_steel': {'alpha_r': 0.00130, 'k0': 749, 'tm': 1400, 'rho_r': 72.0, 'tcap': 4.03}
+})
+
+# Pipe materials: absolute roughness (mm) for Darcy-Weisbach and Hazen-Williams C factor
+PIPE_MATERIALS = _freeze({
+    'steel_new': {'roughness': 0.045, 'c_factor': 120},
+    'steel_old': {'roughness': 0.2, 'c_factor': 100},
+    'galvanized_steel': {'roughness': 0.15, 'c_factor': 120},
+    'copper': {'roughness': 0.0015, 'c_factor': 140},
+    'pvc': {'roughness': 0.0015, 'c_factor': 150},
+    'hdpe': {'roughness': 0.007, 'c_factor': 150},
+    'ductile_iron': {'roughness': 0.1, 'c_factor': 130},
+    'cast_iron': {'roughness': 0.26, 'c_factor': 100},
+    'concrete': {'roughness': 0.5, 'c_factor': 120}
+})
+
+# Pipe fitting loss coefficients K (fully turbulent, h = K v² / 2g)
+PIPE_FITTINGS = _freeze({
+    'elbow_90': 0.75, 'elbow_45': 0.35, 'long_radius_elbow': 0.45, 'tee_run': 0.4, 'tee_branch': 1.5,
+    'gate_valve': 0.15, 'ball_valve': 0.05, 'butterfly_valve': 0.5, 'globe_valve': 6.0, 'check_valve': 2.0,
+    'strainer': 2.0, 'reducer': 0.3, 'entrance': 0.5, 'exit': 1.0
+})
+
+# Duct materials: absolute roughness (mm), ASHRAE Fundamentals ch. 21
+DUCT_MATERIALS = _freeze({
+    'galvanized': 0.09, 'aluminium': 0.03, 'stainless_steel': 0.05, 'pvc': 0.01,
+    'fibreglass_board': 0.9, 'flexible': 3.0, 'concrete': 1.3
+})
+
+# Duct fitting loss coefficients C on the fitting's own velocity pressure (ASHRAE duct fitting database, typical values)
+DUCT_FITTINGS = _freeze({
+    'elbow_90': 0.22, 'elbow_90_mitred': 1.2, 'elbow_90_vaned': 0.25, 'elbow_45': 0.15, 'tee_straight': 0.1,
+    'tee_branch': 0.9, 'wye_branch': 0.4, 'reducer': 0.05, 'transition': 0.15, 'volume_damper': 0.2,
+    'fire_damper': 0.2, 'flexible_connector': 0.1, 'entry': 0.5
+})
+
+# EN 1506 nominal diameters of circular ducts (mm)
+DUCT_ROUND_SIZES = RatingTable([80, 100, 125, 160, 200, 250, 315, 355, 400, 450, 500, 560, 630, 710, 800, 900, 1000, 1120, 1250, 1400, 1600, 1800, 2000])
+
+# Chiller part-load performance: DOE-2 EIR-fPLR quadratic (a + b PLR + c PLR²) and minimum unloading ratio
+CHILLER_PART_LOAD = _freeze({
+    'waterCooled': {'curve': (0.17149, 0.58786, 0.24095), 'min_plr': 0.1},
+    'airCooled': {'curve': (0.06369, 0.58488, 0.35280), 'min_plr': 0.15},
+    'absorption': {'curve': (0.097, 0.903, 0.0), 'min_plr': 0.25}
+})
+
+# ISO 2858 end-suction pumps, nominal best-efficiency point at 2900 rpm: size -> (flow m³/h, head m, efficiency %)
+_ISO_2858_BEP = {
+    '32-125': (12.5, 20, 58), '32-160': (12.5, 32, 52), '32-200': (12.5, 50, 45),
+    '40-125': (25, 20, 66), '40-160': (25, 32, 62), '40-200': (25, 50, 56), '40-250': (25, 80, 47),
+    '50-125': (50, 20, 72), '50-160': (50, 32, 70), '50-200': (50, 50, 65), '50-250': (50, 80, 57),
+    '65-125': (100, 20, 77), '65-160': (100, 32, 76), '65-200': (100, 50, 72), '65-250': (100, 80, 66),
+    '80-160': (160, 32, 79), '80-200': (160, 50, 77), '80-250': (160, 80, 73), '80-315': (160, 125, 66),
+    '100-200': (250, 50, 80), '100-250': (250, 80, 78), '100-315': (250, 125, 73),
+    '125-250': (400, 80, 81), '125-315': (400, 125, 78), '150-315': (630, 125, 81),
+}
+
+# Catalog rows at 2900 and 1450 rpm (affinity-scaled, two points less efficient at the lower speed)
+PUMP_CATALOG = RatingTable([
+    {'model': f"ES {size}/{speed}", 'speed': speed, 'flow': flow * ratio, 'head': head * ratio ** 2,
+     'efficiency': efficiency - (2 if ratio < 1 else 0)}
+    for size, (flow, head, efficiency) in _ISO_2858_BEP.items()
+    for speed, ratio in ((2900, 1.0), (1450, 0.5))
+], key='flow')
+
+# IEC 60072 standard motor outputs (kW)
+MOTOR_RATINGS = RatingTable([0.37, 0.55, 0.75, 1.1, 1.5, 2.2, 3, 4, 5.5, 7.5, 11, 15, 18.5, 22, 30, 37, 45, 55, 75, 90,
+                             110, 132, 160, 200, 250, 315, 355, 400, 450, 500])
+
+# Additional catalogs, e.g. manufacturer ranges loaded at startup
+CATALOGS: Dict[str, RatingTable] = {}
+
+
+def register_catalog(name: str, rows: Iterable[Any], key: Optional[str] = None) -> RatingTable:
+    """
+    Build and register a catalog from dicts or ORM rows (attributes are read when rows are not dicts).
+    Register at startup: cached calculator results do not track catalog contents.
+    """
+    rows = [row if isinstance(row, (dict, int, float)) else {k: v for k, v in vars(row).items() if not k.startswith('_')}
+            for row in rows]
+    table = RatingTable(rows, key=key)
+    CATALOGS[name] = table
+    return table
+
+
+def get_catalog(name: str) -> RatingTable:
+    if name not in CATALOGS:
+        raise ValueError(f"Unknown equipment catalog: {name}")
+    return CATALOGS[name]
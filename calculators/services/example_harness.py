@@ -0,0 +1,321 @@
+"""
+Example Harness
+Runs every worked example (examples.json and the EquationExample table) through the
+calculator registry and the compiled equation engine in worker processes, checks the
+outputs against the expected values and records per-calculator latency (p50/p99) and
+throughput. Reports are written as a JSON baseline that later runs are diffed against:
+
+    python -m calculators.services.example_harness --baseline example_baseline.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, selectinload
+
+from calculators.services.equation_engine import compile_equation, equation_symbols
+
+DEFAULT_EXAMPLES = Path(__file__).resolve().parents[2] / "examples.json"
+REL_TOLERANCE = 1e-3
+ABS_TOLERANCE = 1e-4  # examples.json rounds expected outputs to 4 decimals
+CHUNK_SIZE = 250
+MAX_SLOWDOWN = 1.5
+MIN_SLOWDOWN_US = 5.0  # latency changes below this are timer noise
+
+
+class ExampleCase:
+    """
+    One worked example bound to the calculator or catalog equation that evaluates it
+    """
+
+    __slots__ = ("example_id", "calculator", "kind", "target", "inputs", "expected", "rel_tol", "abs_tol")
+
+    def __init__(self, example_id: str, calculator: str, kind: str, target: str,
+                 inputs: Dict[str, Any], expected: Dict[str, Any], tolerance: Optional[Dict[str, float]] = None):
+        tolerance = tolerance or {}
+        self.example_id = example_id
+        self.calculator = calculator  # registry id or catalog equation_id, used to group metrics
+        self.kind = kind  # "calculator" or "equation"
+        self.target = target  # registry id or equation text
+        self.inputs = inputs
+        self.expected = expected
+        self.rel_tol = float(tolerance.get("rel", REL_TOLERANCE))
+        self.abs_tol = float(tolerance.get("abs", ABS_TOLERANCE))
+
+
+def load_examples(paths: Iterable[Path]) -> List[Dict[str, Any]]:
+    """
+    Read example files shaped like examples.json ({"examples": [...]}) or plain lists
+    """
+    examples = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        examples.extend(data["examples"] if isinstance(data, dict) else data)
+    return examples
+
+
+def _catalog(db: Session) -> List[Tuple[str, str, str, frozenset]]:
+    """
+    (equation_id, domain, text, symbols) for each distinct active equation text
+    """
+    from workflow_models import Equation
+
+    rows = db.query(Equation.equation_id, Equation.domain, Equation.equation).filter(
+        Equation.is_active == True).order_by(Equation.id).all()
+
+    catalog, seen = [], set()
+    for equation_id, domain, text in rows:
+        if text in seen:
+            continue
+        seen.add(text)
+        try:
+            catalog.append((equation_id, domain, text, equation_symbols(text)))
+        except Exception:
+            continue  # unparseable rows are reported by the examples that needed them
+    return catalog
+
+
+def build_cases(db: Session, examples: List[Dict[str, Any]], include_db: bool = True) -> Tuple[List[ExampleCase], List[Dict[str, str]]]:
+    """
+    Bind examples to registry calculators ("calculator" key) or to the catalog equation
+    whose variables match the example's inputs and outputs; returns (cases, unmatched)
+    """
+    from calculators.registry import CALCULATOR_REGISTRY
+    from workflow_models import Equation, EquationExample
+
+    catalog = _catalog(db)
+    cases, unmatched = [], []
+
+    for example in examples:
+        example_id = str(example.get("id"))
+        inputs, expected = example.get("inputs") or {}, example.get("outputs") or {}
+        calculator = example.get("calculator")
+        if calculator:
+            if calculator in CALCULATOR_REGISTRY:
+                cases.append(ExampleCase(example_id, calculator, "calculator", calculator, inputs, expected, example.get("tolerance")))
+            else:
+                unmatched.append({"id": example_id, "reason": f"Unknown calculator '{calculator}'"})
+            continue
+
+        symbols = frozenset(inputs) | frozenset(expected)
+        matches = [entry for entry in catalog if entry[3] == symbols]
+        matches.sort(key=lambda entry: entry[1] != example.get("domain"))
+        if not matches:
+            unmatched.append({"id": example_id, "reason": f"No catalog equation in {', '.join(sorted(symbols))}"})
+            continue
+        equation_id, _, text, _ = matches[0]
+        cases.append(ExampleCase(example_id, equation_id, "equation", text, inputs, expected, example.get("tolerance")))
+
+    if include_db:
+        rows = db.query(EquationExample).options(
+            selectinload(EquationExample.equation).selectinload(Equation.inputs),
+            selectinload(EquationExample.equation).selectinload(Equation.outputs),
+        ).order_by(EquationExample.id).all()
+        for row in rows:
+            equation = row.equation
+            symbol_of = {v.name: v.symbol for v in list(equation.inputs) + list(equation.outputs) if v.symbol}
+            inputs = {symbol_of.get(k, k): v for k, v in (row.input_values or {}).items()}
+            expected = {symbol_of.get(k, k): v for k, v in (row.expected_output or {}).items()}
+            cases.append(ExampleCase(f"{equation.equation_id}#{row.id}", equation.equation_id, "equation",
+                                     equation.equation, inputs, expected))
+
+    return cases, unmatched
+
+
+def _evaluator(kind: str, target: str):
+    """
+    Callable mapping a case to its computed outputs, compiled once per worker
+    """
+    if kind == "equation":
+        compiled = compile_equation(target)
+        return lambda case: {symbol: compiled.solve(symbol, case.inputs) for symbol in case.expected}
+
+    from calculators.registry import CALCULATOR_REGISTRY
+
+    spec = CALCULATOR_REGISTRY[target]
+
+    def evaluate(case: ExampleCase) -> Dict[str, Any]:
+        result = spec.run(spec.validate(case.inputs))
+        if not result.get("success"):
+            raise ValueError(result.get("error"))
+        return {key: result["results"].get(key) for key in case.expected}
+
+    return evaluate
+
+
+def _matches(actual: Any, expected: Any, rel_tol: float, abs_tol: float) -> bool:
+    if isinstance(expected, (int, float)) and not isinstance(expected, bool):
+        return isinstance(actual, (int, float)) and math.isclose(actual, expected, rel_tol=rel_tol, abs_tol=abs_tol)
+    return actual == expected
+
+
+def run_chunk(cases: List[ExampleCase], repeat: int) -> Dict[str, Any]:
+    """
+    Worker task: evaluate one calculator's cases, timing `repeat` evaluations of each
+    """
+    first = cases[0]
+    outcomes, samples = [], []
+    try:
+        evaluate = _evaluator(first.kind, first.target)
+    except Exception as e:
+        return {"calculator": first.calculator, "kind": first.kind, "samples": [],
+                "outcomes": [{"id": c.example_id, "passed": False, "error": str(e)} for c in cases]}
+
+    for case in cases:
+        try:
+            actual = evaluate(case)  # untimed: warms lazily built state
+            for _ in range(repeat):
+                start = time.perf_counter_ns()
+                evaluate(case)
+                samples.append(time.perf_counter_ns() - start)
+        except Exception as e:
+            outcomes.append({"id": case.example_id, "passed": False, "error": str(e)})
+            continue
+        mismatched = {key: {"expected": value, "actual": actual.get(key)} for key, value in case.expected.items()
+                      if not _matches(actual.get(key), value, case.rel_tol, case.abs_tol)}
+        outcome = {"id": case.example_id, "passed": not mismatched}
+        if mismatched:
+            outcome["mismatched"] = mismatched
+        outcomes.append(outcome)
+
+    return {"calculator": first.calculator, "kind": first.kind, "samples": samples, "outcomes": outcomes}
+
+
+def _chunks(cases: List[ExampleCase]) -> List[List[ExampleCase]]:
+    groups: Dict[str, List[ExampleCase]] = {}
+    for case in cases:
+        groups.setdefault(case.calculator, []).append(case)
+    return [group[i:i + CHUNK_SIZE] for group in groups.values() for i in range(0, len(group), CHUNK_SIZE)]
+
+
+def run_examples(db: Session, paths: Optional[List[Path]] = None, workers: Optional[int] = None,
+                 repeat: int = 10, include_db: bool = True) -> Dict[str, Any]:
+    """
+    Run every example and return the report (the baseline format)
+    """
+    examples = load_examples(paths if paths is not None else [DEFAULT_EXAMPLES])
+    cases, unmatched = build_cases(db, examples, include_db)
+    chunks = _chunks(cases)
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    if workers == 1 or len(chunks) <= 1:
+        results = [run_chunk(chunk, repeat) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(run_chunk, chunks, [repeat] * len(chunks)))
+    wall = time.perf_counter() - started
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        entry = merged.setdefault(result["calculator"], {"kind": result["kind"], "samples": [], "outcomes": []})
+        entry["samples"].extend(result["samples"])
+        entry["outcomes"].extend(result["outcomes"])
+
+    calculators = {}
+    for name in sorted(merged):
+        entry = merged[name]
+        samples = np.asarray(entry["samples"], dtype=float) / 1000.0  # microseconds
+        failures = [o for o in entry["outcomes"] if not o["passed"]]
+        calculators[name] = {
+            "kind": entry["kind"],
+            "examples": len(entry["outcomes"]),
+            "passed": len(entry["outcomes"]) - len(failures),
+            "failed": [o["id"] for o in failures],
+            "failures": failures[:10],
+            "evaluations": int(samples.size),
+            "p50_us": round(float(np.percentile(samples, 50)), 3) if samples.size else None,
+            "p99_us": round(float(np.percentile(samples, 99)), 3) if samples.size else None,
+            "throughput_per_s": round(float(samples.size / (samples.sum() / 1e6)), 1) if samples.size else None,
+        }
+
+    passed = sum(c["passed"] for c in calculators.values())
+    return {
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "workers": workers,
+        "repeat": repeat,
+        "examples": len(cases),
+        "passed": passed,
+        "failed": len(cases) - passed,
+        "unmatched": unmatched,
+        "wall_seconds": round(wall, 3),
+        "calculators": calculators,
+    }
+
+
+def compare_reports(previous: Dict[str, Any], current: Dict[str, Any], max_slowdown: float = MAX_SLOWDOWN) -> List[Dict[str, Any]]:
+    """
+    Regressions of current against a previous baseline: examples that used to pass and now
+    fail, calculators that disappeared, and p50/p99 latency growing beyond max_slowdown
+    """
+    regressions = []
+    for name, before in previous.get("calculators", {}).items():
+        after = current["calculators"].get(name)
+        if after is None:
+            regressions.append({"calculator": name, "type": "missing"})
+            continue
+
+        newly_failed = sorted(set(after["failed"]) - set(before.get("failed", [])))
+        if newly_failed:
+            regressions.append({"calculator": name, "type": "correctness", "examples": newly_failed})
+
+        for metric in ("p50_us", "p99_us"):
+            old, new = before.get(metric), after.get(metric)
+            if old and new and new > old * max_slowdown and new - old > MIN_SLOWDOWN_US:
+                regressions.append({"calculator": name, "type": "latency", "metric": metric,
+                                    "baseline": old, "current": new, "ratio": round(new / old, 2)})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run catalog examples and diff against a benchmark baseline")
+    parser.add_argument("--examples", action="append", type=Path, help="example file (repeatable, default examples.json)")
+    parser.add_argument("--baseline", type=Path, default=Path("example_baseline.json"))
+    parser.add_argument("--update", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-slowdown", type=float, default=MAX_SLOWDOWN)
+    parser.add_argument("--no-db", action="store_true", help="skip EquationExample rows")
+    args = parser.parse_args(argv)
+
+    from workflow_database import WorkflowSessionLocal
+
+    db = WorkflowSessionLocal()
+    try:
+        report = run_examples(db, args.examples, args.workers, args.repeat, not args.no_db)
+    finally:
+        db.close()
+
+    print(f"{report['passed']}/{report['examples']} examples passed, {len(report['unmatched'])} unmatched, "
+          f"{report['wall_seconds']}s on {report['workers']} workers")
+    for name, entry in report["calculators"].items():
+        print(f"  {name:<50} {entry['passed']:>5}/{entry['examples']:<5} p50 {entry['p50_us']}us  "
+              f"p99 {entry['p99_us']}us  {entry['throughput_per_s']}/s")
+
+    regressions = []
+    if args.baseline.exists():
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_reports(json.load(f), report, args.max_slowdown)
+        for regression in regressions:
+            print(f"REGRESSION {json.dumps(regression)}")
+
+    if args.update or not args.baseline.exists():
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
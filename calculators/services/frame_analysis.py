@@ -0,0 +1,525 @@
+"""
+Frame Analysis
+Linear-elastic 2D frames and continuous beams by the direct stiffness method. Member stiffness
+matrices are built and rotated for all members at once, scattered into a sparse global matrix
+and factorized once (SuperLU); every load case is a column of one right-hand side, and load
+combinations are a factor matrix applied to the case results. Shear, moment and deflection are
+sampled along each member from its end forces plus the exact in-span load terms.
+"""
+
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from calculators.services.load_combinations import CombinationSet
+
+DOF = 3  # ux, uy, rz per node
+DEFAULT_STATIONS = 21
+
+# Restrained (ux, uy, rz) for each support type
+SUPPORTS = {
+    'free': (False, False, False),
+    'fixed': (True, True, True),
+    'pinned': (True, True, False),
+    'roller': (False, True, False),
+    'roller_x': (True, False, False),
+}
+
+# Elastic modulus of structural materials (kN/m²)
+FRAME_MATERIALS = {'steel': 200e6, 'concrete': 30e6, 'timber': 11e6, 'aluminium': 70e6}
+
+
+def _restraint(support: Union[None, str, Sequence[bool]], node_id: Any) -> tuple:
+    if support is None:
+        return SUPPORTS['free']
+    if isinstance(support, str):
+        if support not in SUPPORTS:
+            raise ValueError(f"Unknown support '{support}' at node {node_id} (expected {', '.join(SUPPORTS)})")
+        return SUPPORTS[support]
+    if len(support) != DOF:
+        raise ValueError(f"Support at node {node_id} must restrain [ux, uy, rz]")
+    return tuple(bool(value) for value in support)
+
+
+class Frame:
+    """
+    Frame model as arrays: node coordinates and restraints, member end nodes, lengths, direction cosines,
+    section properties, DOF map, and the sparse global stiffness matrix.
+    nodes: {"id", "x", "y" (m), "support" ('fixed', 'pinned', 'roller', 'roller_x' or [ux, uy, rz] flags)}
+    members: {"id", "start", "end", "E" (kN/m²) or "material", "A" (m²) and "I" (m⁴), or "b" and "h" (m) of a rectangle}
+    """
+
+    def __init__(self, nodes: Sequence[Dict[str, Any]], members: Sequence[Dict[str, Any]], material: str = 'steel'):
+        if not nodes or not members:
+            raise ValueError("The frame needs nodes and members")
+        self.node_ids = [node['id'] for node in nodes]
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.member_ids = [member.get('id', i) for i, member in enumerate(members)]
+        self.member_index = {member_id: i for i, member_id in enumerate(self.member_ids)}
+        if len(self.node_index) != len(nodes) or len(self.member_index) != len(members):
+            raise ValueError("Node and member ids must be unique")
+
+        self.xy = np.array([[float(node.get('x', 0)), float(node.get('y', 0))] for node in nodes])
+        self.restrained = np.array([_restraint(node.get('support'), node['id']) for node in nodes], dtype=bool).ravel()
+        if not self.restrained.any():
+            raise ValueError("The frame has no supports")
+        try:
+            self.start = np.array([self.node_index[member['start']] for member in members])
+            self.end = np.array([self.node_index[member['end']] for member in members])
+        except KeyError as e:
+            raise ValueError(f"Member node {e.args[0]} does not exist")
+
+        delta = self.xy[self.end] - self.xy[self.start]
+        self.length = np.hypot(delta[:, 0], delta[:, 1])
+        if np.any(self.length <= 0):
+            raise ValueError("Members must join two distinct node positions")
+        self.cos, self.sin = delta[:, 0] / self.length, delta[:, 1] / self.length
+        self.E, self.A, self.I = (np.array(values) for values in zip(*(self._section(member, material) for member in members)))
+
+        self.dofs = np.column_stack([DOF * self.start + k for k in range(DOF)] + [DOF * self.end + k for k in range(DOF)])
+        self.rotation = self._rotation()
+        self.local_stiffness = self._local_stiffness()
+        element = np.einsum('mji,mjk,mkl->mil', self.rotation, self.local_stiffness, self.rotation)
+        size = DOF * len(nodes)
+        rows = np.repeat(self.dofs, 2 * DOF, axis=1).ravel()
+        cols = np.tile(self.dofs, (1, 2 * DOF)).ravel()
+        self.stiffness = sparse.coo_matrix((element.ravel(), (rows, cols)), shape=(size, size)).tocsc()
+
+    @staticmethod
+    def _section(member: Dict[str, Any], material: str):
+        name = member.get('material', material)
+        if member.get('E') is not None:
+            modulus = float(member['E'])
+        elif name in FRAME_MATERIALS:
+            modulus = FRAME_MATERIALS[name]
+        else:
+            raise ValueError(f"Unknown material: {name} (expected {', '.join(FRAME_MATERIALS)} or an explicit E)")
+        if member.get('b') is not None and member.get('h') is not None:
+            b, h = float(member['b']), float(member['h'])
+            area, inertia = b * h, b * h ** 3 / 12
+        elif member.get('I') is not None:
+            inertia = float(member['I'])
+            area = float(member['A']) if member.get('A') is not None else None
+            if area is None:
+                raise ValueError(f"Member {member.get('id')} needs an area A (m²) as well as I")
+        else:
+            raise ValueError(f"Member {member.get('id')} needs A and I, or b and h")
+        if modulus <= 0 or area <= 0 or inertia <= 0:
+            raise ValueError(f"Member {member.get('id')} needs positive E, A and I")
+        return modulus, area, inertia
+
+    def _rotation(self) -> np.ndarray:
+        """Global-to-local transformation (M, 6, 6)"""
+        block = np.zeros((len(self.length), DOF, DOF))
+        block[:, 0, 0] = block[:, 1, 1] = self.cos
+        block[:, 0, 1], block[:, 1, 0] = self.sin, -self.sin
+        block[:, 2, 2] = 1.0
+        rotation = np.zeros((len(self.length), 2 * DOF, 2 * DOF))
+        rotation[:, :DOF, :DOF] = rotation[:, DOF:, DOF:] = block
+        return rotation
+
+    def _local_stiffness(self) -> np.ndarray:
+        """Euler-Bernoulli frame element stiffness in local axes (M, 6, 6)"""
+        L, EA, EI = self.length, self.E * self.A, self.E * self.I
+        k = np.zeros((len(L), 2 * DOF, 2 * DOF))
+        axial, shear, coupling = EA / L, 12 * EI / L ** 3, 6 * EI / L ** 2
+        k[:, 0, 0] = k[:, 3, 3] = axial
+        k[:, 0, 3] = k[:, 3, 0] = -axial
+        k[:, 1, 1] = k[:, 4, 4] = shear
+        k[:, 1, 4] = k[:, 4, 1] = -shear
+        k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = coupling
+        k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -coupling
+        k[:, 2, 2] = k[:, 5, 5] = 4 * EI / L
+        k[:, 2, 5] = k[:, 5, 2] = 2 * EI / L
+        return k
+
+
+class FrameLoads:
+    """
+    Load cases as arrays over (member or DOF, case): nodal loads, uniform member loads and point loads.
+    Loads: {"node", "fx", "fy" (kN), "mz" (kN·m)} in global axes, {"member", "w" (kN/m)} and
+    {"member", "P" (kN), "a" (m from the start node)} along the member's local y axis (upward on a beam drawn left to right).
+    """
+
+    def __init__(self, frame: Frame, load_cases: Mapping[str, Sequence[Dict[str, Any]]]):
+        if not load_cases:
+            raise ValueError("At least one load case is required")
+        self.names = list(load_cases)
+        count = len(self.names)
+        self.nodal = np.zeros((DOF * len(frame.node_ids), count))
+        self.uniform = np.zeros((len(frame.member_ids), count))
+        point_member, point_case, point_load, point_position = [], [], [], []
+        for case, name in enumerate(self.names):
+            for load in load_cases[name]:
+                if 'node' in load:
+                    if load['node'] not in frame.node_index:
+                        raise ValueError(f"Load case {name}: node {load['node']} does not exist")
+                    base = DOF * frame.node_index[load['node']]
+                    for k, key in enumerate(('fx', 'fy', 'mz')):
+                        self.nodal[base + k, case] += float(load.get(key, 0))
+                    continue
+                if load.get('member') not in frame.member_index:
+                    raise ValueError(f"Load case {name}: loads need an existing 'node' or 'member' ({load.get('member')})")
+                member = frame.member_index[load['member']]
+                if 'w' in load:
+                    self.uniform[member, case] += float(load['w'])
+                if 'P' in load:
+                    position = float(load.get('a', frame.length[member] / 2))
+                    if not 0 <= position <= frame.length[member]:
+                        raise ValueError(f"Load case {name}: point load position {position} m is outside member {load['member']}")
+                    point_member.append(member)
+                    point_case.append(case)
+                    point_load.append(float(load['P']))
+                    point_position.append(position)
+        self.point_member = np.array(point_member, dtype=int)
+        self.point_case = np.array(point_case, dtype=int)
+        self.point_load = np.array(point_load, dtype=float)
+        self.point_position = np.array(point_position, dtype=float)
+
+    def fixed_end_forces(self, frame: Frame) -> np.ndarray:
+        """Member end reactions with both ends clamped, local axes (M, 6, cases)"""
+        L, w = frame.length[:, None], self.uniform
+        fef = np.zeros((len(frame.member_ids), 2 * DOF, len(self.names)))
+        fef[:, 1] = fef[:, 4] = -w * L / 2
+        fef[:, 2] = -w * L ** 2 / 12
+        fef[:, 5] = w * L ** 2 / 12
+        m, c, P, a = self.point_member, self.point_case, self.point_load, self.point_position
+        L = frame.length[m]
+        b = L - a
+        np.add.at(fef, (m, 1, c), -P * b ** 2 * (3 * a + b) / L ** 3)
+        np.add.at(fef, (m, 2, c), -P * a * b ** 2 / L ** 2)
+        np.add.at(fef, (m, 4, c), -P * a ** 2 * (a + 3 * b) / L ** 3)
+        np.add.at(fef, (m, 5, c), P * a ** 2 * b / L ** 2)
+        return fef
+
+
+class FrameSolution:
+    """
+    Results over scenarios (load cases, then combinations): displacements (DOFs, S), reactions (DOFs, S),
+    member end forces in local axes (M, 6, S), and axial, shear, moment and deflection sampled at
+    stations (M, n, S) with positions x (M, n): at least `stations` evenly spaced points, both sides of every point
+    load and the zero-shear points of every scenario. Moments are sagging-positive; deflection is the
+    local transverse displacement, relative_deflection the same measured from the chord between the member ends.
+    """
+
+    def __init__(self, frame: Frame, loads: FrameLoads, combinations: Union[None, str, Mapping[str, Mapping[str, float]]] = None,
+                 stations: int = DEFAULT_STATIONS):
+        if stations < 2:
+            raise ValueError("At least two stations per member are needed")
+        self.frame = frame
+        if isinstance(combinations, str):
+            combinations = CombinationSet.from_code(loads.names, combinations).as_dict()
+        combinations = combinations or {}
+        self.case_names = loads.names
+        self.combination_names = list(combinations)
+        self.names = self.case_names + self.combination_names
+        # Scenario factors on the load cases: identity for the cases, then one row per combination
+        factors = np.eye(len(loads.names))
+        if combinations:
+            rows = np.zeros((len(combinations), len(loads.names)))
+            for row, (name, combination) in enumerate(combinations.items()):
+                for case, factor in combination.items():
+                    if case not in loads.names:
+                        raise ValueError(f"Combination {name} refers to unknown load case {case}")
+                    rows[row, loads.names.index(case)] = float(factor)
+            factors = np.vstack([factors, rows])
+        self.factors = factors
+
+        fef = loads.fixed_end_forces(frame)
+        equivalent = np.einsum('mji,mjc->mic', frame.rotation, fef)
+        force = loads.nodal.copy()
+        np.add.at(force, frame.dofs.ravel(), -equivalent.reshape(-1, len(loads.names)))
+
+        free = ~frame.restrained
+        displacement = np.zeros_like(force)
+        try:
+            lu = splu(frame.stiffness[free][:, free].tocsc())
+        except RuntimeError:
+            raise ValueError("The structure is unstable: add supports or members so it cannot move as a mechanism")
+        displacement[free] = lu.solve(np.ascontiguousarray(force[free]))
+        if not np.all(np.isfinite(displacement)):
+            raise ValueError("The structure is unstable: add supports or members so it cannot move as a mechanism")
+        reaction = np.where(frame.restrained[:, None], frame.stiffness @ displacement - force, 0.0)
+
+        local = np.einsum('mij,mjc->mic', frame.rotation, displacement[frame.dofs])
+        end_forces = np.einsum('mij,mjc->mic', frame.local_stiffness, local) + fef
+        self.free_dofs = int(free.sum())
+        self.displacement = displacement @ factors.T
+        self.reaction = reaction @ factors.T
+        self.end_forces = end_forces @ factors.T
+
+        # Stations: evenly spaced, either side of every point load, then the zero-shear points where span moments peak
+        L = frame.length
+        even = np.repeat(np.arange(len(L)), stations), (L[:, None] * np.linspace(0, 1, stations)).ravel()
+        m, a = loads.point_member, loads.point_position
+        base = [even, (m, a), (m, np.minimum(a + 1e-9 * L[m], L[m]))]
+        self._sample(loads, local, end_forces, self._stations(*base))
+        self._sample(loads, local, end_forces, self._stations(*base, self._zero_shear(loads)))
+
+    def _stations(self, *groups) -> np.ndarray:
+        """Sorted, distinct station positions per member from (member, position) groups, shorter rows padded with the member length"""
+        L = self.frame.length
+        member = np.concatenate([group[0] for group in groups]).astype(int)
+        position = np.concatenate([group[1] for group in groups])
+        order = np.lexsort((position, member))
+        member, position = member[order], position[order]
+        keep = np.ones(len(member), dtype=bool)
+        keep[1:] = (member[1:] != member[:-1]) | (position[1:] - position[:-1] > 1e-12 * L[member[1:]])
+        member, position = member[keep], position[keep]
+        counts = np.bincount(member, minlength=len(L))
+        rank = np.arange(len(member)) - np.repeat(np.cumsum(counts) - counts, counts)
+        x = np.repeat(L[:, None], counts.max(), axis=1)
+        x[member, rank] = position
+        return x
+
+    def _zero_shear(self, loads: FrameLoads):
+        """(member, position) of the points where the sampled shear of a scenario crosses zero under uniform load"""
+        w = loads.uniform @ self.factors.T
+        # Between stations the shear is linear in x: V(x) = V(x_k+1) - w (x_k+1 - x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zero = self.x[:, 1:, None] - self.shear[:, 1:, :] / w[:, None, :]
+        inside = (w[:, None, :] != 0) & (zero > self.x[:, :-1, None]) & (zero < self.x[:, 1:, None])
+        member, _, _ = np.nonzero(inside)
+        return member, zero[inside]
+
+    def _sample(self, loads: FrameLoads, local: np.ndarray, f: np.ndarray, x: np.ndarray):
+        """Diagrams of the load cases at stations x (M, n) from local end displacements and forces (M, 6, cases), then combined"""
+        frame = self.frame
+        L = frame.length[:, None]
+        self.x = x
+        x, xi = x[:, :, None], (x / L)[:, :, None]
+        w, EI = loads.uniform[:, None, :], (frame.E * frame.I)[:, None, None]
+
+        axial = np.broadcast_to(-f[:, 0][:, None, :], x.shape[:2] + (f.shape[2],)).copy()
+        shear = f[:, 1][:, None, :] + w * x
+        moment = -f[:, 2][:, None, :] + f[:, 1][:, None, :] * x + w * x ** 2 / 2
+        # Cubic Hermite interpolation of the end displacements plus the clamped-beam deflection under the span loads
+        L3 = L[:, :, None]
+        deflection = ((1 - 3 * xi ** 2 + 2 * xi ** 3) * local[:, 1][:, None, :] + L3 * (xi - 2 * xi ** 2 + xi ** 3) * local[:, 2][:, None, :]
+                      + (3 * xi ** 2 - 2 * xi ** 3) * local[:, 4][:, None, :] + L3 * (xi ** 3 - xi ** 2) * local[:, 5][:, None, :])
+        deflection += w * x ** 2 * (L3 - x) ** 2 / (24 * EI)
+
+        m, c, P, a = loads.point_member, loads.point_case, loads.point_load, loads.point_position
+        if len(m):
+            xs, length = self.x[m], frame.length[m][:, None]
+            pa, pp = a[:, None], P[:, None]
+            b = length - pa
+            beyond = xs > pa
+            np.add.at(shear, (m, slice(None), c), pp * beyond)
+            np.add.at(moment, (m, slice(None), c), pp * (xs - pa) * beyond)
+            left = pp * b ** 2 * xs ** 2 * (3 * pa * length - (3 * pa + b) * xs)
+            mirrored = length - xs
+            right = pp * pa ** 2 * mirrored ** 2 * (3 * b * length - (3 * b + pa) * mirrored)
+            np.add.at(deflection, (m, slice(None), c), np.where(beyond, right, left) / (6 * (frame.E * frame.I)[m][:, None] * length ** 3))
+
+        # Deflection measured from the chord between the displaced member ends, for span/deflection checks
+        relative = deflection - ((1 - xi) * local[:, 1][:, None, :] + xi * local[:, 4][:, None, :])
+        self.axial, self.shear, self.moment, self.deflection, self.relative_deflection = (
+            values @ self.factors.T for values in (axial, shear, moment, deflection, relative))
+
+    def envelope(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-member maximum and minimum over stations and scenarios, with the governing scenario"""
+        flat = values.reshape(len(values), -1)
+        high, low = flat.argmax(axis=1), flat.argmin(axis=1)
+        scenarios = values.shape[2]
+        return {"max": flat[np.arange(len(flat)), high], "min": flat[np.arange(len(flat)), low],
+                "max_scenario": high % scenarios, "min_scenario": low % scenarios,
+                "max_station": high // scenarios, "min_station": low // scenarios}
+
+
+def solve_frame(nodes: Sequence[Dict[str, Any]], members: Sequence[Dict[str, Any]], load_cases: Mapping[str, Sequence[Dict[str, Any]]],
+                combinations: Union[None, str, Mapping[str, Mapping[str, float]]] = None, material: str = 'steel',
+                stations: int = DEFAULT_STATIONS) -> FrameSolution:
+    """
+    Assemble, factorize once and solve every load case; combinations are {name: {case: factor}} or a code
+    (ASCE7, EN1990, IS875) whose combinations are generated from the load case names ('dead', 'live', 'wind_x', ...)
+    """
+    frame = Frame(nodes, members, material)
+    return FrameSolution(frame, FrameLoads(frame, load_cases), combinations, stations)
+
+
+def _extreme(solution: FrameSolution, values: np.ndarray, scale: float = 1.0, absolute: bool = False, lowest: bool = False) -> Dict[str, Any]:
+    """Largest (or most negative) sampled value with its member, scenario and position"""
+    data = np.abs(values) if absolute else (-values if lowest else values)
+    member, station, scenario = np.unravel_index(np.argmax(data), data.shape)
+    return {"value": round(float(values[member, station, scenario]) * scale, 3), "member": solution.frame.member_ids[member],
+            "scenario": solution.names[scenario], "position": round(float(solution.x[member, station]), 3)}
+
+
+def frame_analysis(nodes: Sequence[Dict[str, Any]], members: Sequence[Dict[str, Any]], load_cases: Mapping[str, Sequence[Dict[str, Any]]],
+                   combinations: Union[None, str, Mapping[str, Mapping[str, float]]] = None, material: str = 'steel',
+                   stations: int = DEFAULT_STATIONS, include_details: bool = True, include_diagrams: bool = False) -> Dict[str, Any]:
+    """
+    Linear static analysis of a 2D frame or continuous beam (kN, m). Returns the governing extremes over all load
+    cases and combinations, reactions per scenario, per-member envelopes (include_details) and shear, moment and
+    deflection diagrams at the stations of every member (include_diagrams).
+    """
+    solution = solve_frame(nodes, members, load_cases, combinations, material, stations)
+    frame = solution.frame
+    supported = np.flatnonzero(frame.restrained.reshape(-1, DOF).any(axis=1))
+
+    results = {
+        "nodes": len(frame.node_ids),
+        "members": len(frame.member_ids),
+        "dofs": len(frame.restrained),
+        "free_dofs": solution.free_dofs,
+        "load_cases": solution.case_names,
+        "combinations": solution.combination_names,
+        "max_moment": _extreme(solution, solution.moment),
+        "min_moment": _extreme(solution, solution.moment, lowest=True),
+        "max_shear": _extreme(solution, solution.shear, absolute=True),
+        "max_axial": _extreme(solution, solution.axial, absolute=True),
+        "max_deflection_mm": _extreme(solution, solution.deflection, scale=1000, absolute=True),
+        "reactions": {
+            name: {frame.node_ids[node]: [round(float(value), 3) for value in solution.reaction[DOF * node:DOF * node + DOF, s]]
+                   for node in supported}
+            for s, name in enumerate(solution.names)
+        },
+    }
+    if include_details:
+        moment, shear = solution.envelope(solution.moment), solution.envelope(np.abs(solution.shear))
+        deflection = solution.envelope(np.abs(solution.deflection))
+        relative = solution.envelope(np.abs(solution.relative_deflection))
+        results["member_results"] = [
+            {"id": member_id, "length": round(float(frame.length[i]), 3),
+             "max_moment": round(float(moment["max"][i]), 3), "max_moment_scenario": solution.names[moment["max_scenario"][i]],
+             "min_moment": round(float(moment["min"][i]), 3), "min_moment_scenario": solution.names[moment["min_scenario"][i]],
+             "max_shear": round(float(shear["max"][i]), 3), "max_shear_scenario": solution.names[shear["max_scenario"][i]],
+             "max_deflection_mm": round(float(deflection["max"][i] * 1000), 3),
+             "relative_deflection_mm": round(float(relative["max"][i] * 1000), 3),
+             "span_ratio": round(float(frame.length[i] / relative["max"][i]), 0) if relative["max"][i] > 0 else None}
+            for i, member_id in enumerate(frame.member_ids)
+        ]
+        results["displacements"] = {
+            node_id: {name: [round(float(solution.displacement[DOF * i, s] * 1000), 4), round(float(solution.displacement[DOF * i + 1, s] * 1000), 4),
+                             round(float(solution.displacement[DOF * i + 2, s]), 6)] for s, name in enumerate(solution.names)}
+            for i, node_id in enumerate(frame.node_ids)
+        }
+    if include_diagrams:
+        results["diagrams"] = {
+            member_id: {"x": np.round(solution.x[i], 4).tolist(),
+                        **{name: {"shear": np.round(solution.shear[i, :, s], 3).tolist(),
+                                  "moment": np.round(solution.moment[i, :, s], 3).tolist(),
+                                  "deflection_mm": np.round(solution.deflection[i, :, s] * 1000, 3).tolist()}
+                           for s, name in enumerate(solution.names)}}
+            for i, member_id in enumerate(frame.member_ids)
+        }
+    return results
+
+
+def _per_span(value: Union[float, Sequence[float]], count: int, name: str) -> np.ndarray:
+    values = np.broadcast_to(np.asarray(value, dtype=float), (count,)) if np.ndim(value) == 0 else np.asarray(value, dtype=float)
+    if values.shape != (count,):
+        raise ValueError(f"{name} needs one value per span ({count})")
+    return values
+
+
+def continuous_beam(spans: Sequence[float], dead_load: Union[float, Sequence[float]] = 0.0, live_load: Union[float, Sequence[float]] = 0.0,
+                    point_loads: Optional[Sequence[Dict[str, Any]]] = None, supports: Optional[Sequence[Any]] = None,
+                    section: Optional[Dict[str, Any]] = None, material: str = 'steel', dead_factor: float = 1.0, live_factor: float = 1.0,
+                    pattern: bool = True, stations: int = DEFAULT_STATIONS, include_diagrams: bool = False) -> Dict[str, Any]:
+    """
+    Multi-span beam under uniform dead and live loads (kN/m, downward positive, scalar or per span) and point loads
+    {"span" (1-based), "P" (kN downward), "a" (m from the span's left support), "case" ('dead' or 'live')}.
+    Supports default to pinned then rollers; section is {"E" or "material", "I" and "A", or "b" and "h"}.
+    With pattern loading every span's live load is its own case and the envelope covers all spans, odd spans,
+    even spans and each pair of spans adjacent to an interior support; otherwise dead and live act together.
+    """
+    spans = np.asarray(spans, dtype=float)
+    count = len(spans)
+    if count == 0 or np.any(spans <= 0):
+        raise ValueError("Spans must be a list of positive lengths (m)")
+    if not section or (section.get('I') is None and (section.get('b') is None or section.get('h') is None)):
+        raise ValueError("The beam section needs I (m⁴), or b and h (m)")
+    supports = list(supports) if supports is not None else ['pinned'] + ['roller'] * count
+    if len(supports) != count + 1:
+        raise ValueError(f"Supports needs one entry per support ({count + 1})")
+    dead, live = _per_span(dead_load, count, "dead_load"), _per_span(live_load, count, "live_load")
+
+    positions = np.concatenate([[0.0], np.cumsum(spans)])
+    nodes = [{"id": f"S{i + 1}", "x": float(x), "y": 0.0, "support": support} for i, (x, support) in enumerate(zip(positions, supports))]
+    beam = dict(section, A=section.get('A', 1.0))  # Axial stiffness does not affect a beam under transverse loads
+    members = [dict(beam, id=f"span_{i + 1}", start=f"S{i + 1}", end=f"S{i + 2}") for i in range(count)]
+
+    live_names = [f"live_span_{i + 1}" for i in range(count)] if pattern and count > 1 else ["live"] * count
+    load_cases: Dict[str, List[Dict[str, Any]]] = {"dead": [{"member": f"span_{i + 1}", "w": -q} for i, q in enumerate(dead) if q]}
+    for name in live_names:
+        load_cases.setdefault(name, [])
+    for i, q in enumerate(live):
+        if q:
+            load_cases[live_names[i]].append({"member": f"span_{i + 1}", "w": -q})
+    for load in point_loads or []:
+        span = int(load.get('span', 1))
+        if not 1 <= span <= count:
+            raise ValueError(f"Point load span {span} does not exist (1 to {count})")
+        case = load.get('case', 'dead')
+        if case not in ('dead', 'live'):
+            raise ValueError(f"Point load case must be 'dead' or 'live', not {case}")
+        target = "dead" if case == 'dead' else live_names[span - 1]
+        load_cases[target].append({"member": f"span_{span}", "P": -float(load['P']), "a": float(load.get('a', spans[span - 1] / 2))})
+
+    if live_names[0] == "live":
+        patterns = {"design": [True] * count}
+    else:
+        patterns = {"all_spans": [True] * count, "odd_spans": [i % 2 == 0 for i in range(count)],
+                    "even_spans": [i % 2 == 1 for i in range(count)]}
+        for j in range(1, count):
+            patterns[f"adjacent_S{j + 1}"] = [i in (j - 1, j) for i in range(count)]
+    combinations = {name: {"dead": dead_factor, **{live_names[i]: live_factor for i in range(count) if loaded[i]}}
+                    for name, loaded in patterns.items()}
+
+    solution = solve_frame(nodes, members, load_cases, combinations, material, stations)
+    frame = solution.frame
+    first = len(solution.case_names)
+    names = solution.combination_names
+    moment, shear = solution.moment[:, :, first:], solution.shear[:, :, first:]
+    deflection = solution.deflection[:, :, first:]
+    vertical = solution.reaction[1::DOF, first:]
+
+    # Support moments: the start of span 1, then the end of each span
+    support_moment = np.vstack([moment[0, 0], moment[:, -1]])
+    span_results = []
+    for i in range(count):
+        high, low = np.unravel_index(np.argmax(moment[i]), moment[i].shape), np.unravel_index(np.argmin(moment[i]), moment[i].shape)
+        sag = np.unravel_index(np.argmax(np.abs(deflection[i])), deflection[i].shape)
+        peak = float(np.abs(deflection[i][sag]))
+        span_results.append({
+            "span": i + 1, "length": round(float(spans[i]), 3),
+            "max_moment": round(float(moment[i][high]), 3), "max_moment_at": round(float(solution.x[i, high[0]]), 3),
+            "max_moment_combination": names[high[1]],
+            "min_moment": round(float(moment[i][low]), 3), "min_moment_combination": names[low[1]],
+            "max_shear": round(float(np.abs(shear[i]).max()), 3),
+            "max_deflection_mm": round(peak * 1000, 3), "max_deflection_combination": names[sag[1]],
+            "span_ratio": round(float(spans[i]) / peak, 0) if peak > 0 else None,
+        })
+    supported = frame.restrained.reshape(-1, DOF)[:, 1]
+    support_results = [
+        {"support": frame.node_ids[j], "x": round(float(positions[j]), 3), "type": supports[j] if isinstance(supports[j], str) else list(supports[j]),
+         "min_moment": round(float(support_moment[j].min()), 3), "min_moment_combination": names[int(support_moment[j].argmin())],
+         "max_reaction": round(float(vertical[j].max()), 3) if supported[j] else None,
+         "min_reaction": round(float(vertical[j].min()), 3) if supported[j] else None}
+        for j in range(count + 1)
+    ]
+    results = {
+        "spans": span_results,
+        "supports": support_results,
+        "load_cases": solution.case_names,
+        "combinations": names,
+        "max_moment": max(span["max_moment"] for span in span_results),
+        "min_moment": min(span["min_moment"] for span in span_results),
+        "max_shear": max(span["max_shear"] for span in span_results),
+        "max_deflection_mm": max(span["max_deflection_mm"] for span in span_results),
+    }
+    if include_diagrams:
+        results["diagrams"] = {
+            "x": np.round((solution.x + positions[:-1, None]).ravel(), 4).tolist(),
+            "moment_max": np.round(moment.max(axis=2).ravel(), 3).tolist(),
+            "moment_min": np.round(moment.min(axis=2).ravel(), 3).tolist(),
+            "shear_max": np.round(shear.max(axis=2).ravel(), 3).tolist(),
+            "shear_min": np.round(shear.min(axis=2).ravel(), 3).tolist(),
+            "deflection_mm": np.round(deflection[np.arange(count)[:, None], np.arange(deflection.shape[1])[None, :],
+                                                 np.abs(deflection).max(axis=1).argmax(axis=1)[:, None]].ravel() * 1000, 3).tolist(),
+        }
+    return results
@@ -0,0 +1,356 @@
+"""
+HVAC Loads
+Hourly sensible and latent loads for every zone over a weather year. The hourly drivers
+(sol-air temperatures and irradiance per orientation, occupancy schedules per space type)
+form a small basis; thermal mass delays the radiant and conducted parts through a first-order
+filter applied to the basis, and each zone's loads are one coefficient row times that basis,
+so all zones are evaluated by a single matrix product per construction class. Block loads then
+drive a part-load chiller and cooling tower analysis.
+"""
+
+import math
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from scipy.signal import lfilter
+
+from calculators.services.equipment_data import CHILLER_PART_LOAD
+from calculators.services.psychrometrics import (
+    atmospheric_pressure, humidity_ratio, humidity_ratio_from_dew_point, humidity_ratio_from_wet_bulb, saturation_pressure, wet_bulb
+)
+from calculators.services.solar_pv import MONTH_DAYS, clear_sky_year, decompose, plane_of_array, solar_position, weather_arrays
+
+ORIENTATIONS = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW', 'roof')  # roof is horizontal
+THERMAL_MASS = {'light': 2.0, 'medium': 5.0, 'heavy': 10.0}  # time constant (h) of the radiant/conducted response
+RADIANT_FRACTION = {'solar': 0.8, 'people': 0.6, 'lighting': 0.67, 'equipment': 0.3}
+UNOCCUPIED_FRACTION = {'lighting': 0.05, 'equipment': 0.3}  # share of lighting/equipment left on outside occupancy
+PERSON_SENSIBLE, PERSON_LATENT = 75.0, 55.0  # W per person, moderately active office work
+SOL_AIR_FACTOR = 0.039  # α/h_o (m²·K/W) for medium-coloured surfaces
+ROOF_LONGWAVE = 3.9  # K, sky radiation correction for horizontal surfaces
+AIR_HEAT_CAPACITY = 1.2 * 1006  # ρ·cp, J/(m³·K)
+AIR_LATENT = 1.2 * 2501e3  # ρ·h_fg, J/m³ per kg/kg
+WARM_UP_HOURS = 168  # the filters start from the last week of the year
+MAKE_UP_CYCLES = 4  # cycles of concentration for cooling tower blowdown
+
+# Space types for hourly loads: m² per person, lighting and equipment W/m², ASHRAE 62.1 outdoor air
+# (l/s per person and per m²) and hourly occupancy fractions for weekdays and weekends
+HVAC_SPACE_TYPES = {
+    'office': {'occupant_density': 10, 'lighting': 9, 'equipment': 10, 'ventilation_person': 2.5, 'ventilation_area': 0.3,
+               'weekday': (0, 0, 0, 0, 0, 0, 0.1, 0.2, 0.95, 0.95, 0.95, 0.95, 0.5, 0.95, 0.95, 0.95, 0.95, 0.3, 0.1, 0.1, 0.1, 0.05, 0.05, 0),
+               'weekend': (0, 0, 0, 0, 0, 0, 0, 0, 0.1, 0.1, 0.1, 0.1, 0.1, 0.05, 0.05, 0.05, 0.05, 0, 0, 0, 0, 0, 0, 0)},
+    'retail': {'occupant_density': 7, 'lighting': 14, 'equipment': 5, 'ventilation_person': 3.8, 'ventilation_area': 0.6,
+               'weekday': (0, 0, 0, 0, 0, 0, 0, 0, 0.2, 0.5, 0.5, 0.7, 0.7, 0.7, 0.7, 0.8, 0.7, 0.5, 0.3, 0.3, 0, 0, 0, 0),
+               'weekend': (0, 0, 0, 0, 0, 0, 0, 0, 0.2, 0.6, 0.8, 0.9, 0.9, 0.9, 0.9, 0.8, 0.6, 0.4, 0.2, 0, 0, 0, 0, 0)},
+    'school': {'occupant_density': 2.8, 'lighting': 12, 'equipment': 5, 'ventilation_person': 5.0, 'ventilation_area': 0.6,
+               'weekday': (0, 0, 0, 0, 0, 0, 0, 0.05, 0.75, 0.9, 0.9, 0.8, 0.8, 0.8, 0.8, 0.45, 0.15, 0.05, 0.05, 0, 0, 0, 0, 0),
+               'weekend': (0,) * 24},
+    'residential': {'occupant_density': 25, 'lighting': 5, 'equipment': 5, 'ventilation_person': 2.5, 'ventilation_area': 0.3,
+                    'weekday': (1, 1, 1, 1, 1, 1, 0.9, 0.7, 0.4, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.3, 0.5, 0.7, 0.8, 0.9, 0.9, 1, 1, 1),
+                    'weekend': (1, 1, 1, 1, 1, 1, 1, 0.9, 0.8, 0.6, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.6, 0.8, 0.9, 0.9, 1, 1, 1, 1)},
+    'hotel': {'occupant_density': 20, 'lighting': 8, 'equipment': 5, 'ventilation_person': 2.5, 'ventilation_area': 0.3,
+              'weekday': (0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.7, 0.4, 0.4, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.3, 0.5, 0.5, 0.6, 0.7, 0.8, 0.9, 0.9),
+              'weekend': (0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.7, 0.5, 0.5, 0.3, 0.3, 0.3, 0.3, 0.3, 0.3, 0.3, 0.4, 0.6, 0.6, 0.7, 0.8, 0.8, 0.9, 0.9)},
+    'hospital': {'occupant_density': 10, 'lighting': 10, 'equipment': 15, 'ventilation_person': 5.0, 'ventilation_area': 0.6,
+                 'weekday': (0.7,) * 7 + (0.9,) * 12 + (0.8,) * 5,
+                 'weekend': (0.7,) * 7 + (0.8,) * 12 + (0.7,) * 5},
+    'restaurant': {'occupant_density': 1.4, 'lighting': 10, 'equipment': 20, 'ventilation_person': 3.8, 'ventilation_area': 0.9,
+                   'weekday': (0, 0, 0, 0, 0, 0, 0, 0.05, 0.05, 0.05, 0.2, 0.5, 0.8, 0.7, 0.4, 0.2, 0.25, 0.5, 0.8, 0.8, 0.5, 0.35, 0.2, 0),
+                   'weekend': (0, 0, 0, 0, 0, 0, 0, 0, 0.05, 0.1, 0.2, 0.45, 0.7, 0.7, 0.5, 0.3, 0.3, 0.6, 0.9, 0.9, 0.6, 0.4, 0.2, 0)},
+    'warehouse': {'occupant_density': 100, 'lighting': 6, 'equipment': 2, 'ventilation_person': 0.0, 'ventilation_area': 0.3,
+                  'weekday': (0, 0, 0, 0, 0, 0, 0.15, 0.7, 0.9, 0.9, 0.9, 0.9, 0.5, 0.9, 0.9, 0.9, 0.7, 0.3, 0, 0, 0, 0, 0, 0),
+                  'weekend': (0,) * 24}
+}
+
+
+def synthetic_weather(latitude: float, cooling_design_temp: float = 35.0, heating_design_temp: float = 0.0, daily_range: float = 10.0,
+                      relative_humidity: float = 50.0, daily_irradiance: float = 5.0, hours: int = 8760) -> Dict[str, np.ndarray]:
+    """
+    Design-day year: daily means on an annual cosine (warmest in late July, or late January south of the
+    equator) with a diurnal cosine peaking at 15:00, so the summer peak and winter minimum hit the design
+    temperatures. relative_humidity applies at the daily mean temperature and the vapour pressure is held
+    through the day. Irradiance is a clear-sky profile scaled to daily_irradiance (kWh/m²/day).
+    """
+    index = np.arange(hours)
+    day = index // 24
+    warmest = 200 if latitude >= 0 else 19
+    mean = (cooling_design_temp + heating_design_temp) / 2
+    amplitude = max((cooling_design_temp - heating_design_temp - daily_range) / 2, 0)
+    daily_mean = mean + amplitude * np.cos(2 * np.pi * (day - warmest) / 365)
+    temp_air = daily_mean + daily_range / 2 * np.cos(2 * np.pi * (index % 24 - 15) / 24)
+    humidity = np.minimum(relative_humidity * saturation_pressure(daily_mean) / saturation_pressure(temp_air), 100)
+    return {"temp_air": temp_air, "relative_humidity": humidity, "ghi": clear_sky_year(latitude, daily_irradiance, hours)}
+
+
+def _lag(series: np.ndarray, time_constant: float) -> np.ndarray:
+    """First-order response y[t] = a y[t-1] + (1 - a) x[t] along the last axis, warmed up on the year's last week"""
+    a = math.exp(-1 / time_constant)
+    warm = min(WARM_UP_HOURS, series.shape[-1])
+    extended = np.concatenate([series[..., -warm:], series], axis=-1)
+    return lfilter([1 - a], [1, -a], extended, axis=-1)[..., warm:]
+
+
+def _schedules(hours: int, first_weekday: int) -> np.ndarray:
+    """Hourly occupancy fractions (space types, hours) in HVAC_SPACE_TYPES order"""
+    day = np.arange(hours) // 24
+    weekday = (day + first_weekday) % 7 < 5
+    hour = np.arange(hours) % 24
+    return np.array([np.where(weekday, np.asarray(space['weekday'])[hour], np.asarray(space['weekend'])[hour])
+                     for space in HVAC_SPACE_TYPES.values()])
+
+
+class Zones:
+    """Zone definitions as arrays: areas and U·A per orientation, internal gains, outdoor air and setpoints"""
+
+    def __init__(self, zones: List[Dict[str, Any]]):
+        if not zones:
+            raise ValueError("At least one zone is required")
+        types = list(HVAC_SPACE_TYPES)
+        unknown = {zone.get("type", "office") for zone in zones} - set(types)
+        if unknown:
+            raise ValueError(f"Unknown space type: {', '.join(map(str, unknown))} (expected {', '.join(types)})")
+        unknown = {zone.get("construction", "medium") for zone in zones} - set(THERMAL_MASS)
+        if unknown:
+            raise ValueError(f"Unknown construction: {', '.join(map(str, unknown))} (expected {', '.join(THERMAL_MASS)})")
+
+        def column(key, default):
+            return np.array([float(zone.get(key, default)) for zone in zones])
+
+        def oriented(key):
+            table = np.array([[float((zone.get(key) or {}).get(o, 0)) for o in ORIENTATIONS] for zone in zones])
+            if np.any(table < 0):
+                raise ValueError(f"Zone {key} areas cannot be negative")
+            return table
+
+        self.ids = [zone.get("id", i) for i, zone in enumerate(zones)]
+        self.area = column("area", 0)
+        if np.any(self.area <= 0):
+            raise ValueError("Every zone needs a positive floor area")
+        self.space = np.array([types.index(zone.get("type", "office")) for zone in zones])
+        self.construction = np.array([zone.get("construction", "medium") for zone in zones])
+        space = [HVAC_SPACE_TYPES[types[s]] for s in self.space]
+
+        walls, windows = oriented("walls"), oriented("windows")
+        walls[:, -1] += column("roof_area", 0)
+        opaque_u = np.column_stack([np.repeat(column("u_wall", 0.35)[:, None], len(ORIENTATIONS) - 1, axis=1), column("u_roof", 0.25)])
+        self.opaque_ua = opaque_u * np.maximum(walls - windows, 0)  # window areas are taken out of the gross wall
+        self.window_ua = column("u_window", 1.8) * windows.sum(axis=1)
+        self.solar_area = column("shgc", 0.4)[:, None] * windows
+
+        default_people = [self.area[i] / space[i]['occupant_density'] for i in range(len(zones))]
+        self.people = np.array([float(zone.get("occupants", people)) for zone, people in zip(zones, default_people)])
+        self.lighting = self.area * np.array([float(zone.get("lighting", s['lighting'])) for zone, s in zip(zones, space)])
+        self.equipment = self.area * np.array([float(zone.get("equipment", s['equipment'])) for zone, s in zip(zones, space)])
+        outdoor_air = np.array([float(zone.get("ventilation", s['ventilation_person'] * p + s['ventilation_area'] * a))
+                                for zone, s, p, a in zip(zones, space, self.people, self.area)]) / 1000
+        infiltration = column("infiltration", 0.3) * self.area * column("height", 3.0) / 3600
+        self.ventilation, self.infiltration = outdoor_air, infiltration  # m³/s
+        self.cooling_setpoint = column("cooling_setpoint", 24.0)
+        self.heating_setpoint = column("heating_setpoint", 20.0)
+        if np.any(self.heating_setpoint > self.cooling_setpoint):
+            raise ValueError("Heating setpoints must not exceed cooling setpoints")
+        self.humidity_setpoint = column("humidity_setpoint", 50.0)
+
+
+def zone_loads(zones: List[Dict[str, Any]], weather=None, latitude: float = 0.0, longitude: Optional[float] = None,
+               timezone: Optional[float] = None, altitude: float = 0.0, first_weekday: int = 0, **design) -> Dict[str, Any]:
+    """
+    Hourly sensible (W, positive cooling, negative heating) and latent (W) loads as (zones, hours) arrays.
+    zones: {"id", "area" (m²), "type" (space type), "height", "walls"/"windows" ({orientation: m²}, gross wall
+            areas include windows), "roof_area", "u_wall", "u_window", "u_roof", "shgc", "occupants",
+            "lighting"/"equipment" (W/m²), "ventilation" (l/s), "infiltration" (ACH), "construction",
+            "cooling_setpoint"/"heating_setpoint" (°C), "humidity_setpoint" (%)}
+    weather: hourly temp_air and GHI with relative humidity, dew point or wet bulb; without it a
+             synthetic_weather year is built from the design keyword arguments.
+    """
+    data = weather_arrays(weather) if weather is not None else synthetic_weather(latitude, **design)
+    if "temp_air" not in data:
+        raise ValueError("Weather data needs a dry-bulb temperature column")
+    hours = len(data["temp_air"])
+    pressure = atmospheric_pressure(altitude)
+    temp_air, ghi = data["temp_air"], np.maximum(data["ghi"], 0)
+    if "relative_humidity" in data:
+        outdoor_w = humidity_ratio(temp_air, data["relative_humidity"], pressure)
+    elif "dew_point" in data:
+        outdoor_w = humidity_ratio_from_dew_point(data["dew_point"], pressure)
+    elif "wet_bulb" in data:
+        outdoor_w = humidity_ratio_from_wet_bulb(temp_air, data["wet_bulb"], pressure)
+    else:
+        raise ValueError("Weather data needs relative humidity, dew point or wet bulb")
+
+    sun = solar_position(latitude, hours, longitude, timezone)
+    if "dni" in data and "dhi" in data:
+        dni, dhi = np.maximum(data["dni"], 0), np.maximum(data["dhi"], 0)
+    else:
+        dni, dhi = decompose(ghi, sun["cos_zenith"], sun["extraterrestrial"])
+    tilts = np.array([[90.0]] * (len(ORIENTATIONS) - 1) + [[0.0]])
+    azimuths = np.array([[45.0 * i] for i in range(len(ORIENTATIONS) - 1)] + [[180.0]])
+    irradiance = plane_of_array(sun, dni, dhi, ghi, tilts, azimuths)  # (orientations, hours) W/m²
+    sol_air = temp_air + SOL_AIR_FACTOR * irradiance
+    sol_air[-1] -= ROOF_LONGWAVE
+
+    z = Zones(zones)
+    occupancy = _schedules(hours, first_weekday)
+    occupied = (occupancy > 0).astype(float)
+    lighting = UNOCCUPIED_FRACTION['lighting'] + (1 - UNOCCUPIED_FRACTION['lighting']) * occupancy
+    equipment = UNOCCUPIED_FRACTION['equipment'] + (1 - UNOCCUPIED_FRACTION['equipment']) * occupancy
+    spaces, orientations = len(HVAC_SPACE_TYPES), len(ORIENTATIONS)
+    one_hot = np.eye(spaces)[z.space]  # (zones, space types)
+
+    # Cooling-setpoint balance Q = C @ B: rows of B are sol-air temperatures, irradiance, internal gain schedules,
+    # outdoor temperature and 1, with ventilation switched by each space type's occupied hours
+    static_ua = z.opaque_ua.sum(axis=1) + z.window_ua + AIR_HEAT_CAPACITY * z.infiltration
+    vent = AIR_HEAT_CAPACITY * z.ventilation
+    coefficients = np.hstack([
+        z.opaque_ua, z.solar_area,
+        one_hot * (PERSON_SENSIBLE * z.people)[:, None], one_hot * z.lighting[:, None], one_hot * z.equipment[:, None],
+        one_hot * vent[:, None], one_hot * (-vent * z.cooling_setpoint)[:, None],
+        (z.window_ua + AIR_HEAT_CAPACITY * z.infiltration)[:, None], (-static_ua * z.cooling_setpoint)[:, None],
+    ])
+
+    sensible = np.empty((len(z.ids), hours))
+    for construction, tau in THERMAL_MASS.items():
+        members = np.flatnonzero(z.construction == construction)
+        if not len(members):
+            continue
+
+        def mixed(series, kind):
+            return (1 - RADIANT_FRACTION[kind]) * series + RADIANT_FRACTION[kind] * _lag(series, tau)
+
+        basis = np.vstack([
+            _lag(sol_air, tau), mixed(irradiance, 'solar'),
+            mixed(occupancy, 'people'), mixed(lighting, 'lighting'), mixed(equipment, 'equipment'),
+            occupied * temp_air, occupied,
+            temp_air[None, :], np.ones((1, hours)),
+        ])
+        cooling = coefficients[members] @ basis
+        # Heating-setpoint balance differs by the conductance times the setpoint difference
+        conductance = static_ua[members, None] + vent[members, None] * occupied[z.space[members]]
+        heating = cooling + conductance * (z.cooling_setpoint - z.heating_setpoint)[members, None]
+        sensible[members] = np.where(cooling > 0, cooling, np.minimum(heating, 0))
+
+    indoor_w = humidity_ratio(z.cooling_setpoint, z.humidity_setpoint, pressure)
+    latent_coefficients = np.hstack([
+        one_hot * (PERSON_LATENT * z.people)[:, None],
+        one_hot * (AIR_LATENT * z.ventilation)[:, None], one_hot * (-AIR_LATENT * z.ventilation * indoor_w)[:, None],
+        (AIR_LATENT * z.infiltration)[:, None], (-AIR_LATENT * z.infiltration * indoor_w)[:, None],
+    ])
+    latent_basis = np.vstack([occupancy, occupied * outdoor_w, occupied, outdoor_w[None, :], np.ones((1, hours))])
+    latent = np.maximum(latent_coefficients @ latent_basis, 0)
+
+    return {"ids": z.ids, "area": z.area, "sensible": sensible, "latent": latent, "temp_air": temp_air,
+            "wet_bulb": data["wet_bulb"] if "wet_bulb" in data else wet_bulb(temp_air, outdoor_w, pressure)}
+
+
+def plant_analysis(cooling_load: np.ndarray, wet_bulb_temp: np.ndarray, chiller_type: str = 'waterCooled', chiller_count: int = 2,
+                   supply_temp: float = 7.0, return_temp: float = 12.0, approach: float = 4.0, tower_range: float = 5.0,
+                   safety_factor: float = 1.1) -> Dict[str, Any]:
+    """
+    Part-load plant operation for an hourly block cooling load (kW): equal chillers selected through
+    chiller_selection and staged so each runs at or below full load, DOE-2 part-load power, and for
+    water-cooled and absorption plant the cooling tower from cooling_tower_sizing with hourly make-up water.
+    """
+    from calculators.services.mechanical import MechanicalCalculators
+
+    if chiller_type not in CHILLER_PART_LOAD:
+        raise ValueError(f"Unknown chiller type: {chiller_type} (expected {', '.join(CHILLER_PART_LOAD)})")
+    if chiller_count < 1:
+        raise ValueError("At least one chiller is required")
+    load = np.maximum(np.asarray(cooling_load, dtype=float), 0)
+    design = float(load.max()) * safety_factor
+    if design <= 0:
+        raise ValueError("The cooling load is zero in every hour")
+    unit_capacity = design / chiller_count
+    selection = MechanicalCalculators.chiller_selection(unit_capacity, return_temp, supply_temp, chiller_type)
+    if not selection["success"]:
+        raise ValueError(selection["error"])
+    chiller = selection["results"]
+    part_load = CHILLER_PART_LOAD[chiller_type]
+
+    running = np.clip(np.ceil(load / unit_capacity - 1e-9), 0, chiller_count)
+    plr = np.divide(load, running * unit_capacity, out=np.zeros_like(load), where=running > 0)
+    a, b, c = part_load['curve']
+    # Below the minimum unloading ratio the chiller false-loads (hot-gas bypass) at min_plr power
+    ratio = np.maximum(plr, part_load['min_plr'])
+    power = np.where(running > 0, running * unit_capacity / chiller["cop"] * (a + b * ratio + c * ratio ** 2), 0.0)
+    cooling_hours = running > 0
+    results = {
+        "chiller_type": chiller["chiller_type"],
+        "chiller_count": chiller_count,
+        "design_load_kw": round(design, 1),
+        "chiller": chiller,
+        "annual_cooling_kwh": round(float(load.sum()), 0),
+        "annual_chiller_kwh": round(float(power.sum()), 0),
+        "seasonal_cop": round(float(load.sum() / power.sum()), 2) if power.sum() else 0.0,
+        "operating_hours": int(cooling_hours.sum()),
+        "staging_hours": {str(n): int((running == n).sum()) for n in range(1, chiller_count + 1)},
+        "part_load_hours": {label: int(((plr > low) & (plr <= high)).sum())
+                            for label, low, high in (("0-25%", 0, 0.25), ("25-50%", 0.25, 0.5), ("50-75%", 0.5, 0.75), ("75-100%", 0.75, 1.0))},
+    }
+
+    if chiller_type != 'airCooled':
+        rejection = load + power  # kW; for absorption the power is the heat input
+        design_wet_bulb = float(np.percentile(wet_bulb_temp, 99.6))
+        tower = MechanicalCalculators.cooling_tower_sizing(float(rejection.max()), design_wet_bulb, approach, tower_range)
+        if not tower["success"]:
+            raise ValueError(tower["error"])
+        # Evaporation at 2,400 kJ/kg plus blowdown for the cycles of concentration
+        make_up = rejection / 2400 * 3600 * MAKE_UP_CYCLES / (MAKE_UP_CYCLES - 1) / 1000  # m³/h
+        condenser_supply = np.asarray(wet_bulb_temp) + approach * rejection / rejection.max()
+        results["cooling_tower"] = dict(tower["results"], heat_rejection=round(float(rejection.max()), 1),
+                                        design_wet_bulb=round(design_wet_bulb, 1))
+        results["annual_make_up_water_m3"] = round(float(make_up.sum()), 0)
+        results["mean_condenser_supply_temp"] = round(float(condenser_supply[cooling_hours].mean()), 1) if cooling_hours.any() else None
+    return results
+
+
+def hvac_simulation(zones: List[Dict[str, Any]], weather=None, latitude: float = 0.0, longitude: Optional[float] = None,
+                    timezone: Optional[float] = None, altitude: float = 0.0, chiller_type: str = 'waterCooled', chiller_count: int = 2,
+                    supply_temp: float = 7.0, return_temp: float = 12.0, include_zones: bool = False, include_hourly: bool = False,
+                    **design) -> Dict[str, Any]:
+    """
+    Annual hourly loads for all zones with block (coincident) peaks, monthly energy and the part-load plant analysis
+    """
+    loads = zone_loads(zones, weather, latitude, longitude, timezone, altitude, **design)
+    sensible, latent = loads["sensible"], loads["latent"]
+    zone_cooling = np.maximum(sensible, 0) + latent  # W
+    zone_heating = np.maximum(-sensible, 0)
+    block_cooling = zone_cooling.sum(axis=0) / 1000  # kW
+    block_heating = zone_heating.sum(axis=0) / 1000
+    peak_hour, heating_hour = int(block_cooling.argmax()), int(block_heating.argmax())
+    zone_peaks = zone_cooling.max(axis=1) / 1000
+
+    hours = sensible.shape[1]
+    month = np.repeat(np.arange(12), np.array(MONTH_DAYS) * 24)[:hours] if hours == 8760 else np.arange(hours) * 12 // hours
+    results = {
+        "zones": len(loads["ids"]),
+        "hours": hours,
+        "floor_area": round(float(loads["area"].sum()), 1),
+        "peak_cooling_kw": round(float(block_cooling[peak_hour]), 1),
+        "peak_cooling_hour": peak_hour,
+        "peak_sensible_kw": round(float(np.maximum(sensible[:, peak_hour], 0).sum() / 1000), 1),
+        "peak_latent_kw": round(float(latent[:, peak_hour].sum() / 1000), 1),
+        "peak_heating_kw": round(float(block_heating[heating_hour]), 1),
+        "peak_heating_hour": heating_hour,
+        "sum_of_zone_peaks_kw": round(float(zone_peaks.sum()), 1),
+        "diversity_factor": round(float(block_cooling[peak_hour] / zone_peaks.sum()), 3) if zone_peaks.sum() else 0.0,
+        "cooling_w_m2": round(float(block_cooling[peak_hour] * 1000 / loads["area"].sum()), 1),
+        "annual_cooling_kwh": round(float(block_cooling.sum()), 0),
+        "annual_heating_kwh": round(float(block_heating.sum()), 0),
+        "monthly_cooling_kwh": np.round(np.bincount(month, block_cooling, minlength=12), 0).tolist(),
+        "monthly_heating_kwh": np.round(np.bincount(month, block_heating, minlength=12), 0).tolist(),
+        "plant": plant_analysis(block_cooling, loads["wet_bulb"], chiller_type, chiller_count, supply_temp, return_temp)
+                 if block_cooling.max() > 0 else None,
+    }
+    if include_zones:
+        results["zone_results"] = [
+            {"id": zone_id, "peak_cooling_kw": round(float(peak), 2), "peak_cooling_hour": int(hour),
+             "peak_heating_kw": round(float(heat), 2), "annual_cooling_kwh": round(float(cool_kwh), 0),
+             "annual_heating_kwh": round(float(heat_kwh), 0)}
+            for zone_id, peak, hour, heat, cool_kwh, heat_kwh in zip(
+                loads["ids"], zone_peaks, zone_cooling.argmax(axis=1), zone_heating.max(axis=1) / 1000,
+                zone_cooling.sum(axis=1) / 1000, zone_heating.sum(axis=1) / 1000)
+        ]
+    if include_hourly:
+        results["hourly_cooling_kw"] = np.round(block_cooling, 2).tolist()
+        results["hourly_heating_kw"] = np.round(block_heating, 2).tolist()
+    return results
@@ -0,0 +1,222 @@
+"""
+Lighting
+Point-by-point illuminance on a work-plane grid: every grid point against every luminaire
+through broadcast distance and angle arrays (blocked over points to bound memory), with an
+integrating-sphere estimate of the inter-reflected component. Results are checked against
+EN 12464-1 maintained illuminance and uniformity, and a layout search finds the smallest
+regular fixture array that meets them.
+"""
+
+import math
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from calculators.services.equipment_data import EN12464_TASKS, LUMINAIRE_DISTRIBUTIONS
+
+Distribution = Union[str, Dict[str, Sequence[float]]]
+
+POINT_BLOCK = 8192  # grid points broadcast against all luminaires at once
+SEARCH_POINTS = 2500  # coarse grid size used while searching layouts
+DEFAULT_REFLECTANCES = (0.7, 0.5, 0.2)  # ceiling, walls, floor
+
+
+def grid_spacing(length: float, width: float) -> float:
+    """
+    EN 12464-1 maximum grid cell size p = 0.2 x 5^log10(d) for the longer dimension d (m)
+    """
+    return min(0.2 * 5 ** math.log10(max(length, width)), 10.0)
+
+
+def calculation_grid(length: float, width: float, spacing: Optional[float] = None, border: float = 0.5) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Cell-centred grid points (n, 2) over the area inside the border band, and the (nx, ny) shape
+    """
+    border = min(border, 0.25 * min(length, width))
+    spacing = spacing or grid_spacing(length, width)
+    span_x, span_y = length - 2 * border, width - 2 * border
+    nx, ny = max(math.ceil(span_x / spacing), 1), max(math.ceil(span_y / spacing), 1)
+    x = border + (np.arange(nx) + 0.5) * span_x / nx
+    y = border + (np.arange(ny) + 0.5) * span_y / ny
+    gx, gy = np.meshgrid(x, y, indexing="ij")
+    return np.column_stack([gx.ravel(), gy.ravel()]), (nx, ny)
+
+
+def intensity(distribution: Distribution, cos_gamma: np.ndarray) -> np.ndarray:
+    """
+    Luminous intensity per lumen (cd/lm) at polar angle gamma from the downward axis.
+    distribution is a named cos^n type or a measured table {"angles": [deg], "candela": [cd/klm]}.
+    """
+    if isinstance(distribution, str):
+        if distribution not in LUMINAIRE_DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution} (expected {', '.join(LUMINAIRE_DISTRIBUTIONS)} or an intensity table)")
+        n = LUMINAIRE_DISTRIBUTIONS[distribution]
+        return (n + 1) / (2 * math.pi) * np.maximum(cos_gamma, 0) ** n
+    gamma = np.degrees(np.arccos(np.clip(cos_gamma, -1, 1)))
+    return np.interp(gamma, distribution["angles"], distribution["candela"], right=0.0) / 1000
+
+
+def direct_illuminance(points: np.ndarray, positions: np.ndarray, lumens: np.ndarray, plane_height: float,
+                       distribution: Distribution = 'wide') -> np.ndarray:
+    """
+    Horizontal illuminance (lx) at (n, 2) points from (m, 3) luminaire positions: E = I(gamma) cos(gamma) / d²
+    """
+    h = positions[:, 2] - plane_height
+    if np.any(h <= 0):
+        raise ValueError("Luminaires must be mounted above the work plane")
+    illuminance = np.empty(len(points))
+    for start in range(0, len(points), POINT_BLOCK):
+        block = points[start:start + POINT_BLOCK]
+        dx = block[:, 0, None] - positions[None, :, 0]
+        dy = block[:, 1, None] - positions[None, :, 1]
+        d2 = dx * dx + dy * dy + h * h
+        cos_gamma = h / np.sqrt(d2)
+        illuminance[start:start + POINT_BLOCK] = (intensity(distribution, cos_gamma) * cos_gamma / d2) @ lumens
+    return illuminance
+
+
+def indirect_illuminance(total_lumens: float, length: float, width: float, height: float,
+                         reflectances: Sequence[float] = DEFAULT_REFLECTANCES) -> float:
+    """
+    Integrating-sphere inter-reflected illuminance E = Φρ / (S(1 - ρ)) with area-weighted reflectance
+    """
+    ceiling, walls, floor = reflectances
+    floor_area, wall_area = length * width, 2 * height * (length + width)
+    surface = 2 * floor_area + wall_area
+    rho = (floor_area * (ceiling + floor) + wall_area * walls) / surface
+    return total_lumens * rho / (surface * (1 - rho))
+
+
+def regular_layout(length: float, width: float, nx: int, ny: int, height: float) -> np.ndarray:
+    """
+    nx x ny luminaires at equal spacing with half spacing to the walls
+    """
+    x = (np.arange(nx) + 0.5) * length / nx
+    y = (np.arange(ny) + 0.5) * width / ny
+    gx, gy = np.meshgrid(x, y, indexing="ij")
+    return np.column_stack([gx.ravel(), gy.ravel(), np.full(nx * ny, float(height))])
+
+
+def _requirements(task: Optional[str], target_lux: Optional[float], target_uniformity: Optional[float]) -> Tuple[float, float]:
+    if task is not None:
+        if task not in EN12464_TASKS:
+            raise ValueError(f"Unknown task: {task} (expected {', '.join(EN12464_TASKS)})")
+        requirement = EN12464_TASKS[task]
+        return target_lux or requirement['lux'], target_uniformity or requirement['uniformity']
+    if not target_lux:
+        raise ValueError("Provide a target illuminance or an EN 12464 task")
+    return target_lux, target_uniformity or 0.6
+
+
+def _statistics(illuminance: np.ndarray, target_lux: float, target_uniformity: float) -> Dict[str, Any]:
+    average, minimum, maximum = float(illuminance.mean()), float(illuminance.min()), float(illuminance.max())
+    uniformity = minimum / average if average else 0.0
+    return {
+        "average_lux": round(average, 1),
+        "min_lux": round(minimum, 1),
+        "max_lux": round(maximum, 1),
+        "uniformity": round(uniformity, 3),
+        "diversity": round(minimum / maximum, 3) if maximum else 0.0,
+        "target_lux": target_lux,
+        "target_uniformity": target_uniformity,
+        "compliant": bool(average >= target_lux and uniformity >= target_uniformity),
+    }
+
+
+class _Room:
+    """Room geometry and light-loss settings shared by the evaluation and the layout search"""
+
+    def __init__(self, length: float, width: float, work_plane_height: float, maintenance_factor: float,
+                 reflectances: Optional[Sequence[float]], distribution: Distribution, grid_spacing_m: Optional[float], border: float):
+        if length <= 0 or width <= 0:
+            raise ValueError("Room length and width must be positive")
+        if not 0 < maintenance_factor <= 1:
+            raise ValueError("Maintenance factor must be between 0 and 1")
+        self.length, self.width = length, width
+        self.plane = work_plane_height
+        self.maintenance_factor = maintenance_factor
+        self.reflectances = reflectances
+        self.distribution = distribution
+        self.points, self.shape = calculation_grid(length, width, grid_spacing_m, border)
+        coarse = max(grid_spacing_m or grid_spacing(length, width), math.sqrt(length * width / SEARCH_POINTS))
+        self.search_points, _ = calculation_grid(length, width, coarse, border)
+
+    def illuminance(self, positions: np.ndarray, lumens: np.ndarray, points: np.ndarray) -> np.ndarray:
+        direct = direct_illuminance(points, positions, lumens, self.plane, self.distribution)
+        indirect = indirect_illuminance(lumens.sum(), self.length, self.width, positions[:, 2].max(), self.reflectances) if self.reflectances else 0.0
+        return self.maintenance_factor * (direct + indirect)
+
+
+def lighting_calculation(length: float, width: float, luminaires: List[Dict[str, float]], mounting_height: float = 3.0,
+                         fixture_lumens: Optional[float] = None, work_plane_height: float = 0.8, distribution: Distribution = 'wide',
+                         maintenance_factor: float = 0.8, reflectances: Optional[Sequence[float]] = DEFAULT_REFLECTANCES,
+                         task: Optional[str] = None, target_lux: Optional[float] = None, target_uniformity: Optional[float] = None,
+                         grid_spacing_m: Optional[float] = None, border: float = 0.5, include_grid: bool = False) -> Dict[str, Any]:
+    """
+    Maintained illuminance over the work-plane grid for given luminaires ({"x", "y", optional "z" and "lumens"})
+    """
+    target_lux, target_uniformity = _requirements(task, target_lux, target_uniformity)
+    room = _Room(length, width, work_plane_height, maintenance_factor, reflectances, distribution, grid_spacing_m, border)
+    if not luminaires:
+        raise ValueError("At least one luminaire is required")
+    positions = np.array([[l["x"], l["y"], l.get("z", mounting_height)] for l in luminaires], dtype=float)
+    lumens = np.array([l.get("lumens", fixture_lumens) or 0 for l in luminaires], dtype=float)
+    if np.any(lumens <= 0):
+        raise ValueError("Every luminaire needs a positive lumen output")
+
+    illuminance = room.illuminance(positions, lumens, room.points)
+    results = _statistics(illuminance, target_lux, target_uniformity)
+    results.update({"fixture_count": len(luminaires), "grid_points": len(room.points), "grid_shape": list(room.shape),
+                    "power_density_lm_m2": round(float(lumens.sum()) / (length * width), 1)})
+    if include_grid:
+        results["grid"] = np.round(illuminance.reshape(room.shape), 1).tolist()
+    return results
+
+
+def optimize_layout(length: float, width: float, fixture_lumens: float, mounting_height: float = 3.0,
+                    work_plane_height: float = 0.8, distribution: Distribution = 'wide', maintenance_factor: float = 0.8,
+                    reflectances: Optional[Sequence[float]] = DEFAULT_REFLECTANCES, task: Optional[str] = None,
+                    target_lux: Optional[float] = None, target_uniformity: Optional[float] = None,
+                    grid_spacing_m: Optional[float] = None, border: float = 0.5, max_fixtures: int = 2500) -> Dict[str, Any]:
+    """
+    Smallest regular nx x ny array (spacing ratio between 1:2 and 2:1) that meets the target illuminance
+    and uniformity. Candidates are screened on a coarse grid and confirmed on the full EN 12464 grid.
+    """
+    target_lux, target_uniformity = _requirements(task, target_lux, target_uniformity)
+    room = _Room(length, width, work_plane_height, maintenance_factor, reflectances, distribution, grid_spacing_m, border)
+    if fixture_lumens <= 0:
+        raise ValueError("Fixture lumens must be positive")
+
+    # Upper bound on illuminance per fixture: all flux on the work plane plus the inter-reflected share
+    per_fixture = maintenance_factor * (fixture_lumens / (length * width)
+                                        + (indirect_illuminance(fixture_lumens, length, width, mounting_height, reflectances) if reflectances else 0))
+    minimum = max(math.ceil(target_lux / per_fixture), 1)
+    candidates = sorted(
+        ((nx, ny) for nx in range(1, max_fixtures + 1) for ny in range(1, max_fixtures // nx + 1)
+         if nx * ny >= minimum and 0.5 <= (length / nx) / (width / ny) <= 2),
+        key=lambda c: (c[0] * c[1], abs(length / c[0] - width / c[1])))
+
+    evaluated = 0
+    for nx, ny in candidates:
+        positions = regular_layout(length, width, nx, ny, mounting_height)
+        lumens = np.full(nx * ny, float(fixture_lumens))
+        evaluated += 1
+        if not _statistics(room.illuminance(positions, lumens, room.search_points), target_lux, target_uniformity)["compliant"]:
+            continue
+        illuminance = room.illuminance(positions, lumens, room.points)
+        results = _statistics(illuminance, target_lux, target_uniformity)
+        if not results["compliant"]:
+            continue
+        results.update({
+            "fixture_count": nx * ny,
+            "rows": ny,
+            "columns": nx,
+            "spacing_x": round(length / nx, 3),
+            "spacing_y": round(width / ny, 3),
+            "spacing_to_height": round(max(length / nx, width / ny) / (mounting_height - work_plane_height), 2),
+            "luminaires": [{"x": round(float(x), 3), "y": round(float(y), 3)} for x, y, _ in positions],
+            "grid_points": len(room.points),
+            "layouts_evaluated": evaluated,
+        })
+        return results
+    raise ValueError(f"No regular layout with up to {max_fixtures} fixtures meets {target_lux} lx at U0 {target_uniformity}")
@@ -0,0 +1,242 @@
+"""
+Load Combinations
+Code strength combinations as a factor matrix over the basic load cases. Every combination of a
+code table is expanded over the wind and seismic cases (alternative directions) and their reversal,
+then the effects of all members and outputs under all combinations are one matrix product of the
+(combinations x cases) factors with the stacked case effects; envelopes and governing combinations
+are reductions of that product.
+"""
+
+from typing import Dict, Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+LOAD_TYPES = ('dead', 'live', 'roof_live', 'snow', 'wind', 'seismic')
+# Directional load types: each case is an alternative to the others and acts in both senses
+REVERSIBLE = ('wind', 'seismic')
+# Common code symbols for the load types
+LOAD_ALIASES = {'D': 'dead', 'DL': 'dead', 'G': 'dead', 'L': 'live', 'LL': 'live', 'Q': 'live', 'Lr': 'roof_live',
+                'S': 'snow', 'W': 'wind', 'WL': 'wind', 'E': 'seismic', 'EL': 'seismic', 'AEd': 'seismic'}
+
+# Strength load combinations {name: {load type: factor}}; wind and seismic terms also act reversed
+LOAD_COMBINATION_CODES = {
+    # ASCE 7-16 §2.3.1 (LRFD)
+    'ASCE7': {
+        '1.4D': {'dead': 1.4},
+        '1.2D+1.6L+0.5Lr': {'dead': 1.2, 'live': 1.6, 'roof_live': 0.5},
+        '1.2D+1.6L+0.5S': {'dead': 1.2, 'live': 1.6, 'snow': 0.5},
+        '1.2D+1.6Lr+L': {'dead': 1.2, 'roof_live': 1.6, 'live': 1.0},
+        '1.2D+1.6Lr+0.5W': {'dead': 1.2, 'roof_live': 1.6, 'wind': 0.5},
+        '1.2D+1.6S+L': {'dead': 1.2, 'snow': 1.6, 'live': 1.0},
+        '1.2D+1.6S+0.5W': {'dead': 1.2, 'snow': 1.6, 'wind': 0.5},
+        '1.2D+W+L+0.5Lr': {'dead': 1.2, 'wind': 1.0, 'live': 1.0, 'roof_live': 0.5},
+        '1.2D+W+L+0.5S': {'dead': 1.2, 'wind': 1.0, 'live': 1.0, 'snow': 0.5},
+        '0.9D+W': {'dead': 0.9, 'wind': 1.0},
+        '1.2D+E+L+0.2S': {'dead': 1.2, 'seismic': 1.0, 'live': 1.0, 'snow': 0.2},
+        '0.9D+E': {'dead': 0.9, 'seismic': 1.0},
+    },
+    # EN 1990 eq. 6.10, set B, with psi0 = 0.7 (imposed), 0.5 (snow), 0.6 (wind); seismic per eq. 6.12b with psi2 = 0.3
+    'EN1990': {
+        '1.35G': {'dead': 1.35},
+        '1.35G+1.5Q+0.75S+0.9W': {'dead': 1.35, 'live': 1.5, 'snow': 0.75, 'wind': 0.9},
+        '1.35G+1.5S+1.05Q+0.9W': {'dead': 1.35, 'snow': 1.5, 'live': 1.05, 'wind': 0.9},
+        '1.35G+1.5W+1.05Q+0.75S': {'dead': 1.35, 'wind': 1.5, 'live': 1.05, 'snow': 0.75},
+        '1.0G+1.5W': {'dead': 1.0, 'wind': 1.5},
+        'G+AEd+0.3Q': {'dead': 1.0, 'seismic': 1.0, 'live': 0.3},
+    },
+    # IS 875 (Part 5):1987 / IS 456:2000 Table 18 (limit state of collapse)
+    'IS875': {
+        '1.5(DL+LL)': {'dead': 1.5, 'live': 1.5},
+        '1.2(DL+LL+WL)': {'dead': 1.2, 'live': 1.2, 'wind': 1.2},
+        '1.2(DL+LL+EL)': {'dead': 1.2, 'live': 1.2, 'seismic': 1.2},
+        '1.5(DL+WL)': {'dead': 1.5, 'wind': 1.5},
+        '1.5(DL+EL)': {'dead': 1.5, 'seismic': 1.5},
+        '0.9DL+1.5WL': {'dead': 0.9, 'wind': 1.5},
+        '0.9DL+1.5EL': {'dead': 0.9, 'seismic': 1.5},
+    },
+}
+
+
+def load_type(case: str, case_types: Optional[Mapping[str, str]] = None) -> str:
+    """Load type of a case: explicit mapping, type name or code symbol, or a type-name prefix such as 'wind_x'"""
+    name = (case_types or {}).get(case, case)
+    name = LOAD_ALIASES.get(name, name)
+    if name in LOAD_TYPES:
+        return name
+    for prefix in sorted(LOAD_TYPES, key=len, reverse=True):
+        if name.lower().startswith(prefix):
+            return prefix
+    raise ValueError(f"Cannot tell the load type of case '{case}' (expected {', '.join(LOAD_TYPES)}, or give case_types)")
+
+
+def _describe(cases: Sequence[str], row: np.ndarray) -> str:
+    terms = [(factor, case) for factor, case in zip(row, cases) if factor]
+    text = " + ".join(f"{abs(factor):g} {case}" if factor > 0 else f"-{abs(factor):g} {case}" for factor, case in terms)
+    return text.replace("+ -", "- ")
+
+
+class CombinationSet:
+    """
+    Combination factors (combinations, cases) with the combination names and the clause each one comes from
+    """
+
+    def __init__(self, case_names: Sequence[str], names: Sequence[str], factors: np.ndarray, sources: Optional[Sequence[str]] = None):
+        self.case_names = list(case_names)
+        self.names = list(names)
+        self.factors = np.asarray(factors, dtype=float).reshape(len(self.names), len(self.case_names))
+        self.sources = list(sources) if sources is not None else list(self.names)
+
+    @classmethod
+    def from_code(cls, case_names: Sequence[str], code: str = 'ASCE7', case_types: Optional[Mapping[str, str]] = None) -> 'CombinationSet':
+        """
+        Expand a code table over the given cases. Cases of the same gravity type act together; wind and seismic cases
+        are alternatives, each applied in both senses. Terms without a matching case drop out and duplicates are removed.
+        """
+        if code not in LOAD_COMBINATION_CODES:
+            raise ValueError(f"Unknown combination code: {code} (expected {', '.join(LOAD_COMBINATION_CODES)})")
+        types = np.array([load_type(case, case_types) for case in case_names])
+        rows, sources, seen = [], [], set()
+        for source, terms in LOAD_COMBINATION_CODES[code].items():
+            base = np.zeros(len(case_names))
+            for kind, factor in terms.items():
+                if kind not in REVERSIBLE:
+                    base[types == kind] = factor
+            variants = [base]
+            for kind, factor in terms.items():
+                members = np.flatnonzero(types == kind)
+                if kind not in REVERSIBLE or not len(members):
+                    continue
+                expanded = []
+                for row in variants:
+                    for case in members:
+                        for sign in (1, -1):
+                            variant = row.copy()
+                            variant[case] = sign * factor
+                            expanded.append(variant)
+                variants = expanded
+            for row in variants:
+                key = tuple(row)
+                if row.any() and key not in seen:
+                    seen.add(key)
+                    rows.append(row)
+                    sources.append(f"{code} {source}")
+        if not rows:
+            raise ValueError(f"None of the {code} combinations involve the given load cases")
+        factors = np.array(rows)
+        return cls(case_names, [_describe(case_names, row) for row in factors], factors, sources)
+
+    @classmethod
+    def from_factors(cls, case_names: Sequence[str], combinations: Mapping[str, Mapping[str, float]]) -> 'CombinationSet':
+        """Explicit combinations {name: {case: factor}}"""
+        if not combinations:
+            raise ValueError("At least one combination is required")
+        factors = np.zeros((len(combinations), len(case_names)))
+        for row, (name, terms) in enumerate(combinations.items()):
+            for case, factor in terms.items():
+                if case not in case_names:
+                    raise ValueError(f"Combination {name} refers to unknown load case {case}")
+                factors[row, list(case_names).index(case)] = float(factor)
+        return cls(case_names, list(combinations), factors)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: {case: float(factor) for case, factor in zip(self.case_names, row) if factor}
+                for name, row in zip(self.names, self.factors)}
+
+    def combine(self, effects: np.ndarray) -> np.ndarray:
+        """Combined effects (combinations, ...) of case effects stacked on the first axis (cases, ...)"""
+        effects = np.asarray(effects, dtype=float)
+        if effects.shape[0] != len(self.case_names):
+            raise ValueError(f"Expected effects for {len(self.case_names)} load cases, got {effects.shape[0]}")
+        return np.tensordot(self.factors, effects, axes=1)
+
+    def envelope(self, effects: np.ndarray) -> Dict[str, np.ndarray]:
+        """Maximum and minimum over the combinations of every effect, with the index of the governing combination"""
+        combined = self.combine(effects)
+        high, low = combined.argmax(axis=0), combined.argmin(axis=0)
+        return {"max": np.take_along_axis(combined, high[None], axis=0)[0], "min": np.take_along_axis(combined, low[None], axis=0)[0],
+                "max_combination": high, "min_combination": low}
+
+
+def _effects(load_cases: Mapping[str, Any]) -> np.ndarray:
+    """Case effects stacked as (cases, members, outputs)"""
+    arrays = [np.asarray(values, dtype=float) for values in load_cases.values()]
+    shapes = {array.shape for array in arrays}
+    if len(shapes) != 1:
+        raise ValueError("Every load case needs effects of the same shape (members, or members x outputs)")
+    effects = np.stack(arrays)
+    if effects.ndim == 1:
+        effects = effects[:, None]
+    if effects.ndim == 2:
+        effects = effects[:, :, None]
+    if effects.ndim != 3:
+        raise ValueError("Load case effects must be a list per member, or a members x outputs table")
+    return effects
+
+
+def load_combinations(load_cases: Mapping[str, Any], code: str = 'ASCE7', combinations: Optional[Mapping[str, Mapping[str, float]]] = None,
+                      case_types: Optional[Mapping[str, str]] = None, member_ids: Optional[Sequence[Any]] = None,
+                      outputs: Optional[Sequence[str]] = None, capacities: Optional[Any] = None,
+                      include_members: bool = True) -> Dict[str, Any]:
+    """
+    Combine basic load case effects {case: values per member (members) or per member and output (members x outputs)}
+    with a code table (ASCE7, EN1990, IS875) or explicit combinations {name: {case: factor}}. Returns the overall
+    extremes per output and, per member, the envelope with the governing combinations. With capacities (per member
+    and output, or per output) each member also gets its utilization |effect| / capacity and the governing case.
+    """
+    if not load_cases:
+        raise ValueError("At least one load case is required")
+    case_names = list(load_cases)
+    effects = _effects(load_cases)
+    _, count, width = effects.shape
+    member_ids = list(member_ids) if member_ids is not None else list(range(count))
+    outputs = list(outputs) if outputs is not None else [f"effect_{k}" for k in range(width)] if width > 1 else ["effect"]
+    if len(member_ids) != count or len(outputs) != width:
+        raise ValueError(f"Expected {count} member ids and {width} output names")
+
+    combination_set = (CombinationSet.from_factors(case_names, combinations) if combinations
+                       else CombinationSet.from_code(case_names, code, case_types))
+    names = combination_set.names
+    combined = combination_set.combine(effects)
+    envelope = combination_set.envelope(effects)
+
+    extremes = {}
+    for k, output in enumerate(outputs):
+        high, low = int(envelope["max"][:, k].argmax()), int(envelope["min"][:, k].argmin())
+        extremes[output] = {
+            "max": round(float(envelope["max"][high, k]), 4), "max_member": member_ids[high], "max_combination": names[envelope["max_combination"][high, k]],
+            "min": round(float(envelope["min"][low, k]), 4), "min_member": member_ids[low], "min_combination": names[envelope["min_combination"][low, k]],
+        }
+    results = {
+        "code": None if combinations else code,
+        "load_cases": case_names,
+        "combinations": [{"name": name, "source": source, "factors": factors}
+                         for name, source, factors in zip(names, combination_set.sources, combination_set.as_dict().values())],
+        "members": count,
+        "outputs": outputs,
+        "extremes": extremes,
+    }
+
+    if capacities is not None:
+        capacity = np.broadcast_to(np.asarray(capacities, dtype=float), (count, width))
+        if np.any(capacity <= 0):
+            raise ValueError("Capacities must be positive")
+        ratio = np.abs(combined) / capacity
+        flat = ratio.transpose(1, 0, 2).reshape(count, -1)
+        governing = flat.argmax(axis=1)
+        utilization = flat[np.arange(count), governing]
+        results["max_utilization"] = round(float(utilization.max()), 4)
+        results["failing_members"] = [member_ids[i] for i in np.flatnonzero(utilization > 1)]
+    if include_members:
+        members = {"id": member_ids}
+        for k, output in enumerate(outputs):
+            members[output] = {
+                "max": np.round(envelope["max"][:, k], 4).tolist(), "min": np.round(envelope["min"][:, k], 4).tolist(),
+                "max_combination": [names[i] for i in envelope["max_combination"][:, k]],
+                "min_combination": [names[i] for i in envelope["min_combination"][:, k]],
+            }
+        if capacities is not None:
+            members["utilization"] = np.round(utilization, 4).tolist()
+            members["governing_combination"] = [names[i] for i in governing // width]
+            members["governing_output"] = [outputs[i] for i in governing % width]
+        results["member_results"] = members
+    return results
@@ -1,3 +1,14 @@
+import math
+from typing import Dict, Any, List, Optional, Union
+
+from calculators.services.equipment_data import PIPE_MATERIALS
+from calculators.services.pipe_network import friction_factor, pipe_network
+from calculators.services.duct_network import duct_network
+from calculators.services.hvac_loads import hvac_simulation
+from calculators.services.pump_selection import pump_selection
+from calculators.services.psychrometrics import atmospheric_pressure, psychrometric_state
+
+
 class MechanicalCalculators:
     @staticmethod
     def hvac_load(area: float, height: float, occupants: int, climate: str):
@@ -34,6 +45,19 @@ class MechanicalCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def hvac_simulation(zones: List[Dict[str, Any]], latitude: float, weather: Optional[Dict[str, List[float]]] = None, longitude: Optional[float] = None, timezone: Optional[float] = None, altitude: float = 0, cooling_design_temp: float = 35, heating_design_temp: float = 0, daily_range: float = 10, relative_humidity: float = 50, daily_irradiance: float = 5, chiller_type: str = 'waterCooled', chiller_count: int = 2, supply_temp: float = 7, return_temp: float = 12, include_zones: bool = False, include_hourly: bool = False):
+        """Hourly zone loads over a weather year with block peaks and part-load chiller and cooling tower analysis"""
+        try:
+            design = {} if weather is not None else {"cooling_design_temp": cooling_design_temp, "heating_design_temp": heating_design_temp,
+                                                     "daily_range": daily_range, "relative_humidity": relative_humidity, "daily_irradiance": daily_irradiance}
+            results = hvac_simulation(zones, weather, latitude, longitude, timezone, altitude, chiller_type, chiller_count, supply_temp,
+                                      return_temp, include_zones, include_hourly, **design)
+            compliance = "ASHRAE Fundamentals hourly heat balance" if weather is not None else "ASHRAE Fundamentals hourly heat balance (synthetic design year)"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def pump_sizing(flow_rate: float, head: float, efficiency: float, speed: float = 1450):
         """Calculate pump sizing with efficiency and speed"""
@@ -74,6 +98,17 @@ class MechanicalCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def pump_selection(flow_rate: float, head: float, static_head: float = 0, catalog: Optional[Union[str, List[Dict[str, Any]]]] = None, arrangements: Optional[List[str]] = None, max_pumps: int = 3, vfd: bool = False, min_speed: float = 0.6, max_oversize: float = 0.15, min_efficiency: float = 0, fluid_density: float = 1000, max_results: int = 5, include_curves: bool = False, fallback: bool = True):
+        """Select pumps from a curve catalog by intersecting every curve and parallel/series arrangement with the system curve"""
+        try:
+            results = pump_selection(flow_rate, head, static_head, catalog, arrangements or ('single', 'parallel'), max_pumps, vfd, min_speed, max_oversize,
+                                     min_efficiency, fluid_density, max_results, include_curves, fallback)
+            compliance = "ISO 9906:2012 / HI 9.6.3 preferred operating region"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def pipe_sizing(flow_rate: float, velocity: float = 2, schedule: str = 'schedule40'):
         """Calculate pipe sizing"""
@@ -116,23 +151,10 @@ class MechanicalCalculators:
             rho = 1000
             Re = (velocity * diameter) / nu
             
-            pipe_roughness = {
-                'steel_new': 0.045,
-                'steel_old': 0.2,
-                'copper': 0.0015,
-                'pvc': 0.0015,
-                'cast_iron': 0.26
-            }
-            
-            epsilon = pipe_roughness.get(roughness, 0.045)
+            epsilon = PIPE_MATERIALS.get(roughness, PIPE_MATERIALS['steel_new'])['roughness']
             relative_roughness = epsilon / (pipe_size)
             
-            if Re < 2300:
-                f = 64 / Re
-            else:
-                f = __import__('math').pow(-1.8 * __import__('math').log10(__import__('math').pow(relative_roughness / 3.7, 1.1) + 6.9 / Re), -2)
-                for i in range(3):
-                    f = __import__('math').pow(-2 * __import__('math').log10(relative_roughness / 3.7 + 2.51 / (Re * __import__('math').sqrt(f))), -2)
+            f = float(friction_factor(Re, relative_roughness))
             
             head_loss = f * (L / diameter) * (velocity ** 2 / (2 * g))
             pressure_drop = rho * g * head_loss / 1000
@@ -154,6 +176,21 @@ class MechanicalCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def pipe_network(nodes: List[Dict[str, Any]], pipes: List[Dict[str, Any]], temperature: float = 20, method: str = 'darcy_weisbach', material: str = 'steel_new', tolerance: float = 1e-6, max_iterations: int = 50, include_details: bool = True):
+        """Solve flows and heads of a looped pipe network by the global gradient algorithm"""
+        try:
+            results = pipe_network(nodes, pipes, temperature, method, material, tolerance, max_iterations, include_details)
+            if not results["converged"]:
+                compliance = f"Network did not converge in {max_iterations} iterations"
+            elif results["min_pressure_kpa"] < 0:
+                compliance = f"Negative pressure at node {results['critical_node']}"
+            else:
+                compliance = "Darcy-Weisbach & Colebrook-White" if method == 'darcy_weisbach' else "Hazen-Williams"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def duct_sizing(airflow: float, velocity: float = 10):
         """Calculate duct sizing for HVAC systems"""
@@ -189,6 +226,17 @@ class MechanicalCalculators:
         except Exception as e:
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def duct_network(segments: List[Dict[str, Any]], method: str = 'equal_friction', friction_rate: float = 1.0, max_velocity: float = 10.0, min_velocity: float = 2.0, shape: str = 'round', aspect_ratio: float = 2.0, material: str = 'galvanized', regain_coefficient: float = 0.75, terminal_pressure: float = 25.0, air_temperature: float = 20, altitude: float = 0, include_details: bool = True):
+        """Size a supply duct tree and find the index path that sets the fan pressure"""
+        try:
+            results = duct_network(segments, method, friction_rate, max_velocity, min_velocity, shape, aspect_ratio, material,
+                                   regain_coefficient, terminal_pressure, air_temperature, altitude, include_details)
+            compliance = "ASHRAE Fundamentals ch. 21 equal friction" if method == 'equal_friction' else "ASHRAE Fundamentals ch. 21 static regain"
+            return {"results": results, "compliance": compliance, "success": True}
+        except Exception as e:
+            return {"error": str(e), "success": False}
+    
     @staticmethod
     def heat_transfer(area: float, delta_t: float, u_value: float = 1.5):
         """Calculate heat transfer and energy loss"""
@@ -367,41 +415,23 @@ class MechanicalCalculators:
     def psychrometrics(dry_bulb_temp: float, relative_humidity: float, altitude: float = 0):
         """Calculate psychrometric properties"""
         try:
-            Tdb = dry_bulb_temp
-            RH = relative_humidity / 100
-            P = 101.325 * __import__('math').pow(1 - 0.0065 * altitude / 288.15, 5.2559)
-            
-            Pws = 0.61121 * __import__('math').exp((18.678 - Tdb / 234.5) * (Tdb / (257.14 + Tdb)))
-            Pw = RH * Pws
-            W = 0.622 * Pw / (P - Pw)
-            
-            alpha = __import__('math').log(Pw / 0.61121)
-            Tdp = (257.14 * alpha) / (18.678 - alpha)
-            
-            Twb = Tdb * __import__('math').atan(0.151977 * __import__('math').pow(RH * 100 + 8.313659, 0.5)) + \
-                  __import__('math').atan(Tdb + RH * 100) - __import__('math').atan(RH * 100 - 1.676331) + \
-                  0.00391838 * __import__('math').pow(RH * 100, 1.5) * __import__('math').atan(0.023101 * RH * 100) - 4.686035
-            
-            h = 1.006 * Tdb + W * (2501 + 1.86 * Tdb)
-            v = (0.287 * (Tdb + 273.15) * (1 + 1.6078 * W)) / P
-            density = 1 / v
-            
-            Ws = 0.622 * Pws / (P - Pws)
-            degree_of_saturation = (W / Ws) * 100
-            
+            state = {name: float(value) for name, value in psychrometric_state(dry_bulb_temp, relative_humidity, altitude=altitude).items()}
+            if math.isnan(state["humidity_ratio"]):
+                raise ValueError("Relative humidity must be between 0 and 100 %")
+
             results = {
-                "dry_bulb_temp": round(Tdb, 1),
-                "relative_humidity": round(RH * 100, 1),
+                "dry_bulb_temp": round(dry_bulb_temp, 1),
+                "relative_humidity": round(relative_humidity, 1),
                 "altitude": round(altitude, 0),
-                "atmospheric_pressure": round(P, 2),
-                "wet_bulb_temp": round(Twb, 1),
-                "dew_point_temp": round(Tdp, 1),
-                "humidity_ratio": round(W * 1000, 2),
-                "specific_enthalpy": round(h, 2),
-                "specific_volume": round(v, 3),
-                "air_density": round(density, 3),
-                "degree_of_saturation": round(degree_of_saturation, 1),
-                "vapor_pressure": round(Pw, 2)
+                "atmospheric_pressure": round(float(atmospheric_pressure(altitude)), 2),
+                "wet_bulb_temp": round(state["wet_bulb"], 1),
+                "dew_point_temp": None if math.isnan(state["dew_point"]) else round(state["dew_point"], 1),
+                "humidity_ratio": round(state["humidity_ratio"] * 1000, 2),
+                "specific_enthalpy": round(state["enthalpy"], 2),
+                "specific_volume": round(state["specific_volume"], 3),
+                "air_density": round(state["density"], 3),
+                "degree_of_saturation": round(state["degree_of_saturation"], 1),
+                "vapor_pressure": round(state["vapour_pressure"], 2)
             }
             
             compliance = "ASHRAE Fundamentals"
@@ -0,0 +1,230 @@
+"""
+Pipe Network
+Steady-state hydraulics of looped pipe networks (chilled water, fire water, distribution mains)
+by the global gradient algorithm of Todini and Pilati: node-pipe incidence is assembled once as
+sparse matrices, and each Newton step updates the friction of every pipe in one vectorized pass
+(Swamee-Jain start refined with Colebrook-White, or Hazen-Williams) before solving the sparse
+nodal head system.
+"""
+
+import math
+from typing import Dict, Any, List, Mapping, Sequence, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import spsolve
+
+from calculators.services.equipment_data import PIPE_FITTINGS, PIPE_MATERIALS
+
+G = 9.81
+LAMINAR_RE = 2300  # below this f = 64 / Re
+TURBULENT_RE = 4000  # network friction blends linearly from laminar to turbulent in between
+MIN_FLOW = 1e-7  # m³/s, floor on |Q| so stagnant pipes keep a finite gradient
+HAZEN_EXPONENT = 1.852
+INITIAL_VELOCITY = 0.3  # m/s, starting flow in every pipe
+
+
+def water_properties(temperature: float = 20) -> Dict[str, float]:
+    """
+    Density (kg/m³) and kinematic viscosity (m²/s) of water at temperature (°C)
+    """
+    density = 1000 * (1 - (temperature + 288.9414) / (508929.2 * (temperature + 68.12963)) * (temperature - 3.9863) ** 2)
+    dynamic = 2.414e-5 * 10 ** (247.8 / (temperature + 133.15))
+    return {"density": density, "viscosity": dynamic / density}
+
+
+def friction_factor(reynolds: Union[float, np.ndarray], relative_roughness: Union[float, np.ndarray], iterations: int = 3,
+                    blend: bool = False) -> np.ndarray:
+    """
+    Darcy friction factor: 64/Re when laminar, otherwise Swamee-Jain refined by Colebrook-White fixed-point steps.
+    blend interpolates across the transitional range so f(Re) is continuous, which Newton iteration needs.
+    """
+    re = np.maximum(np.asarray(reynolds, dtype=float), 1e-9)
+    roughness = np.asarray(relative_roughness, dtype=float) / 3.7
+    turbulent_re = np.maximum(re, TURBULENT_RE) if blend else re
+    f = 0.25 / np.log10(roughness + 5.74 / turbulent_re ** 0.9) ** 2
+    for _ in range(iterations):
+        f = (-2 * np.log10(roughness + 2.51 / (turbulent_re * np.sqrt(f)))) ** -2
+    if blend:
+        share = np.clip((re - LAMINAR_RE) / (TURBULENT_RE - LAMINAR_RE), 0, 1)
+        f = (1 - share) * 64 / LAMINAR_RE + share * f
+    return np.where(re < LAMINAR_RE, 64 / re, f)
+
+
+def fittings_k(fittings: Union[None, float, str, Sequence[Any], Dict[str, float]], table: Mapping[str, float] = PIPE_FITTINGS) -> float:
+    """
+    Total loss coefficient from a K value, a list of fitting names/K values, comma-separated text of them
+    ("elbow_90, gate_valve") or {fitting: count}, with names looked up in table
+    """
+    if fittings is None:
+        return 0.0
+    if isinstance(fittings, (int, float)):
+        return float(fittings)
+    if isinstance(fittings, str):
+        fittings = [item.strip() for item in fittings.split(',') if item.strip()]
+    items = fittings.items() if isinstance(fittings, dict) else ((item, 1) for item in fittings)
+    total = 0.0
+    for fitting, count in items:
+        if isinstance(fitting, str) and fitting not in table:
+            try:
+                fitting = float(fitting)
+            except ValueError:
+                pass
+        if isinstance(fitting, (int, float)):
+            total += float(fitting) * count
+        elif fitting in table:
+            total += table[fitting] * count
+        else:
+            raise ValueError(f"Unknown fitting: {fitting} (expected {', '.join(table)} or a K value)")
+    return total
+
+
+class Network:
+    """Sparse incidence of a pipe network split into unknown-head junctions and fixed-head sources"""
+
+    def __init__(self, nodes: List[Dict[str, Any]], pipes: List[Dict[str, Any]], material: str = 'steel_new'):
+        if not pipes:
+            raise ValueError("The network needs at least one pipe")
+        index = {node["id"]: i for i, node in enumerate(nodes)}
+        if len(index) != len(nodes):
+            raise ValueError("Node ids must be unique")
+        try:
+            start = np.array([index[pipe["from"]] for pipe in pipes])
+            end = np.array([index[pipe["to"]] for pipe in pipes])
+        except KeyError as e:
+            raise ValueError(f"Pipe refers to unknown node {e.args[0]}")
+        if np.any(start == end):
+            raise ValueError("Pipes must connect two different nodes")
+
+        fixed = np.array([node.get("head") is not None for node in nodes])
+        if not fixed.any():
+            raise ValueError("At least one node needs a fixed head (reservoir, tank or pump discharge)")
+        graph = sparse.coo_matrix((np.ones(len(pipes)), (start, end)), shape=(len(nodes), len(nodes)))
+        count, labels = connected_components(graph, directed=False)
+        if count > 1 and len(set(labels[fixed])) < count:
+            orphans = [nodes[i]["id"] for i in np.flatnonzero(~np.isin(labels, labels[fixed]))[:5]]
+            raise ValueError(f"Nodes not connected to any fixed-head node: {', '.join(map(str, orphans))}")
+
+        self.nodes, self.pipes = nodes, pipes
+        self.ids = [node["id"] for node in nodes]
+        self.start, self.end = start, end
+        self.fixed = fixed
+        # Unknown heads are numbered 0..n-1, fixed heads 0..m-1
+        self.column = np.where(fixed, np.cumsum(fixed) - 1, np.cumsum(~fixed) - 1)
+        self.junctions = int((~fixed).sum())
+        self.fixed_head = np.array([float(node["head"]) for node in nodes if node.get("head") is not None])
+        self.demand = np.array([float(node.get("demand", 0)) for node, f in zip(nodes, fixed) if not f]) / 3600
+        self.elevation = np.array([float(node.get("elevation", 0)) for node in nodes])
+
+        # A12 / A10: -1 at the upstream node, +1 at the downstream node (energy: h(Q) + A12 H + A10 H0 = 0)
+        rows = np.concatenate([np.arange(len(pipes))] * 2)
+        nodes_of = np.concatenate([start, end])
+        signs = np.concatenate([-np.ones(len(pipes)), np.ones(len(pipes))])
+        unknown = ~fixed[nodes_of]
+        self.a12 = sparse.csr_matrix((signs[unknown], (rows[unknown], self.column[nodes_of][unknown])), shape=(len(pipes), self.junctions))
+        self.a10 = sparse.csr_matrix((signs[~unknown], (rows[~unknown], self.column[nodes_of][~unknown])), shape=(len(pipes), len(self.fixed_head)))
+
+        materials = [pipe.get("material", material) for pipe in pipes]
+        unknown_materials = set(materials) - set(PIPE_MATERIALS)
+        if unknown_materials:
+            raise ValueError(f"Unknown pipe material: {', '.join(map(str, unknown_materials))} (expected {', '.join(PIPE_MATERIALS)})")
+        self.length = np.array([float(pipe["length"]) for pipe in pipes])
+        self.diameter = np.array([float(pipe["diameter"]) for pipe in pipes]) / 1000
+        if np.any(self.length <= 0) or np.any(self.diameter <= 0):
+            raise ValueError("Pipe lengths and diameters must be positive")
+        self.roughness = np.array([float(pipe.get("roughness", PIPE_MATERIALS[m]['roughness'])) for pipe, m in zip(pipes, materials)]) / 1000
+        self.c_factor = np.array([float(pipe.get("c_factor", PIPE_MATERIALS[m]['c_factor'])) for pipe, m in zip(pipes, materials)])
+        self.minor_k = np.array([fittings_k(pipe.get("fittings", pipe.get("minor_loss"))) for pipe in pipes])
+        self.area = math.pi * self.diameter ** 2 / 4
+
+
+def pipe_network(nodes: List[Dict[str, Any]], pipes: List[Dict[str, Any]], temperature: float = 20, method: str = 'darcy_weisbach',
+                 material: str = 'steel_new', tolerance: float = 1e-6, max_iterations: int = 50,
+                 include_details: bool = True) -> Dict[str, Any]:
+    """
+    Flows and heads of a pipe network.
+    nodes: {"id", "demand" (m³/h drawn off, negative for inflow), "elevation" (m), "head" (m, fixed-head nodes only)}
+    pipes: {"id", "from", "to", "length" (m), "diameter" (mm), optional "material", "roughness" (mm),
+            "c_factor", "fittings" (K, fitting names or {fitting: count})}
+    Pipe flows are positive from "from" to "to".
+    """
+    if method not in ('darcy_weisbach', 'hazen_williams'):
+        raise ValueError("Method must be 'darcy_weisbach' or 'hazen_williams'")
+    network = Network(nodes, pipes, material)
+    water = water_properties(temperature)
+    d, area = network.diameter, network.area
+
+    minor = 8 * network.minor_k / (G * math.pi ** 2 * d ** 4)
+    if method == 'hazen_williams':
+        hazen = 10.67 * network.length / (network.c_factor ** HAZEN_EXPONENT * d ** 4.8704)
+    else:
+        darcy = 8 * network.length / (G * math.pi ** 2 * d ** 5)
+
+    a21 = network.a12.T.tocsr()
+    fixed_term = network.a10 @ network.fixed_head
+    flow = INITIAL_VELOCITY * area
+    heads = np.zeros(network.junctions)
+    converged, iteration = False, 0
+    for iteration in range(1, max_iterations + 1):
+        q = np.maximum(np.abs(flow), MIN_FLOW)
+        if method == 'hazen_williams':
+            resistance, exponent = hazen * q ** (HAZEN_EXPONENT - 1), HAZEN_EXPONENT
+        else:
+            reynolds = q * d / (area * water["viscosity"])
+            f = friction_factor(reynolds, network.roughness / d, blend=True)
+            resistance, exponent = darcy * f * q, np.where(reynolds < LAMINAR_RE, 1.0, 2.0)
+        # Head loss h = R Q; Newton gradient dh/dQ = n R
+        loss = (resistance + minor * q) * flow
+        gradient = exponent * resistance + 2 * minor * q
+        inverse = 1 / gradient
+
+        energy = loss + network.a12 @ heads + fixed_term
+        continuity = a21 @ flow - network.demand
+        system = (a21 @ sparse.diags(inverse) @ network.a12).tocsc()
+        step = spsolve(system, continuity - a21 @ (inverse * energy)) if network.junctions else np.zeros(0)
+        heads = heads + step
+        change = -inverse * (energy + network.a12 @ step)
+        flow = flow + change
+        if np.abs(change).sum() <= tolerance * max(np.abs(flow).sum(), MIN_FLOW):
+            converged = True
+            break
+
+    all_heads = np.empty(len(nodes))
+    all_heads[~network.fixed] = heads
+    all_heads[network.fixed] = network.fixed_head
+    pressure = water["density"] * G * (all_heads - network.elevation) / 1000
+    q = np.abs(flow)
+    velocity = q / area
+    head_loss = all_heads[network.start] - all_heads[network.end]
+    gradient_pa_m = water["density"] * G * np.abs(head_loss) / network.length
+
+    junction = np.flatnonzero(~network.fixed)
+    critical = int(junction[np.argmin(pressure[junction])]) if len(junction) else int(np.argmin(pressure))
+    supply = -(network.a10.T @ flow) * 3600  # inflow from each fixed-head node
+    results = {
+        "converged": converged,
+        "iterations": iteration,
+        "method": method,
+        "pipes": len(pipes),
+        "nodes": len(nodes),
+        "supply_flow": round(float(supply.sum()), 3),
+        "total_demand": round(float(network.demand.sum() * 3600), 3),
+        "critical_node": network.ids[critical],
+        "min_pressure_kpa": round(float(pressure[critical]), 2),
+        "max_velocity": round(float(velocity.max()), 3),
+        "max_gradient_pa_m": round(float(gradient_pa_m.max()), 1),
+        # Friction and fitting losses from the highest source to the critical node
+        "pressure_drop_total": round(float(water["density"] * G * (network.fixed_head.max() - all_heads[critical]) / 1000), 2),
+    }
+    if include_details:
+        results["node_results"] = [
+            {"id": node_id, "head": round(float(h), 3), "pressure_kpa": round(float(p), 2)}
+            for node_id, h, p in zip(network.ids, all_heads, pressure)
+        ]
+        results["pipe_results"] = [
+            {"id": pipe.get("id", i), "flow": round(float(Q * 3600), 3), "velocity": round(float(v), 3),
+             "head_loss": round(float(h), 4), "gradient_pa_m": round(float(gr), 1)}
+            for i, (pipe, Q, v, h, gr) in enumerate(zip(pipes, flow, velocity, head_loss, gradient_pa_m))
+        ]
+    return results
@@ -0,0 +1,225 @@
+"""
+Psychrometrics
+Moist-air state functions that take scalars or NumPy arrays alike (ASHRAE Fundamentals ch. 1,
+Buck saturation pressure over water and ice), so hourly weather years and trend logs are
+evaluated in single array passes. Data frames are processed CHUNK_ROWS rows at a time so the
+temporaries of the iterative solutions stay bounded however long the log is.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+MOLAR_RATIO = 0.621945  # Mw / Mda
+WET_BULB_BISECTIONS = 32
+DEW_POINT_ITERATIONS = 4  # Newton steps on the Buck equation from the Magnus estimate
+CHUNK_ROWS = 250_000
+
+# Buck (1996) coefficients a, b, c of Pws = P0 exp((a - t/b) t / (c + t)) over water and ice
+BUCK_WATER = (18.678, 234.5, 257.14)
+BUCK_ICE = (23.036, 333.7, 279.82)
+WATER_PRESSURE = 0.61121  # kPa, P0 over water
+TRIPLE_POINT_PRESSURE = 0.61115  # kPa, saturation pressure at 0 °C over ice (P0 over ice)
+
+HUMIDITY_BASES = ('relative_humidity', 'dew_point', 'wet_bulb', 'humidity_ratio')
+STATE_PROPERTIES = ('relative_humidity', 'humidity_ratio', 'dew_point', 'wet_bulb', 'enthalpy', 'specific_volume',
+                    'density', 'degree_of_saturation', 'vapour_pressure')
+
+
+def atmospheric_pressure(altitude: ArrayLike = 0) -> np.ndarray:
+    """
+    Standard atmospheric pressure (kPa) at altitude (m)
+    """
+    return 101.325 * (1 - 2.25577e-5 * np.asarray(altitude, dtype=float)) ** 5.2559
+
+
+def saturation_pressure(temperature: ArrayLike) -> np.ndarray:
+    """
+    Saturation vapour pressure (kPa) over water, or over ice below 0 °C (Buck 1996)
+    """
+    t = np.asarray(temperature, dtype=float)
+    ice = t < 0
+    a, b, c = (np.where(ice, i, w) for w, i in zip(BUCK_WATER, BUCK_ICE))
+    return np.where(ice, TRIPLE_POINT_PRESSURE, WATER_PRESSURE) * np.exp((a - t / b) * t / (c + t))
+
+
+def humidity_ratio(dry_bulb: ArrayLike, relative_humidity: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Humidity ratio (kg/kg dry air) from dry bulb (°C) and relative humidity (%)
+    """
+    vapour = np.asarray(relative_humidity, dtype=float) / 100 * saturation_pressure(dry_bulb)
+    return MOLAR_RATIO * vapour / (pressure - vapour)
+
+
+def humidity_ratio_from_dew_point(dew_point: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Humidity ratio (kg/kg dry air) from dew point (°C)
+    """
+    vapour = saturation_pressure(dew_point)
+    return MOLAR_RATIO * vapour / (pressure - vapour)
+
+
+def humidity_ratio_from_wet_bulb(dry_bulb: ArrayLike, wet_bulb: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Humidity ratio (kg/kg dry air) from dry and thermodynamic wet bulb (°C), ASHRAE eq. 33 (water) / 35 (ice)
+    """
+    t, twb = np.asarray(dry_bulb, dtype=float), np.asarray(wet_bulb, dtype=float)
+    vapour = saturation_pressure(twb)
+    saturated = MOLAR_RATIO * vapour / (pressure - vapour)
+    water = ((2501 - 2.326 * twb) * saturated - 1.006 * (t - twb)) / (2501 + 1.86 * t - 4.186 * twb)
+    ice = ((2830 - 0.24 * twb) * saturated - 1.006 * (t - twb)) / (2830 + 1.86 * t - 2.1 * twb)
+    return np.where(twb >= 0, water, ice)
+
+
+def wet_bulb(dry_bulb: ArrayLike, humidity: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Thermodynamic wet bulb (°C) for a humidity ratio (kg/kg), by bisection on every element at once
+    """
+    t = np.asarray(dry_bulb, dtype=float)
+    w = np.broadcast_to(np.asarray(humidity, dtype=float), t.shape)
+    low, high = t - 60.0, t.copy()
+    for _ in range(WET_BULB_BISECTIONS):
+        middle = 0.5 * (low + high)
+        below = humidity_ratio_from_wet_bulb(t, middle, pressure) < w
+        low, high = np.where(below, middle, low), np.where(below, high, middle)
+    return np.where(np.isnan(w), np.nan, 0.5 * (low + high))
+
+
+def vapour_pressure(humidity: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Partial pressure of water vapour (kPa) for a humidity ratio (kg/kg)
+    """
+    w = np.asarray(humidity, dtype=float)
+    return pressure * w / (MOLAR_RATIO + w)
+
+
+def relative_humidity_from_humidity_ratio(dry_bulb: ArrayLike, humidity: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Relative humidity (%) from dry bulb (°C) and humidity ratio (kg/kg)
+    """
+    return 100 * vapour_pressure(humidity, pressure) / saturation_pressure(dry_bulb)
+
+
+def dew_point_from_humidity_ratio(humidity: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Dew (or frost) point (°C) for a humidity ratio (kg/kg): the Buck equation inverted by Newton steps
+    on every element at once. Dry air (W = 0) has no dew point and gives NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        target = np.log(vapour_pressure(humidity, pressure) / WATER_PRESSURE)
+        ice = target < np.log(TRIPLE_POINT_PRESSURE / WATER_PRESSURE)
+        a, b, c = (np.where(ice, i, w) for w, i in zip(BUCK_WATER, BUCK_ICE))
+        target = np.where(ice, target + np.log(WATER_PRESSURE / TRIPLE_POINT_PRESSURE), target)
+        t = c * target / (a - target)  # Magnus form, exact when t/b is negligible
+        for _ in range(DEW_POINT_ITERATIONS):
+            g = (a - t / b) * t / (c + t)
+            slope = -t / (b * (c + t)) + (a - t / b) * c / (c + t) ** 2
+            t = t - (g - target) / slope
+    return np.where(np.isfinite(target), t, np.nan)
+
+
+def enthalpy(dry_bulb: ArrayLike, humidity: ArrayLike) -> np.ndarray:
+    """
+    Specific enthalpy (kJ/kg dry air) of moist air, ASHRAE eq. 30
+    """
+    t = np.asarray(dry_bulb, dtype=float)
+    return 1.006 * t + np.asarray(humidity, dtype=float) * (2501 + 1.86 * t)
+
+
+def specific_volume(dry_bulb: ArrayLike, humidity: ArrayLike, pressure: ArrayLike = 101.325) -> np.ndarray:
+    """
+    Specific volume (m³/kg dry air) of moist air, ASHRAE eq. 26
+    """
+    t = np.asarray(dry_bulb, dtype=float)
+    return 0.287042 * (t + 273.15) * (1 + 1.607858 * np.asarray(humidity, dtype=float)) / pressure
+
+
+def psychrometric_state(dry_bulb: ArrayLike, humidity: ArrayLike, basis: str = 'relative_humidity', altitude: ArrayLike = 0,
+                        properties: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Moist-air state from dry bulb (°C) and one humidity measure: basis 'relative_humidity' (%), 'dew_point' (°C),
+    'wet_bulb' (°C) or 'humidity_ratio' (kg/kg). Returns arrays of the requested STATE_PROPERTIES (all by default);
+    physically impossible samples (RH outside 0-100 %, dew point above dry bulb, ...) come back as NaN.
+    """
+    if basis not in HUMIDITY_BASES:
+        raise ValueError(f"Unknown humidity basis: {basis} (expected {', '.join(HUMIDITY_BASES)})")
+    wanted = STATE_PROPERTIES if properties is None else tuple(properties)
+    unknown = set(wanted) - set(STATE_PROPERTIES)
+    if unknown:
+        raise ValueError(f"Unknown psychrometric properties: {', '.join(sorted(unknown))}")
+
+    t, measure = np.broadcast_arrays(np.asarray(dry_bulb, dtype=float), np.asarray(humidity, dtype=float))
+    pressure = atmospheric_pressure(altitude)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if basis == 'relative_humidity':
+            w = humidity_ratio(t, measure, pressure)
+            valid = (measure >= 0) & (measure <= 100)
+        elif basis == 'dew_point':
+            w = humidity_ratio_from_dew_point(measure, pressure)
+            valid = measure <= t
+        elif basis == 'wet_bulb':
+            w = humidity_ratio_from_wet_bulb(t, measure, pressure)
+            valid = (measure <= t) & (w >= 0)
+        else:
+            w = measure
+            valid = w >= 0
+        saturated = humidity_ratio(t, 100.0, pressure)
+        invalid = ~(valid & (w <= saturated * (1 + 1e-9)))
+        w = np.where(invalid, np.nan, w)
+
+        # Evaluated only when requested; the wet bulb bisection is the expensive one
+        derived = {
+            'relative_humidity': lambda: relative_humidity_from_humidity_ratio(t, w, pressure),
+            'humidity_ratio': lambda: w,
+            'dew_point': lambda: dew_point_from_humidity_ratio(w, pressure),
+            'wet_bulb': lambda: wet_bulb(t, w, pressure),
+            'enthalpy': lambda: enthalpy(t, w),
+            'specific_volume': lambda: specific_volume(t, w, pressure),
+            'density': lambda: (1 + w) / specific_volume(t, w, pressure),
+            'degree_of_saturation': lambda: 100 * w / saturated,
+            'vapour_pressure': lambda: vapour_pressure(w, pressure),
+        }
+        state = {name: np.where(invalid, np.nan, measure) if name == basis else derived[name]() for name in wanted}
+    return state
+
+
+def psychrometric_chunks(frames: Iterable[Any], dry_bulb: str, humidity: str, basis: str = 'relative_humidity', altitude: float = 0,
+                         properties: Optional[Iterable[str]] = None, prefix: str = '', chunk_rows: int = CHUNK_ROWS) -> Iterator[Any]:
+    """
+    Add psychrometric columns (prefix + property name) to each data frame of a stream, e.g. pandas.read_csv(chunksize=...),
+    yielding one frame per chunk_rows rows or fewer. Only the current chunk is ever held in memory.
+    """
+    wanted = list(STATE_PROPERTIES if properties is None else properties)
+    for frame in frames:
+        for column in (dry_bulb, humidity):
+            if column not in frame.columns:
+                raise ValueError(f"Column '{column}' not found in data")
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows].copy()
+            state = psychrometric_state(chunk[dry_bulb].to_numpy(dtype=float), chunk[humidity].to_numpy(dtype=float),
+                                        basis, altitude, wanted)
+            for name in wanted:
+                chunk[prefix + name] = state[name]
+            yield chunk
+
+
+def add_psychrometrics(frame: Any, dry_bulb: str, humidity: str, basis: str = 'relative_humidity', altitude: float = 0,
+                       properties: Optional[Iterable[str]] = None, prefix: str = '', chunk_rows: int = CHUNK_ROWS) -> List[str]:
+    """
+    Add psychrometric columns to a data frame in place, CHUNK_ROWS at a time; returns the new column names
+    """
+    wanted = list(STATE_PROPERTIES if properties is None else properties)
+    for column in (dry_bulb, humidity):
+        if column not in frame.columns:
+            raise ValueError(f"Column '{column}' not found in data")
+    columns = {name: np.empty(len(frame)) for name in wanted}
+    t, measure = frame[dry_bulb].to_numpy(dtype=float), frame[humidity].to_numpy(dtype=float)
+    for start in range(0, len(frame), chunk_rows):
+        rows = slice(start, start + chunk_rows)
+        for name, values in psychrometric_state(t[rows], measure[rows], basis, altitude, wanted).items():
+            columns[name][rows] = values
+    for name in wanted:
+        frame[prefix + name] = columns[name]
+    return [prefix + name for name in wanted]
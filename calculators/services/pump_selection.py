@@ -0,0 +1,332 @@
+"""
+Pump Selection
+Pump catalogs held as polynomial coefficient arrays in flow (head and efficiency, one row per
+curve) so every curve, in every parallel or series arrangement, is intersected with the system
+curve H = H_static + k Q² in one vectorized bisection. Variable-speed selections solve the
+affinity-scaled speed that puts the curve through the duty point instead. Feasible candidates
+are ranked by efficiency at the duty point.
+"""
+
+from typing import Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+from calculators.services.equipment_data import MOTOR_RATINGS, PUMP_CATALOG, get_catalog
+
+G = 9.81
+DEGREE = 3  # highest curve power; lower-order curves are zero-padded
+BISECTIONS = 48
+MAX_PUMPS = 6
+MOTOR_MARGIN = 1.15  # motor output over duty shaft power, as in pump_sizing
+
+# Normalized radial-impeller characteristic for catalogs that only give the best-efficiency point,
+# in x = Q / Q_bep: head/H_bep = 1.25 - 0.25 x², efficiency/η_bep = 2x - x², end of curve at x = 1.3
+HEAD_SHAPE = (1.25, 0.0, -0.25)
+EFFICIENCY_SHAPE = (0.0, 2.0, -1.0)
+END_OF_CURVE = 1.3
+
+# Hydraulic Institute 9.6.3 preferred operating region, and the minimum continuous flow (fractions of BEP flow)
+PREFERRED_REGION = (0.7, 1.2)
+MIN_FLOW_RATIO = 0.5
+# Lowest speed ratio of the nearest-match fallback (VFD turndown or a trimmed impeller)
+FALLBACK_SPEED = 0.3
+
+ARRANGEMENTS = ('single', 'parallel', 'series')
+
+
+def _polyval(coefficients: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Row-wise polynomials (ascending coefficients) at x, by Horner's rule"""
+    result = np.zeros(np.broadcast(coefficients[..., 0], x).shape)
+    for k in range(coefficients.shape[-1] - 1, -1, -1):
+        result = result * x + coefficients[..., k]
+    return result
+
+
+def _padded(coefficients: Sequence[float]) -> np.ndarray:
+    values = np.zeros(DEGREE + 1)
+    coefficients = np.asarray(coefficients, dtype=float)
+    if len(coefficients) > DEGREE + 1:
+        raise ValueError(f"Pump curves are polynomials of degree {DEGREE} at most")
+    values[:len(coefficients)] = coefficients
+    return values
+
+
+class PumpCurves:
+    """
+    Pump catalog as arrays: head and efficiency coefficients (N, DEGREE + 1) in flow (m³/h), with head in m and
+    efficiency as a fraction, plus best-efficiency and end-of-curve flows and rated speeds.
+    Rows give the BEP only ({"model", "flow", "head", "efficiency" (%), "speed"}), explicit coefficients
+    ({"head_coefficients", "efficiency_coefficients" (%), "max_flow"}) or test points
+    ({"points": {"flow": [...], "head": [...], "efficiency": [...]}}, fitted by least squares).
+    """
+
+    def __init__(self, pumps: Sequence[Dict[str, Any]]):
+        if not pumps:
+            raise ValueError("The pump catalog is empty")
+        self.models = [str(pump.get('model', f"pump {i + 1}")) for i, pump in enumerate(pumps)]
+        self.speed = np.array([float(pump.get('speed', 2900)) for pump in pumps])
+        self.head = np.zeros((len(pumps), DEGREE + 1))
+        self.efficiency = np.zeros((len(pumps), DEGREE + 1))
+        self.bep_flow = np.zeros(len(pumps))
+        self.max_flow = np.zeros(len(pumps))
+        for i, pump in enumerate(pumps):
+            try:
+                self._load(i, pump)
+            except (KeyError, TypeError) as e:
+                raise ValueError(f"Pump {self.models[i]} needs a best-efficiency point, curve coefficients or test points ({e})")
+        if np.any(self.head[:, 0] <= 0) or np.any(self.max_flow <= 0) or np.any(self.bep_flow <= 0):
+            raise ValueError("Pump curves need a positive shut-off head, best-efficiency flow and end-of-curve flow")
+
+    def _load(self, i: int, pump: Dict[str, Any]):
+        if 'points' in pump:
+            points = pump['points']
+            flow = np.asarray(points['flow'], dtype=float)
+            head = np.asarray(points['head'], dtype=float)
+            efficiency = np.asarray(points['efficiency'], dtype=float) / 100
+            if len(flow) < 3:
+                raise ValueError(f"Pump {self.models[i]} needs at least three test points")
+            self.head[i] = _padded(np.polyfit(flow, head, 2)[::-1])
+            # Efficiency through the origin: η = e1 Q + e2 Q²
+            fit = np.linalg.lstsq(np.column_stack([flow, flow ** 2]), efficiency, rcond=None)[0]
+            self.efficiency[i] = _padded([0.0, *fit])
+            self.max_flow[i] = flow.max()
+            self.bep_flow[i] = -fit[0] / (2 * fit[1]) if fit[1] < 0 else flow.max()
+        elif 'head_coefficients' in pump:
+            self.head[i] = _padded(pump['head_coefficients'])
+            self.efficiency[i] = _padded(pump['efficiency_coefficients']) / 100
+            self.max_flow[i] = float(pump['max_flow'])
+            if pump.get('bep_flow') is not None:
+                self.bep_flow[i] = float(pump['bep_flow'])
+            else:
+                flow = np.linspace(0, self.max_flow[i], 201)
+                self.bep_flow[i] = flow[np.argmax(_polyval(self.efficiency[i], flow))]
+        else:
+            flow, head, efficiency = float(pump['flow']), float(pump['head']), float(pump['efficiency']) / 100
+            self.head[i] = _padded([c * head / flow ** k for k, c in enumerate(HEAD_SHAPE)])
+            self.efficiency[i] = _padded([c * efficiency / flow ** k for k, c in enumerate(EFFICIENCY_SHAPE)])
+            self.bep_flow[i] = flow
+            self.max_flow[i] = END_OF_CURVE * flow
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+
+_BUILT_IN: Optional[PumpCurves] = None
+
+
+def pump_catalog(catalog: Union[None, str, Sequence[Dict[str, Any]], PumpCurves] = None) -> PumpCurves:
+    """
+    The built-in ISO 2858 catalog (None), a registered equipment catalog (name), rows, or curves as given
+    """
+    global _BUILT_IN
+    if isinstance(catalog, PumpCurves):
+        return catalog
+    if catalog is None:
+        if _BUILT_IN is None:
+            _BUILT_IN = PumpCurves(list(PUMP_CATALOG))
+        return _BUILT_IN
+    if isinstance(catalog, str):
+        return PumpCurves(list(get_catalog(catalog)))
+    return PumpCurves(list(catalog))
+
+
+def _bisect(function, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Root of a function decreasing from low to high, element-wise"""
+    for _ in range(BISECTIONS):
+        middle = 0.5 * (low + high)
+        positive = function(middle) > 0
+        low, high = np.where(positive, middle, low), np.where(positive, high, middle)
+    return 0.5 * (low + high)
+
+
+def _options(arrangements: Sequence[str], max_pumps: int) -> list:
+    """(pump count, in series) for every allowed arrangement"""
+    unknown = set(arrangements) - set(ARRANGEMENTS)
+    if unknown or not arrangements:
+        raise ValueError(f"Unknown pump arrangement: {', '.join(sorted(unknown)) or 'none given'} (expected {', '.join(ARRANGEMENTS)})")
+    options = [(1, False)] if 'single' in arrangements else []
+    options += [(n, False) for n in range(2, max_pumps + 1) if 'parallel' in arrangements]
+    options += [(n, True) for n in range(2, max_pumps + 1) if 'series' in arrangements]
+    if not options:
+        raise ValueError("No arrangement to evaluate: allow 'single' or max_pumps of at least 2")
+    return options
+
+
+def _match(curves: PumpCurves, options: list, flow_rate: float, head: float, static_head: float, vfd: bool, min_speed: float,
+           max_oversize: float, min_flow_ratio: float, throttle: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Operating point of every (catalog curve, arrangement) row, and whether it meets the duty hydraulically.
+    With throttle, variable-speed pumps still too strong at min_speed run there and a valve takes the excess head.
+    """
+    count = np.array([n for n, _ in options])
+    series = np.array([s for _, s in options])
+
+    # One row per (catalog curve, arrangement)
+    pump = np.repeat(np.arange(len(curves)), len(options))
+    arrangement = np.tile(np.arange(len(options)), len(curves))
+    parallel = np.where(series, 1, count)[arrangement]
+    stages = np.where(series, count, 1)[arrangement]
+    head_curve, efficiency_curve = curves.head[pump], curves.efficiency[pump]
+    bep_flow, max_flow = curves.bep_flow[pump], curves.max_flow[pump]
+    system = (head - static_head) / flow_rate ** 2
+
+    powers = np.arange(DEGREE + 1)
+    if vfd:
+        # Each pump at its share of the duty flow: H_n(q) = Σ c_k (n/n0)^(2-k) q^k
+        pump_flow = np.full(len(pump), flow_rate) / parallel
+        pump_head = head / stages
+
+        # H_n(q) = t0 s² + t1 s + t2 + t3 / s with t_k = c_k q^k and s = n/n0 (DEGREE 3)
+        t0, t1, t2, t3 = (head_curve * pump_flow[:, None] ** powers).T
+
+        def surplus(speed):
+            return pump_head - ((t0 * speed + t1) * speed + t2 + t3 / speed)
+
+        speed = _bisect(surplus, np.full(len(pump), min_speed), np.ones(len(pump)))
+        feasible = surplus(np.ones(len(pump))) <= 1e-9
+        if throttle:
+            pump_head = pump_head - np.minimum(surplus(speed), 0)
+        else:
+            feasible &= surplus(np.full(len(pump), min_speed)) >= -1e-9
+        flow = np.full(len(pump), float(flow_rate))
+        operating_head = np.full(len(pump), float(head))
+    else:
+        speed = np.ones(len(pump))
+
+        # Combined curve minus system curve as one polynomial in the total flow Q
+        combined = head_curve * stages[:, None] / parallel[:, None] ** powers
+        combined[:, 0] -= static_head
+        combined[:, 2] -= system
+
+        def surplus(q):
+            return _polyval(combined, q)
+
+        high = parallel * max_flow
+        flow = _bisect(surplus, np.zeros(len(pump)), high)
+        operating_head = static_head + system * flow ** 2
+        # The curve must start above the static head and cross the system curve before its end
+        feasible = (surplus(np.zeros(len(pump))) > 0) & (surplus(high) < 0)
+        feasible &= (flow >= flow_rate * (1 - 1e-6)) & (flow <= flow_rate * (1 + max_oversize))
+        pump_flow = flow / parallel
+        pump_head = operating_head / stages
+
+    # The affinity laws carry efficiency to the corresponding full-speed flow q / (n/n0)
+    rated_flow = pump_flow / speed
+    efficiency = _polyval(efficiency_curve, rated_flow)
+    bep_ratio = rated_flow / bep_flow
+    feasible &= (rated_flow <= max_flow * (1 + 1e-9)) & (bep_ratio >= min_flow_ratio) & (efficiency > 0)
+    return {"pump": pump, "arrangement": arrangement, "count": count[arrangement], "parallel": parallel, "stages": stages,
+            "speed": speed, "flow": flow, "operating_head": operating_head, "pump_flow": pump_flow, "pump_head": pump_head,
+            "efficiency": efficiency, "bep_ratio": bep_ratio, "feasible": feasible, "system": system}
+
+
+def pump_selection(flow_rate: float, head: float, static_head: float = 0.0,
+                   catalog: Union[None, str, Sequence[Dict[str, Any]], PumpCurves] = None,
+                   arrangements: Sequence[str] = ('single', 'parallel'), max_pumps: int = 3, vfd: bool = False, min_speed: float = 0.6,
+                   max_oversize: float = 0.15, min_efficiency: float = 0.0, fluid_density: float = 1000.0,
+                   max_results: int = 5, include_curves: bool = False, fallback: bool = True) -> Dict[str, Any]:
+    """
+    Select pumps for a duty point flow_rate (m³/h) at head (m) on the system curve through it and static_head (m).
+    Every catalog curve is tried in each allowed arrangement ('single', and up to max_pumps in 'parallel' or
+    'series'). Fixed-speed pumps must deliver the duty flow with at most max_oversize excess; with vfd the
+    affinity laws (H ∝ n², Q ∝ n) give the speed, not below min_speed, that meets the duty exactly. Candidates running below MIN_FLOW_RATIO of
+    BEP flow or past the end of their curve are rejected; the rest are ranked by efficiency at duty.
+    When nothing qualifies and fallback is set, the duty is matched by speed reduction or impeller trim, then by the
+    nearest catalog match (any arrangement of up to MAX_PUMPS, down to FALLBACK_SPEED with a throttling valve, below minimum flow), listing what was relaxed
+    in "warnings" instead of failing.
+    """
+    if flow_rate <= 0 or head <= 0:
+        raise ValueError("Flow rate and head must be positive")
+    if not 0 <= static_head < head:
+        raise ValueError("Static head must be at least zero and below the duty head")
+    if not 1 <= max_pumps <= MAX_PUMPS:
+        raise ValueError(f"max_pumps must be between 1 and {MAX_PUMPS}")
+    if not 0 < min_speed <= 1:
+        raise ValueError("min_speed must be a fraction of rated speed between 0 and 1")
+    options = _options(arrangements, max_pumps)
+    curves = pump_catalog(catalog)
+
+    match = _match(curves, options, flow_rate, head, static_head, vfd, min_speed, max_oversize, MIN_FLOW_RATIO)
+    feasible = match["feasible"] & (match["efficiency"] >= min_efficiency / 100)
+    warnings = []
+    if not feasible.any() and fallback:
+        relaxed = [
+            (options, min_speed, MIN_FLOW_RATIO, False, "matched by speed reduction (VFD) or impeller trim"),
+            (_options(ARRANGEMENTS, MAX_PUMPS), FALLBACK_SPEED, 0.0, True,
+             "the nearest catalog match: check the arrangement, speed, throttling and minimum flow"),
+        ]
+        for fallback_options, fallback_speed, min_flow_ratio, throttle, note in relaxed:
+            match = _match(curves, fallback_options, flow_rate, head, static_head, True, fallback_speed, max_oversize, min_flow_ratio, throttle)
+            feasible = match["feasible"]
+            if feasible.any():
+                options = fallback_options
+                warnings.append(f"No pump meets {flow_rate:g} m³/h at {head:g} m as specified"
+                                f"{'' if vfd else ' at fixed speed'}{f' at {min_efficiency:g}% efficiency' if min_efficiency else ''}; "
+                                f"selections are {note}")
+                break
+    if not feasible.any():
+        raise ValueError(f"No pump in the catalog meets {flow_rate:g} m³/h at {head:g} m with up to {max_pumps} pump(s)"
+                         f"{'' if vfd or fallback else ' at fixed speed; try vfd=True or a larger max_oversize'}")
+
+    pump, arrangement, count, speed = match["pump"], match["arrangement"], match["count"], match["speed"]
+    flow, operating_head, pump_flow, pump_head = match["flow"], match["operating_head"], match["pump_flow"], match["pump_head"]
+    efficiency, bep_ratio, system = match["efficiency"], match["bep_ratio"], match["system"]
+    shaft_power = np.where(feasible, fluid_density * G * pump_flow / 3600 * pump_head / np.where(efficiency > 0, efficiency, 1) / 1000, np.inf)
+    candidates = np.flatnonzero(feasible)
+    ranked = candidates[np.lexsort((shaft_power[candidates] * count[candidates], -efficiency[candidates]))]
+
+    selections = []
+    for i in ranked[:max_results]:
+        n, in_series = options[arrangement[i]]
+        p = pump[i]
+        motor = MOTOR_RATINGS.ceiling(shaft_power[i] * MOTOR_MARGIN)
+        bep_head = _polyval(curves.head[p], curves.bep_flow[p])
+        selections.append({
+            "model": curves.models[p],
+            "arrangement": "single" if n == 1 else f"{n} in {'series' if in_series else 'parallel'}",
+            "pumps": int(n),
+            "rated_speed": round(float(curves.speed[p]), 0),
+            "speed_ratio": round(float(speed[i]), 3),
+            "operating_speed": round(float(curves.speed[p] * speed[i]), 0),
+            "operating_flow": round(float(flow[i]), 2),
+            "operating_head": round(float(operating_head[i]), 2),
+            "pump_flow": round(float(pump_flow[i]), 2),
+            "pump_head": round(float(pump_head[i]), 2),
+            "throttled_head": round(float(pump_head[i] * match["stages"][i] - operating_head[i]), 2),
+            "efficiency": round(float(efficiency[i] * 100), 1),
+            "bep_ratio": round(float(bep_ratio[i]), 2),
+            "preferred_region": bool(PREFERRED_REGION[0] <= bep_ratio[i] <= PREFERRED_REGION[1]),
+            "below_minimum_flow": bool(bep_ratio[i] < MIN_FLOW_RATIO),
+            "shaft_power_each": round(float(shaft_power[i]), 2),
+            "shaft_power_total": round(float(shaft_power[i] * n), 2),
+            "motor_rating": motor if motor is not None else round(float(shaft_power[i] * MOTOR_MARGIN), 0),
+            # European specific speed n_q = n √Q / H^0.75 at the best-efficiency point (m³/s, m)
+            "specific_speed": round(float(curves.speed[p] * np.sqrt(curves.bep_flow[p] / 3600) / bep_head ** 0.75), 1),
+        })
+
+    best = ranked[0]
+    results = {
+        "duty_flow": round(flow_rate, 2),
+        "duty_head": round(head, 2),
+        "static_head": round(static_head, 2),
+        "system_coefficient": float(f"{system:.6g}"),
+        "control": "variable speed" if vfd or warnings else "fixed speed",
+        "catalog_curves": len(curves),
+        "candidates": int(len(pump)),
+        "feasible": int(len(candidates)),
+        "fallback": bool(warnings),
+        "warnings": warnings,
+        "selections": selections,
+    }
+    if include_curves:
+        n_parallel, n_series = match["parallel"][best], match["stages"][best]
+        head_curve, max_flow = curves.head[pump[best]], curves.max_flow[pump[best]]
+        powers = np.arange(DEGREE + 1)
+        q = np.linspace(0, n_parallel * max_flow * speed[best], 41)
+        scaled = head_curve * speed[best] ** (2 - powers)
+        results["curves"] = {
+            "flow": np.round(q, 2).tolist(),
+            "pump_head": np.round(n_series * _polyval(scaled, q / n_parallel), 2).tolist(),
+            "system_head": np.round(static_head + system * q ** 2, 2).tolist(),
+        }
+    return results
@@ -0,0 +1,212 @@
+"""
+Result Cache
+Calculators are pure functions of their inputs, so successful results are cached
+under (calculator id, code version, canonical inputs). An in-process LRU tier is
+always used; an optional SQLite tier shares results between workers.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional
+
+
+def canonical_key(calculator_id: str, version: str, inputs: Dict[str, Any]) -> str:
+    """
+    Stable key for a call; inputs should already be validated so equal values serialize equally
+    """
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{calculator_id}:{version}:{digest}"
+
+
+def source_version(*parts: Any) -> str:
+    """
+    Short hash identifying a calculator revision (source code, equation text, ...)
+    """
+    return hashlib.sha256("\x00".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+class SQLiteTier:
+    """
+    Cross-worker tier backed by a local SQLite file
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache ("
+                "key TEXT PRIMARY KEY, calculator_id TEXT NOT NULL, version TEXT NOT NULL, "
+                "value TEXT NOT NULL, expires_at REAL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_result_cache_calculator ON result_cache (calculator_id, version)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_result_cache_created ON result_cache (created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, now: float) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= now:
+            self._connect().execute("DELETE FROM result_cache WHERE key = ?", (key,))
+            return None
+        return row[0]
+
+    def set(self, key: str, calculator_id: str, version: str, value: str, expires_at: Optional[float], now: float):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO result_cache (key, calculator_id, version, value, expires_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, calculator_id, version, value, expires_at, now)
+        )
+        # Trim occasionally rather than on every insert
+        if hash(key) % 64 == 0:
+            self.trim(now)
+
+    def trim(self, now: float):
+        conn = self._connect()
+        conn.execute("DELETE FROM result_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM result_cache WHERE key IN ("
+            "SELECT key FROM result_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def purge_stale(self, versions: Dict[str, str]) -> int:
+        """
+        Drop entries written by other code versions of the given calculators
+        """
+        conn = self._connect()
+        removed = 0
+        for calculator_id, version in versions.items():
+            cursor = conn.execute(
+                "DELETE FROM result_cache WHERE calculator_id = ? AND version != ?", (calculator_id, version)
+            )
+            removed += cursor.rowcount
+        return removed
+
+    def clear(self):
+        self._connect().execute("DELETE FROM result_cache")
+
+    def size(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Two-tier cache of successful calculator results, stored as JSON so callers
+    always receive a fresh copy
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = 86400,
+                 sqlite_path: Optional[str] = None, sqlite_max_entries: int = 200000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.shared = SQLiteTier(sqlite_path, sqlite_max_entries) if sqlite_path else None
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(value)
+                del self._entries[key]
+
+        if self.shared is not None:
+            value = self.shared.get(key, now)
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                    self._store(key, value, self._expiry(now))
+                return json.loads(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, calculator_id: str, version: str, result: Dict[str, Any]):
+        now = time.time()
+        value = json.dumps(result, separators=(",", ":"))
+        expires_at = self._expiry(now)
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.shared is not None:
+            self.shared.set(key, calculator_id, version, value, expires_at, now)
+
+    def get_or_compute(self, calculator_id: str, version: str, inputs: Dict[str, Any],
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached result for this call, computing and storing it on a miss.
+        Failed results are never cached.
+        """
+        key = canonical_key(calculator_id, version, inputs)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        result = compute()
+        if result.get("success"):
+            self.set(key, calculator_id, version, result)
+        return result
+
+    def purge_stale(self, versions: Dict[str, str]) -> int:
+        """
+        Remove entries from previous code versions; in-process keys embed the version
+        so only the shared tier can hold stale rows
+        """
+        return self.shared.purge_stale(versions) if self.shared is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+                "shared": self.shared is not None
+            }
+
+    def _expiry(self, now: float) -> Optional[float]:
+        return now + self.ttl if self.ttl else None
+
+    def _store(self, key: str, value: str, expires_at: Optional[float]):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,225 @@
+"""
+Solar PV Yield
+Hourly PV yield simulation over a weather year, vectorized across hours and design
+variants: solar position, Erbs decomposition, Hay-Davies plane-of-array irradiance,
+PVsyst cell temperature, PVWatts DC and inverter models with clipping. A sweep over
+tilt, azimuth and DC/AC ratio evaluates every combination in one NumPy pass per ratio.
+"""
+
+import math
+from typing import Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+from calculators.services.equipment_data import PV_MODULE_TYPES, PV_MOUNTING
+
+Sweep = Union[float, Sequence[float]]
+
+SOLAR_CONSTANT = 1367.0  # W/m²
+STC_IRRADIANCE = 1000.0  # W/m²
+ABSORPTANCE = 0.9
+IAM_B0 = 0.05  # ASHRAE incidence angle modifier coefficient
+INVERTER_REFERENCE_EFFICIENCY = 0.9637  # PVWatts v5
+LATITUDE = 20.0  # site latitude (°N) assumed when a workflow gives none
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+WEATHER_COLUMNS = {
+    "ghi": ("ghi", "global_horizontal", "solar_irradiance", "irradiance"),
+    "dni": ("dni", "direct_normal"),
+    "dhi": ("dhi", "diffuse_horizontal", "diffuse"),
+    "temp_air": ("temp_air", "temperature", "ambient_temp", "dry_bulb", "tamb"),
+    "wind_speed": ("wind_speed", "wind", "ws"),
+    "relative_humidity": ("relative_humidity", "rh", "humidity"),
+    "dew_point": ("dew_point", "temp_dew", "dewpoint", "tdew"),
+    "wet_bulb": ("wet_bulb", "temp_wet", "twb"),
+}
+
+
+def weather_arrays(weather) -> Dict[str, np.ndarray]:
+    """
+    Hourly arrays from a dict or DataFrame of weather columns (W/m², °C, m/s); GHI is required
+    """
+    columns = {str(name).strip().lower(): name for name in (weather.columns if hasattr(weather, "columns") else weather)}
+    arrays = {}
+    for field, aliases in WEATHER_COLUMNS.items():
+        name = next((columns[alias] for alias in aliases if alias in columns), None)
+        if name is not None:
+            arrays[field] = np.asarray(weather[name], dtype=float)
+    if "ghi" not in arrays:
+        raise ValueError("Weather data needs a GHI column (global horizontal irradiance, W/m²)")
+    hours = len(arrays["ghi"])
+    if hours < 24 or hours % 24:
+        raise ValueError(f"Weather data must cover whole days of hourly values, got {hours} rows")
+    if any(len(values) != hours for values in arrays.values()):
+        raise ValueError("All weather columns must have the same length")
+    return arrays
+
+
+def solar_position(latitude: float, hours: int, longitude: Optional[float] = None, timezone: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Zenith and azimuth (radians, azimuth clockwise from north) at the middle of each hour of the year.
+    Without longitude and timezone the hours are taken as local solar time.
+    """
+    index = np.arange(hours)
+    day = index // 24 + 1
+    b = 2 * np.pi * (day - 1) / 365
+    declination = (0.006918 - 0.399912 * np.cos(b) + 0.070257 * np.sin(b) - 0.006758 * np.cos(2 * b)
+                   + 0.000907 * np.sin(2 * b) - 0.002697 * np.cos(3 * b) + 0.00148 * np.sin(3 * b))
+    solar_time = index % 24 + 0.5
+    if longitude is not None and timezone is not None:
+        equation_of_time = 229.18 * (0.000075 + 0.001868 * np.cos(b) - 0.032077 * np.sin(b)
+                                     - 0.014615 * np.cos(2 * b) - 0.040849 * np.sin(2 * b))
+        solar_time = solar_time + (4 * (longitude - 15 * timezone) + equation_of_time) / 60
+    hour_angle = np.radians(15 * (solar_time - 12))
+    phi = math.radians(latitude)
+
+    cos_zenith = np.clip(math.sin(phi) * np.sin(declination) + math.cos(phi) * np.cos(declination) * np.cos(hour_angle), -1, 1)
+    azimuth = np.arctan2(np.sin(hour_angle), np.cos(hour_angle) * math.sin(phi) - np.tan(declination) * math.cos(phi)) + np.pi
+    extraterrestrial = SOLAR_CONSTANT * (1.00011 + 0.034221 * np.cos(b) + 0.00128 * np.sin(b)
+                                         + 0.000719 * np.cos(2 * b) + 0.000077 * np.sin(2 * b))
+    return {"cos_zenith": cos_zenith, "zenith": np.arccos(cos_zenith), "azimuth": azimuth, "extraterrestrial": extraterrestrial}
+
+
+def decompose(ghi: np.ndarray, cos_zenith: np.ndarray, extraterrestrial: np.ndarray):
+    """
+    Erbs correlation: DNI and DHI from GHI through the clearness index
+    """
+    daylight = cos_zenith > 0.065
+    kt = np.where(daylight, np.clip(ghi / (extraterrestrial * np.maximum(cos_zenith, 0.065)), 0, 1), 0)
+    kd = np.where(kt <= 0.22, 1 - 0.09 * kt,
+                  np.where(kt <= 0.8, 0.9511 - 0.1604 * kt + 4.388 * kt ** 2 - 16.638 * kt ** 3 + 12.336 * kt ** 4, 0.165))
+    dhi = np.where(daylight, kd * ghi, ghi)
+    dni = np.where(daylight, (ghi - dhi) / np.maximum(cos_zenith, 0.065), 0)
+    return dni, dhi
+
+
+def clear_sky_year(latitude: float, daily_irradiance: float, hours: int = 8760) -> np.ndarray:
+    """
+    Haurwitz clear-sky GHI shape scaled to an average daily irradiation (kWh/m²/day)
+    """
+    cos_zenith = solar_position(latitude, hours)["cos_zenith"]
+    shape = np.where(cos_zenith > 0, 1098 * cos_zenith * np.exp(-0.057 / np.maximum(cos_zenith, 1e-3)), 0)
+    return shape * daily_irradiance * 1000 * (hours / 24) / shape.sum()
+
+
+def plane_of_array(sun: Dict[str, np.ndarray], dni: np.ndarray, dhi: np.ndarray, ghi: np.ndarray,
+                   tilt: np.ndarray, azimuth: np.ndarray, albedo: float = 0.2) -> np.ndarray:
+    """
+    Hay-Davies transposition for (surfaces, 1) tilt/azimuth in degrees against hourly (hours,) irradiance
+    """
+    beta, gamma = np.radians(tilt), np.radians(azimuth)
+    cos_zenith = sun["cos_zenith"]
+    cos_aoi = cos_zenith * np.cos(beta) + np.sqrt(1 - cos_zenith ** 2) * np.sin(beta) * np.cos(sun["azimuth"] - gamma)
+    facing = np.maximum(cos_aoi, 0)
+    iam = np.clip(1 - IAM_B0 * (1 / np.maximum(cos_aoi, 1e-3) - 1), 0, 1)
+    anisotropy = dni / sun["extraterrestrial"]
+    rb = facing / np.maximum(cos_zenith, 0.0872)
+    sky = dhi * (anisotropy * rb + (1 - anisotropy) * (1 + np.cos(beta)) / 2)
+    ground = ghi * albedo * (1 - np.cos(beta)) / 2
+    return dni * facing * iam + sky + ground
+
+
+def inverter_output(dc: np.ndarray, ac_rating: float, efficiency: float = 0.96):
+    """
+    PVWatts v5 part-load inverter efficiency; returns AC power and the power clipped at the AC rating
+    """
+    dc_rating = ac_rating / efficiency
+    zeta = dc / dc_rating
+    eta = efficiency / INVERTER_REFERENCE_EFFICIENCY * (-0.0162 * zeta - 0.0059 / np.maximum(zeta, 1e-6) + 0.9858)
+    unclipped = np.where(dc > 0, np.maximum(eta * dc, 0), 0)
+    ac = np.minimum(unclipped, ac_rating)
+    return ac, unclipped - ac
+
+
+def pv_yield(weather=None, latitude: float = 0.0, longitude: Optional[float] = None, timezone: Optional[float] = None,
+             dc_capacity: float = 1.0, tilt: Sweep = 20, azimuth: Sweep = 180, dc_ac_ratio: Sweep = 1.2,
+             system_losses: float = 14, inverter_efficiency: float = 0.96, module_type: str = 'standard',
+             mounting: str = 'open_rack', albedo: float = 0.2, daily_irradiance: Optional[float] = None,
+             energy_demand: Optional[float] = None, include_hourly: bool = False) -> Dict[str, Any]:
+    """
+    Annual yield for every tilt x azimuth x DC/AC ratio combination (dc_capacity in kWp, azimuth 180 = south).
+    weather: hourly GHI (plus optional DNI, DHI, temp_air, wind_speed); without it a clear-sky year is scaled
+    to daily_irradiance. energy_demand (kWh/day) sizes the array and inverter from the best variant.
+    """
+    if module_type not in PV_MODULE_TYPES:
+        raise ValueError(f"Unknown module type: {module_type} (expected {', '.join(PV_MODULE_TYPES)})")
+    if mounting not in PV_MOUNTING:
+        raise ValueError(f"Unknown mounting: {mounting} (expected {', '.join(PV_MOUNTING)})")
+    if weather is not None:
+        data = weather_arrays(weather)
+        source = "hourly weather data"
+    elif daily_irradiance:
+        data = {"ghi": clear_sky_year(latitude, daily_irradiance)}
+        source = f"clear-sky profile scaled to {daily_irradiance} kWh/m²/day"
+    else:
+        raise ValueError("Provide hourly weather data or an average daily irradiance")
+
+    hours = len(data["ghi"])
+    ghi = np.maximum(data["ghi"], 0)
+    sun = solar_position(latitude, hours, longitude, timezone)
+    if "dni" in data and "dhi" in data:
+        dni, dhi = np.maximum(data["dni"], 0), np.maximum(data["dhi"], 0)
+    else:
+        dni, dhi = decompose(ghi, sun["cos_zenith"], sun["extraterrestrial"])
+    temp_air = data.get("temp_air", np.full(hours, 25.0))
+    wind = data.get("wind_speed", np.ones(hours))
+
+    tilts, azimuths = np.meshgrid(np.atleast_1d(np.asarray(tilt, dtype=float)), np.atleast_1d(np.asarray(azimuth, dtype=float)), indexing="ij")
+    tilts, azimuths = tilts.reshape(-1, 1), azimuths.reshape(-1, 1)
+    ratios = np.atleast_1d(np.asarray(dc_ac_ratio, dtype=float))
+    if np.any(ratios <= 0) or dc_capacity <= 0:
+        raise ValueError("DC capacity and DC/AC ratios must be positive")
+
+    module, mount = PV_MODULE_TYPES[module_type], PV_MOUNTING[mounting]
+    poa = plane_of_array(sun, dni, dhi, ghi, tilts, azimuths, albedo)
+    cell_temp = temp_air + poa * ABSORPTANCE * (1 - module["efficiency"]) / (mount["u_c"] + mount["u_v"] * wind)
+    dc = np.maximum(dc_capacity * poa / STC_IRRADIANCE * (1 + module["gamma"] * (cell_temp - 25)), 0) * (1 - system_losses / 100)
+    poa_total = poa.sum(axis=1) / 1000
+    dc_total = dc.sum(axis=1)
+
+    variants = []
+    hourly_ac = []
+    for ratio in ratios:
+        ac, clipped = inverter_output(dc, dc_capacity / ratio, inverter_efficiency)
+        ac_total, clipped_total = ac.sum(axis=1), clipped.sum(axis=1)
+        hourly_ac.append(ac)
+        for k in range(len(tilts)):
+            variants.append({
+                "tilt": float(tilts[k, 0]),
+                "azimuth": float(azimuths[k, 0]),
+                "dc_ac_ratio": float(ratio),
+                "inverter_kw": round(float(dc_capacity / ratio), 3),
+                "poa_kwh_m2": round(float(poa_total[k]), 1),
+                "dc_kwh": round(float(dc_total[k]), 1),
+                "ac_kwh": round(float(ac_total[k]), 1),
+                "clipping_kwh": round(float(clipped_total[k]), 1),
+                "clipping_percent": round(float(clipped_total[k] / (ac_total[k] + clipped_total[k]) * 100), 2) if ac_total[k] else 0.0,
+                "specific_yield": round(float(ac_total[k] / dc_capacity), 1),
+                "capacity_factor": round(float(ac_total[k] / (dc_capacity * hours) * 100), 2),
+                "performance_ratio": round(float(ac_total[k] / (dc_capacity * poa_total[k])), 3) if poa_total[k] else 0.0,
+            })
+
+    best_index = max(range(len(variants)), key=lambda i: variants[i]["ac_kwh"])
+    best = variants[best_index]
+    best_ac = hourly_ac[best_index // len(tilts)][best_index % len(tilts)]
+    results = {
+        "weather_source": source,
+        "hours": hours,
+        "dc_capacity_kwp": dc_capacity,
+        "annual_ghi_kwh_m2": round(float(ghi.sum() / 1000), 1),
+        "variants": variants,
+        "best": best,
+        "peak_ac_kw": round(float(best_ac.max()), 3),
+    }
+    if hours in (8760, 8784):
+        days = np.array(MONTH_DAYS) + np.array([0, hours == 8784] + [0] * 10)
+        starts = np.concatenate([[0], np.cumsum(days)[:-1]]) * 24
+        results["monthly_ac_kwh"] = np.round(np.add.reduceat(best_ac, starts), 1).tolist()
+    if energy_demand:
+        # Array size that meets the annual demand at the best variant's specific yield
+        pv_kwp = energy_demand * hours / 24 / best["specific_yield"]
+        results["pv_kwp"] = round(pv_kwp, 2)
+        results["inverter_kw"] = round(pv_kwp / best["dc_ac_ratio"], 2)
+    if include_hourly:
+        results["hourly_ac_kw"] = np.round(best_ac, 4).tolist()
+    return results
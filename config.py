@@ -30,6 +30,11 @@ class Settings:
     # Paymob
     PAYMOB_API_KEY = os.getenv("PAYMOB_API_KEY")
     
+    # Calculator result cache (RESULT_CACHE_DB enables the cross-worker SQLite tier)
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "10000"))
+    RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "86400"))
+    RESULT_CACHE_DB = os.getenv("RESULT_CACHE_DB")
+    
     # Environment
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
     DEBUG = os.getenv("DEBUG", "True").lower() == "true"
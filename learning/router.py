@@ -783,13 +783,20 @@ def calculate_simulation_results(simulation, params):
         }
     
     elif sim_type == "beam-analysis":
+        from calculators.services.frame_analysis import continuous_beam
         load = float(params.get("load", 10))
         span = float(params.get("span", 6))
-        m_max = (load * span * span) / 8
+        spans = int(params.get("spans", 1))
+        # Default section: IPE 300 in steel
+        section = {"I": float(params.get("inertia", 8.356e-5)), "A": 5.381e-3}
+        beam = continuous_beam([span] * spans, dead_load=load, section=section, pattern=False, include_diagrams=True)
         return {
-            "m_max": round(m_max, 2),
-            "ra": round(load * span / 2, 2),
-            "rb": round(load * span / 2, 2)
+            "m_max": round(beam["max_moment"], 2),
+            "m_support": round(beam["min_moment"], 2),
+            "ra": round(beam["supports"][0]["max_reaction"], 2),
+            "rb": round(beam["supports"][-1]["max_reaction"], 2),
+            "deflection_mm": round(beam["max_deflection_mm"], 2),
+            "diagram": beam["diagrams"]
         }
     
     return {}
@@ -7,6 +7,7 @@ from workflow_database import workflow_engine, WorkflowBase, get_workflow_db
 from config import settings
 import logging
 import os
+import threading
 import json
 from typing import Dict
 
@@ -89,6 +90,25 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
+# Derive the catalog's equation forms and build the planner graph off the request path
+def warm_equation_catalog():
+    from workflow_database import WorkflowSessionLocal
+    from calculators.services.equation_engine import EquationEngine
+    from calculators.services.equation_planner import get_planner
+
+    db = WorkflowSessionLocal()
+    try:
+        get_planner(db)
+        logger.info(f"Equation catalog warmed: {EquationEngine.warm(db)} forms")
+    except Exception as e:
+        logger.error(f"Equation catalog warm-up failed: {e}")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def start_equation_warmup():
+    threading.Thread(target=warm_equation_catalog, name="equation-warmup", daemon=True).start()
+
 # Include routers
 from auth.router import router as auth_router
 from auth.google_oauth_routes import router as google_oauth_router
@@ -98,6 +118,7 @@ from ai.router import router as ai_router
 from payments.router import router as payments_router
 from workflows.router import router as workflows_router
 from calculation_pipeline.router import router as calculation_pipeline_router
+from units.router import router as units_router
 
 app.include_router(auth_router)
 app.include_router(google_oauth_router)
@@ -107,6 +128,7 @@ app.include_router(ai_router)
 app.include_router(payments_router)
 app.include_router(workflows_router)
 app.include_router(calculation_pipeline_router)
+app.include_router(units_router)
 
 # Mount static files from frontend folder (must come last!)
 from pathlib import Path
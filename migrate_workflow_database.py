@@ -16,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from workflow_database import workflow_engine, WorkflowBase, get_workflow_db
+from workflow_search import ensure_schema, index_equation, index_workflow, sync_search_index
 from workflow_models import (
     Equation, EquationCategory, EquationInput, EquationOutput, 
     EquationUnit, EquationExample,
@@ -83,6 +84,7 @@ def migrate_equations():
     
     # Get database session
     db = next(get_workflow_db())
+    ensure_schema(db)
     
     try:
         # Track statistics
@@ -147,7 +149,10 @@ def migrate_equations():
                     db.add(input_param)
                     inputs_created += 1
             
-            # Commit after each equation to avoid large transactions
+            # Index alongside the row and commit after each equation to avoid large transactions
+            db.flush()
+            db.refresh(equation)
+            index_equation(db, equation)
             db.commit()
         
         print("\n" + "="*50)
@@ -206,6 +211,7 @@ def migrate_workflows():
     
     # Get database session
     db = next(get_workflow_db())
+    ensure_schema(db)
     
     try:
         # Track statistics
@@ -274,7 +280,10 @@ def migrate_workflows():
                 db.add(step)
                 steps_created += 1
             
-            # Commit after each workflow
+            # Index alongside the row and commit after each workflow
+            db.flush()
+            db.refresh(workflow)
+            index_workflow(db, workflow)
             db.commit()
         
         print("\n" + "="*50)
@@ -356,6 +365,13 @@ if __name__ == "__main__":
     # Run workflow migration
     migrate_workflows()
     
+    # Record the search index sync point
+    db = next(get_workflow_db())
+    try:
+        print(f"Search index synced: {sync_search_index(db)}")
+    finally:
+        db.close()
+    
     # Verify migration
     verify_migration()
     
@@ -0,0 +1,52 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.arc_flash import arc_flash_study, ppe_category
+from calculators.services.electrical import ElectricalCalculators
+
+
+class TestArcFlashStudy:
+    """Tests for the vectorized IEEE 1584 arc-flash study"""
+
+    def test_low_voltage_switchgear(self):
+        label = arc_flash_study([50], [0.2], 0.48)["labels"][0]
+        # IEEE 1584-2002 eq. 1 and 4-6 for 480 V switchgear, 32 mm gap, 610 mm, solidly grounded
+        assert label["arcing_current_ka"] == pytest.approx(24.06, abs=0.01)
+        assert label["incident_energy_cal_cm2"] == pytest.approx(10.88, abs=0.01)
+        assert label["ppe_category"] == 3
+        assert label["working_distance_mm"] == 610
+
+    def test_energy_scales_with_clearing_time(self):
+        result = arc_flash_study([[20, 20]], [[0.1, 0.2]], 4.16, "switchgear")
+        energy = result["scenarios"]["Scenario 1"]["incident_energy_cal_cm2"]
+        assert energy[1] == pytest.approx(2 * energy[0], rel=1e-3)
+
+    def test_worst_scenario_per_bus(self):
+        result = arc_flash_study([[20, 40], [30, 30]], [[0.5, 0.1], [0.1, 0.5]], [0.48, 13.8],
+                                 ["mcc", "switchgear"], bus_ids=["MCC-1", "SWGR-1"], scenarios=["normal", "tie"])
+        assert [label["worst_scenario"] for label in result["labels"]] == ["normal", "tie"]
+        assert result["summary"]["scenarios"] == 2
+
+    def test_reduced_arcing_current_with_slower_clearing(self):
+        base = arc_flash_study([30], [0.05], 0.48)["labels"][0]
+        reduced = arc_flash_study([30], [0.05], 0.48, clearing_time_reduced=[0.4])["labels"][0]
+        assert reduced["incident_energy_cal_cm2"] > base["incident_energy_cal_cm2"]
+        assert reduced["arcing_current_ka"] == pytest.approx(0.85 * base["arcing_current_ka"], abs=0.01)
+
+    def test_lee_method_and_categories(self):
+        label = arc_flash_study([25], [0.3], 34.5, "open_air")["labels"][0]
+        assert label["method"] == "Lee"
+        assert label["ppe_category"] is None
+        assert label["danger"] == True
+        assert ppe_category(np.array([0.5, 1.2, 3.9, 8.0, 39, 41])).tolist() == [0, 0, 1, 2, 4, 5]
+
+    def test_calculator_validates_equipment(self):
+        result = ElectricalCalculators.arc_flash_study([20], [0.1], 0.4, "kiosk")
+        assert result["success"] == False
+        assert "Unknown equipment class" in result["error"]
@@ -0,0 +1,119 @@
+import pytest
+import sys
+import os
+import io
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.bar_schedule import bar_schedule, cutting_plan, schedule_frame
+from calculators.services.civil import CivilCalculators
+from analytics.bar_schedule import BarScheduleService
+
+
+def member_list(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Member": [f"M{i // 8}" for i in range(count)],
+        "Type": rng.choice(["beam", "slab", "column"], count),
+        "Shape": rng.choice(["straight", "L", "U", "link", "crank"], count),
+        "Dia": rng.choice([8, 10, 12, 16, 20, 25], count),
+        "A": rng.integers(30, 900, count) * 10, "B": rng.integers(10, 80, count) * 10, "C": rng.integers(10, 50, count) * 10,
+        "Bars": rng.integers(1, 20, count), "Members": rng.integers(1, 5, count),
+    })
+
+
+class TestBarSchedule:
+    """Tests for the project bar bending schedule and stock cutting optimization"""
+
+    def test_cutting_lengths_of_shapes(self):
+        rows = pd.DataFrame([
+            {"shape": "straight", "diameter": 16, "A": 4000},
+            {"shape": "hooked", "diameter": 12, "A": 3000},
+            {"shape": "L", "diameter": 20, "A": 2000, "B": 500},
+            {"shape": "link", "diameter": 8, "A": 250, "B": 550},
+            {"shape": "crank", "diameter": 12, "A": 4000, "B": 150},
+        ])
+        schedule = schedule_frame(rows, rounding=1)
+        expected = [4000, 3000 + 2 * 10 * 12, 2500 - 2 * 20, 2 * 800 + 20 * 8 - 3 * 2 * 8 - 2 * 3 * 8, np.ceil(4000 + 0.42 * 150 - 4 * 12)]
+        assert schedule["cut_length"].tolist() == expected
+        # Same rule as the single-member calculator for stirrups: length + 2 hooks - 4 bends
+        single = CivilCalculators.bar_bending_schedule("stirrup", 1, 8, 1600)["results"]["cutting_length"] * 1000
+        assert single == 1600 + 20 * 8 - 4 * 2 * 8
+
+    def test_weights_and_laps(self):
+        schedule = schedule_frame(pd.DataFrame([{"diameter": 20, "length": 30000, "bars": 4, "members": 2}]))
+        row = schedule.iloc[0]
+        assert row["quantity"] == 8 and row["laps"] == 2
+        assert row["total_length"] == pytest.approx(8 * (30000 + 2 * 50 * 20) / 1000)
+        assert row["weight"] == pytest.approx(row["total_length"] * 0.00617 * 400, abs=1e-3)
+        with pytest.raises(ValueError):
+            schedule_frame(pd.DataFrame([{"diameter": 12, "shape": "spiral", "A": 1000}]))
+
+    def test_cutting_plan_covers_demand(self):
+        pieces = {5000.0: 7, 3500.0: 9, 2400.0: 15, 800.0: 40}
+        plan = cutting_plan(pieces, 12000, max_patterns=100)
+        supplied = {}
+        for pattern in plan["top_patterns"]:
+            for length, count in pattern["pieces"].items():
+                supplied[length] = supplied.get(length, 0) + count * pattern["repeats"]
+            assert sum(length * count for length, count in pattern["pieces"].items()) + pattern["offcut"] == 12000
+        assert supplied == pieces
+        demand = sum(length * count for length, count in pieces.items())
+        assert plan["stock_bars"] == pytest.approx(np.ceil(demand / 12000), abs=1)
+        assert plan["offcut"] == pytest.approx((plan["stock_bars"] * 12000 - demand) / 1000)
+
+    def test_best_stock_length_per_diameter(self):
+        result = bar_schedule([{"diameter": 16, "A": 5800, "quantity": 101}, {"diameter": 10, "A": 3900, "quantity": 30}], stock_lengths=[6000, 12000])
+        cutting = {row["diameter"]: row["cutting"] for row in result["diameters"]}
+        assert cutting[16]["stock_length"] == 6000 and cutting[16]["stock_bars"] == 101
+        assert cutting[10]["stock_length"] == 12000 and cutting[10]["stock_bars"] == 10
+        assert result["total_bars"] == 131
+
+    def test_lapped_bars_are_cut_from_the_chosen_stock(self):
+        result = bar_schedule([{"diameter": 16, "A": 15000, "quantity": 1}], stock_lengths=(6000, 12000), include_rows=False)
+        row = result["diameters"][0]
+        cutting = row["cutting"]
+        # 6 m stock: two whole bars plus a 4.6 m last piece carrying two 800 mm laps, 18 m bought against 24 m of 12 m stock
+        assert cutting["stock_length"] == 6000 and cutting["stock_bars"] == 3 and cutting["lapped_bars"] == 2
+        assert cutting["stock_weight"] >= row["weight"]
+        assert cutting["waste_percent"] == pytest.approx((18000 - 16600) / 18000 * 100, abs=0.01)
+        # Stock too short to lap a bar is never chosen for it
+        short = bar_schedule([{"diameter": 32, "A": 5000, "quantity": 4}], stock_lengths=(1500, 12000), include_rows=False)
+        assert short["diameters"][0]["cutting"]["stock_length"] == 12000
+
+    def test_hundred_thousand_bars(self):
+        members = member_list(100_000)
+        data = members.to_csv(index=False).encode()
+        result = BarScheduleService.analyze_file(io.BytesIO(data), "project.csv", stock_lengths=[6000, 12000])
+        assert result["success"] == True
+        reference = schedule_frame(members)
+        assert result["results"]["rows"] == 100_000
+        assert result["results"]["total_weight"] == pytest.approx(reference["weight"].sum(), abs=0.1)
+        for row in result["results"]["diameters"]:
+            assert row["cutting"]["stock_bars"] * row["cutting"]["stock_length"] / 1000 >= row["total_length"] - 1e-6
+
+    def test_streamed_csv_and_xlsx_exports(self):
+        members = member_list(1200, seed=3)
+        data = members.to_csv(index=False).encode()
+        text = "".join(BarScheduleService.export_csv(io.BytesIO(data), "project.csv"))
+        exported = pd.read_csv(io.StringIO(text))
+        assert len(exported) == 1200 and exported["weight"].sum() == pytest.approx(schedule_frame(members)["weight"].sum(), abs=0.1)
+        workbook = b"".join(BarScheduleService.export_xlsx(io.BytesIO(data), "project.csv"))
+        sheets = pd.read_excel(io.BytesIO(workbook), sheet_name=None)
+        assert list(sheets) == ["Schedule", "Summary", "Cutting"]
+        assert len(sheets["Schedule"]) == 1200
+        with pytest.raises(ValueError):
+            BarScheduleService.export_csv(io.BytesIO(b"member,size\nB1,12\n"), "project.csv")
+
+    def test_calculator_and_takeoff_workflow(self):
+        result = CivilCalculators.bar_schedule([{"member": "S1", "diameter": 10, "A": 3000, "bars": 20}])
+        assert result["success"] == True
+        assert result["results"]["schedule"][0]["weight"] == pytest.approx(60 * 0.617, abs=0.01)
+        assert CivilCalculators.bar_schedule([{"member": "S1", "diameter": 10}])["success"] == False
+        from workflows.services.workflow_service import WorkflowService
+        takeoff = WorkflowService.execute_workflow("civil_rebar_takeoff", {"member_geometry": [{"diameter": 12, "A": 6000, "quantity": 10}]})
+        assert takeoff["results"]["bar_count"] == 10 and takeoff["results"]["stock_bars"] == {"12": 5}
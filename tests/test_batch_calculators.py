@@ -0,0 +1,96 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.registry import run_batch
+from calculators.services.electrical import ElectricalCalculators
+from calculators.services.mechanical import MechanicalCalculators
+from calculators.services.civil import CivilCalculators
+
+
+def assert_matches_scalar(calculator_type, method, rows):
+    """Run rows through the batch path and compare each row with the scalar calculator"""
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+    batch = run_batch(calculator_type, columns)
+    assert batch["success"] == True
+    assert batch["count"] == len(rows)
+
+    for i, row in enumerate(rows):
+        scalar = method(**row)
+        assert batch["row_success"][i] == scalar["success"]
+        if not scalar["success"]:
+            continue
+        for key, value in scalar["results"].items():
+            column = batch["results"][key]
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    assert column[sub_key][i] == pytest.approx(sub_value, abs=0.011)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                assert column[i] == pytest.approx(value, abs=0.011)
+            else:
+                assert column[i] == value
+
+
+class TestBatchCalculators:
+    """Vectorized calculators must agree with their scalar counterparts"""
+
+    def test_cable_sizing(self):
+        rows = [
+            {"design_current": 12, "length": 40, "install_method": "openAir", "material": "copper", "ambient_temp": 30},
+            {"design_current": 180, "length": 120, "install_method": "conduit", "material": "aluminium", "ambient_temp": 45},
+            {"design_current": 900, "length": 10, "install_method": "trunking", "material": "copper", "ambient_temp": 40},
+        ]
+        assert_matches_scalar("electrical_cable_sizing", ElectricalCalculators.cable_sizing, rows)
+
+    def test_voltage_drop(self):
+        rows = [
+            {"current": 32, "length": 80, "cross_section": 6, "system_type": "1phase", "circuit_type": "power"},
+            {"current": 200, "length": 150, "cross_section": 240, "system_type": "3phase", "circuit_type": "lighting"},
+        ]
+        assert_matches_scalar("electrical_voltage_drop", ElectricalCalculators.voltage_drop, rows)
+
+    def test_load_calculation(self):
+        rows = [
+            {"connected_load": 150, "system_type": "3phase"},
+            {"connected_load": 8, "system_type": "1phase"},
+        ]
+        assert_matches_scalar("electrical_load_calculation", ElectricalCalculators.load_calculation, rows)
+
+    def test_pipe_friction(self):
+        rows = [
+            {"flow_rate": 0.01, "pipe_size": 50, "pipe_length": 10, "roughness": "steel_new", "temperature": 20},
+            {"flow_rate": 36, "pipe_size": 100, "pipe_length": 200, "roughness": "pvc", "temperature": 40},
+        ]
+        assert_matches_scalar("mechanical_pipe_friction", MechanicalCalculators.pipe_friction, rows)
+
+    def test_psychrometrics(self):
+        rows = [
+            {"dry_bulb_temp": 25, "relative_humidity": 60, "altitude": 0},
+            {"dry_bulb_temp": -5, "relative_humidity": 80, "altitude": 2000},
+            {"dry_bulb_temp": 35, "relative_humidity": 120, "altitude": 0},
+        ]
+        assert_matches_scalar("mechanical_psychrometrics", MechanicalCalculators.psychrometrics, rows)
+
+    def test_beam_and_column(self):
+        beams = [
+            {"uniform_load": 25, "length": 6, "beam_depth": 600, "standard": "IS456"},
+            {"uniform_load": 60, "length": 8, "beam_depth": 750, "standard": "ACI318"},
+        ]
+        columns = [
+            {"axial_load": 1500, "end_condition": "bothFixed", "design_code": "IS456"},
+            {"axial_load": 300, "end_condition": "cantilever", "design_code": "Eurocode"},
+        ]
+        assert_matches_scalar("civil_beam_load", CivilCalculators.beam_load, beams)
+        assert_matches_scalar("civil_column_design", CivilCalculators.column_design, columns)
+
+    def test_scalar_fallback_and_broadcast(self):
+        result = run_batch("civil_concrete_volume", {"length": [1, 2], "width": 2, "depth": 0.2})
+        assert result["results"]["volume"] == [0.4, 0.8]
+
+    def test_unknown_type_and_mismatched_columns(self):
+        assert run_batch("civil_unknown", {"x": [1]}) is None
+        result = run_batch("electrical_cable_sizing", {"design_current": [1, 2], "length": [1, 2, 3]})
+        assert result["success"] == False
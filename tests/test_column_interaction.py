@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.column_interaction import column_interaction, interaction_surface, select_reinforcement
+from calculators.services.civil import CivilCalculators
+
+SQUARE = {"b": 400, "h": 400, "cover": 50, "bars": {"count_x": 3, "count_y": 3, "diameter": 20}}
+
+
+class TestColumnInteraction:
+    """Tests for the vectorized P-M interaction surfaces and column checks"""
+
+    def test_pure_bending_matches_hand_calculation(self):
+        # Tension bars only, ACI 318: Mn = As fy (d - a/2), tension-controlled so phi = 0.9
+        section = {"b": 300, "h": 500, "bars": [{"x": -100, "y": -200, "diameter": 25}, {"x": 100, "y": -200, "diameter": 25}]}
+        surface = interaction_surface(section, 28, 420, "ACI318")
+        area = 2 * np.pi * 25 ** 2 / 4
+        depth = area * 420 / (0.85 * 28 * 300)
+        expected = 0.9 * area * 420 * (450 - depth / 2) / 1e6
+        assert surface.moment_capacity(np.array([0.0]), np.array([0.0]))[0] == pytest.approx(expected, rel=0.015)
+
+    def test_axial_limits(self):
+        surface = interaction_surface(SQUARE, 30, 500, "ACI318")
+        steel = 8 * np.pi * 100
+        assert surface.P0 == pytest.approx((0.85 * 30 * (160000 - steel) + 500 * steel) / 1e3)
+        assert surface.Pmax == pytest.approx(0.8 * 0.65 * surface.P0)
+        assert surface.Pt == pytest.approx(-0.9 * 500 * steel / 1e3)
+        eurocode = interaction_surface(SQUARE, 30, 500, "Eurocode")
+        assert eurocode.P0 == pytest.approx((0.85 / 1.5 * 30 * (160000 - steel) + 400 * steel) / 1e3)
+
+    def test_square_section_is_symmetric(self):
+        surface = interaction_surface(SQUARE, 25, 415, "IS456")
+        axial = np.full(4, 800.0)
+        capacity = surface.moment_capacity(axial, np.array([0, np.pi / 2, np.pi, -np.pi / 2]))
+        assert np.allclose(capacity, capacity[0], rtol=1e-3)
+        # Biaxial bending is weaker than bending about either axis
+        assert surface.moment_capacity(axial[:1], np.array([np.pi / 4]))[0] < capacity[0]
+
+    def test_utilization_along_rays(self):
+        surface = interaction_surface(SQUARE, 25, 415, "IS456")
+        diagram = surface.diagram("x")
+        middle = len(diagram["P"]) // 4
+        on_surface = surface.utilization(diagram["P"][middle], diagram["M"][middle], 0)
+        assert on_surface == pytest.approx(1.0, abs=0.02)
+        demand = np.array([[600.0, 80.0, 30.0], [-200.0, 20.0, 0.0], [0.0, 0.0, 0.0]])
+        ratios = surface.utilization(*demand.T)
+        assert np.allclose(surface.utilization(*(1.7 * demand).T), 1.7 * ratios, rtol=1e-6)
+        assert ratios[2] == 0.0
+
+    def test_section_types_share_cached_surfaces(self):
+        sections = {"C1": dict(SQUARE), "C1-copy": dict(SQUARE), "C2": {"shape": "circular", "diameter": 500, "bars": {"count": 8, "diameter": 20}}}
+        columns = [{"id": f"col{i}", "section": list(sections)[i % 3], "P": [900, 1500], "Mx": [60, 20], "My": [10, 40]} for i in range(30)]
+        first = column_interaction(columns, sections, fck=32, fy=460, code="Eurocode", combination_names=["ULS1", "ULS2"])
+        assert first["surfaces_built"] <= 2
+        again = column_interaction(columns, sections, fck=32, fy=460, code="Eurocode", combination_names=["ULS1", "ULS2"])
+        assert again["surfaces_built"] == 0
+        assert again["columns"] == first["columns"]
+        assert {column["governing_combination"] for column in first["columns"]} <= {"ULS1", "ULS2"}
+
+    def test_hundreds_of_columns_and_combinations(self):
+        rng = np.random.default_rng(4)
+        sections = {f"S{i}": {"b": 300 + 100 * i, "h": 500, "bars": {"count_x": 3, "count_y": 4, "diameter": 25}} for i in range(4)}
+        columns = [{"id": i, "section": f"S{i % 4}", "P": rng.uniform(0, 3000, 36), "Mx": rng.normal(0, 100, 36), "My": rng.normal(0, 60, 36)}
+                   for i in range(400)]
+        result = column_interaction(columns, sections, code="ACI318", fck=35, fy=420)
+        assert len(result["columns"]) == 400
+        surface = interaction_surface(sections["S1"], 35, 420, "ACI318")
+        column = columns[1]
+        assert result["columns"][1]["utilization"] == pytest.approx(surface.utilization(column["P"], column["Mx"], column["My"]).max(), abs=1e-4)
+        assert set(result["failing_columns"]) == {c["id"] for c in result["columns"] if c["utilization"] > 1}
+
+    def test_reinforcement_selection_and_calculator(self):
+        design = select_reinforcement({"b": 400, "h": 400}, [1800, 1200], [90, 150], 0, 25, 415, "IS456")
+        assert design["utilization"] <= 1 and design["steel_ratio"] >= 0.008
+        lighter = select_reinforcement({"b": 400, "h": 400}, 1200, 60, 0, 25, 415, "IS456")
+        assert lighter["steel_area"] <= design["steel_area"]
+        with pytest.raises(ValueError):
+            select_reinforcement({"b": 200, "h": 200}, 5000, 300, 0, 25, 415, "IS456")
+        result = CivilCalculators.column_interaction([{"id": "A1", "section": "C1", "P": 1000, "Mx": 50}], {"C1": SQUARE}, include_diagrams=True)
+        assert result["success"] == True
+        assert result["results"]["columns"][0]["status"] == "PASS"
+        assert len(result["results"]["sections"]["C1"]["diagram_x"]["P"]) == len(result["results"]["sections"]["C1"]["diagram_x"]["M"])
+        assert CivilCalculators.column_interaction([{"id": "A1", "section": "C9", "P": 1000}], {"C1": SQUARE})["success"] == False
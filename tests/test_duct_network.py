@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.duct_network import air_properties, duct_network, equal_friction_diameter, tree_levels
+from calculators.services.pipe_network import friction_factor
+from calculators.services.mechanical import MechanicalCalculators
+
+
+def random_tree(count, seed=0):
+    rng = np.random.default_rng(seed)
+    segments = [{"id": 0, "parent": None, "length": 5.0, "fittings": ["elbow_90"]}]
+    for i in range(1, count):
+        segments.append({"id": i, "parent": int(rng.integers(0, i)), "length": float(rng.uniform(1, 8)),
+                         "fittings": {"tee_branch": 1}})
+    parents = {segment["parent"] for segment in segments}
+    for segment in segments:
+        if segment["id"] not in parents:
+            segment["airflow"] = float(rng.uniform(100, 600))
+    return segments
+
+
+class TestDuctNetwork:
+    """Tests for the duct tree sizing and index path engine"""
+
+    def test_levels_follow_the_tree(self):
+        parent = np.array([-1, 0, 0, 1, 3, 2])
+        levels = tree_levels(parent)
+        assert [sorted(level.tolist()) for level in levels] == [[0], [1, 2], [3, 5], [4]]
+        with pytest.raises(ValueError):
+            tree_levels(np.array([-1, 2, 1]))
+
+    def test_equal_friction_diameter_hits_target_rate(self):
+        air = air_properties()
+        flow = np.array([0.05, 0.5, 5.0])
+        diameter = equal_friction_diameter(flow, 1.0, air["density"], air["viscosity"], 0.09e-3)
+        velocity = 4 * flow / (math.pi * diameter ** 2)
+        f = friction_factor(velocity * diameter / air["viscosity"], 0.09e-3 / diameter)
+        assert np.allclose(f / diameter * air["density"] * velocity ** 2 / 2, 1.0, rtol=1e-3)
+
+    def test_sizes_respect_friction_and_velocity(self):
+        segments = random_tree(300)
+        result = duct_network(segments, friction_rate=1.0, max_velocity=6)
+        total = sum(segment.get("airflow", 0) for segment in segments)
+        assert result["total_airflow"] == pytest.approx(total, abs=0.1)
+        assert result["max_velocity"] <= 6
+        assert result["max_friction_rate"] <= 1.0
+        assert all(segment["size"].startswith("Ø") for segment in result["segment_results"])
+
+    def test_critical_path_matches_walk(self):
+        segments = random_tree(500, seed=3)
+        result = duct_network(segments, shape="rectangular")
+        loss = {segment["id"]: segment["loss"] for segment in result["segment_results"]}
+        parent = {segment["id"]: segment["parent"] for segment in segments}
+
+        def path_loss(segment_id):
+            total = 0.0
+            while segment_id is not None:
+                total, segment_id = total + loss[segment_id], parent[segment_id]
+            return total
+
+        worst = max(result["terminal_excess"], key=path_loss)
+        assert result["critical_terminal"] == worst
+        assert result["fan_pressure"] == pytest.approx(path_loss(worst), abs=0.05)
+        assert result["critical_path"][0] == 0 and result["critical_path"][-1] == worst
+        assert result["terminal_excess"][worst] == 0
+
+    def test_static_regain_balances_better(self):
+        segments = [{"id": "fan", "parent": None, "length": 4, "fittings": ["elbow_90"]}]
+        for k in range(8):
+            segments.append({"id": f"trunk{k}", "parent": "fan" if k == 0 else f"trunk{k - 1}", "length": 6, "fittings": ["tee_straight"]})
+            segments.append({"id": f"outlet{k}", "parent": f"trunk{k}", "length": 2, "airflow": 400, "fittings": ["tee_branch"]})
+        equal = duct_network(segments, method="equal_friction")
+        regain = duct_network(segments, method="static_regain")
+        assert regain["max_excess_pressure"] < equal["max_excess_pressure"]
+        velocities = [segment["velocity"] for segment in regain["segment_results"] if str(segment["id"]).startswith("trunk")]
+        # Velocity falls along the trunk; rounding up to EN 1506 sizes keeps it within one size step of min_velocity
+        assert velocities[0] == max(velocities) and velocities[-1] < velocities[0] / 2
+        assert min(velocities) >= 2.0 * (250 / 315) ** 2
+
+    def test_building_scale_tree(self):
+        segments = random_tree(30000, seed=7)
+        result = duct_network(segments, include_details=False)
+        assert result["segments"] == 30000
+
+    def test_calculator_reports_errors(self):
+        result = MechanicalCalculators.duct_network([{"id": "a", "length": 3}, {"id": "b", "parent": "a", "length": 2}])
+        assert result["success"] == False
+        assert "positive airflow" in result["error"]
+        result = MechanicalCalculators.duct_network([{"id": "a", "length": 3, "airflow": 100, "fittings": ["swan_neck"]}])
+        assert result["success"] == False
+        assert "Unknown fitting" in result["error"]
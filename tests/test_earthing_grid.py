@@ -0,0 +1,65 @@
+import pytest
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.earthing_grid import (
+    Segments, conductor_area, earthing_grid, resistance_matrix, split_at_crossings, tolerable_voltages
+)
+from calculators.services.electrical import ElectricalCalculators
+
+
+class TestEarthingGrid:
+    """Tests for the IEEE 80 earthing grid solver"""
+
+    def test_single_rod_matches_dwight(self):
+        rod = [{"start": [0, 0, 0.01], "end": [0, 0, 3.01], "diameter": 0.016}]
+        result = earthing_grid(0, 0, 1000, 100, conductors=rod, segment_length=0.1)
+        dwight = 100 / (2 * math.pi * 3) * (math.log(4 * 3 / 0.008) - 1)
+        assert result["grid_resistance"] == pytest.approx(dwight, rel=0.02)
+        assert result["rods"] == 1
+
+    def test_ieee80_example_grid(self):
+        # IEEE 80 Annex B example: 70 x 70 m square grid, 10 x 10 conductors, 400 Ω·m, 0.1 m of 2500 Ω·m rock
+        result = earthing_grid(70, 70, 1908, 400, along_length=10, along_width=10, depth=0.5,
+                               surface_resistivity=2500, fault_time=0.5)
+        assert result["grid_resistance"] == pytest.approx(result["grid_resistance_ieee80"], rel=0.06)
+        assert result["max_touch_voltage"] == pytest.approx(1030.7, rel=0.03)
+        assert result["tolerable_touch_voltage"] == pytest.approx(838.2, rel=0.01)
+        assert result["touch_ok"] == False
+        assert result["step_ok"] == True
+
+    def test_crossing_conductors_are_split(self):
+        starts = np.array([[0.0, 5.0, 0.5], [5.0, 0.0, 0.5]])
+        ends = np.array([[10.0, 5.0, 0.5], [5.0, 10.0, 0.5]])
+        split_starts, _, radii = split_at_crossings(starts, ends, np.array([0.005, 0.005]))
+        assert len(split_starts) == 4
+        # Odd segment counts would put both midpoints on the crossing without the split
+        segments = Segments(*split_at_crossings(starts, ends, np.array([0.005, 0.005])), 10 / 3)
+        assert np.all(np.linalg.eigvalsh(resistance_matrix(segments, 100)) > 0)
+
+    def test_rods_lower_resistance_and_touch_voltage(self):
+        plain = earthing_grid(40, 30, 5000, 200, along_length=4, along_width=5)
+        rodded = earthing_grid(40, 30, 5000, 200, along_length=4, along_width=5, rod_count=12, rod_length=6)
+        assert rodded["grid_resistance"] < plain["grid_resistance"]
+        assert rodded["max_touch_voltage"] < plain["max_touch_voltage"]
+        assert rodded["gpr"] == pytest.approx(5000 * rodded["grid_resistance"], rel=1e-3)
+
+    def test_limits_and_conductor_size(self):
+        limits = tolerable_voltages(400, 0.5, surface_resistivity=2500, surface_thickness=0.1, body_weight=70)
+        assert limits["cs"] == pytest.approx(0.74, abs=0.01)
+        assert limits["step"] == pytest.approx((1000 + 6 * limits["cs"] * 2500) * 0.157 / math.sqrt(0.5))
+        # IEEE 80 eq. 37: annealed copper for 25 kA over 0.5 s is about 63 mm²
+        assert conductor_area(25000, 0.5) == pytest.approx(63, rel=0.05)
+
+    def test_calculator_reports_errors(self):
+        result = ElectricalCalculators.earthing_grid(20, 20, 5000, 100, along_length=1)
+        assert result["success"] == False
+        assert "at least two conductors" in result["error"]
+        result = ElectricalCalculators.earthing_grid(20, 20, 5000, 100, material="gold")
+        assert result["success"] == False
@@ -0,0 +1,117 @@
+import pytest
+import sys
+import os
+import io
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.earthworks import SurveyGrid, earthwork_volumes, earthworks, prism_volumes
+from calculators.services.civil import CivilCalculators
+from analytics.earthworks import EarthworksService
+
+
+def sloping_survey(count, seed=0, size=100.0):
+    """Points on the plane z = 0.1 x over a size x size site"""
+    rng = np.random.default_rng(seed)
+    x, y = rng.uniform(0, size, count), rng.uniform(0, size, count)
+    return np.column_stack([x, y, 0.1 * x])
+
+
+class TestEarthworks:
+    """Tests for the gridded cut/fill engine of survey point clouds"""
+
+    def test_prisms_split_at_the_zero_line(self):
+        # One cell, depths linear in x from -1 to +1: half the cell in cut, half in fill
+        depth = np.array([[-1.0, 1.0], [-1.0, 1.0]])
+        cells = prism_volumes(depth, 2.0)
+        assert cells["cut"][0, 0] == pytest.approx(1.0)
+        assert cells["fill"][0, 0] == pytest.approx(1.0)
+        # A single corner in cut is a tetrahedron over a quarter of the triangle
+        corner = prism_volumes(np.array([[1.0, -1.0], [-1.0, -1.0]]), 1.0)
+        assert corner["cut"][0, 0] == pytest.approx(2 * 0.5 / 3 / 4)
+        assert corner["cut"][0, 0] - corner["fill"][0, 0] == pytest.approx(2 * 0.5 * -1 / 3)
+        # Unknown corners leave the triangles touching them out
+        partial = prism_volumes(np.array([[1.0, np.nan], [1.0, 1.0]]), 1.0)
+        assert partial["area"][0, 0] == pytest.approx(0.5) and partial["cut"][0, 0] == pytest.approx(0.5)
+
+    def test_flat_pad_on_sloping_ground(self):
+        result = earthworks(sloping_survey(100_000), 5.0, cell_size=2.0)
+        # Exact volumes: 100 m wide, 0.1 x - 5 over x = 50..100 in cut and 0..50 in fill
+        assert result["area"] == pytest.approx(10_000)
+        assert result["cut_volume"] == pytest.approx(12_500, rel=0.01)
+        assert result["fill_volume"] == pytest.approx(12_500, rel=0.01)
+        assert result["max_cut"] == pytest.approx(5, abs=0.2)
+        assert result["net_balance"] == pytest.approx(result["cut_volume"] * 0.9 - result["fill_volume"], abs=0.01)
+        assert result["import_volume"] > 0 and result["export_volume"] == 0
+
+    def test_design_plane_and_design_points(self):
+        survey = sloping_survey(50_000)
+        # A design plane parallel to the ground 1 m below it is cut everywhere
+        plane = earthworks(survey, {"level": -1, "slope_x": 10, "origin": [0, 0]}, cell_size=2.0)
+        assert plane["cut_volume"] == pytest.approx(10_000, rel=0.01)
+        assert plane["fill_volume"] == pytest.approx(0, abs=1)
+        corners = [[0, 0, 11], [100, 0, 11], [0, 100, 11], [100, 100, 11]]
+        points = earthworks(survey, corners, cell_size=2.0)
+        assert points["fill_volume"] == pytest.approx(10_000 * 6, rel=0.01)
+        with pytest.raises(ValueError):
+            earthworks(survey, {"slope_x": 1}, cell_size=2.0)
+
+    def test_grid_gaps_and_tin_surface(self):
+        survey = sloping_survey(40_000)
+        # Remove a hole in the middle of the site: the grid method fills it from the nodes around it
+        hole = (np.abs(survey[:, 0] - 50) < 10) & (np.abs(survey[:, 1] - 50) < 10)
+        grid = earthworks(survey[~hole], 5.0, cell_size=2.0)
+        assert grid["grid"]["interpolated_nodes"] > 0
+        assert grid["cut_volume"] == pytest.approx(12_500, rel=0.01)
+        tin = earthworks(survey[~hole], 5.0, cell_size=2.0, method="tin")
+        assert tin["cut_volume"] == pytest.approx(tin["fill_volume"], rel=0.02)
+        assert tin["area"] <= grid["area"]
+
+    def test_streamed_chunks_match_one_pass_with_bounded_state(self):
+        survey = sloping_survey(200_000, seed=3)
+        streamed = SurveyGrid(2.0)
+        for chunk in np.array_split(survey, 7):
+            streamed.feed(chunk)
+        whole = earthworks(survey, 5.0, cell_size=2.0)
+        assert earthwork_volumes(streamed, 5.0)["cut_volume"] == pytest.approx(whole["cut_volume"])
+        # State is one row per occupied node, not per point
+        assert len(streamed.keys) == 51 * 51 and streamed.points == 200_000
+
+    def test_survey_file_with_heatmap_and_csv_export(self):
+        survey = sloping_survey(1_000_000, seed=5)
+        data = pd.DataFrame(survey, columns=["Easting", "Northing", "Level"]).to_csv(index=False).encode()
+        result = EarthworksService.analyze_file(io.BytesIO(data), "survey.csv", 5.0, cell_size=1.0)
+        assert result["success"] == True
+        assert result["results"]["points"] == 1_000_000
+        heatmap = result["results"]["heatmap"]
+        assert heatmap["shape"] == [100, 100] and heatmap["cell_size"] == 1.0
+        # Cells on the west half are in fill, the east half in cut
+        assert heatmap["fill"][50][10] > 0 and heatmap["cut"][50][10] == 0
+        assert heatmap["cut"][50][90] > 0
+
+        xyz = "\n".join(f"{x:.3f} {y:.3f} {z:.3f}" for x, y, z in survey[:20_000]).encode()
+        text = "".join(EarthworksService.export_csv(io.BytesIO(xyz), "site.xyz", 5.0, cell_size=5.0, block_rows=3))
+        cells = pd.read_csv(io.StringIO(text))
+        assert list(cells.columns) == ["x", "y", "existing", "design", "depth", "cut", "fill"]
+        assert len(cells) == 20 * 20
+        assert cells["cut"].sum() == pytest.approx(12_500, rel=0.02)
+
+    def test_calculator_and_earthworks_workflow(self):
+        survey = sloping_survey(5_000).tolist()
+        result = CivilCalculators.earthwork_grid(survey, 5.0, cell_size=5.0)
+        assert result["success"] == True
+        assert result["results"]["cut_volume"] == pytest.approx(12_500, rel=0.03)
+        assert CivilCalculators.earthwork_grid(survey, 5.0, method="kriging")["success"] == False
+        from workflows.services.workflow_service import WorkflowService
+        points = [{"x": x, "y": y, "z": z} for x, y, z in survey]
+        workflow = WorkflowService.execute_workflow("civil_earthworks", {"surface_data": points, "design_levels": 5.0, "cell_size": 5.0})
+        assert workflow["results"]["cut_volume"] == result["results"]["cut_volume"]
+        assert workflow["results"]["heatmap"]["shape"] == [20, 20]
+        text = WorkflowService.execute_workflow("civil_earthworks", {"surface_data": points, "design_levels": "5.0", "cell_size": "5"})
+        assert text["results"]["cut_volume"] == result["results"]["cut_volume"]
+        plane = WorkflowService.execute_workflow("civil_earthworks", {"surface_data": points, "design_levels": '{"level": 5}', "cell_size": 5})
+        assert plane["results"]["cut_volume"] == result["results"]["cut_volume"]
@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.equation_engine import EquationEngine, compile_equation
+
+
+def make_equation(text, inputs, outputs):
+    """Build an Equation-like object with EquationInput/EquationOutput metadata"""
+    return SimpleNamespace(
+        equation=text,
+        inputs=[SimpleNamespace(name=name, symbol=symbol, default_value=None, min_value=None, max_value=None)
+                for name, symbol in inputs],
+        outputs=[SimpleNamespace(name=name, symbol=symbol, precision=4, output_order=i)
+                 for i, (name, symbol) in enumerate(outputs)]
+    )
+
+
+class TestCompiledEquation:
+    """Tests for equation parsing and rearrangement"""
+
+    def test_solves_for_every_variable(self):
+        compiled = compile_equation("sigma = M * c / I")
+        assert set(compiled.solvable_for) == {"sigma", "M", "c", "I"}
+        assert compiled.solve("sigma", {"M": 100, "c": 0.2, "I": 4}) == pytest.approx(5.0)
+        assert compiled.solve("I", {"sigma": 5, "M": 100, "c": 0.2}) == pytest.approx(4.0)
+
+    def test_caret_power_and_positive_root(self):
+        compiled = compile_equation("delta_max = 5 * w * L^4 / (384 * E * I)")
+        values = {"w": 9000, "L": 5.0, "E": 25e9, "I": 0.00028}
+        delta = compiled.solve("delta_max", values)
+        assert delta == pytest.approx(0.010463, rel=1e-4)
+        assert compiled.solve("L", {"delta_max": delta, "w": 9000, "E": 25e9, "I": 0.00028}) == pytest.approx(5.0)
+
+    def test_trig_aliases_expand_to_angle(self):
+        compiled = compile_equation("Vd = sqrt(3) * I * (R * cos_phi + X * sin_phi) * L")
+        vd = compiled.solve("Vd", {"I": 100, "R": 0.1, "X": 0.08, "phi": 0.5548, "L": 0.5})
+        phi = compiled.solve("phi", {"Vd": vd, "I": 100, "R": 0.1, "X": 0.08, "L": 0.5})
+        assert phi == pytest.approx(0.5548, rel=1e-6)
+
+    def test_logarithmic_equation_uses_physical_root(self):
+        compiled = compile_equation("Rg = (rho / (2 * pi * L)) * (ln(4 * L / d) - 1)")
+        rg = compiled.solve("Rg", {"rho": 100, "L": 3, "d": 0.016})
+        assert compiled.solve("L", {"rho": 100, "Rg": rg, "d": 0.016}) == pytest.approx(3.0)
+
+    def test_compiled_once_per_text(self):
+        assert compile_equation("Q = A * v") is compile_equation("Q = A * v")
+
+    def test_forms_are_derived_per_target(self):
+        compiled = compile_equation("F = m * g * mu")
+        assert compiled.forms == {}
+        assert compiled.solve("mu", {"F": 49.05, "m": 10, "g": 9.81}) == pytest.approx(0.5)
+        assert list(compiled.forms) == ["mu"]
+        assert compiled.form("x") is None
+
+
+class TestEquationEngine:
+    """Tests for evaluation against catalog metadata"""
+
+    def test_calculate_outputs_by_name_or_symbol(self):
+        equation = make_equation("V = I * R", [("voltage", "V"), ("current", "I")], [("resistance", "R")])
+        result = EquationEngine.calculate(equation, {"voltage": 230, "I": "10"})
+        assert result["success"] == True
+        assert result["results"] == {"resistance": 23.0}
+        assert result["solved_for"] == ["R"]
+
+    def test_calculate_explicit_target(self):
+        equation = make_equation("V = I * R", [("voltage", "V"), ("current", "I")], [("resistance", "R")])
+        result = EquationEngine.calculate(equation, {"I": 10, "R": 23}, target="V")
+        assert result["results"] == {"V": 230.0}
+
+    def test_calculate_reports_missing_inputs(self):
+        equation = make_equation("V = I * R", [("voltage", "V"), ("current", "I")], [("resistance", "R")])
+        result = EquationEngine.calculate(equation, {"V": 230})
+        assert result["success"] == False
+        assert "I" in result["error"]
+
+    def test_calculate_enforces_limits(self):
+        equation = make_equation("Q = A * v", [("area", "A"), ("velocity", "v")], [("flow", "Q")])
+        equation.inputs[1].max_value = 5
+        result = EquationEngine.calculate(equation, {"A": 1, "v": 10})
+        assert result["success"] == False
+        assert "exceeds maximum" in result["error"]
@@ -0,0 +1,58 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.equation_planner import EquationNode, EquationPlanner
+
+
+@pytest.fixture
+def planner():
+    return EquationPlanner([
+        EquationNode("ohms_law", "V = I * R", {"V": "voltage", "I": "current", "R": "resistance"}),
+        EquationNode("dc_power", "P = V * I", {"P": "power", "V": "voltage", "I": "current"}),
+        EquationNode("joule", "P = I^2 * R", {"P": "power", "I": "current", "R": "resistance"}),
+        EquationNode("energy", "E = P * t", {"E": "energy", "P": "power", "t": "time"}),
+    ])
+
+
+class TestEquationPlanner:
+    """Tests for chaining catalog equations"""
+
+    def test_chains_equations(self, planner):
+        result = planner.solve({"voltage": 230, "resistance": 23, "time": 2}, "energy")
+        assert result["success"] == True
+        assert result["value"] == pytest.approx(4600)
+        assert [step["solved_for"] for step in result["steps"]][-1] == "energy"
+        assert len(result["steps"]) == 3
+
+    def test_prefers_direct_equation(self, planner):
+        result = planner.solve({"current": 10, "resistance": 23}, "power")
+        assert [step["equation_id"] for step in result["steps"]] == ["joule"]
+        assert result["value"] == pytest.approx(2300)
+
+    def test_rearranges_for_target(self, planner):
+        result = planner.solve({"power": 2300, "current": 10}, "resistance")
+        assert result["value"] == pytest.approx(23)
+
+    def test_plan_is_cached(self, planner):
+        planner.solve({"voltage": 1, "current": 2}, "power")
+        planner.solve({"voltage": 5, "current": 7}, "power")
+        assert planner.plan.cache_info().hits == 1
+
+    def test_unreachable_and_unknown(self, planner):
+        assert planner.solve({"voltage": 230}, "power")["success"] == False
+        assert "Unknown variable" in planner.solve({"voltage": 230}, "torque")["error"]
+
+    def test_only_relaxed_forms_are_derived(self):
+        from calculators.services.equation_engine import compile_equation
+        planner = EquationPlanner([
+            EquationNode("kinetic", "Ek = m * u^2 / 2", {"Ek": "kinetic_energy", "m": "mass", "u": "speed"}),
+            EquationNode("momentum", "pm = m * u", {"pm": "momentum", "m": "mass", "u": "speed"}),
+        ])
+        assert compile_equation("pm = m * u").forms == {}
+        result = planner.solve({"mass": 2, "momentum": 6}, "kinetic_energy")
+        assert result["value"] == pytest.approx(9)
+        assert list(compile_equation("pm = m * u").forms) == ["u"]
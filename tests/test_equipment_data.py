@@ -0,0 +1,55 @@
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.equipment_data import (
+    RatingTable, CABLE_TABLE, BREAKER_RATINGS, INSTALL_DERATING, register_catalog, get_catalog
+)
+from calculators.services.electrical import ElectricalCalculators
+
+
+class TestRatingTable:
+    """Tests for sorted catalog lookup"""
+
+    def test_ceiling_and_above(self):
+        assert BREAKER_RATINGS.ceiling(62.5) == 63
+        assert BREAKER_RATINGS.ceiling(63) == 63
+        assert BREAKER_RATINGS.above(63) == 80
+        assert BREAKER_RATINGS.ceiling(10000) is None
+        assert BREAKER_RATINGS.ceiling(10000, BREAKER_RATINGS.last) == 6300
+
+    def test_rows_sorted_and_immutable(self):
+        table = RatingTable([{'size': 2, 'rating': 20}, {'size': 1, 'rating': 10}], key='rating')
+        assert table.keys == (10, 20)
+        assert table.ceiling(15)['size'] == 2
+        with pytest.raises(TypeError):
+            CABLE_TABLE.ceiling(100)['mm2'] = 1
+        with pytest.raises(TypeError):
+            INSTALL_DERATING['conduit'] = 1.0
+
+    def test_register_catalog_from_rows(self):
+        rows = [SimpleNamespace(model='X-250', rating=250), SimpleNamespace(model='X-100', rating=100)]
+        register_catalog('test_breakers', rows, key='rating')
+        assert get_catalog('test_breakers').ceiling(120)['model'] == 'X-250'
+        with pytest.raises(ValueError):
+            get_catalog('missing')
+
+
+class TestElectricalLookups:
+    """Calculators select from the shared catalogs"""
+
+    def test_cable_sizing_selects_smallest_adequate(self):
+        result = ElectricalCalculators.cable_sizing(design_current=100, length=50)
+        assert result["results"]["cable_size"] == 50
+        assert result["results"]["ampacity"] == 130
+
+    def test_breaker_selection(self):
+        result = ElectricalCalculators.breaker_selection(design_current=50, fault_current=10, curve_type='D')
+        assert result["success"] == True
+        assert result["results"]["breaker_rating"] == 63
+        assert result["results"]["breaking_capacity"] == 15
+        assert result["results"]["instant_trip_max"] == 1260
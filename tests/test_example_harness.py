@@ -0,0 +1,76 @@
+import pytest
+import sys
+import os
+import json
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from calculators.services.example_harness import run_examples, compare_reports
+from workflow_database import WorkflowBase
+from workflow_models import Equation, EquationInput, EquationOutput, EquationExample
+
+
+@pytest.fixture
+def db():
+    """In-memory workflow database with Ohm's law and one stored example"""
+    engine = create_engine("sqlite://")
+    WorkflowBase.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    ohm = Equation(equation_id="electrical_ohms_law_1", name="Ohm's law", equation="V = I * R", domain="electrical")
+    ohm.inputs = [EquationInput(name="current", symbol="I"), EquationInput(name="resistance", symbol="R")]
+    ohm.outputs = [EquationOutput(name="voltage", symbol="V")]
+    ohm.examples = [EquationExample(title="Lamp", input_values={"current": 2, "resistance": 6}, expected_output={"voltage": 12})]
+    session.add(ohm)
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def examples(tmp_path):
+    path = tmp_path / "examples.json"
+    path.write_text(json.dumps({"examples": [
+        {"id": "ohm_ok", "domain": "electrical", "inputs": {"I": 8.0, "R": 12.0}, "outputs": {"V": 96.0}},
+        {"id": "ohm_wrong", "domain": "electrical", "inputs": {"I": 8.0, "R": 12.0}, "outputs": {"V": 97.0}},
+        {"id": "no_equation", "domain": "civil", "inputs": {"Ka": 0.33, "H": 4}, "outputs": {"Pa": 1.0}},
+        {"id": "slab", "calculator": "civil_concrete_volume", "inputs": {"length": 2, "width": 1, "depth": 0.5},
+         "outputs": {"volume": 1.0}},
+    ]}))
+    return path
+
+
+class TestExampleHarness:
+    """Tests for the example regression and benchmark harness"""
+
+    def test_checks_examples_and_records_latency(self, db, examples):
+        report = run_examples(db, [examples], workers=1, repeat=3)
+        ohm = report["calculators"]["electrical_ohms_law_1"]
+        assert ohm["examples"] == 3
+        assert ohm["failed"] == ["ohm_wrong"]
+        assert ohm["evaluations"] == 9
+        assert ohm["p99_us"] >= ohm["p50_us"] > 0
+        assert report["calculators"]["civil_concrete_volume"]["passed"] == 1
+        assert [u["id"] for u in report["unmatched"]] == ["no_equation"]
+
+    def test_worker_processes(self, db, examples):
+        report = run_examples(db, [examples], workers=2, repeat=1, include_db=False)
+        assert report["passed"] == 2
+        assert report["failed"] == 1
+
+    def test_compare_reports(self):
+        baseline = {"calculators": {
+            "a": {"failed": [], "p50_us": 10.0, "p99_us": 20.0},
+            "b": {"failed": ["b1"], "p50_us": 10.0, "p99_us": 20.0},
+            "c": {"failed": [], "p50_us": 1.0, "p99_us": 2.0},
+        }}
+        current = {"calculators": {
+            "a": {"failed": ["a1"], "p50_us": 10.0, "p99_us": 40.0},
+            "b": {"failed": ["b1"], "p50_us": 11.0, "p99_us": 20.0},
+        }}
+        regressions = compare_reports(baseline, current)
+        assert {(r["calculator"], r["type"]) for r in regressions} == {("a", "correctness"), ("a", "latency"), ("c", "missing")}
@@ -0,0 +1,127 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.frame_analysis import continuous_beam, frame_analysis, solve_frame
+from calculators.services.civil import CivilCalculators
+
+E, I, A = 200e6, 1e-4, 1e-2  # kN/m², m⁴, m²
+
+
+def beam(supports, span=6.0):
+    nodes = [{"id": "A", "x": 0, "y": 0, "support": supports[0]}, {"id": "B", "x": span, "y": 0, "support": supports[1]}]
+    return nodes, [{"id": "AB", "start": "A", "end": "B", "E": E, "I": I, "A": A}]
+
+
+def portal_frame(bays, storeys, bay=6.0, storey=3.5):
+    nodes, members, gravity, wind = [], [], [], []
+    for level in range(storeys + 1):
+        for column in range(bays + 1):
+            nodes.append({"id": f"N{level}_{column}", "x": column * bay, "y": level * storey, "support": "fixed" if level == 0 else None})
+    for level in range(storeys):
+        for column in range(bays + 1):
+            members.append({"id": f"C{level}_{column}", "start": f"N{level}_{column}", "end": f"N{level + 1}_{column}", "b": 0.4, "h": 0.4})
+        for column in range(bays):
+            members.append({"id": f"B{level + 1}_{column}", "start": f"N{level + 1}_{column}", "end": f"N{level + 1}_{column + 1}", "b": 0.3, "h": 0.6})
+            gravity.append({"member": f"B{level + 1}_{column}", "w": -25})
+        wind.append({"node": f"N{level + 1}_0", "fx": 15})
+    return nodes, members, {"dead": gravity, "wind": wind}
+
+
+class TestFrameAnalysis:
+    """Tests for the sparse stiffness frame and continuous beam solver"""
+
+    def test_single_spans_match_closed_form(self):
+        w, L = 10.0, 6.0
+        simple = solve_frame(*beam(["pinned", "roller"]), {"udl": [{"member": "AB", "w": -w}]})
+        assert simple.moment[0, 10, 0] == pytest.approx(w * L ** 2 / 8)
+        assert simple.deflection[0, 10, 0] == pytest.approx(-5 * w * L ** 4 / (384 * E * I))
+        assert simple.reaction[1, 0] == pytest.approx(w * L / 2)
+        fixed = solve_frame(*beam(["fixed", "fixed"]), {"udl": [{"member": "AB", "w": -w}]})
+        assert fixed.moment[0, 0, 0] == pytest.approx(-w * L ** 2 / 12)
+        assert fixed.moment[0, 10, 0] == pytest.approx(w * L ** 2 / 24)
+        cantilever = solve_frame(*beam(["fixed", None]), {"tip": [{"node": "B", "fy": -10}]})
+        assert cantilever.moment[0, 0, 0] == pytest.approx(-10 * L)
+        assert cantilever.displacement[4, 0] == pytest.approx(-10 * L ** 3 / (3 * E * I))
+
+    def test_point_load_deflection_profile(self):
+        P, L, a = 20.0, 6.0, 2.0
+        solution = solve_frame(*beam(["pinned", "roller"], L), {"point": [{"member": "AB", "P": -P, "a": a}]}, stations=31)
+        b, x = L - a, solution.x[0]
+        expected = np.where(x <= a, -P * b * x * (L ** 2 - b ** 2 - x ** 2) / (6 * E * I * L),
+                            -P * a * (L - x) * (L ** 2 - a ** 2 - (L - x) ** 2) / (6 * E * I * L))
+        assert np.allclose(solution.deflection[0, :, 0], expected, rtol=1e-9, atol=1e-12)
+        assert solution.moment[0, :, 0].max() == pytest.approx(P * a * b / L)
+
+    def test_peaks_between_even_stations_are_sampled(self):
+        # P at 2 m of a 6 m span is not one of the 21 even stations: the peak Pab/L = 13.33 must still be found
+        single = continuous_beam([6.0], point_loads=[{"P": 10, "a": 2}], section={"E": E, "I": I, "A": A})
+        assert single["max_moment"] == pytest.approx(10 * 2 * 4 / 6, abs=1e-3)
+        assert single["spans"][0]["max_moment_at"] == pytest.approx(2)
+        # Shear just past the load is sampled too
+        assert single["max_shear"] == pytest.approx(10 * 4 / 6, abs=1e-3)
+        # Propped cantilever: the sagging peak 9wL²/128 sits at the zero-shear point 3L/8 from the roller
+        propped = continuous_beam([6.0], dead_load=10, supports=["fixed", "roller"], section={"E": E, "I": I, "A": A})
+        assert propped["max_moment"] == pytest.approx(9 * 10 * 36 / 128, abs=1e-3)
+        assert propped["spans"][0]["max_moment_at"] == pytest.approx(6 - 2.25, abs=1e-6)
+
+    def test_combinations_are_factored_load_cases(self):
+        nodes, members, cases = portal_frame(3, 4)
+        solution = solve_frame(nodes, members, cases, {"uls": {"dead": 1.35, "wind": 1.5}, "uplift": {"dead": 1.0, "wind": -1.5}})
+        assert solution.names == ["dead", "wind", "uls", "uplift"]
+        for values in (solution.displacement, solution.reaction, solution.moment):
+            assert np.allclose(values[..., 2], 1.35 * values[..., 0] + 1.5 * values[..., 1])
+            assert np.allclose(values[..., 3], values[..., 0] - 1.5 * values[..., 1])
+        # Global equilibrium: the base reactions balance the applied loads in every scenario
+        applied_x = 15 * 4 * solution.factors[:, 1]
+        assert np.allclose(solution.reaction[0::3].sum(axis=0), -applied_x)
+        assert np.allclose(solution.reaction[1::3].sum(axis=0), 25 * 6 * 3 * 4 * solution.factors[:, 0])
+
+    def test_large_frame_with_many_combinations(self):
+        nodes, members, cases = portal_frame(20, 40)
+        cases["live"] = [dict(load, w=-10) for load in cases["dead"]]
+        combinations = {f"combo_{i}": {"dead": 1.2, "live": 1.6 - i / 100, "wind": (-1) ** i * i / 40} for i in range(40)}
+        results = frame_analysis(nodes, members, cases, combinations, material="concrete")
+        assert results["free_dofs"] == 3 * 21 * 40
+        assert len(results["member_results"]) == len(members)
+        assert results["max_moment"]["scenario"] in combinations
+
+    def test_two_span_beam_and_pattern_loading(self):
+        q, L = 10.0, 6.0
+        uniform = continuous_beam([L, L], dead_load=q, section={"E": E, "I": I}, pattern=False)
+        assert uniform["supports"][1]["min_moment"] == pytest.approx(-q * L ** 2 / 8)
+        assert uniform["supports"][1]["max_reaction"] == pytest.approx(1.25 * q * L)
+        patterned = continuous_beam([L, L, L], dead_load=q, live_load=q, section={"E": E, "I": I})
+        assert patterned["combinations"] == ["all_spans", "odd_spans", "even_spans", "adjacent_S2", "adjacent_S3"]
+        assert patterned["spans"][0]["max_moment_combination"] == "odd_spans"
+        assert patterned["supports"][1]["min_moment_combination"] == "adjacent_S2"
+        # Pattern loading governs over loading every span
+        everywhere = continuous_beam([L, L, L], dead_load=2 * q, section={"E": E, "I": I}, pattern=False)
+        assert patterned["max_moment"] > everywhere["max_moment"]
+        assert patterned["min_moment"] < everywhere["min_moment"]
+
+    def test_invalid_models_raise(self):
+        with pytest.raises(ValueError, match="unstable"):
+            solve_frame(*beam(["roller", "roller"]), {"udl": [{"member": "AB", "w": -1}]})
+        with pytest.raises(ValueError, match="existing"):
+            solve_frame(*beam(["pinned", "roller"]), {"udl": [{"member": "XY", "w": -1}]})
+        with pytest.raises(ValueError, match="unknown load case"):
+            solve_frame(*beam(["pinned", "roller"]), {"udl": [{"member": "AB", "w": -1}]}, {"uls": {"snow": 1.5}})
+        with pytest.raises(ValueError):
+            continuous_beam([6, 6], dead_load=[1, 2, 3], section={"I": I})
+
+    def test_civil_calculators(self):
+        nodes, members = beam(["pinned", "roller"])
+        result = CivilCalculators.frame_analysis(nodes, members, {"udl": [{"member": "AB", "w": -10}]}, include_diagrams=True)
+        assert result["success"] == True
+        assert result["results"]["max_moment"]["value"] == 45.0
+        assert len(result["results"]["diagrams"]["AB"]["udl"]["moment"]) == 21
+        result = CivilCalculators.continuous_beam([5, 5], {"b": 0.3, "h": 0.5, "material": "concrete"}, dead_load=20, dead_factor=1.35)
+        assert result["success"] == True
+        assert result["results"]["min_moment"] == pytest.approx(-1.35 * 20 * 25 / 8)
+        assert CivilCalculators.continuous_beam([5, 5], {"b": 0.3, "h": 0.5, "material": "glass"}, dead_load=20)["success"] == False
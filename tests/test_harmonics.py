@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+import io
+import math
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.harmonics import HarmonicAnalyzer, HarmonicAnalysisService, waveform_blocks
+
+
+def waveform(seconds, sample_rate=6400, frequency=50, amplitude=230 * math.sqrt(2), harmonics=None):
+    """Sine wave with harmonics given as {order: fraction of the fundamental}"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = amplitude * np.sin(2 * np.pi * frequency * t)
+    for order, fraction in (harmonics or {}).items():
+        signal += fraction * amplitude * np.sin(2 * np.pi * order * frequency * t)
+    return signal
+
+
+class TestHarmonicAnalysis:
+    """Tests for the streaming FFT harmonic analysis"""
+
+    def test_known_spectrum(self):
+        samples = waveform(1, harmonics={5: 0.04, 7: 0.03})
+        result = HarmonicAnalysisService.analyze_samples({"Va": samples.tolist()}, 6400)
+        channel = result["results"]["channels"]["Va"]
+        assert result["success"] == True
+        assert channel["fundamental_rms"] == pytest.approx(230, rel=1e-6)
+        assert channel["harmonics"][4]["percent"] == pytest.approx(4.0, abs=1e-3)
+        assert channel["harmonics"][6]["percent"] == pytest.approx(3.0, abs=1e-3)
+        assert channel["thd"] == pytest.approx(5.0, abs=1e-3)
+        assert channel["worst_harmonic"] == 5
+        assert channel["compliant"] == True
+
+    def test_streamed_blocks_match_single_pass(self):
+        samples = np.column_stack([waveform(2, harmonics={3: 0.1}), waveform(2, amplitude=100, harmonics={5: 0.2})])
+        whole = HarmonicAnalyzer(6400, channels=["Va", "Ia"])
+        whole.feed(samples)
+        streamed = HarmonicAnalyzer(6400, channels=["Va", "Ia"])
+        for start in range(0, len(samples), 777):
+            streamed.feed(samples[start:start + 777])
+        assert streamed.windows == whole.windows == 10
+        assert streamed.result()["channels"] == whole.result()["channels"]
+
+    def test_csv_upload_is_read_in_chunks(self):
+        t = np.arange(12800) / 6400
+        text = "time,Va,Ia\n" + "\n".join(f"{a},{b},{c}" for a, b, c in zip(t, waveform(2), waveform(2, amplitude=50, harmonics={5: 0.1})))
+        names, blocks = waveform_blocks(io.BytesIO(text.encode()), "meter.csv", block_samples=1000)
+        assert names == ["Va", "Ia"]
+        assert len(list(blocks)) == 13
+
+        result = HarmonicAnalysisService.analyze_file(io.BytesIO(text.encode()), "meter.csv", 6400)
+        assert result["results"]["channels"]["Ia"]["type"] == "current"
+        assert result["results"]["channels"]["Va"]["thd"] == pytest.approx(0, abs=1e-3)
+
+    def test_binary_recording(self):
+        samples = np.column_stack([waveform(1, frequency=60, sample_rate=7680), waveform(1, frequency=60, sample_rate=7680, harmonics={2: 0.05})])
+        data = samples.astype(np.float32).tobytes()
+        result = HarmonicAnalysisService.analyze_file(io.BytesIO(data), "capture.bin", 7680, channel_count=2, frequency=60)
+        assert result["results"]["window_cycles"] == 12
+        assert result["results"]["channels"]["ch2"]["harmonics"][1]["percent"] == pytest.approx(5.0, abs=1e-2)
+
+        buffer = io.BytesIO()
+        np.save(buffer, samples)
+        buffer.seek(0)
+        npy = HarmonicAnalysisService.analyze_file(buffer, "capture.npy", 7680, channels=["Va", "Vb"], frequency=60)
+        assert npy["results"]["channels"]["Vb"]["thd"] == pytest.approx(5.0, abs=1e-3)
+
+    def test_current_tdd_and_ieee519_limits(self):
+        # 5th harmonic at 10 % of a 100 A load with Isc/IL = 15 exceeds the 4 % / 5 % TDD limits
+        samples = waveform(1, amplitude=100 * math.sqrt(2), harmonics={5: 0.1})
+        result = HarmonicAnalysisService.analyze_samples({"Ia": samples.tolist()}, 6400, load_current=100, short_circuit_current=1500)
+        channel = result["results"]["channels"]["Ia"]
+        assert channel["tdd"] == pytest.approx(10.0, abs=1e-3)
+        assert channel["limits"]["tdd"] == 5.0
+        assert channel["violations"] == [5]
+        assert channel["filter_current"] == pytest.approx(100 * math.sqrt(10 ** 2 - 5 ** 2) / 100, abs=0.01)
+        assert result["results"]["compliant"] == False
+
+    def test_short_recording_is_rejected(self):
+        result = HarmonicAnalysisService.analyze_samples({"Va": [0.0] * 100}, 6400)
+        assert result["success"] == False
+        assert "shorter than one" in result["error"]
+
+    def test_workflow_estimates_from_its_declared_inputs(self):
+        from workflows.services.workflow_service import WorkflowService
+        # electrical_harmonics_1 declares load_profile, nonlinear_loads and system_impedance only
+        run = WorkflowService.execute_workflow("electrical_harmonics_1", {"load_profile": "100", "nonlinear_loads": "50", "system_impedance": "6"})
+        current = run["results"]["channels"]["Ia"]
+        # Half the load is six-pulse drives: TDD is half of their own current distortion
+        drive = math.sqrt(30 ** 2 + 12 ** 2 + 8 ** 2 + 6 ** 2 + 4 ** 2 + 3 ** 2)
+        assert current["tdd"] == pytest.approx(drive / 2, rel=0.02)
+        assert current["isc_il_ratio"] == pytest.approx(100 / 6, rel=0.01)
+        assert run["results"]["thd"] > 0 and run["results"]["filter_size"] > 0
+        mixed = WorkflowService.execute_workflow("electrical_harmonics_1", {"load_profile": [60, 100, 80], "nonlinear_loads": {"twelve_pulse": 50}})
+        assert mixed["results"]["tdd"] < current["tdd"]
+        with pytest.raises(ValueError):
+            WorkflowService.execute_workflow("electrical_harmonics_1", {"load_profile": 100, "nonlinear_loads": {"arc_furnace": 10}})
@@ -0,0 +1,85 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.hvac_loads import AIR_LATENT, hvac_simulation, plant_analysis, zone_loads
+from calculators.services.psychrometrics import humidity_ratio, humidity_ratio_from_wet_bulb, wet_bulb
+from calculators.services.mechanical import MechanicalCalculators
+
+BARE = {"occupants": 0, "lighting": 0, "equipment": 0, "ventilation": 0, "infiltration": 0}
+
+
+def constant_weather(temperature, humidity=50.0, ghi=0.0):
+    return {"temp_air": np.full(8760, float(temperature)), "relative_humidity": np.full(8760, humidity), "ghi": np.full(8760, ghi)}
+
+
+class TestHVACLoads:
+    """Tests for the hourly zone load engine and plant analysis"""
+
+    def test_steady_conduction_and_deadband(self):
+        zone = dict(BARE, area=50, walls={"N": 100}, u_wall=0.5)
+        hot = zone_loads([zone], constant_weather(30))["sensible"]
+        assert np.allclose(hot, 0.5 * 100 * (30 - 24))
+        cold = zone_loads([zone], constant_weather(10))["sensible"]
+        assert np.allclose(cold, -0.5 * 100 * (20 - 10))
+        assert np.allclose(zone_loads([zone], constant_weather(22))["sensible"], 0)
+
+    def test_thermal_mass_delays_and_flattens_solar_peak(self):
+        weather = {"temp_air": np.full(8760, 24.0), "relative_humidity": np.full(8760, 50.0),
+                   "ghi": np.tile(np.maximum(np.sin(np.linspace(0, 2 * np.pi, 24, endpoint=False) - np.pi / 2), 0) * 800, 365)}
+        zones = [dict(BARE, id=mass, area=40, walls={"W": 30}, windows={"W": 12}, construction=mass) for mass in ("light", "heavy")]
+        sensible = zone_loads(zones, weather, latitude=40)["sensible"]
+        light, heavy = sensible[0, 24 * 180:24 * 181], sensible[1, 24 * 180:24 * 181]
+        assert heavy.max() < light.max()
+        assert heavy.argmax() >= light.argmax()
+        # The lag redistributes solar gain in time without losing it
+        assert sensible[1].sum() == pytest.approx(sensible[0].sum(), rel=1e-3)
+
+    def test_ventilation_latent_load(self):
+        zone = dict(BARE, area=100, type="hospital", ventilation=100)
+        loads = zone_loads([zone], constant_weather(30, humidity=70))
+        outdoor, indoor = humidity_ratio(30, 70), humidity_ratio(24, 50)
+        assert np.allclose(loads["latent"], AIR_LATENT * 0.1 * (outdoor - indoor))
+
+    def test_wet_bulb_iteration_round_trips(self):
+        dry_bulb = np.array([-5.0, 10.0, 25.0, 35.0, 45.0])
+        true_wet_bulb = np.array([-7.0, 6.0, 18.0, 28.0, 25.0])
+        humidity = humidity_ratio_from_wet_bulb(dry_bulb, true_wet_bulb)
+        assert np.allclose(wet_bulb(dry_bulb, humidity), true_wet_bulb, atol=1e-4)
+        assert humidity_ratio(20, 50) == pytest.approx(0.00726, rel=0.01)
+
+    def test_campus_of_500_zones(self):
+        rng = np.random.default_rng(1)
+        types = ["office", "retail", "school", "residential", "hotel", "hospital", "restaurant", "warehouse"]
+        zones = [{"id": i, "area": float(rng.uniform(20, 400)), "type": types[i % 8], "construction": ("light", "medium", "heavy")[i % 3],
+                  "walls": {("N", "E", "S", "W")[i % 4]: 60.0}, "windows": {("N", "E", "S", "W")[i % 4]: 20.0}} for i in range(500)]
+        result = hvac_simulation(zones, latitude=30, cooling_design_temp=38, heating_design_temp=2, include_zones=True)
+        assert result["zones"] == 500 and result["hours"] == 8760
+        assert result["peak_cooling_kw"] <= result["sum_of_zone_peaks_kw"]
+        assert sum(result["monthly_cooling_kwh"]) == pytest.approx(result["annual_cooling_kwh"], rel=1e-3)
+        assert result["plant"]["annual_cooling_kwh"] == pytest.approx(result["annual_cooling_kwh"], rel=1e-6)
+
+    def test_plant_stages_chillers_at_part_load(self):
+        load = np.full(8760, 100.0)
+        load[:4380] = 40.0
+        plant = plant_analysis(load, np.full(8760, 20.0), "airCooled", chiller_count=2, safety_factor=1.0)
+        cop = plant["chiller"]["cop"]
+        # 40 kW runs one 50 kW chiller at 80 %; 100 kW runs both at full load
+        expected = 4380 * 50 / cop * (0.06369 + 0.58488 * 0.8 + 0.35280 * 0.64) + 4380 * 100 / cop * (0.06369 + 0.58488 + 0.35280)
+        assert plant["annual_chiller_kwh"] == pytest.approx(expected, rel=1e-3)
+        assert plant["staging_hours"] == {"1": 4380, "2": 4380}
+        assert "cooling_tower" not in plant
+        assert "cooling_tower" in plant_analysis(load, np.full(8760, 20.0), "waterCooled")
+
+    def test_calculator_validates_zones(self):
+        result = MechanicalCalculators.hvac_simulation([{"area": 100, "type": "stadium"}], latitude=10)
+        assert result["success"] == False
+        assert "Unknown space type" in result["error"]
+        result = MechanicalCalculators.hvac_simulation([{"area": 100}], latitude=10, weather={"temp_air": [20.0] * 8760, "ghi": [0.0] * 8760})
+        assert result["success"] == False
+        assert "humidity" in result["error"]
@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.lighting import (
+    calculation_grid, direct_illuminance, grid_spacing, lighting_calculation, optimize_layout, regular_layout
+)
+from calculators.services.electrical import ElectricalCalculators
+
+
+class TestLighting:
+    """Tests for the point-by-point illuminance engine"""
+
+    def test_inverse_square_cosine_law(self):
+        positions = np.array([[0.0, 0.0, 2.8]])
+        points = np.array([[0.0, 0.0], [2.0, 0.0]])
+        illuminance = direct_illuminance(points, positions, np.array([1000.0]), 0.8, "wide")
+        # Lambertian I(gamma) = I0 cos(gamma) with I0 = lumens / pi
+        i0 = 1000 / math.pi
+        assert illuminance[0] == pytest.approx(i0 / 4)
+        assert illuminance[1] == pytest.approx(i0 * (2 / math.sqrt(8)) ** 2 / 8)
+
+    def test_intensity_table_matches_named_distribution(self):
+        angles = np.linspace(0, 90, 91)
+        table = {"angles": angles.tolist(), "candela": (1000 / math.pi * np.cos(np.radians(angles))).tolist()}
+        points, _ = calculation_grid(6, 4, 0.5)
+        positions = regular_layout(6, 4, 3, 2, 2.7)
+        lumens = np.full(6, 3000.0)
+        named = direct_illuminance(points, positions, lumens, 0.8, "wide")
+        measured = direct_illuminance(points, positions, lumens, 0.8, table)
+        assert np.allclose(named, measured, rtol=1e-3)
+
+    def test_grid_follows_en12464_cell_size(self):
+        assert grid_spacing(10, 5) == pytest.approx(1.0)
+        points, shape = calculation_grid(10, 5, border=0.5)
+        assert shape == (9, 4)
+        assert points[:, 0].min() > 0.5 and points[:, 0].max() < 9.5
+
+    def test_blocked_evaluation_of_large_hall(self):
+        luminaires = [{"x": float(x), "y": float(y)} for x, y, _ in regular_layout(120, 80, 12, 9, 10)]
+        result = lighting_calculation(120, 80, luminaires, mounting_height=10, fixture_lumens=30000,
+                                      distribution="narrow", task="warehouse", grid_spacing_m=0.3)
+        assert result["grid_points"] > 100000
+        assert result["min_lux"] <= result["average_lux"] <= result["max_lux"]
+        assert result["uniformity"] == pytest.approx(result["min_lux"] / result["average_lux"], abs=2e-3)
+
+    def test_optimizer_returns_smallest_compliant_layout(self):
+        result = optimize_layout(20, 12, 4000, mounting_height=3, task="office")
+        assert result["compliant"] == True
+        assert result["average_lux"] >= 500 and result["uniformity"] >= 0.6
+        assert len(result["luminaires"]) == result["fixture_count"]
+
+        # One fewer row or column must not satisfy the task
+        for nx, ny in ((result["columns"] - 1, result["rows"]), (result["columns"], result["rows"] - 1)):
+            if nx and ny:
+                luminaires = [{"x": float(x), "y": float(y)} for x, y, _ in regular_layout(20, 12, nx, ny, 3)]
+                check = lighting_calculation(20, 12, luminaires, mounting_height=3, fixture_lumens=4000, task="office")
+                assert check["compliant"] == False
+
+    def test_calculator_validates_inputs(self):
+        result = ElectricalCalculators.lighting_layout(10, 8, 3000, task="ballroom")
+        assert result["success"] == False
+        assert "Unknown task" in result["error"]
+        result = ElectricalCalculators.lighting_layout(10, 8, 3000, target_lux=300, luminaires=[{"x": 5, "y": 4, "z": 0.5}])
+        assert result["success"] == False
+
+    def test_workflow_with_text_inputs_and_utilization_factor(self):
+        from workflows.services.workflow_service import WorkflowService
+        inputs = {"area": "100", "target_lux": "500", "fixture_lumens": "4000", "utilization_factor": "0.6"}
+        results = WorkflowService.execute_workflow("electrical_lighting_layout", inputs)["results"]
+        assert results["average_lux"] >= 500
+        # N = 500 x 100 / (4000 x 0.6 x 0.8)
+        assert results["lumen_method_count"] == 27
+        assert "UF 0.6" in results["compliance"]
+        percent = WorkflowService.execute_workflow("electrical_lighting_layout", {**inputs, "utilization_factor": "60"})["results"]
+        assert percent["lumen_method_count"] == 27
@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.load_combinations import CombinationSet, load_combinations, load_type
+from calculators.services.frame_analysis import solve_frame
+from calculators.services.civil import CivilCalculators
+
+
+class TestLoadCombinations:
+    """Tests for the code load combination factor matrices and envelopes"""
+
+    def test_load_types_from_names_and_symbols(self):
+        assert load_type("D") == "dead" and load_type("Q") == "live" and load_type("Lr") == "roof_live"
+        assert load_type("wind_x") == "wind" and load_type("roof_live_2") == "roof_live"
+        assert load_type("crane", {"crane": "live"}) == "live"
+        with pytest.raises(ValueError):
+            load_type("temperature")
+
+    def test_code_tables_expand_directions_and_reversal(self):
+        combinations = CombinationSet.from_code(["dead", "live", "wind_x", "wind_y"], "ASCE7")
+        factors = combinations.as_dict()
+        assert factors["1.4 dead"] == {"dead": 1.4}
+        assert factors["0.9 dead - 1 wind_y"] == {"dead": 0.9, "wind_y": -1.0}
+        # Wind directions are alternatives: no combination has both
+        assert not np.any((combinations.factors[:, 2] != 0) & (combinations.factors[:, 3] != 0))
+        assert len({tuple(row) for row in combinations.factors}) == len(combinations.names)
+        assert all(source.startswith("ASCE7 ") for source in combinations.sources)
+
+    def test_eurocode_and_indian_factors(self):
+        eurocode = CombinationSet.from_code(["G", "Q", "W"], "EN1990").as_dict()
+        assert eurocode["1.35 G + 1.5 Q + 0.9 W"] == {"G": 1.35, "Q": 1.5, "W": 0.9}
+        assert eurocode["1 G - 1.5 W"] == {"G": 1.0, "W": -1.5}
+        indian = CombinationSet.from_code(["DL", "LL", "EL"], "IS875").as_dict()
+        assert indian["1.2 DL + 1.2 LL - 1.2 EL"] == {"DL": 1.2, "LL": 1.2, "EL": -1.2}
+        with pytest.raises(ValueError):
+            CombinationSet.from_code(["dead"], "NBC")
+
+    def test_envelope_matches_loop_over_combinations(self):
+        rng = np.random.default_rng(3)
+        cases = {name: rng.normal(size=(40, 3)) for name in ("dead", "live", "snow", "wind", "seismic")}
+        result = load_combinations(cases, "ASCE7", outputs=["N", "V", "M"])
+        combinations = CombinationSet.from_code(list(cases), "ASCE7")
+        combined = np.array([sum(factor * cases[case] for case, factor in zip(cases, row)) for row in combinations.factors])
+        moment = result["member_results"]["M"]
+        assert np.allclose(moment["max"], combined[:, :, 2].max(axis=0), atol=1e-4)
+        assert np.allclose(moment["min"], combined[:, :, 2].min(axis=0), atol=1e-4)
+        governing = [combinations.names.index(name) for name in moment["max_combination"]]
+        assert governing == combined[:, :, 2].argmax(axis=0).tolist()
+        assert result["extremes"]["M"]["max"] == pytest.approx(combined[:, :, 2].max(), abs=1e-4)
+
+    def test_utilization_and_governing_case(self):
+        result = load_combinations({"dead": [[100, 10], [50, 40]], "live": [[50, 0], [0, 30]]}, "IS875",
+                                   member_ids=["C1", "C2"], outputs=["axial", "moment"], capacities=[300, 100])
+        members = result["member_results"]
+        assert members["utilization"] == [pytest.approx(0.75), pytest.approx(1.05)]
+        assert members["governing_output"] == ["axial", "moment"]
+        assert members["governing_combination"] == ["1.5 dead + 1.5 live", "1.5 dead + 1.5 live"]
+        assert result["failing_members"] == ["C2"] and result["max_utilization"] == pytest.approx(1.05)
+
+    def test_thousands_of_members_in_one_product(self):
+        rng = np.random.default_rng(8)
+        cases = {name: rng.normal(size=(20000, 6)) for name in ("dead", "live", "snow", "wind_x", "wind_y", "seismic_x", "seismic_y")}
+        result = load_combinations(cases, "EN1990", include_members=False)
+        assert len(result["combinations"]) > 12 and result["members"] == 20000 and "member_results" not in result
+
+    def test_frame_and_calculator_use_code_combinations(self):
+        nodes = [{"id": "A", "x": 0, "y": 0, "support": "fixed"}, {"id": "B", "x": 0, "y": 4}]
+        members = [{"id": "col", "start": "A", "end": "B", "E": 30e6, "b": 0.4, "h": 0.4}]
+        solution = solve_frame(nodes, members, {"dead": [{"node": "B", "fy": -500}], "wind": [{"node": "B", "fx": 20}]}, "IS875")
+        assert "1.5 dead - 1.5 wind" in solution.combination_names
+        base_moment = solution.reaction[2, solution.names.index("1.5 dead - 1.5 wind")]
+        assert base_moment == pytest.approx(-1.5 * 20 * 4)
+        result = CivilCalculators.load_combinations({"D": [10], "L": [5]}, "EN1990")
+        assert result["success"] == True
+        assert result["results"]["extremes"]["effect"]["max"] == pytest.approx(1.35 * 10 + 1.5 * 5)
+        assert CivilCalculators.load_combinations({"D": [10], "L": [5, 6]})["success"] == False
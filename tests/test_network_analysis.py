@@ -0,0 +1,77 @@
+import pytest
+import sys
+import os
+import math
+import random
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.network_analysis import Network, analyze_network, zbus_diagonal
+from calculators.services.electrical import ElectricalCalculators
+
+
+def feeder(n, meshes=0, seed=1):
+    """Random 11 kV radial feeder with optional ties between buses"""
+    rng = random.Random(seed)
+    buses = [{"id": "B0"}] + [{"id": f"B{i}", "load_kw": rng.uniform(5, 20)} for i in range(1, n)]
+    branches = [{"from": f"B{rng.randrange(max(0, i - 10), i)}", "to": f"B{i}", "length": rng.uniform(20, 80), "cable_size": 240}
+                for i in range(1, n)]
+    for _ in range(meshes):
+        a, b = rng.sample(range(n), 2)
+        branches.append({"from": f"B{a}", "to": f"B{b}", "length": 100, "cable_size": 240})
+    return buses, branches
+
+
+class TestNetworkAnalysis:
+    """Tests for the sparse load-flow and short-circuit study"""
+
+    def test_single_feeder_matches_hand_calculation(self):
+        buses = [{"id": "MSB"}, {"id": "DB1", "load_kw": 50, "load_kvar": 0}]
+        branches = [{"from": "MSB", "to": "DB1", "length": 100, "r_ohm": 0.02, "x_ohm": 0}]
+        result = analyze_network(buses, branches, {"sc_mva": 1e9})
+
+        current = result["branches"][0]["current"]
+        assert result["summary"]["converged"] == True
+        # V * I = P and the drop across 0.02 ohm at about 72 A
+        assert current == pytest.approx(50e3 / (math.sqrt(3) * result["buses"][1]["voltage"]), rel=1e-3)
+        assert result["buses"][0]["voltage"] - result["buses"][1]["voltage"] == pytest.approx(math.sqrt(3) * current * 0.02, abs=0.01)
+        assert result["summary"]["losses_kw"] == pytest.approx(3 * current ** 2 * 0.02 / 1000, abs=1e-3)
+
+    def test_transformer_fault_level(self):
+        result = analyze_network([{"id": "MSB"}], [], {"transformer_kva": 1000, "transformer_impedance": 6})
+        ik = 1.1 * 1000e3 / (math.sqrt(3) * 400 * 0.06 * result["summary"]["transformer_correction"])
+        assert result["buses"][0]["ik_max_ka"] == pytest.approx(ik / 1000, rel=1e-3)
+        assert result["buses"][0]["ip_ka"] > math.sqrt(2) * result["buses"][0]["ik_max_ka"]
+
+    def test_zbus_diagonal_matches_dense_inverse(self):
+        buses, branches = feeder(80, meshes=6)
+        network = Network(buses, branches, {"sc_mva": 250, "transformer_kva": 10000}, base_kv=11)
+        assert network.meshed == True
+        Y = network.admittance()[1:, 1:].tocsc()
+        assert np.allclose(zbus_diagonal(Y), np.diag(np.linalg.inv(Y.toarray())), rtol=1e-9)
+
+    def test_fault_current_decreases_along_radial_feeder(self):
+        buses = [{"id": f"B{i}", "load_kw": 10} for i in range(5)]
+        branches = [{"from": f"B{i}", "to": f"B{i + 1}", "length": 50, "cable_size": 95} for i in range(4)]
+        result = analyze_network(buses, branches, {"transformer_kva": 630})
+        faults = [bus["ik_max_ka"] for bus in result["buses"]]
+        drops = [bus["voltage_drop_percent"] for bus in result["buses"]]
+        assert faults == sorted(faults, reverse=True)
+        assert drops == sorted(drops)
+        assert result["branches"][0]["loading_percent"] is not None
+
+    def test_large_meshed_network(self):
+        buses, branches = feeder(2000, meshes=50)
+        result = analyze_network(buses, branches, {"sc_mva": 500, "transformer_kva": 40000}, base_kv=11)
+        assert result["summary"]["converged"] == True
+        assert result["summary"]["topology"] == "meshed"
+        assert len(result["buses"]) == 2000
+
+    def test_calculator_reports_invalid_networks(self):
+        result = ElectricalCalculators.network_analysis(
+            [{"id": "A"}, {"id": "B"}, {"id": "C"}], [{"from": "A", "to": "B", "length": 10, "cable_size": 16}], {"transformer_kva": 500})
+        assert result["success"] == False
+        assert "not connected" in result["error"]
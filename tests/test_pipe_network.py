@@ -0,0 +1,114 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.pipe_network import fittings_k, friction_factor, pipe_network, water_properties
+from calculators.services.mechanical import MechanicalCalculators
+
+
+def grid_network(n, demand=0.5, diameter=150):
+    nodes = [{"id": (i, j), "demand": demand} for i in range(n) for j in range(n)]
+    nodes[0] = {"id": (0, 0), "head": 60}
+    pipes = []
+    for i in range(n):
+        for j in range(n):
+            if i + 1 < n:
+                pipes.append({"from": (i, j), "to": (i + 1, j), "length": 50, "diameter": diameter})
+            if j + 1 < n:
+                pipes.append({"from": (i, j), "to": (i, j + 1), "length": 50, "diameter": diameter})
+    return nodes, pipes
+
+
+class TestPipeNetwork:
+    """Tests for the global gradient pipe network solver"""
+
+    def test_friction_factor_satisfies_colebrook(self):
+        re = np.array([5e3, 1e5, 1e7])
+        roughness = np.array([1e-4, 1e-3, 1e-2])
+        f = friction_factor(re, roughness)
+        colebrook = (-2 * np.log10(roughness / 3.7 + 2.51 / (re * np.sqrt(f)))) ** -2
+        assert np.allclose(f, colebrook, rtol=1e-4)
+        assert friction_factor(1000, 1e-3) == pytest.approx(0.064)
+        # The blended curve is continuous across the transitional range
+        blended = friction_factor(np.array([2299.999, 2300.001, 3999.999, 4000.001]), 1e-3, blend=True)
+        assert blended[0] == pytest.approx(blended[1], rel=1e-5) and blended[2] == pytest.approx(blended[3], rel=1e-5)
+
+    def test_single_pipe_matches_pipe_friction(self):
+        single = MechanicalCalculators.pipe_friction(30, 100, 100)["results"]
+        nodes = [{"id": "R", "head": 40}, {"id": "A", "demand": 30}]
+        result = pipe_network(nodes, [{"id": "P1", "from": "R", "to": "A", "length": 100, "diameter": 100}])
+        assert result["pipe_results"][0]["head_loss"] == pytest.approx(single["head_loss"], rel=1e-3)
+        assert result["node_results"][1]["head"] == pytest.approx(40 - single["head_loss"], abs=1e-3)
+
+    def test_loop_balances_flow_and_head(self):
+        nodes = [{"id": "S", "head": 50}, {"id": "A", "demand": 20, "elevation": 5}, {"id": "B", "demand": 35},
+                 {"id": "C", "demand": 15, "elevation": 10}]
+        pipes = [{"id": 1, "from": "S", "to": "A", "length": 300, "diameter": 150},
+                 {"id": 2, "from": "A", "to": "B", "length": 400, "diameter": 100},
+                 {"id": 3, "from": "B", "to": "C", "length": 350, "diameter": 80},
+                 {"id": 4, "from": "A", "to": "C", "length": 500, "diameter": 100, "fittings": {"elbow_90": 4, "gate_valve": 2}}]
+        result = pipe_network(nodes, pipes)
+        flows = {pipe["id"]: pipe["flow"] for pipe in result["pipe_results"]}
+        losses = {pipe["id"]: pipe["head_loss"] for pipe in result["pipe_results"]}
+        assert result["converged"] == True
+        assert flows[1] == pytest.approx(70, abs=1e-3)
+        assert flows[1] - flows[2] - flows[4] == pytest.approx(20, abs=1e-3)
+        assert flows[3] + flows[4] == pytest.approx(15, abs=1e-3)
+        # Head losses around the loop A-B-C-A cancel
+        assert losses[2] + losses[3] - losses[4] == pytest.approx(0, abs=1e-3)
+        assert result["supply_flow"] == pytest.approx(result["total_demand"])
+
+    def test_parallel_pipes_share_flow_by_resistance(self):
+        nodes = [{"id": 0, "head": 20}, {"id": 1, "demand": 100}]
+        pipes = [{"from": 0, "to": 1, "length": 100, "diameter": 100, "material": "pvc"},
+                 {"from": 0, "to": 1, "length": 100, "diameter": 100, "material": "cast_iron"}]
+        for method in ("darcy_weisbach", "hazen_williams"):
+            result = pipe_network(nodes, pipes, method=method)
+            smooth, rough = (pipe["flow"] for pipe in result["pipe_results"])
+            assert smooth > rough
+            assert smooth + rough == pytest.approx(100, abs=1e-3)
+        # Hazen-Williams: Q ∝ C at equal head loss
+        assert smooth / rough == pytest.approx(150 / 100, rel=1e-3)
+
+    def test_campus_network_converges(self):
+        nodes, pipes = grid_network(60)
+        result = pipe_network(nodes, pipes, include_details=False)
+        assert len(pipes) > 7000
+        assert result["converged"] == True
+        assert result["iterations"] < 15
+        assert result["supply_flow"] == pytest.approx(0.5 * (60 * 60 - 1), rel=1e-4)
+        assert result["critical_node"] == (59, 59)
+
+    def test_fittings_given_as_text(self):
+        assert fittings_k("elbow_90") == pytest.approx(0.75)
+        assert fittings_k("elbow_90, gate_valve,0.5") == pytest.approx(0.75 + 0.15 + 0.5)
+        assert fittings_k("") == 0.0
+        with pytest.raises(ValueError):
+            fittings_k("elbow_91")
+
+    def test_pressure_drop_workflow_with_text_inputs(self):
+        from workflows.services.workflow_service import WorkflowService
+        inputs = {"pipe_lengths": 50, "pipe_size": 80, "flow_rate": 30, "fittings": "elbow_90", "fluid_properties": "water"}
+        water = WorkflowService.execute_workflow("mechanical_pressure_drop", inputs)["results"]
+        assert water["pressure_drop_total"] > 0
+        warm = WorkflowService.execute_workflow("mechanical_pressure_drop", {**inputs, "fluid_properties": "60"})["results"]
+        # Warmer water is less viscous
+        assert warm["pressure_drop_total"] < water["pressure_drop_total"]
+        assert WorkflowService.execute_workflow("mechanical_pressure_drop", {**inputs, "fluid_properties": {"temperature": 60}})["results"] == warm
+        with pytest.raises(ValueError, match="fluid_properties"):
+            WorkflowService.execute_workflow("mechanical_pressure_drop", {**inputs, "fluid_properties": "glycol"})
+
+    def test_calculator_reports_errors(self):
+        nodes = [{"id": "R", "head": 30}, {"id": "A", "demand": 5}, {"id": "B", "demand": 5}, {"id": "C"}]
+        pipes = [{"from": "R", "to": "A", "length": 10, "diameter": 50}, {"from": "B", "to": "C", "length": 10, "diameter": 50}]
+        result = MechanicalCalculators.pipe_network(nodes, pipes)
+        assert result["success"] == False
+        assert "not connected" in result["error"]
+        result = MechanicalCalculators.pipe_network(nodes[:2], pipes[:1], material="bamboo")
+        assert result["success"] == False
+        assert water_properties(20)["viscosity"] == pytest.approx(1.004e-6, rel=0.01)
@@ -0,0 +1,93 @@
+import pytest
+import sys
+import os
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.psychrometrics import (
+    add_psychrometrics, dew_point_from_humidity_ratio, humidity_ratio, humidity_ratio_from_dew_point, psychrometric_state)
+from calculators.services.mechanical import MechanicalCalculators
+from analytics.psychrometrics import PsychrometricAnalysisService
+from analytics.query_builder import QueryBuilder
+
+
+def trend_log(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"timestamp": np.arange(count), "oat": rng.uniform(-15, 40, count), "rh": rng.uniform(5, 100, count)})
+
+
+class TestPsychrometrics:
+    """Tests for the array psychrometric functions and the trend log operations"""
+
+    def test_state_matches_ashrae_reference_point(self):
+        # ASHRAE Fundamentals example: 25 °C, 50 % RH at sea level
+        state = psychrometric_state(25, 50)
+        assert float(state["humidity_ratio"]) == pytest.approx(0.00988, rel=5e-3)
+        assert float(state["enthalpy"]) == pytest.approx(50.3, abs=0.2)
+        assert float(state["dew_point"]) == pytest.approx(13.9, abs=0.1)
+        assert float(state["wet_bulb"]) == pytest.approx(17.9, abs=0.1)
+        assert float(state["specific_volume"]) == pytest.approx(0.858, abs=0.002)
+
+    def test_dew_point_inverts_saturation_over_water_and_ice(self):
+        dew_point = np.array([-30.0, -5.0, -0.1, 0.1, 12.0, 35.0])
+        assert np.allclose(dew_point_from_humidity_ratio(humidity_ratio_from_dew_point(dew_point)), dew_point, atol=1e-6)
+        assert np.isnan(dew_point_from_humidity_ratio(0.0))
+
+    def test_every_basis_gives_the_same_state(self):
+        dry_bulb, rh = np.array([-8.0, 5.0, 22.0, 38.0]), np.array([70.0, 90.0, 45.0, 20.0])
+        reference = psychrometric_state(dry_bulb, rh, altitude=1200)
+        for basis in ("dew_point", "wet_bulb", "humidity_ratio"):
+            state = psychrometric_state(dry_bulb, reference[basis], basis, altitude=1200)
+            for name, values in reference.items():
+                assert np.allclose(state[name], values, rtol=1e-6, atol=1e-6), (basis, name)
+
+    def test_impossible_samples_are_nan(self):
+        state = psychrometric_state([25, 25, 25, np.nan], [50, 130, -5, 50])
+        assert np.isfinite(state["wet_bulb"][0])
+        assert np.isnan(state["wet_bulb"][1:]).all() and np.isnan(state["enthalpy"][1:]).all()
+        assert np.isnan(psychrometric_state(20, 25, "dew_point")["humidity_ratio"])
+        with pytest.raises(ValueError):
+            psychrometric_state(20, 50, "absolute_humidity")
+
+    def test_million_samples_in_chunks(self):
+        log = trend_log(1_000_000)
+        columns = add_psychrometrics(log, "oat", "rh", properties=["humidity_ratio", "wet_bulb", "enthalpy"], prefix="oa_", chunk_rows=200_000)
+        assert columns == ["oa_humidity_ratio", "oa_wet_bulb", "oa_enthalpy"]
+        sample = log.sample(50, random_state=1)
+        assert np.allclose(sample["oa_humidity_ratio"], humidity_ratio(sample["oat"].to_numpy(), sample["rh"].to_numpy()))
+        assert (log["oa_wet_bulb"] <= log["oat"] + 1e-9).all()
+
+    def test_uploaded_log_summary_and_csv_export(self):
+        log = trend_log(2500, seed=4)
+        log.loc[7, "rh"] = 140.0
+        data = log.to_csv(index=False).encode()
+        result = PsychrometricAnalysisService.analyze_file(io.BytesIO(data), "bms.csv", "oat", "rh", properties=["dew_point", "enthalpy"])
+        assert result["success"] == True
+        assert result["results"]["rows"] == 2500 and result["results"]["invalid_rows"] == 1
+        state = psychrometric_state(log["oat"], log["rh"])
+        assert result["results"]["statistics"]["enthalpy"]["mean"] == pytest.approx(np.nanmean(state["enthalpy"]), abs=1e-3)
+
+        text = "".join(PsychrometricAnalysisService.export_csv(io.BytesIO(data), "bms.csv", "oat", "rh", properties=["wet_bulb"], prefix="p_"))
+        exported = pd.read_csv(io.StringIO(text))
+        assert len(exported) == 2500 and list(exported.columns) == ["timestamp", "oat", "rh", "p_wet_bulb"]
+        with pytest.raises(ValueError):
+            PsychrometricAnalysisService.export_csv(io.BytesIO(data), "bms.csv", "outdoor", "rh")
+
+    def test_query_pipeline_operation_and_calculator(self):
+        log = trend_log(200, seed=2)
+        query = {"psychrometrics": {"dry_bulb": "oat", "humidity": "rh", "properties": ["enthalpy"]},
+                 "filters": [{"column": "enthalpy", "operator": "greater_than", "value": 60}]}
+        result = QueryBuilder.execute_query(log.to_json(orient="records"), query)
+        assert result["success"] == True
+        rows = json.loads(result["results"])
+        assert rows and all(row["enthalpy"] > 60 for row in rows)
+
+        scalar = MechanicalCalculators.psychrometrics(25, 50, 0)["results"]
+        assert scalar["wet_bulb_temp"] == 17.9 and scalar["dew_point_temp"] == 13.9
+        assert MechanicalCalculators.psychrometrics(25, 120, 0)["success"] == False
@@ -0,0 +1,122 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.pump_selection import PumpCurves, pump_catalog, pump_selection
+from calculators.services.mechanical import MechanicalCalculators
+
+ONE_PUMP = [{"model": "A", "flow": 100, "head": 40, "efficiency": 80, "speed": 2900}]
+
+
+def head_at(curves, index, flow):
+    return float(np.polyval(curves.head[index][::-1], flow))
+
+
+class TestPumpSelection:
+    """Tests for the pump/system curve matching and selection engine"""
+
+    def test_bep_rows_become_curves_through_the_bep(self):
+        curves = PumpCurves(ONE_PUMP)
+        assert head_at(curves, 0, 100) == pytest.approx(40)
+        flow = np.linspace(1, 130, 500)
+        efficiency = np.polyval(curves.efficiency[0][::-1], flow)
+        assert flow[np.argmax(efficiency)] == pytest.approx(100, abs=0.5)
+        assert efficiency.max() == pytest.approx(0.80, abs=1e-4)
+
+    def test_fixed_speed_operating_point_is_on_both_curves(self):
+        result = pump_selection(90, 36, static_head=12, catalog=ONE_PUMP, arrangements=["single"], include_curves=True)
+        best = result["selections"][0]
+        q, h = best["operating_flow"], best["operating_head"]
+        assert h == pytest.approx(12 + (36 - 12) / 90 ** 2 * q ** 2, abs=0.01)
+        assert h == pytest.approx(head_at(pump_catalog(ONE_PUMP), 0, q), abs=0.01)
+        assert 90 <= q <= 90 * 1.15
+        assert len(result["curves"]["flow"]) == len(result["curves"]["system_head"])
+
+    def test_parallel_and_series_share_flow_and_head(self):
+        curves = pump_catalog(ONE_PUMP)
+        parallel = pump_selection(180, 40, catalog=ONE_PUMP, arrangements=["parallel"], max_pumps=2)["selections"][0]
+        assert parallel["arrangement"] == "2 in parallel"
+        assert parallel["pump_flow"] == pytest.approx(parallel["operating_flow"] / 2, abs=0.01)
+        assert parallel["operating_head"] == pytest.approx(head_at(curves, 0, parallel["pump_flow"]), abs=0.02)
+        series = pump_selection(90, 80, static_head=40, catalog=ONE_PUMP, arrangements=["series"], max_pumps=2)["selections"][0]
+        assert series["arrangement"] == "2 in series"
+        assert series["operating_head"] == pytest.approx(2 * head_at(curves, 0, series["operating_flow"]), abs=0.02)
+
+    def test_vfd_follows_affinity_laws(self):
+        curves = pump_catalog(ONE_PUMP)
+        best = pump_selection(70, 25, static_head=5, catalog=ONE_PUMP, arrangements=["single"], vfd=True)["selections"][0]
+        s = best["speed_ratio"]
+        assert s < 1
+        assert s ** 2 * head_at(curves, 0, 70 / s) == pytest.approx(25, abs=0.05)
+        assert best["efficiency"] == pytest.approx(100 * np.polyval(curves.efficiency[0][::-1], 70 / s), abs=0.1)
+        assert best["operating_speed"] == pytest.approx(2900 * s, abs=2)
+        # Too small to reach the duty even at full speed
+        with pytest.raises(ValueError):
+            pump_selection(70, 60, catalog=ONE_PUMP, arrangements=["single"], vfd=True, fallback=False)
+
+    def test_test_points_and_coefficients_give_the_same_curve(self):
+        flow = np.array([0, 40, 80, 120, 150])
+        head = 50 - 0.001 * flow ** 2
+        efficiency = 1.6 * flow - 0.008 * flow ** 2
+        curves = PumpCurves([{"model": "fit", "points": {"flow": flow, "head": head, "efficiency": efficiency}},
+                             {"model": "coef", "head_coefficients": [50, 0, -0.001], "efficiency_coefficients": [0, 1.6, -0.008], "max_flow": 150}])
+        assert np.allclose(curves.head[0], curves.head[1], atol=1e-9)
+        assert np.allclose(curves.efficiency[0], curves.efficiency[1], atol=1e-9)
+        assert curves.bep_flow[0] == pytest.approx(100) and curves.bep_flow[1] == pytest.approx(100, abs=1)
+
+    def test_thousands_of_curves_ranked(self):
+        rng = np.random.default_rng(5)
+        rows = [{"model": f"P{i}", "flow": float(f), "head": float(h), "efficiency": float(e)}
+                for i, (f, h, e) in enumerate(zip(rng.uniform(5, 500, 3000), rng.uniform(10, 100, 3000), rng.uniform(40, 85, 3000)))]
+        catalog = pump_catalog(rows)
+        result = pump_selection(120, 40, static_head=5, catalog=catalog, arrangements=["single", "parallel", "series"], vfd=True, max_results=20)
+        assert result["candidates"] == 3000 * 5
+        efficiencies = [selection["efficiency"] for selection in result["selections"]]
+        assert efficiencies == sorted(efficiencies, reverse=True)
+        assert all(selection["operating_flow"] == 120 for selection in result["selections"])
+
+    def test_fallback_flags_the_nearest_match(self):
+        # Out of reach of a single pump: pumps in series at reduced speed, flagged
+        result = pump_selection(70, 60, catalog=ONE_PUMP, arrangements=["single"])
+        assert result["fallback"] == True and "nearest catalog match" in result["warnings"][0]
+        best = result["selections"][0]
+        assert best["arrangement"].endswith("in series") and best["operating_head"] == pytest.approx(60)
+        # Far more flow than the catalog sizes at low head: floor speed, excess head throttled
+        result = pump_selection(1000, 3)
+        best = result["selections"][0]
+        assert result["fallback"] == True and best["speed_ratio"] == pytest.approx(0.3, abs=1e-3)
+        assert best["pump_head"] - best["throttled_head"] == pytest.approx(3, abs=0.01)
+        # Only the fixed-speed oversize limit fails: trimmed to the duty without leaving the arrangement
+        result = pump_selection(600, 10)
+        assert "speed reduction" in result["warnings"][0]
+        assert result["selections"][0]["operating_flow"] == 600
+
+    def test_ordinary_duty_points_always_select(self):
+        for flow in (2, 5, 10, 20, 40, 80, 150, 300, 600, 1000):
+            for head in (3, 5, 10, 20, 30, 50, 80, 120):
+                result = pump_selection(flow, head)
+                assert result["selections"] and result["selections"][0]["operating_flow"] >= flow * (1 - 1e-6)
+
+    def test_workflow_runs_with_its_declared_inputs(self):
+        from workflows.services.workflow_service import WorkflowService
+        workflow = WorkflowService.execute_workflow("mechanical_pump_sizing", {"flow_rate": 20, "total_head": 30, "efficiency": 75})
+        results = workflow["results"]
+        assert results["pump_model"].startswith("ES ") and results["pump_power"] > 0
+        assert results["efficiency_target_met"] == (results["pump_efficiency"] >= 75)
+        assert "75% target" in results["compliance"]
+        text = WorkflowService.execute_workflow("mechanical_pump_sizing", {"flow_rate": "20", "total_head": "30", "efficiency": "75"})
+        assert text["results"]["pump_model"] == results["pump_model"]
+
+    def test_calculator_uses_the_built_in_catalog(self):
+        result = MechanicalCalculators.pump_selection(80, 32)
+        assert result["success"] == True
+        best = result["results"]["selections"][0]
+        assert best["model"].startswith("ES ") and best["motor_rating"] >= best["shaft_power_each"]
+        result = MechanicalCalculators.pump_selection(80, 32, arrangements=["staggered"])
+        assert result["success"] == False
+        assert "Unknown pump arrangement" in result["error"]
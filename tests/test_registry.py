@@ -0,0 +1,57 @@
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import ValidationError
+
+from calculators.registry import CALCULATOR_REGISTRY, validate_equation_inputs
+
+
+class TestCalculatorRegistry:
+    """Tests for registry dispatch and generated input models"""
+
+    def test_registers_every_domain(self):
+        assert "electrical_cable_sizing" in CALCULATOR_REGISTRY
+        assert "mechanical_pump_sizing" in CALCULATOR_REGISTRY
+        assert "civil_concrete_volume" in CALCULATOR_REGISTRY
+        assert CALCULATOR_REGISTRY["electrical_cable_sizing"].batch is not None
+
+    def test_inputs_are_coerced_and_metered(self):
+        spec = CALCULATOR_REGISTRY["civil_concrete_volume"]
+        calls = spec.calls
+        result = spec({"length": "2", "width": 1, "depth": 0.5})
+        assert result["success"] == True
+        assert result["results"]["volume"] == 1.0
+        assert spec.calls == calls + 1
+
+    def test_unknown_and_missing_inputs_rejected(self):
+        spec = CALCULATOR_REGISTRY["civil_concrete_volume"]
+        with pytest.raises(ValidationError):
+            spec({"length": 2, "width": 1, "depth": 0.5, "height": 3})
+        with pytest.raises(ValidationError):
+            spec({"length": 2})
+
+    def test_describe_includes_schema(self):
+        description = CALCULATOR_REGISTRY["electrical_voltage_drop"].describe()
+        assert "current" in description["inputs"]
+        assert "current" in description["required"]
+        assert description["vectorized"] == True
+
+    def test_equation_inputs_by_symbol_or_name(self):
+        equation = SimpleNamespace(
+            equation_id="electrical_ohms_law_test",
+            updated_at=None,
+            inputs=[
+                SimpleNamespace(name="voltage", symbol="V", data_type="float", default_value=None,
+                                min_value=0, max_value=1000, description=None),
+                SimpleNamespace(name="current", symbol="I", data_type="float", default_value=None,
+                                min_value=None, max_value=None, description=None),
+            ]
+        )
+        assert validate_equation_inputs(equation, {"voltage": "230", "I": 10}) == {"V": 230.0, "I": 10.0}
+        with pytest.raises(ValidationError):
+            validate_equation_inputs(equation, {"V": 5000})
@@ -0,0 +1,70 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.result_cache import ResultCache, canonical_key
+
+
+class Counter:
+    """Compute callback that records how often it ran"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return dict(self.result)
+
+
+class TestResultCache:
+    """Tests for the two-tier calculator result cache"""
+
+    def test_key_ignores_input_order(self):
+        assert canonical_key("c", "v1", {"a": 1.0, "b": 2.0}) == canonical_key("c", "v1", {"b": 2.0, "a": 1.0})
+        assert canonical_key("c", "v1", {"a": 1.0}) != canonical_key("c", "v2", {"a": 1.0})
+
+    def test_hit_returns_copy_and_counts(self):
+        cache = ResultCache(max_entries=10)
+        compute = Counter({"results": {"x": 1}, "success": True})
+        first = cache.get_or_compute("c", "v1", {"a": 1.0}, compute)
+        first["results"]["x"] = 99
+        second = cache.get_or_compute("c", "v1", {"a": 1.0}, compute)
+        assert compute.calls == 1
+        assert second["results"]["x"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_failures_not_cached(self):
+        cache = ResultCache(max_entries=10)
+        compute = Counter({"error": "bad", "success": False})
+        cache.get_or_compute("c", "v1", {}, compute)
+        cache.get_or_compute("c", "v1", {}, compute)
+        assert compute.calls == 2
+
+    def test_lru_eviction_and_ttl(self, monkeypatch):
+        cache = ResultCache(max_entries=2, ttl=10)
+        for a in (1, 2, 3):
+            cache.get_or_compute("c", "v1", {"a": a}, Counter({"success": True}))
+        assert cache.stats()["entries"] == 2
+        assert cache.get(canonical_key("c", "v1", {"a": 1})) is None
+
+        now = __import__('time').time()
+        monkeypatch.setattr("calculators.services.result_cache.time.time", lambda: now + 11)
+        assert cache.get(canonical_key("c", "v1", {"a": 3})) is None
+
+    def test_sqlite_tier_shared_and_purged(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        writer = ResultCache(max_entries=10, sqlite_path=path)
+        reader = ResultCache(max_entries=10, sqlite_path=path)
+        writer.get_or_compute("c", "v1", {"a": 1.0}, Counter({"results": {"x": 1}, "success": True}))
+
+        compute = Counter({"success": True})
+        assert reader.get_or_compute("c", "v1", {"a": 1.0}, compute)["results"] == {"x": 1}
+        assert compute.calls == 0
+        assert reader.stats()["shared_hits"] == 1
+
+        assert reader.purge_stale({"c": "v2"}) == 1
+        assert reader.shared.size() == 0
@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculators.services.solar_pv import pv_yield, clear_sky_year, decompose, solar_position
+from calculators.services.electrical import ElectricalCalculators
+
+
+class TestSolarPV:
+    """Tests for the hourly PV yield simulation"""
+
+    def test_clear_sky_year_matches_daily_irradiance(self):
+        ghi = clear_sky_year(35, 5.5)
+        assert len(ghi) == 8760
+        assert ghi.sum() / 1000 == pytest.approx(5.5 * 365)
+        assert ghi.min() == 0
+
+    def test_decomposition_conserves_ghi(self):
+        sun = solar_position(45, 8760)
+        ghi = clear_sky_year(45, 4.0) * np.random.default_rng(1).uniform(0.2, 1, 8760)
+        dni, dhi = decompose(ghi, sun["cos_zenith"], sun["extraterrestrial"])
+        day = sun["cos_zenith"] > 0.065
+        assert np.allclose(dni[day] * sun["cos_zenith"][day] + dhi[day], ghi[day])
+        assert np.all(dni >= 0)
+
+    def test_equator_facing_surface_wins(self):
+        north = pv_yield(daily_irradiance=5, latitude=35, tilt=30, azimuth=[0, 90, 180, 270])
+        south = pv_yield(daily_irradiance=5, latitude=-35, tilt=30, azimuth=[0, 90, 180, 270])
+        assert north["best"]["azimuth"] == 180
+        assert south["best"]["azimuth"] == 0
+
+    def test_clipping_grows_with_dc_ac_ratio(self):
+        weather = {"GHI": clear_sky_year(25, 7.0), "Temperature": np.full(8760, 15.0)}
+        result = pv_yield(weather, latitude=25, tilt=25, dc_ac_ratio=[1.0, 1.3, 1.6, 2.0])
+        clipping = [variant["clipping_kwh"] for variant in result["variants"]]
+        assert clipping == sorted(clipping)
+        assert clipping[-1] > 0
+        assert sum(result["monthly_ac_kwh"]) == pytest.approx(result["best"]["ac_kwh"], rel=1e-3)
+
+    def test_sizing_meets_annual_demand(self):
+        result = pv_yield(daily_irradiance=4.5, latitude=20, energy_demand=30, dc_ac_ratio=1.25)
+        assert result["pv_kwp"] * result["best"]["specific_yield"] == pytest.approx(30 * 365, rel=1e-3)
+        assert result["inverter_kw"] == pytest.approx(result["pv_kwp"] / 1.25, abs=0.01)
+
+    def test_full_design_sweep(self):
+        result = pv_yield(daily_irradiance=5, latitude=40, longitude=-105, timezone=-7,
+                          tilt=np.arange(0, 61, 5), azimuth=np.arange(90, 271, 15), dc_ac_ratio=[1.0, 1.1, 1.2, 1.3, 1.4, 1.5])
+        assert len(result["variants"]) == 13 * 13 * 6
+
+    def test_calculator_validates_inputs(self):
+        result = ElectricalCalculators.pv_yield(30, weather={"temp_air": [20.0] * 8760})
+        assert result["success"] == False
+        assert "GHI" in result["error"]
+        assert ElectricalCalculators.pv_yield(30, daily_irradiance=5, module_type="bifacial")["success"] == False
+
+    def test_workflow_runs_with_its_declared_inputs(self):
+        from workflows.services.workflow_service import WorkflowService
+        # electrical_solar_pv_1 declares energy_demand, solar_irradiance and system_losses only; form values arrive as text
+        run = WorkflowService.execute_workflow("electrical_solar_pv_1", {"energy_demand": "40", "solar_irradiance": "5.5", "system_losses": "14"})
+        assert run["results"]["pv_kwp"] > 0
+        assert "default" in run["results"]["compliance"]
+        site = WorkflowService.execute_workflow("electrical_solar_pv_1", {"energy_demand": 40, "solar_irradiance": 5.5, "latitude": 40})
+        assert site["results"]["pv_kwp"] != run["results"]["pv_kwp"]
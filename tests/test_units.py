@@ -0,0 +1,60 @@
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from units import UNITS, normalize_inputs
+from calculators.registry import CALCULATOR_REGISTRY, validate_equation_inputs
+
+
+class TestUnitConverter:
+    """Tests for the precomputed conversion tables"""
+
+    def test_scalar_and_array(self):
+        assert UNITS.convert(1, "ft", "mm") == pytest.approx(304.8)
+        assert UNITS.convert([1, 2], "kV", "V") == [1000.0, 2000.0]
+        assert UNITS.convert(36, "m^3/h", "L/s") == pytest.approx(10.0)
+
+    def test_temperature_offsets(self):
+        assert UNITS.convert(100, "degC", "degF") == pytest.approx(212)
+        assert UNITS.convert(32, "degF", "K") == pytest.approx(273.15)
+
+    def test_incompatible_and_unknown(self):
+        with pytest.raises(ValueError):
+            UNITS.convert(1, "m", "kg")
+        with pytest.raises(ValueError):
+            UNITS.convert(1, "m", "parsec_per_fortnight")
+
+    def test_catalog_units_resolve(self):
+        for unit in ["N*m", "m^4", "N/m", "ohm/m", "ohm*m", "kg/m^3", "W/m*K", "Pa*s", "rad", "-"]:
+            assert UNITS.category_of(unit) is not None
+
+    def test_units_outside_tables_fall_back_to_pint(self):
+        assert UNITS.convert(2, "nautical_mile", "m") == pytest.approx(3704)
+
+
+class TestInputNormalization:
+    """Unit-tagged calculator inputs are converted before validation"""
+
+    def test_normalize_inputs(self):
+        values = normalize_inputs({"length": {"value": 2, "unit": "km"}, "width": 3}, {"length": "m"})
+        assert values == {"length": 2000.0, "width": 3}
+        with pytest.raises(ValueError):
+            normalize_inputs({"width": {"value": 3, "unit": "m"}}, {"length": "m"})
+
+    def test_builtin_calculator_accepts_units(self):
+        spec = CALCULATOR_REGISTRY["civil_concrete_volume"]
+        result = spec({"length": {"value": 1000, "unit": "mm"}, "width": 2, "depth": {"value": 50, "unit": "cm"}})
+        assert result["results"]["volume"] == 1.0
+
+    def test_catalog_equation_accepts_units(self):
+        equation = SimpleNamespace(
+            equation_id="electrical_ohms_law_units",
+            updated_at=None,
+            inputs=[SimpleNamespace(name="voltage", symbol="V", unit="V", data_type="float", default_value=None,
+                                    min_value=None, max_value=None, description=None)]
+        )
+        assert validate_equation_inputs(equation, {"voltage": {"value": 0.4, "unit": "kV"}}) == {"V": 400.0}
@@ -0,0 +1,69 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import workflow_search
+from workflow_database import WorkflowBase
+from workflow_models import Equation, EquationInput, EquationOutput, Workflow, WorkflowInput, WorkflowStep
+
+
+@pytest.fixture
+def db():
+    """In-memory workflow database with a few equations and workflows"""
+    engine = create_engine("sqlite://")
+    WorkflowBase.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    beam = Equation(equation_id="civil_deflection_1", name="Deflection for simply supported beam", equation="d = 5*w*L^4/(384*E*I)", domain="civil")
+    beam.inputs = [EquationInput(name="uniform_load", symbol="w"), EquationInput(name="span", symbol="L")]
+    beam.outputs = [EquationOutput(name="deflection", symbol="d")]
+    ohm = Equation(equation_id="electrical_ohms_law_1", name="Ohm's law", equation="V = I * R", domain="electrical", tags=["circuits"])
+    ohm.inputs = [EquationInput(name="current", symbol="I"), EquationInput(name="resistance", symbol="R")]
+    cable = Workflow(workflow_id="electrical_cable_sizing_1", title="Cable Sizing", description="Size feeders for load and voltage drop", domain="electrical")
+    cable.inputs = [WorkflowInput(name="design_current")]
+    cable.steps = [WorkflowStep(step_number=1, name="Check voltage drop")]
+    session.add_all([beam, ohm, cable])
+    session.commit()
+
+    workflow_search._synced.clear()
+    workflow_search._vocabulary.clear()
+    workflow_search.sync_search_index(session)
+    yield session
+    session.close()
+    workflow_search._synced.clear()
+    workflow_search._vocabulary.clear()
+
+
+class TestWorkflowSearch:
+    """Tests for the FTS5 equation/workflow search index"""
+
+    def test_prefix_and_variable_match(self, db):
+        assert [r["id"] for r in workflow_search.search(db, "equations", "defl")["results"]] == ["civil_deflection_1"]
+        assert [r["id"] for r in workflow_search.search(db, "equations", "span load")["results"]] == ["civil_deflection_1"]
+        assert workflow_search.search(db, "equations", "circuits")["count"] == 1
+
+    def test_typo_tolerance(self, db):
+        result = workflow_search.search(db, "workflows", "voltage drp cabel")
+        assert result["results"][0]["id"] == "electrical_cable_sizing_1"
+        assert result["corrections"]["cabel"] == ["cable"]
+
+    def test_domain_filter(self, db):
+        assert workflow_search.search(db, "equations", "ohm", domain="civil")["count"] == 0
+        assert workflow_search.search(db, "equations", "ohm", domain="electrical")["count"] == 1
+
+    def test_incremental_update_and_delete(self, db):
+        ohm = db.query(Equation).filter_by(equation_id="electrical_ohms_law_1").first()
+        ohm.name = "Ohm's law - power"
+        workflow_search.index_equation(db, ohm)
+        assert workflow_search.search(db, "equations", "power")["count"] == 1
+
+        db.delete(ohm)
+        db.commit()
+        workflow_search.sync_search_index(db)
+        assert workflow_search.search(db, "equations", "ohm")["count"] == 0
@@ -0,0 +1,13 @@
+"""
+Unit Conversion Service
+Precomputed conversion tables for calculator inputs and the /units API.
+"""
+
+from units.converter import UNITS, UNIT_CATEGORIES, UnitConverter, normalize_inputs
+
+__all__ = [
+    "UNITS",
+    "UNIT_CATEGORIES",
+    "UnitConverter",
+    "normalize_inputs"
+]
@@ -0,0 +1,177 @@
+"""
+Unit Converter
+Conversion factors for every supported unit, precomputed with pint when the module
+loads and stored as dense scale/offset matrices per category, so converting a value
+or an array at request time is a table lookup and a multiply-add.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+import pint
+
+# category -> units; the first unit is the category's base unit
+UNIT_CATEGORIES: Dict[str, List[str]] = {
+    "length": ["m", "mm", "cm", "km", "in", "ft", "yd", "mi"],
+    "area": ["m^2", "mm^2", "cm^2", "km^2", "ha", "in^2", "ft^2", "acre"],
+    "volume": ["m^3", "L", "mL", "ft^3", "gal", "imp_gal"],
+    "flow_rate": ["m^3/s", "m^3/h", "L/s", "L/min", "gal/min", "ft^3/min"],
+    "velocity": ["m/s", "km/h", "ft/s", "ft/min", "mph"],
+    "acceleration": ["m/s^2", "ft/s^2", "g0"],
+    "mass": ["kg", "g", "t", "lb"],
+    "density": ["kg/m^3", "g/cm^3", "lb/ft^3"],
+    "force": ["N", "kN", "MN", "lbf", "kip", "kgf"],
+    "linear_load": ["N/m", "kN/m", "lbf/ft", "kip/ft"],
+    "moment": ["N*m", "kN*m", "lbf*ft", "kip*ft"],
+    "pressure": ["Pa", "kPa", "MPa", "GPa", "N/mm^2", "bar", "mbar", "psi", "ksi", "atm", "mmHg"],
+    "energy": ["J", "kJ", "MJ", "Wh", "kWh", "BTU", "kcal"],
+    "power": ["W", "kW", "MW", "hp", "BTU/h", "TR"],
+    "apparent_power": ["VA", "kVA", "MVA"],
+    "voltage": ["V", "mV", "kV"],
+    "current": ["A", "mA", "kA"],
+    "resistance": ["ohm", "mohm", "kohm"],
+    "resistance_per_length": ["ohm/m", "ohm/km", "mohm/m"],
+    "resistivity": ["ohm*m", "ohm*cm", "ohm*mm^2/m"],
+    "temperature": ["K", "degC", "degF"],
+    "second_moment_of_area": ["m^4", "mm^4", "cm^4", "in^4"],
+    "thermal_conductivity": ["W/m*K", "BTU/h*ft*F"],
+    "dynamic_viscosity": ["Pa*s", "mPa*s", "cP", "P"],
+    "angle": ["rad", "deg"],
+    "time": ["s", "min", "h", "day"],
+    "dimensionless": ["-", "%"],
+}
+
+# Labels used by the catalog/UI that pint spells differently
+_PINT_NAMES = {
+    "imp_gal": "imperial_gallon",
+    "g0": "standard_gravity",
+    "t": "metric_ton",
+    "TR": "ton_of_refrigeration",
+    "VA": "V*A",
+    "kVA": "kV*A",
+    "MVA": "MV*A",
+    "mohm": "milliohm",
+    "kohm": "kiloohm",
+    "mohm/m": "milliohm/m",
+    "W/m*K": "W/(m*K)",
+    "BTU/h*ft*F": "BTU/(h*ft*delta_degF)",
+    "P": "poise",
+    "-": "dimensionless",
+    "%": "percent",
+}
+
+_registry = pint.UnitRegistry()
+
+
+def _scale_offset(label: str, base: str) -> Tuple[float, float]:
+    """
+    Affine map label -> base: value_in_base = value * scale + offset (offset is non-zero for temperatures)
+    """
+    unit = _PINT_NAMES.get(label, label)
+    base_unit = _PINT_NAMES.get(base, base)
+    zero = _registry.Quantity(0.0, unit).to(base_unit).magnitude
+    one = _registry.Quantity(1.0, unit).to(base_unit).magnitude
+    return one - zero, zero
+
+
+class UnitCategory:
+    """
+    Units of one physical quantity with their pairwise conversion matrices
+    """
+
+    __slots__ = ("name", "units", "index", "scale", "offset")
+
+    def __init__(self, name: str, units: List[str]):
+        self.name = name
+        self.units = units
+        self.index = {unit: i for i, unit in enumerate(units)}
+        pairs = np.array([_scale_offset(unit, units[0]) for unit in units])
+        to_base_scale, to_base_offset = pairs[:, 0], pairs[:, 1]
+        # x_j = x_i * scale[i, j] + offset[i, j]
+        self.scale = to_base_scale[:, None] / to_base_scale[None, :]
+        self.offset = (to_base_offset[:, None] - to_base_offset[None, :]) / to_base_scale[None, :]
+
+    @property
+    def base(self) -> str:
+        return self.units[0]
+
+
+class UnitConverter:
+    """
+    Converts scalars and arrays between compatible units
+    """
+
+    def __init__(self, categories: Dict[str, List[str]] = UNIT_CATEGORIES):
+        self.categories = {name: UnitCategory(name, units) for name, units in categories.items()}
+        self.units: Dict[str, Tuple[UnitCategory, int]] = {}
+        for category in self.categories.values():
+            for unit, i in category.index.items():
+                self.units.setdefault(unit, (category, i))
+
+    def category_of(self, unit: str) -> Optional[str]:
+        entry = self.units.get(unit)
+        return entry[0].name if entry else None
+
+    def factors(self, from_unit: str, to_unit: str) -> Tuple[float, float, str]:
+        """
+        (scale, offset, category) such that converted = value * scale + offset
+        """
+        source = self.units.get(from_unit)
+        target = self.units.get(to_unit)
+        if source is None or target is None:
+            return _fallback_factors(from_unit, to_unit)
+        if source[0] is not target[0]:
+            raise ValueError(f"Cannot convert {source[0].name} ({from_unit}) to {target[0].name} ({to_unit})")
+        category, i = source
+        j = target[1]
+        return float(category.scale[i, j]), float(category.offset[i, j]), category.name
+
+    def convert(self, value: Union[float, List[float]], from_unit: str, to_unit: str) -> Union[float, List[float]]:
+        """
+        Convert a scalar or a list (any nesting) of values
+        """
+        if from_unit == to_unit:
+            return value
+        scale, offset, _ = self.factors(from_unit, to_unit)
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return (np.asarray(value, dtype=float) * scale + offset).tolist()
+        return float(value) * scale + offset
+
+    def describe(self) -> Dict[str, Any]:
+        return {name: {"base": c.base, "units": c.units} for name, c in self.categories.items()}
+
+
+@lru_cache(maxsize=1024)
+def _fallback_factors(from_unit: str, to_unit: str) -> Tuple[float, float, str]:
+    """
+    Units outside the precomputed tables are parsed by pint once per pair
+    """
+    try:
+        source = _registry.Unit(_PINT_NAMES.get(from_unit, from_unit))
+        target = _registry.Unit(_PINT_NAMES.get(to_unit, to_unit))
+    except Exception:
+        raise ValueError(f"Unknown unit in conversion {from_unit} -> {to_unit}")
+    if source.dimensionality != target.dimensionality:
+        raise ValueError(f"Cannot convert {from_unit} to {to_unit}")
+    scale, offset = _scale_offset(from_unit, to_unit)
+    return scale, offset, str(source.dimensionality)
+
+
+UNITS = UnitConverter()
+
+
+def normalize_inputs(inputs: Dict[str, Any], expected_units: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Replace {"value": ..., "unit": ...} inputs with plain values in the expected unit;
+    other inputs pass through unchanged
+    """
+    normalized = {}
+    for key, value in inputs.items():
+        if isinstance(value, dict) and "unit" in value:
+            expected = expected_units.get(key)
+            if not expected:
+                raise ValueError(f"Input '{key}' does not accept a unit")
+            value = UNITS.convert(value.get("value"), value["unit"], expected)
+        normalized[key] = value
+    return normalized
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Union
+
+from units.converter import UNITS
+
+router = APIRouter(prefix="/units", tags=["units"])
+
+class ConversionRequest(BaseModel):
+    value: Union[float, List[float]]
+    from_unit: str
+    to_unit: str
+
+@router.get("/")
+async def get_units():
+    """List unit categories with their base and supported units"""
+    return UNITS.describe()
+
+@router.post("/convert")
+async def convert_units(request: ConversionRequest):
+    """Convert a scalar or an array of values between compatible units"""
+    try:
+        scale, offset, category = UNITS.factors(request.from_unit, request.to_unit)
+        return {
+            "value": UNITS.convert(request.value, request.from_unit, request.to_unit),
+            "from_unit": request.from_unit,
+            "to_unit": request.to_unit,
+            "category": category,
+            "factor": scale,
+            "offset": offset
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,257 @@
+"""
+Workflow Search Index
+SQLite FTS5 index over equations and workflows in the workflow database:
+name/title, description, tags, and variable names and symbols. Results are
+ranked with BM25, every term is matched as a prefix, and terms that match
+nothing are swapped for their closest indexed words to tolerate typos.
+
+The index is updated row by row by the migration scripts and synced on first
+use from updated_at, so it never needs a full rebuild at request time.
+Run this module directly to rebuild it.
+"""
+
+import difflib
+import re
+import threading
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, selectinload
+
+from workflow_models import Equation, Workflow
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# kind -> (FTS table, id column, name column, column weights for bm25 in declaration order)
+SEARCH_TABLES = {
+    "equations": ("equation_search", "equation_id", "name", (0.0, 10.0, 2.0, 5.0, 3.0, 0.0)),
+    "workflows": ("workflow_search", "workflow_id", "title", (0.0, 10.0, 2.0, 5.0, 3.0, 0.0)),
+}
+
+_vocabulary: Dict[str, set] = {}
+_synced = set()
+_lock = threading.Lock()
+
+
+def _words(*values: Any) -> str:
+    """
+    Flatten values (strings, tag lists, snake_case names) into space separated words
+    """
+    parts = []
+    for value in values:
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            parts.append(_words(*value))
+        else:
+            parts.append(str(value).replace("_", " "))
+    return " ".join(parts)
+
+
+def is_supported(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def ensure_schema(db: Session):
+    """
+    Create the FTS5 tables and sync bookkeeping if they do not exist yet
+    """
+    for table, id_column, name_column, _ in SEARCH_TABLES.values():
+        db.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"{id_column} UNINDEXED, {name_column}, description, tags, variables, domain UNINDEXED, "
+            f"tokenize='porter unicode61', prefix='2 3')"
+        ))
+    db.execute(text(
+        "CREATE TABLE IF NOT EXISTS search_index_state (kind TEXT PRIMARY KEY, synced_at TEXT)"
+    ))
+
+
+def index_equation(db: Session, equation: Equation):
+    """
+    Insert or replace one equation in the index; call after its inputs/outputs are saved
+    """
+    variables = _words(
+        [v.name for v in equation.inputs], [v.symbol for v in equation.inputs],
+        [v.name for v in equation.outputs], [v.symbol for v in equation.outputs]
+    )
+    _replace(db, "equations", equation.id, equation.equation_id, equation.name, equation.description,
+             _words(equation.tags, equation.category.name if equation.category else None), variables, equation.domain)
+
+
+def index_workflow(db: Session, workflow: Workflow):
+    """
+    Insert or replace one workflow in the index; call after its inputs/outputs/steps are saved
+    """
+    variables = _words(
+        [v.name for v in workflow.inputs], [v.name for v in workflow.outputs], [s.name for s in workflow.steps]
+    )
+    _replace(db, "workflows", workflow.id, workflow.workflow_id, workflow.title, workflow.description,
+             _words(workflow.tags, workflow.category.name if workflow.category else None), variables, workflow.domain)
+
+
+def _replace(db: Session, kind: str, rowid: int, item_id: str, name: str, description: Optional[str], tags: str, variables: str, domain: str):
+    table, id_column, name_column, _ = SEARCH_TABLES[kind]
+    # FTS rowids mirror the source primary keys so replacing a row is a keyed delete
+    db.execute(text(f"DELETE FROM {table} WHERE rowid = :rowid"), {"rowid": rowid})
+    db.execute(
+        text(f"INSERT INTO {table} (rowid, {id_column}, {name_column}, description, tags, variables, domain) "
+             f"VALUES (:rowid, :id, :name, :description, :tags, :variables, :domain)"),
+        {"rowid": rowid, "id": item_id, "name": name or "", "description": description or "", "tags": tags,
+         "variables": variables, "domain": domain}
+    )
+    vocabulary = _vocabulary.get(kind)
+    if vocabulary is not None:
+        vocabulary.update(_WORD.findall(f"{name} {description} {tags} {variables}".lower()))
+
+
+def sync_search_index(db: Session) -> Dict[str, int]:
+    """
+    Reindex rows changed since the last sync and drop rows that no longer exist
+    """
+    ensure_schema(db)
+    counts = {}
+    for kind, model, loader, indexer in (
+        ("equations", Equation, (selectinload(Equation.inputs), selectinload(Equation.outputs), selectinload(Equation.category)), index_equation),
+        ("workflows", Workflow, (selectinload(Workflow.inputs), selectinload(Workflow.outputs), selectinload(Workflow.steps), selectinload(Workflow.category)), index_workflow),
+    ):
+        table = SEARCH_TABLES[kind][0]
+        synced_at = db.execute(text("SELECT synced_at FROM search_index_state WHERE kind = :kind"), {"kind": kind}).scalar()
+        latest = db.execute(text(f"SELECT MAX(updated_at) FROM {model.__tablename__}")).scalar()
+
+        query = db.query(model).options(*loader)
+        if synced_at is not None:
+            query = query.filter(text(f"{model.__tablename__}.updated_at > :synced_at")).params(synced_at=synced_at)
+        rows = query.all()
+        for row in rows:
+            indexer(db, row)
+
+        db.execute(text(
+            f"DELETE FROM {table} WHERE rowid NOT IN (SELECT id FROM {model.__tablename__})"
+        ))
+        db.execute(
+            text("INSERT OR REPLACE INTO search_index_state (kind, synced_at) VALUES (:kind, :synced_at)"),
+            {"kind": kind, "synced_at": latest}
+        )
+        counts[kind] = len(rows)
+    db.commit()
+    return counts
+
+
+def _ensure_ready(db: Session):
+    """
+    Sync once per process before the first search
+    """
+    if len(_synced) == len(SEARCH_TABLES):
+        return
+    with _lock:
+        if len(_synced) < len(SEARCH_TABLES):
+            sync_search_index(db)
+            _synced.update(SEARCH_TABLES)
+
+
+def _load_vocabulary(db: Session, kind: str) -> set:
+    vocabulary = _vocabulary.get(kind)
+    if vocabulary is None:
+        table, _, name_column, _ = SEARCH_TABLES[kind]
+        vocabulary = set()
+        for row in db.execute(text(f"SELECT {name_column}, description, tags, variables FROM {table}")):
+            vocabulary.update(_WORD.findall(" ".join(row).lower()))
+        _vocabulary[kind] = vocabulary
+    return vocabulary
+
+
+def _correct(term: str, vocabulary: set) -> List[str]:
+    """
+    Closest indexed words for a term that matches nothing as a prefix
+    """
+    if len(term) < 3 or any(word.startswith(term) for word in vocabulary):
+        return [term]
+    candidates = [word for word in vocabulary if abs(len(word) - len(term)) <= 2]
+    return difflib.get_close_matches(term, candidates, n=3, cutoff=0.75) or [term]
+
+
+def _match_expression(groups: List[List[str]]) -> str:
+    clauses = []
+    for group in groups:
+        options = [f'"{term}"*' for term in group]
+        clauses.append(options[0] if len(options) == 1 else "(" + " OR ".join(options) + ")")
+    return " AND ".join(clauses)
+
+
+def search(db: Session, kind: str, query: str, domain: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+    """
+    Ranked search over equations or workflows
+    """
+    terms = _WORD.findall(query.lower())
+    if not terms:
+        return {"query": query, "results": [], "count": 0, "corrections": {}}
+
+    table, id_column, name_column, weights = SEARCH_TABLES[kind]
+    if not is_supported(db):
+        return _search_like(db, kind, terms, domain, limit)
+
+    _ensure_ready(db)
+    sql = (
+        f"SELECT {id_column}, {name_column}, description, domain, bm25({table}, {', '.join(map(str, weights))}) AS score "
+        f"FROM {table} WHERE {table} MATCH :match"
+        + (" AND domain = :domain" if domain else "")
+        + " ORDER BY score LIMIT :limit"
+    )
+
+    def run(groups):
+        params = {"match": _match_expression(groups), "limit": limit, "domain": domain}
+        return db.execute(text(sql), params).fetchall()
+
+    corrections = {}
+    rows = run([[term] for term in terms])
+    if not rows:
+        vocabulary = _load_vocabulary(db, kind)
+        groups = [_correct(term, vocabulary) for term in terms]
+        corrections = {term: group for term, group in zip(terms, groups) if group != [term]}
+        if corrections:
+            rows = run(groups)
+
+    return {
+        "query": query,
+        "results": [
+            {"id": row[0], "name": row[1], "description": row[2] or None, "domain": row[3], "score": round(-row[4], 4)}
+            for row in rows
+        ],
+        "count": len(rows),
+        "corrections": corrections
+    }
+
+
+def _search_like(db: Session, kind: str, terms: List[str], domain: Optional[str], limit: int) -> Dict[str, Any]:
+    """
+    Substring fallback for non-SQLite workflow databases
+    """
+    model, id_attr, name_attr = (Equation, "equation_id", "name") if kind == "equations" else (Workflow, "workflow_id", "title")
+    query = db.query(model)
+    for term in terms:
+        query = query.filter(getattr(model, name_attr).ilike(f"%{term}%"))
+    if domain:
+        query = query.filter(model.domain == domain)
+    rows = query.limit(limit).all()
+    return {
+        "query": " ".join(terms),
+        "results": [
+            {"id": getattr(row, id_attr), "name": getattr(row, name_attr), "description": row.description, "domain": row.domain, "score": None}
+            for row in rows
+        ],
+        "count": len(rows),
+        "corrections": {}
+    }
+
+
+if __name__ == "__main__":
+    from workflow_database import get_workflow_db
+
+    db = next(get_workflow_db())
+    try:
+        ensure_schema(db)
+        db.execute(text("DELETE FROM search_index_state"))
+        print(f"Search index rebuilt: {sync_search_index(db)}")
+    finally:
+        db.close()
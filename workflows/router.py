@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from database import get_db
 from workflow_database import get_workflow_db
+import workflow_search
 from workflow_models import Workflow, WorkflowCategory, WorkflowInput, WorkflowOutput, WorkflowStep
+from workflows.services.workflow_service import WorkflowService
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
@@ -39,6 +41,16 @@ async def get_all_workflows(db: Session = Depends(get_workflow_db)):
     
     return result
 
+@router.get("/search")
+async def search_workflows(
+    q: str,
+    domain: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_workflow_db)
+):
+    """Ranked full-text search over workflows (prefix and typo tolerant)"""
+    return workflow_search.search(db, "workflows", q, domain, limit)
+
 @router.get("/{domain}")
 async def get_workflows_by_domain(domain: str, db: Session = Depends(get_workflow_db)):
     """Get workflows for a specific domain with category hierarchy"""
@@ -195,5 +207,9 @@ async def execute_workflow(workflow_id: str, request: WorkflowExecutionRequest,
         # Simulate workflow execution
         result = WorkflowService.execute_workflow(workflow_id, request.inputs)
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,8 @@
 import json
+import math
 import os
 import re
+from typing import Dict, Any
 from sqlalchemy.orm import Session
 from workflow_models import Workflow, WorkflowCategory, WorkflowInput, WorkflowOutput, WorkflowStep, Equation, EquationInput, EquationOutput
 
@@ -121,14 +123,62 @@ class WorkflowService:
         # Simulate workflow execution based on workflow type
         if domain == 'civil':
             if normalized_id == 'civil_earthworks' or workflow_id == 'civil_earthworks_volume':
-                results['cut_volume'] = 1250
-                results['fill_volume'] = 1180
-                results['net_balance'] = -70
-                results['compliance'] = 'Quantity survey completed successfully'
+                from calculators.services.earthworks import earthworks
+                if not inputs.get('surface_data') or inputs.get('design_levels') is None:
+                    raise ValueError("Earthworks requires 'surface_data' (survey points [x, y, z]) and 'design_levels' (a level, plane or design points)")
+                options = {key: inputs[key] for key in ('cell_size', 'method') if inputs.get(key) is not None}
+                if 'cell_size' in options:
+                    options['cell_size'] = float(options['cell_size'])
+                design = inputs['design_levels']
+                if isinstance(design, str):
+                    # A level typed as text, or a plane/point list sent as JSON text
+                    try:
+                        design = float(design)
+                    except ValueError:
+                        try:
+                            design = json.loads(design)
+                        except ValueError:
+                            raise ValueError(f"'design_levels' must be a level (m), a plane or design points, not '{design}'")
+                volumes = earthworks(inputs['surface_data'], design, bulking=float(inputs.get('bulking_factor') or 1.25),
+                                     shrinkage=float(inputs.get('shrink_factor') or 0.9), include_heatmap=True, **options)
+                results['cut_volume'] = volumes['cut_volume']
+                results['fill_volume'] = volumes['fill_volume']
+                results['net_balance'] = volumes['net_balance']
+                results['import_volume'] = volumes['import_volume']
+                results['export_volume'] = volumes['export_volume']
+                results['heatmap'] = volumes['heatmap']
+                results['compliance'] = f"Cut/fill by triangular prisms over {volumes['area']} m² of {volumes['cell_size']:g} m grid cells"
+            elif normalized_id == 'civil_beam_analysis':
+                from calculators.services.frame_analysis import continuous_beam
+                span = inputs.get('span_m', inputs.get('spans'))
+                if not span:
+                    raise ValueError("Beam analysis requires 'span_m' (m), a single span or a list of spans")
+                spans = [float(value) for value in (span if isinstance(span, (list, tuple)) else [span])]
+                point_loads = [{"span": 1, "P": float(inputs['point_load_kn'])}] if inputs.get('point_load_kn') else None
+                # Section defaults to a steel IPE 300
+                section = {"I": float(inputs.get('moment_of_inertia_m4', 8.356e-5)), "A": float(inputs.get('area_m2', 5.381e-3))}
+                options = {key: inputs[key] for key in ('live_load', 'supports', 'material', 'dead_factor', 'live_factor') if inputs.get(key) is not None}
+                beam = continuous_beam(spans, float(inputs.get('distributed_load_kn_m', 0)), point_loads=point_loads, section=section, **options)
+                governing = max(abs(beam['max_moment']), abs(beam['min_moment']))
+                results['max_moment_knm'] = governing
+                results['max_shear_kn'] = beam['max_shear']
+                results['max_deflection_mm'] = beam['max_deflection_mm']
+                results['support_moments_knm'] = [support['min_moment'] for support in beam['supports']]
+                if inputs.get('material_fy_mpa'):
+                    results['required_section_modulus_cm3'] = round(governing / float(inputs['material_fy_mpa']) * 1000, 1)
+                results['compliance'] = f"Stiffness analysis of {len(spans)} span(s) over {len(beam['combinations'])} load pattern(s)"
             elif normalized_id == 'civil_rebar_takeoff' or workflow_id == 'civil_rebar_takeoff':
-                results['bar_count'] = 245
-                results['bar_length'] = 490
-                results['total_weight'] = 1250
+                from calculators.services.bar_schedule import bar_schedule
+                if not isinstance(inputs.get('member_geometry'), list) or not inputs['member_geometry']:
+                    raise ValueError("Rebar takeoff requires 'member_geometry': bar rows with 'diameter', 'shape', 'A'..'D' (mm), 'bars' and 'members'")
+                options = {key: inputs[key] for key in ('stock_lengths', 'rounding') if inputs.get(key) is not None}
+                if inputs.get('laps') is not None:
+                    options['lap'] = float(inputs['laps'])
+                takeoff = bar_schedule(inputs['member_geometry'], include_rows=False, **options)
+                results['bar_count'] = takeoff['total_bars']
+                results['bar_length'] = round(sum(row['total_length'] for row in takeoff['diameters']), 2)
+                results['total_weight'] = takeoff['total_weight']
+                results['stock_bars'] = {f"{row['diameter']:g}": row['cutting']['stock_bars'] for row in takeoff['diameters']}
                 results['compliance'] = 'Rebar quantities calculated'
             elif normalized_id == 'civil_slab_design' or workflow_id == 'civil_slab_design':
                 results['slab_thickness'] = 150
@@ -136,10 +186,22 @@ class WorkflowService:
                 results['deflection_ratio'] = 0.003
                 results['compliance'] = 'Deflection within limits (L/250)'
             elif normalized_id == 'civil_column_design' or workflow_id == 'civil_column_design':
-                results['rebar_ratio'] = 0.018
-                results['bar_layout'] = '12-D16'
-                results['utilization'] = 0.92
-                results['compliance'] = 'Column section adequate'
+                from calculators.services.column_interaction import select_reinforcement
+                if inputs.get('axial_load') is None or not inputs.get('section_dims'):
+                    raise ValueError("Column design requires 'axial_load' (kN) and 'section_dims' ({'b', 'h'} or {'diameter'} in mm)")
+                section = inputs['section_dims']
+                if isinstance(section, str):
+                    b, h = (float(value) for value in re.split(r"\s*[x×*]\s*", section.strip().lower()))
+                    section = {"b": b, "h": h}
+                moment = inputs.get('moment') or 0
+                mx, my = (moment.get('Mx', 0), moment.get('My', 0)) if isinstance(moment, dict) else (moment, 0)
+                strengths = inputs.get('material_strengths') or {}
+                design = select_reinforcement(section, inputs['axial_load'], mx, my, float(strengths.get('fck', 25)), float(strengths.get('fy', 415)),
+                                              inputs.get('design_code', 'IS456'))
+                results['rebar_ratio'] = design['steel_ratio']
+                results['bar_layout'] = f"{design['bar_count']}-D{design['bar_diameter']}"
+                results['utilization'] = design['utilization']
+                results['compliance'] = 'Column section adequate (P-M interaction)'
             elif normalized_id == 'civil_footing_sizing' or workflow_id == 'civil_footing_sizing':
                 results['footing_area'] = 4.5
                 results['thickness'] = 600
@@ -189,50 +251,235 @@ class WorkflowService:
                 results['interrupting_rating'] = 25
                 results['compliance'] = 'Equipment rating sufficient'
             elif normalized_id == 'electrical_lighting_layout' or workflow_id == 'electrical_lighting_layout':
-                results['fixture_count'] = 12
-                results['spacing'] = 4.5
-                results['compliance'] = 'Lighting levels meet EN 12464'
+                from calculators.services.lighting import optimize_layout
+                if not inputs.get('fixture_lumens') or not (inputs.get('area') or (inputs.get('length') and inputs.get('width'))):
+                    raise ValueError("Lighting layout requires 'fixture_lumens' and the room 'area' (or 'length' and 'width')")
+                # Without room dimensions the area is treated as a square room
+                length = float(inputs.get('length') or float(inputs['area']) ** 0.5)
+                width = float(inputs.get('width') or float(inputs['area']) / length)
+                options = {key: inputs[key] for key in ('task', 'distribution') if inputs.get(key) not in (None, '')}
+                for key in ('target_lux', 'target_uniformity', 'mounting_height', 'work_plane_height', 'maintenance_factor'):
+                    if inputs.get(key) not in (None, ''):
+                        options[key] = float(inputs[key])
+                layout = optimize_layout(length, width, float(inputs['fixture_lumens']), **options)
+                results['fixture_count'] = layout['fixture_count']
+                results['spacing'] = max(layout['spacing_x'], layout['spacing_y'])
+                results['layout'] = f"{layout['columns']} x {layout['rows']}"
+                results['average_lux'] = layout['average_lux']
+                results['uniformity'] = layout['uniformity']
+                results['compliance'] = f"Lighting levels meet EN 12464-1 ({layout['average_lux']} lx, U0 {layout['uniformity']})"
+                if inputs.get('utilization_factor') not in (None, ''):
+                    # Lumen method cross-check, N = E A / (Φ UF MF), with the utilization factor as a fraction or percent
+                    utilization = float(inputs['utilization_factor'])
+                    utilization = utilization / 100 if utilization > 1 else utilization
+                    if utilization <= 0:
+                        raise ValueError("'utilization_factor' must be positive")
+                    lumen_count = math.ceil(layout['target_lux'] * length * width
+                                            / (float(inputs['fixture_lumens']) * utilization * options.get('maintenance_factor', 0.8)))
+                    results['lumen_method_count'] = lumen_count
+                    results['compliance'] += f"; lumen method with UF {utilization:g} gives {lumen_count} fixtures"
             elif normalized_id == 'electrical_grounding' or workflow_id == 'electrical_grounding':
-                results['ground_conductor_size'] = 50
-                results['estimated_resistance'] = 0.8
-                results['compliance'] = 'Ground resistance within 1Ω limit'
+                from calculators.services.earthing_grid import earthing_grid
+                if not inputs.get('fault_current') or not inputs.get('soil_resistivity'):
+                    raise ValueError("Grounding design requires 'fault_current' (A) and 'soil_resistivity' (Ω·m) inputs")
+                options = {key: inputs[key] for key in ('along_length', 'along_width', 'depth', 'rod_count', 'rod_length', 'fault_time', 'split_factor', 'surface_resistivity', 'material') if inputs.get(key) is not None}
+                if str(inputs.get('electrode_type', 'grid')).lower() in ('rod', 'rods', 'earth_rod'):
+                    # A single driven rod, top at the burial depth
+                    depth, rod_length = float(inputs.get('depth', 0.5)), float(inputs.get('rod_length', 3.0))
+                    options = {key: value for key, value in options.items() if key in ('fault_time', 'split_factor', 'surface_resistivity', 'material')}
+                    options['conductors'] = [{'start': [0, 0, depth], 'end': [0, 0, depth + rod_length], 'diameter': 0.016}]
+                    options['segment_length'] = rod_length / 10
+                grid = earthing_grid(float(inputs.get('length', 20)), float(inputs.get('width', 20)), float(inputs['fault_current']), float(inputs['soil_resistivity']), **options)
+                limit = float(inputs.get('max_resistance', 1.0))
+                results['ground_conductor_size'] = grid['recommended_conductor']
+                results['estimated_resistance'] = grid['grid_resistance']
+                results['gpr'] = grid['gpr']
+                results['max_touch_voltage'] = grid['max_touch_voltage']
+                results['max_step_voltage'] = grid['max_step_voltage']
+                results['tolerable_touch_voltage'] = grid['tolerable_touch_voltage']
+                results['tolerable_step_voltage'] = grid['tolerable_step_voltage']
+                checks = [f"resistance {'within' if grid['grid_resistance'] <= limit else 'above'} {limit} Ω limit",
+                          f"touch voltage {'within' if grid['touch_ok'] else 'exceeds'} IEEE 80 limit",
+                          f"step voltage {'within' if grid['step_ok'] else 'exceeds'} IEEE 80 limit"]
+                results['compliance'] = 'Ground ' + ', '.join(checks)
             elif normalized_id == 'electrical_transformer_sizing' or workflow_id == 'electrical_transformer_sizing':
                 results['transformer_kva'] = 160
                 results['loading_pct'] = 75
                 results['compliance'] = 'Transformer sizing complete'
             elif normalized_id == 'electrical_solar_pv' or workflow_id == 'electrical_solar_pv':
-                results['pv_kwp'] = 15
-                results['inverter_kw'] = 12
-                results['compliance'] = 'PV system sized for daily consumption'
+                from calculators.services.solar_pv import LATITUDE, pv_yield
+                if not inputs.get('energy_demand'):
+                    raise ValueError("Solar PV sizing requires 'energy_demand' (kWh/day)")
+                irradiance = inputs.get('solar_irradiance')
+                if irradiance is not None and not isinstance(irradiance, list):
+                    irradiance = float(irradiance)
+                # solar_irradiance is either an average daily value (kWh/m²/day) or an hourly GHI series (W/m²)
+                weather = inputs.get('weather') or ({'ghi': irradiance} if isinstance(irradiance, list) else None)
+                options = {key: inputs[key] for key in ('longitude', 'timezone', 'tilt', 'azimuth', 'dc_ac_ratio', 'system_losses', 'module_type', 'mounting', 'albedo') if inputs.get(key) is not None}
+                latitude = float(inputs['latitude']) if inputs.get('latitude') is not None else LATITUDE
+                if 'system_losses' in options:
+                    options['system_losses'] = float(options['system_losses'])
+                pv = pv_yield(weather, latitude, daily_irradiance=None if weather else irradiance,
+                              energy_demand=float(inputs['energy_demand']), **options)
+                results['pv_kwp'] = pv['pv_kwp']
+                results['inverter_kw'] = pv['inverter_kw']
+                results['annual_yield_kwh'] = round(pv['best']['specific_yield'] * pv['pv_kwp'])
+                results['specific_yield'] = pv['best']['specific_yield']
+                results['best_configuration'] = pv['best']
+                results['monthly_yield_kwh'] = [round(month * pv['pv_kwp'], 1) for month in pv.get('monthly_ac_kwh', [])]
+                site = f"latitude {latitude:g}°" + ("" if inputs.get('latitude') is not None else " (default, give 'latitude' for the site)")
+                results['compliance'] = f"PV system sized for daily consumption from {pv['weather_source']} at {site}"
             elif normalized_id == 'electrical_motor_starting':
                 results['starting_current'] = 350
                 results['voltage_dip'] = 8.5
                 results['compliance'] = 'Motor starting analysis completed'
             elif normalized_id == 'electrical_harmonics':
-                results['thd'] = 12.5
-                results['filter_size'] = 150
-                results['compliance'] = 'Harmonic distortion within limits'
+                from analytics.harmonics import HarmonicAnalysisService, estimated_waveforms
+                options = {key: inputs[key] for key in ('frequency', 'nominal_voltage', 'load_current', 'short_circuit_current', 'channel_types') if inputs.get(key) is not None}
+                if inputs.get('samples') and inputs.get('sample_rate'):
+                    analysis = HarmonicAnalysisService.analyze_samples(inputs['samples'], float(inputs['sample_rate']), **options)
+                elif inputs.get('nonlinear_loads'):
+                    # No recording: synthesize one window from typical spectra of the declared loads
+                    estimate = estimated_waveforms(inputs.get('load_profile'), inputs['nonlinear_loads'], inputs.get('system_impedance'),
+                                                   float(inputs.get('frequency', 50)), float(inputs.get('nominal_voltage', 0.4)))
+                    options.setdefault('load_current', estimate['load_current'])
+                    options.setdefault('short_circuit_current', estimate['short_circuit_current'])
+                    analysis = HarmonicAnalysisService.analyze_samples(estimate['samples'], estimate['sample_rate'], **options)
+                else:
+                    raise ValueError("Harmonic analysis requires 'nonlinear_loads' (kW, with 'load_profile' and 'system_impedance' %), or recorded 'samples' ({channel: [values]}) with 'sample_rate'")
+                if not analysis['success']:
+                    raise ValueError(analysis['error'])
+                channels = analysis['results']['channels']
+                currents = [c for c in channels.values() if c['type'] == 'current']
+                voltages = [c for c in channels.values() if c['type'] == 'voltage']
+                results['thd'] = max(c['thd'] for c in voltages or currents)
+                results['tdd'] = max((c['tdd'] for c in currents), default=None)
+                results['filter_size'] = max((c['filter_current'] for c in currents), default=0)
+                results['channels'] = channels
+                results['compliance'] = 'Harmonic distortion within IEEE 519 limits' if analysis['results']['compliant'] else 'Harmonic distortion exceeds IEEE 519 limits'
         
         elif domain == 'mechanical':
             if normalized_id == 'mechanical_hvac_load' or workflow_id == 'mechanical_hvac_load':
-                results['cooling_load'] = 125
-                results['heating_load'] = 85
-                results['compliance'] = 'Load calculation per ASHRAE'
+                from calculators.services.hvac_loads import hvac_simulation
+                if inputs.get('zones'):
+                    zones = inputs['zones']
+                else:
+                    # One zone from its floor area, occupancy and envelope (walls, windows, U-values, ...)
+                    if not inputs.get('zone_area'):
+                        raise ValueError("HVAC load calculation requires 'zone_area' (m²) or a list of 'zones'")
+                    zones = [dict(inputs.get('envelope_data') or {}, id='zone', area=float(inputs['zone_area']))]
+                    if inputs.get('occupancy') is not None:
+                        zones[0]['occupants'] = float(inputs['occupancy'])
+                options = {key: inputs[key] for key in ('longitude', 'timezone', 'altitude', 'chiller_type', 'chiller_count') if inputs.get(key) is not None}
+                if not inputs.get('weather_data'):
+                    options.update({key: inputs[key] for key in ('cooling_design_temp', 'heating_design_temp', 'daily_range', 'relative_humidity', 'daily_irradiance') if inputs.get(key) is not None})
+                loads = hvac_simulation(zones, inputs.get('weather_data') or None, float(inputs.get('latitude', 0)), **options)
+                results['cooling_load'] = loads['peak_cooling_kw']
+                results['heating_load'] = loads['peak_heating_kw']
+                results['annual_cooling_kwh'] = loads['annual_cooling_kwh']
+                results['annual_heating_kwh'] = loads['annual_heating_kwh']
+                if loads['plant']:
+                    results['chiller_kw'] = loads['plant']['design_load_kw']
+                    results['annual_chiller_kwh'] = loads['plant']['annual_chiller_kwh']
+                results['compliance'] = f"Hourly load calculation per ASHRAE over {loads['hours']} hours"
             elif normalized_id == 'mechanical_duct_sizing' or workflow_id == 'mechanical_duct_sizing':
-                results['duct_dimensions'] = '300x200'
-                results['pressure_drop'] = 8.5
-                results['compliance'] = 'Pressure drop within limits'
+                from calculators.services.duct_network import duct_network
+                options = {key: inputs[key] for key in ('method', 'friction_rate', 'min_velocity', 'shape', 'aspect_ratio', 'terminal_pressure') if inputs.get(key) is not None}
+                if inputs.get('velocity_limit') is not None:
+                    options['max_velocity'] = float(inputs['velocity_limit'])
+                if inputs.get('duct_material') is not None:
+                    options['material'] = inputs['duct_material']
+                if inputs.get('segments'):
+                    segments = inputs['segments']
+                else:
+                    # A single run carrying the whole airflow to one outlet
+                    if not inputs.get('airflow'):
+                        raise ValueError("Duct sizing requires 'airflow' (m³/h) or a 'segments' duct tree")
+                    segments = [{'id': 'duct', 'length': float(inputs.get('length', 10)), 'airflow': float(inputs['airflow']), 'fittings': inputs.get('fittings')}]
+                    options.setdefault('terminal_pressure', 0.0)
+                ducts = duct_network(segments, **options)
+                sizes = {segment['id']: segment['size'] for segment in ducts['segment_results']}
+                results['duct_dimensions'] = sizes['duct'] if len(sizes) == 1 and 'duct' in sizes else sizes
+                results['pressure_drop'] = ducts['fan_pressure']
+                results['critical_path'] = ducts['critical_path']
+                results['max_velocity'] = ducts['max_velocity']
+                results['compliance'] = f"Index path {' > '.join(map(str, ducts['critical_path']))} requires {ducts['fan_pressure']} Pa"
             elif normalized_id == 'mechanical_pump_sizing' or workflow_id == 'mechanical_pump_sizing':
-                results['pump_power'] = 15
-                results['pump_model'] = 'P-125'
-                results['compliance'] = 'Pump selected per manufacturer data'
+                from calculators.services.pump_selection import pump_selection
+                head = inputs.get('total_head', inputs.get('head'))
+                if not inputs.get('flow_rate') or not head:
+                    raise ValueError("Pump sizing requires 'flow_rate' (m³/h) and 'total_head' (m)")
+                options = {key: inputs[key] for key in ('static_head', 'catalog', 'arrangements', 'max_pumps', 'vfd', 'min_speed', 'max_oversize')
+                           if inputs.get(key) is not None}
+                for key in ('static_head', 'min_speed', 'max_oversize'):
+                    if key in options:
+                        options[key] = float(options[key])
+                if 'max_pumps' in options:
+                    options['max_pumps'] = int(float(options['max_pumps']))
+                if isinstance(options.get('vfd'), str):
+                    options['vfd'] = options['vfd'].strip().lower() in ('true', 'yes', '1')
+                selection = pump_selection(float(inputs['flow_rate']), float(head), max_results=3, **options)
+                best = selection['selections'][0]
+                results['pump_power'] = best['shaft_power_total']
+                results['pump_model'] = best['model']
+                results['arrangement'] = best['arrangement']
+                results['pump_efficiency'] = best['efficiency']
+                results['motor_rating'] = best['motor_rating']
+                results['alternatives'] = [f"{option['model']} ({option['arrangement']})" for option in selection['selections'][1:]]
+                results['compliance'] = f"Selected from {selection['feasible']} of {selection['candidates']} curve intersections"
+                # The declared efficiency is a target to report against, not a filter that can leave no pump
+                if inputs.get('efficiency') not in (None, ''):
+                    target = float(inputs['efficiency'])
+                    results['efficiency_target_met'] = best['efficiency'] >= target
+                    if best['efficiency'] < target:
+                        results['compliance'] += f"; best efficiency {best['efficiency']}% is below the {target:g}% target"
+                if selection['warnings']:
+                    results['warnings'] = selection['warnings']
+                    results['compliance'] += f"; {selection['warnings'][0]}"
             elif normalized_id == 'mechanical_pipe_sizing' or workflow_id == 'mechanical_pipe_sizing':
                 results['pipe_diameter'] = 100
                 results['pressure_drop'] = 6.5
                 results['compliance'] = 'Pipe size determined by velocity'
             elif normalized_id == 'mechanical_pressure_drop' or workflow_id == 'mechanical_pressure_drop':
-                results['pressure_drop_total'] = 45
-                results['compliance'] = 'System pressure losses calculated'
+                from calculators.services.pipe_network import pipe_network
+                # The solver models water: the fluid is given by name, by its temperature (°C) or as {'temperature': °C}
+                fluid = inputs.get('fluid_properties')
+                temperature = inputs.get('temperature', 20)
+                if isinstance(fluid, dict):
+                    temperature = fluid.get('temperature', temperature)
+                elif isinstance(fluid, (int, float)) and not isinstance(fluid, bool):
+                    temperature = fluid
+                elif isinstance(fluid, str) and fluid.strip() and fluid.strip().lower() != 'water':
+                    try:
+                        temperature = float(fluid)
+                    except ValueError:
+                        raise ValueError(f"Unsupported fluid '{fluid}': 'fluid_properties' must be 'water', "
+                                         "a water temperature (°C) or {'temperature': °C}")
+                elif fluid not in (None, '') and not isinstance(fluid, str):
+                    raise ValueError("'fluid_properties' must be 'water', a water temperature (°C) or {'temperature': °C}")
+                options = {key: inputs[key] for key in ('method', 'material') if inputs.get(key) is not None}
+                options['temperature'] = float(temperature)
+                if inputs.get('pipes') and inputs.get('nodes'):
+                    nodes, pipes = inputs['nodes'], inputs['pipes']
+                else:
+                    # Pipes in series from a source to one outlet; fittings are taken on the first pipe
+                    if not inputs.get('pipe_lengths') or not inputs.get('flow_rate'):
+                        raise ValueError("Pressure drop requires 'pipe_lengths' (m) and 'flow_rate' (m³/h), or a 'nodes'/'pipes' network")
+                    lengths = inputs['pipe_lengths'] if isinstance(inputs['pipe_lengths'], list) else [inputs['pipe_lengths']]
+                    diameters = inputs.get('pipe_sizes') or inputs.get('pipe_size') or 100
+                    diameters = diameters if isinstance(diameters, list) else [diameters] * len(lengths)
+                    if len(diameters) != len(lengths):
+                        raise ValueError("'pipe_sizes' must give one diameter (mm) per pipe length")
+                    nodes = [{'id': 0, 'head': 0.0}] + [{'id': i + 1} for i in range(len(lengths))]
+                    nodes[-1]['demand'] = float(inputs['flow_rate'])
+                    pipes = [{'id': i, 'from': i, 'to': i + 1, 'length': float(length), 'diameter': float(diameter)}
+                             for i, (length, diameter) in enumerate(zip(lengths, diameters))]
+                    pipes[0]['fittings'] = inputs.get('fittings')
+                network = pipe_network(nodes, pipes, include_details=False, **options)
+                results['pressure_drop_total'] = network['pressure_drop_total']
+                results['max_velocity'] = network['max_velocity']
+                results['critical_node'] = network['critical_node']
+                results['compliance'] = f"System pressure losses calculated ({network['iterations']} iterations)" if network['converged'] else 'Network solution did not converge'
             elif normalized_id == 'mechanical_chiller_selection' or workflow_id == 'mechanical_chiller_selection':
                 results['chiller_tons'] = 45
                 results['chiller_model'] = 'C-45'